@@ -9,6 +9,7 @@ Initializes FastAPI application with:
 - Configuration loading
 """
 
+import asyncio
 import logging
 import warnings
 from contextlib import asynccontextmanager
@@ -21,10 +22,12 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.config import settings
-from backend.middleware.observability import ObservabilityContextMiddleware
-from backend.middleware.feature_flag_context import FeatureFlagContextMiddleware
+from backend.middleware.pipeline import RequestPipeline
+from backend.middleware.metrics import HTTPMetricsStage
+from backend.middleware.observability import ObservabilityContextStage
+from backend.middleware.feature_flag_context import FeatureFlagContextStage
 
-from mgx_observability import ObservabilityConfig, initialize_otel, get_langsmith_logger
+from mgx_observability import ObservabilityConfig, initialize_otel, get_langsmith_logger, shutdown_langsmith_logger
 # Lazy import MGXTeamProvider to avoid Pydantic validation errors during module import
 from backend.services import (
     get_task_runner,
@@ -39,6 +42,7 @@ from backend.routers import (
     tasks_router,
     runs_router,
     metrics_router,
+    prometheus_router,
     agents_router,
     workflows_router,
     ws_router,
@@ -72,6 +76,9 @@ from backend.routers.performance import router as performance_router
 
 # Import database session factory and workflow engine integration
 from backend.db.engine import get_session_factory
+from backend.services.audit.logger import shutdown_audit_logger
+from backend.services.deepsite.port_allocator import shutdown_port_allocator
+from backend.services.github.api_client import get_github_api_client
 from backend.services.workflows.integration import get_workflow_engine_integration
 
 # Structured logging configuration
@@ -117,6 +124,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         otlp_protocol=settings.otel_otlp_protocol,
         otlp_headers=settings.otel_otlp_headers,
         sample_ratio=settings.otel_sample_ratio,
+        span_store_max_bytes=settings.otel_span_store_max_bytes,
+        span_store_spill_path=settings.otel_span_store_spill_path,
         langsmith_enabled=settings.langsmith_enabled,
         langsmith_api_key=settings.langsmith_api_key,
         langsmith_project=settings.langsmith_project,
@@ -144,6 +153,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         from backend.services import MGXTeamProvider
         team_provider = MGXTeamProvider(config=None)  # Uses default config
         app.state.team_provider = team_provider
+        team_provider.start_prewarm()
         logger.info("✓ MGXTeamProvider initialized")
     except Exception as e:
         logger.error(f"Failed to initialize MGXTeamProvider: {e}")
@@ -247,6 +257,32 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     except Exception as e:
         logger.error(f"Error stopping task runner: {str(e)}")
     
+    # Flush buffered audit records
+    try:
+        await shutdown_audit_logger()
+        logger.info("✓ Audit log buffer flushed")
+    except Exception as e:
+        logger.error(f"Error flushing audit logs: {str(e)}")
+
+    # Flush queued LangSmith runs
+    try:
+        await asyncio.to_thread(shutdown_langsmith_logger)
+        logger.info("✓ LangSmith exporter flushed")
+    except Exception as e:
+        logger.error(f"Error flushing LangSmith exporter: {str(e)}")
+
+    # Close the pooled Redis client of the preview port allocator
+    try:
+        await shutdown_port_allocator()
+    except Exception as e:
+        logger.error(f"Error closing port allocator: {str(e)}")
+
+    # Close the GitHub API client
+    try:
+        await get_github_api_client().aclose()
+    except Exception as e:
+        logger.error(f"Error closing GitHub API client: {str(e)}")
+    
     # Shutdown team provider
     if team_provider is not None:
         try:
@@ -318,7 +354,7 @@ def create_app() -> FastAPI:
     # ========== Security Headers ==========
     from backend.middleware.security_headers import (
         SecurityHeadersConfig,
-        SecurityHeadersMiddleware,
+        SecurityHeadersStage,
     )
 
     security_headers_config = SecurityHeadersConfig(
@@ -331,7 +367,7 @@ def create_app() -> FastAPI:
         ),
         enable_hsts=settings.mgx_env == "production",
     )
-    app.add_middleware(SecurityHeadersMiddleware, config=security_headers_config)
+    # Added to the request pipeline below
 
     # Add exception handler to ensure appropriate CORS headers are present on errors.
     from fastapi import Request
@@ -413,14 +449,20 @@ def create_app() -> FastAPI:
             headers=_cors_headers_for_request(request),
         )
 
-    # Add structured logging middleware (replaces old RequestLoggingMiddleware)
-    from backend.middleware.logging import StructuredLoggingMiddleware
-    app.add_middleware(StructuredLoggingMiddleware)
-
-    # Add middleware that enriches traces with workspace/project context.
-    app.add_middleware(ObservabilityContextMiddleware)
-
-    app.add_middleware(FeatureFlagContextMiddleware)
+    # Per-request concerns run as stages of one pure-ASGI middleware
+    # (outermost first): HTTP metrics, feature flag context, trace context
+    # enrichment with workspace/project, structured logging, security headers.
+    from backend.middleware.logging import StructuredLoggingStage
+    app.add_middleware(
+        RequestPipeline,
+        stages=[
+            HTTPMetricsStage(),
+            FeatureFlagContextStage(),
+            ObservabilityContextStage(),
+            StructuredLoggingStage(),
+            SecurityHeadersStage(security_headers_config),
+        ],
+    )
 
     # ========== Router Registration ==========
     app.include_router(health_router)
@@ -444,6 +486,10 @@ def create_app() -> FastAPI:
     app.include_router(metrics_router)
     logger.info("✓ Registered: metrics_router")
 
+    if settings.metrics_enabled:
+        app.include_router(prometheus_router)
+        logger.info("✓ Registered: prometheus_router")
+
     app.include_router(agents_router)
     logger.info("✓ Registered: agents_router")
     
@@ -75,6 +75,15 @@ class Settings(BaseSettings):
         default=None,
         description="GitHub webhook secret for signature verification",
     )
+    github_api_url: str = Field(
+        default="https://api.github.com",
+        description="GitHub REST API base URL",
+    )
+    github_api_cache_entries: int = Field(
+        default=1024,
+        ge=0,
+        description="Max GitHub API responses kept for conditional revalidation",
+    )
 
     # Agent Configuration
     agents_enabled: bool = Field(default=False, description="Enable multi-agent system")
@@ -113,6 +122,46 @@ class Settings(BaseSettings):
         description="Maximum number of agent messages to retain per agent instance",
     )
 
+    agent_message_retention_check_interval: int = Field(
+        default=100,
+        ge=1,
+        le=100_000,
+        description="Appends per agent instance between retention passes",
+    )
+
+    # MGXStyleTeam pool
+    team_pool_max_size: int = Field(
+        default=4,
+        ge=1,
+        le=256,
+        description="Maximum MGXStyleTeam instances per backend process",
+    )
+    team_pool_per_workspace_limit: int = Field(
+        default=2,
+        ge=0,
+        le=256,
+        description="Maximum teams checked out by one workspace at a time (0 = no limit)",
+    )
+    team_pool_prewarm: int = Field(
+        default=1,
+        ge=0,
+        le=256,
+        description="Teams built at startup so the first tasks skip role/LLM setup",
+    )
+    team_pool_idle_timeout_seconds: float = Field(
+        default=900.0,
+        ge=0.0,
+        description="Idle teams above the pre-warm floor are dropped after this long (0 = never)",
+    )
+    team_pool_acquire_timeout_seconds: float = Field(
+        default=600.0,
+        ge=0.0,
+        description="How long a task waits for a free team before failing (0 = wait forever)",
+    )
+
+    # Prometheus/OpenMetrics endpoint
+    metrics_enabled: bool = Field(default=True, description="Expose process metrics on GET /metrics")
+
     agent_message_ack_window_seconds: int = Field(
         default=3600,
         ge=60,
@@ -134,6 +183,18 @@ class Settings(BaseSettings):
         description="JWT secret key for authentication tokens (use strong random key in production)",
         validation_alias=AliasChoices("jwt_secret_key", "JWT_SECRET", "JWT_SECRET_KEY"),
     )
+    auth_principal_cache_ttl_seconds: float = Field(
+        default=30.0,
+        ge=0.0,
+        le=3600.0,
+        description="How long a validated token's user stays cached (0 disables the cache)",
+    )
+    auth_principal_cache_max_entries: int = Field(
+        default=10000,
+        ge=1,
+        le=1_000_000,
+        description="Maximum number of validated tokens kept in the principal cache",
+    )
     deepsite_skip_auth: bool = Field(
         default=True,
         description=(
@@ -181,6 +242,15 @@ class Settings(BaseSettings):
         le=1.0,
         description="Trace sampling ratio (0..1)",
     )
+    otel_span_store_max_bytes: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Memory budget of the in-process span store (bytes); whole traces are evicted beyond it",
+    )
+    otel_span_store_spill_path: Optional[str] = Field(
+        default=None,
+        description="Append evicted traces to this file so they stay queryable",
+    )
 
     langsmith_enabled: bool = Field(default=False, description="Enable LangSmith run logging")
     langsmith_api_key: Optional[str] = Field(default=None, description="LangSmith API key")
@@ -239,6 +309,56 @@ class Settings(BaseSettings):
         le=2555,
         description="How long to retain secret audit logs (in days)"
     )
+    secret_envelope_encryption: bool = Field(
+        default=True,
+        description="Encrypt secret values with backend-wrapped data keys instead of one backend call per value"
+    )
+    secret_data_key_max_uses: int = Field(
+        default=1000,
+        ge=1,
+        description="Number of values encrypted with one data key before a new one is generated"
+    )
+    secret_data_key_ttl_seconds: int = Field(
+        default=300,
+        ge=1,
+        description="How long a data key is reused for encryption and kept unwrapped in memory (in seconds)"
+    )
+    secret_data_key_cache_size: int = Field(
+        default=1024,
+        ge=1,
+        description="Maximum number of unwrapped data keys kept in memory"
+    )
+    secret_value_cache_ttl_seconds: float = Field(
+        default=30.0,
+        ge=0.0,
+        description="How long decrypted secret values are cached in memory (0 disables the cache)"
+    )
+    secret_value_cache_max_entries: int = Field(
+        default=1024,
+        ge=1,
+        description="Maximum number of decrypted secret values cached in memory"
+    )
+    secret_reencrypt_batch_size: int = Field(
+        default=200,
+        ge=1,
+        description="Secrets re-encrypted per database batch during key rotation"
+    )
+    audit_queue_max_size: int = Field(
+        default=10000,
+        ge=1,
+        le=1_000_000,
+        description="Maximum audit records buffered before writers wait"
+    )
+    audit_batch_size: int = Field(
+        default=500,
+        ge=1,
+        le=10000,
+        description="Maximum audit records per bulk insert"
+    )
+    audit_spool_path: Optional[str] = Field(
+        default=None,
+        description="Local fsync'd spool file for buffered audit records (disabled if unset)"
+    )
     
     # LLM Provider Settings
     llm_default_provider: str = Field(
@@ -4,10 +4,20 @@ Database engine configuration for async SQLAlchemy operations.
 """
 
 import asyncio
+import time
+import weakref
 from typing import AsyncGenerator, Optional
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, async_sessionmaker, AsyncSession
 from sqlalchemy.pool import StaticPool
 from ..config import settings
+from ..services.metrics_registry import (
+    DB_CONNECTIONS_IN_USE,
+    DB_POOL_CHECKOUTS,
+    DB_POOL_SIZE,
+    DB_QUERY_DURATION,
+    DB_QUERY_ERRORS,
+)
 
 
 # Global engine and session maker instances
@@ -44,10 +54,65 @@ async def create_engine() -> AsyncEngine:
         # Pool recycle time (2 hours)
         pool_recycle=7200,
     )
+    instrument_engine(engine)
     
     return engine
 
 
+_QUERY_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "BEGIN", "COMMIT", "ROLLBACK"})
+_QUERY_STARTED_ATTR = "_metrics_query_started"
+
+
+def _query_operation(statement: Optional[str]) -> str:
+    """Leading SQL keyword, bucketed so the label set stays small."""
+    keyword = (statement or "").lstrip().split(None, 1)[:1]
+    operation = keyword[0].upper() if keyword else ""
+    return operation if operation in _QUERY_OPERATIONS else "OTHER"
+
+
+def instrument_engine(engine: AsyncEngine) -> AsyncEngine:
+    """Record query timing and pool usage of ``engine`` in the metrics registry."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            setattr(context, _QUERY_STARTED_ATTR, time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, _QUERY_STARTED_ATTR, None)
+        if started is not None:
+            DB_QUERY_DURATION.observe(time.perf_counter() - started, operation=_query_operation(statement))
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        DB_QUERY_ERRORS.inc(operation=_query_operation(exception_context.statement))
+
+    @event.listens_for(sync_engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc()
+
+    # Weak reference so the gauges don't keep a dropped engine alive; the
+    # pool is looked up at scrape time because dispose() replaces it
+    engine_ref = weakref.ref(sync_engine)
+
+    def _pool_value(method: str) -> dict:
+        current = engine_ref()
+        getter = getattr(current.pool, method, None) if current is not None else None
+        return {(): getter()} if getter else {}
+
+    def _in_use() -> dict:
+        return _pool_value("checkedout")
+
+    def _size() -> dict:
+        return _pool_value("size")
+
+    DB_CONNECTIONS_IN_USE.add_callback(_in_use)
+    DB_POOL_SIZE.add_callback(_size)
+    return engine
+
+
 def get_engine() -> AsyncEngine:
     """Get or create the global async engine."""
     global _engine
@@ -49,6 +49,7 @@ from .entities import (
     AgentContextVersion,
     AgentDefinition,
     AgentInstance,
+    AgentMemoryEntry,
     AgentMessage,
     MetricSnapshot,
     Project,
@@ -109,6 +110,7 @@ __all__ = [
     "AgentInstance",
     "AgentContext",
     "AgentContextVersion",
+    "AgentMemoryEntry",
     "AgentMessage",
     "WorkflowDefinition",
     "WorkflowStep",
@@ -256,6 +256,7 @@ class Task(Base, TimestampMixin, SerializationMixin):
             ondelete="RESTRICT",
         ),
         Index("idx_tasks_workspace_project", "workspace_id", "project_id"),
+        Index("idx_tasks_workspace_created_id", "workspace_id", "created_at", "id"),
     )
 
     workspace = relationship("Workspace", back_populates="tasks", overlaps="tasks")
@@ -319,6 +320,8 @@ class TaskRun(Base, TimestampMixin, SerializationMixin):
         Index("idx_task_runs_task_id_status", "task_id", "status"),
         Index("idx_task_runs_started_at", "started_at"),
         Index("idx_task_runs_workspace_status", "workspace_id", "status"),
+        Index("idx_task_runs_workspace_created_id", "workspace_id", "created_at", "id"),
+        Index("idx_task_runs_task_created_id", "task_id", "created_at", "id"),
     )
 
     task = relationship("Task", back_populates="runs")
@@ -554,6 +557,46 @@ class AgentContextVersion(Base, TimestampMixin, SerializationMixin):
         return f"<AgentContextVersion(context_id={self.context_id}, version={self.version})>"
 
 
+class AgentMemoryEntry(Base, TimestampMixin, SerializationMixin):
+    """Append-only agent memory entry (one row per stored memory)."""
+
+    __tablename__ = "agent_memory_entries"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid4()), index=True)
+
+    workspace_id = Column(String(36), ForeignKey("workspaces.id", ondelete="CASCADE"), nullable=False, index=True)
+    project_id = Column(String(36), nullable=False, index=True)
+
+    agent_instance_id = Column(
+        String(36),
+        ForeignKey("agent_instances.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    memory_key = Column(String(255), nullable=False, comment="Memory key (e.g. workflow_state)")
+    data = Column(JSON, nullable=True, comment="Stored memory payload")
+    meta_data = Column("metadata", JSON, nullable=False, default=dict)
+    size_bytes = Column(Integer, nullable=False, default=0, comment="Serialized payload size")
+
+    recorded_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, comment="Entry timestamp")
+    last_accessed_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, comment="LRU access time")
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["workspace_id", "project_id"],
+            ["projects.workspace_id", "projects.id"],
+            name="fk_agent_memory_entries_project_in_workspace",
+            ondelete="RESTRICT",
+        ),
+        Index("idx_agent_memory_entries_key_recorded", "agent_instance_id", "memory_key", "recorded_at"),
+        Index("idx_agent_memory_entries_key_accessed", "agent_instance_id", "memory_key", "last_accessed_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<AgentMemoryEntry(id={self.id}, agent_instance_id={self.agent_instance_id}, key='{self.memory_key}')>"
+
+
 class AgentMessage(Base, TimestampMixin, SerializationMixin):
     """Persistent agent message log entry."""
 
@@ -630,6 +673,7 @@ class WorkflowDefinition(Base, TimestampMixin, SerializationMixin):
         ),
         Index("idx_workflow_definitions_workspace_project", "workspace_id", "project_id"),
         Index("idx_workflow_definitions_name_version", "name", "version"),
+        Index("idx_workflow_definitions_workspace_created_id", "workspace_id", "created_at", "id"),
         UniqueConstraint("workspace_id", "project_id", "name", "version", name="uq_workflow_definitions_unique"),
     )
 
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Keyset pagination and cheap row counts for list queries.
+
+Pages are ordered newest first by ``(created_at, id)`` and continue from an
+opaque cursor holding the last row's key, so page N costs the same as page 1
+(an index range scan on ``(workspace_id, created_at, id)``) instead of
+reading and discarding ``OFFSET`` rows.
+
+Counting every matching row is the other cost of a list request, so counts
+are opt-in:
+
+- ``exact``: ``count(*)`` over the filtered query.
+- ``estimate``: the planner's row estimate (``EXPLAIN``, fed by the
+  ``pg_class``/``pg_statistic`` statistics) on PostgreSQL, falling back to an
+  exact count when the estimate is small; on other databases an exact count
+  cached for a short time.
+- none: ``total`` is only filled in when it is known for free, i.e. the first
+  page is also the last one.
+"""
+
+import base64
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Select, and_, func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+COUNT_EXACT = "exact"
+COUNT_ESTIMATE = "estimate"
+COUNT_MODES = (COUNT_EXACT, COUNT_ESTIMATE)
+
+# Below this many estimated rows an exact count is cheap and more useful
+EXACT_COUNT_THRESHOLD = 10_000
+COUNT_CACHE_TTL_SECONDS = 30.0
+_COUNT_CACHE_MAX_ENTRIES = 1024
+
+_count_cache: Dict[str, Tuple[float, int]] = {}
+
+
+@dataclass
+class KeysetPage:
+    """One page of rows plus the cursor for the next one (``None`` on the last page)."""
+
+    items: List[Any]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """Opaque cursor for the row ``(created_at, row_id)``."""
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of :func:`encode_cursor`; raises ``ValueError`` on malformed input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+async def fetch_keyset_page(
+    session: AsyncSession,
+    query: Select,
+    model: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+) -> KeysetPage:
+    """Run ``query`` for one page, newest first.
+
+    ``skip`` is only honoured without a cursor (legacy offset clients).
+    """
+    created_col, id_col = model.created_at, model.id
+    if session.get_bind().dialect.name == "sqlite":
+        # SQLite stores timestamps as text with or without microseconds
+        # (server default vs. Python value); compare them as numbers
+        created_key = func.julianday(created_col)
+    else:
+        created_key = created_col
+    query = query.order_by(created_key.desc(), id_col.desc())
+
+    if cursor:
+        cursor_created, cursor_id = decode_cursor(cursor)
+        cursor_key = func.julianday(cursor_created) if created_key is not created_col else cursor_created
+        query = query.where(
+            or_(
+                created_key < cursor_key,
+                and_(created_key == cursor_key, id_col < cursor_id),
+            )
+        )
+    elif skip:
+        query = query.offset(skip)
+
+    # One extra row tells whether another page follows
+    rows = list((await session.execute(query.limit(limit + 1))).scalars().all())
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return KeysetPage(items=rows, next_cursor=next_cursor)
+
+
+async def count_rows(session: AsyncSession, query: Select, mode: str) -> Tuple[int, bool]:
+    """Count the rows of the filtered ``query``; returns ``(total, is_estimate)``."""
+    if mode not in COUNT_MODES:
+        raise ValueError(f"Invalid count mode: {mode}")
+
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    if mode == COUNT_EXACT:
+        return (await session.execute(count_query)).scalar_one(), False
+
+    bind = session.get_bind()
+    if bind.dialect.name == "postgresql":
+        estimate = await _planner_estimate(session, query)
+        if estimate is not None and estimate >= EXACT_COUNT_THRESHOLD:
+            return estimate, True
+        return (await session.execute(count_query)).scalar_one(), False
+
+    return await _cached_count(session, count_query), False
+
+
+async def _planner_estimate(session: AsyncSession, query: Select) -> Optional[int]:
+    """Row estimate of ``query`` from the PostgreSQL planner."""
+    compiled = query.order_by(None).compile(
+        dialect=session.get_bind().dialect,
+        compile_kwargs={"literal_binds": True},
+    )
+    try:
+        # Savepoint so a failed EXPLAIN doesn't abort the request's transaction
+        async with session.begin_nested():
+            result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+            plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception:
+        return None
+
+
+async def _cached_count(session: AsyncSession, count_query: Select) -> int:
+    compiled = count_query.compile(dialect=session.get_bind().dialect)
+    key = f"{compiled}|{sorted(compiled.params.items())!r}"
+    now = time.monotonic()
+    cached = _count_cache.get(key)
+    if cached is not None and now - cached[0] < COUNT_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    total = (await session.execute(count_query)).scalar_one()
+    if len(_count_cache) >= _COUNT_CACHE_MAX_ENTRIES:
+        _count_cache.clear()
+    _count_cache[key] = (now, total)
+    return total
+
+
+def page_total(page: KeysetPage, cursor: Optional[str], skip: int) -> Optional[int]:
+    """Total that is known without counting: the first page is also the last."""
+    if cursor is None and page.next_cursor is None and (page.items or not skip):
+        return skip + len(page.items)
+    return None
+
+
+__all__ = [
+    "COUNT_EXACT",
+    "COUNT_ESTIMATE",
+    "COUNT_MODES",
+    "KeysetPage",
+    "encode_cursor",
+    "decode_cursor",
+    "fetch_keyset_page",
+    "count_rows",
+    "page_total",
+]
@@ -23,13 +23,15 @@ from .spans import (
 )
 from .otel import initialize_otel
 from .span_store import get_span_store
-from .langsmith import get_langsmith_logger
+from .langsmith import LangSmithExporter, get_langsmith_logger, shutdown_langsmith_logger
 
 __all__ = [
     "ObservabilityConfig",
     "initialize_otel",
     "get_span_store",
     "get_langsmith_logger",
+    "shutdown_langsmith_logger",
+    "LangSmithExporter",
     "start_span",
     "set_span_attributes",
     "record_exception",
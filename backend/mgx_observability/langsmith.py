@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
-import asyncio
+import atexit
+import json
 import logging
 import os
+import queue
+import threading
+import time
+import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from .config import ObservabilityConfig
 from .spans import get_current_span_ids
@@ -15,21 +20,177 @@ from .spans import get_current_span_ids
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_ENDPOINT = "https://api.smith.langchain.com"
+
+
+class LangSmithExporter:
+    """Long-lived background exporter posting runs to LangSmith in batches.
+
+    ``submit`` only enqueues: a worker thread sends up to ``max_batch_size``
+    runs per ``POST /runs/batch`` request, or whatever is queued once
+    ``flush_interval`` seconds pass, over one keep-alive HTTP client. When
+    the queue is full new runs are dropped and counted rather than blocking
+    the caller.
+    """
+
+    def __init__(
+        self,
+        *,
+        api_key: str,
+        endpoint: Optional[str] = None,
+        max_queue_size: int = 10_000,
+        max_batch_size: int = 100,
+        flush_interval: float = 1.0,
+        timeout: float = 10.0,
+    ) -> None:
+        self.api_key = api_key
+        self.endpoint = (endpoint or DEFAULT_ENDPOINT).rstrip("/")
+        self.max_batch_size = max(1, max_batch_size)
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._stats = {"submitted": 0, "sent": 0, "dropped": 0, "failed": 0, "batches": 0}
+
+    def submit(self, run: Dict[str, Any]) -> bool:
+        """Queue one run; returns False (and counts a drop) when the queue is full."""
+        if self._stopping:
+            self._count("dropped")
+            return False
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(run)
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("submitted")
+        return True
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Send everything queued so far; returns False if ``timeout`` expired first."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(_FlushMarker(done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Flush pending runs and stop the worker (also registered with ``atexit``)."""
+        if self._stopping:
+            return
+        self.flush(timeout)
+        self._stopping = True
+        thread = self._thread
+        if thread is not None:
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="langsmith-exporter", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        import httpx
+
+        client = httpx.Client(
+            base_url=self.endpoint,
+            headers={"x-api-key": self.api_key},
+            timeout=self.timeout,
+        )
+        try:
+            while True:
+                batch, markers, stop = self._next_batch()
+                if batch:
+                    self._send(client, batch)
+                for marker in markers:
+                    marker.done.set()
+                if stop:
+                    return
+        finally:
+            client.close()
+
+    def _next_batch(self):
+        """Collect runs until the batch is full, the interval passes, or a marker arrives."""
+        batch: List[Dict[str, Any]] = []
+        markers: List[_FlushMarker] = []
+        deadline = None
+        while len(batch) < self.max_batch_size:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, markers, True
+            if isinstance(item, _FlushMarker):
+                markers.append(item)
+                break
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+        return batch, markers, False
+
+    def _send(self, client, batch: List[Dict[str, Any]]) -> None:
+        try:
+            response = client.post("/runs/batch", content=json.dumps({"post": batch}, default=_json_default))
+            response.raise_for_status()
+        except Exception as e:
+            logger.debug("LangSmith batch export failed (%s runs): %s", len(batch), e)
+            self._count("failed", len(batch))
+            return
+        self._count("sent", len(batch))
+        self._count("batches")
+
+
+class _FlushMarker:
+    __slots__ = ("done",)
+
+    def __init__(self, done: threading.Event) -> None:
+        self.done = done
+
+
+_STOP = object()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
 @dataclass
 class LangSmithLogger:
     api_key: str
     project: str
     endpoint: Optional[str] = None
+    exporter: Optional[LangSmithExporter] = None
 
-    def _client(self):
-        from langsmith import Client
-
-        kwargs: Dict[str, Any] = {}
-        if self.endpoint:
-            kwargs["api_url"] = self.endpoint
-        if self.api_key:
-            kwargs["api_key"] = self.api_key
-        return Client(**kwargs)
+    def __post_init__(self) -> None:
+        if self.exporter is None:
+            self.exporter = LangSmithExporter(api_key=self.api_key, endpoint=self.endpoint)
 
     async def log_llm_call(
         self,
@@ -44,9 +205,10 @@ class LangSmithLogger:
         end_time: Optional[datetime] = None,
         error: Optional[str] = None,
     ) -> Optional[str]:
-        """Create a LangSmith run for an LLM call.
+        """Queue a LangSmith run for an LLM call; returns its id, or None if dropped.
 
-        This uses a background thread to avoid blocking the event loop.
+        Runs are sent in batches by the background exporter, so this never
+        waits on the network.
         """
 
         trace_id, span_id = get_current_span_ids()
@@ -62,35 +224,27 @@ class LangSmithLogger:
         start_time = start_time or datetime.now(timezone.utc)
         end_time = end_time or datetime.now(timezone.utc)
 
-        def _send() -> str:
-            client = self._client()
-
-            payload: Dict[str, Any] = {
-                "name": name,
-                "run_type": "llm",
-                "inputs": {"prompt": prompt},
-                "outputs": {"output": output} if error is None else None,
-                "extra": {"metadata": merged_meta},
-                "start_time": start_time,
-                "end_time": end_time,
-            }
-            if error is not None:
-                payload["error"] = error
-
-            try:
-                run = client.create_run(**payload, project_name=self.project)
-            except TypeError:
-                run = client.create_run(**payload, session_name=self.project)
-
-            if isinstance(run, dict) and "id" in run:
-                return str(run["id"])
-            return str(run)
+        run_id = str(uuid.uuid4())
+        run: Dict[str, Any] = {
+            "id": run_id,
+            "trace_id": run_id,
+            "dotted_order": f"{start_time.strftime('%Y%m%dT%H%M%S%fZ')}{run_id}",
+            "name": name,
+            "run_type": "llm",
+            "inputs": {"prompt": prompt},
+            "outputs": {"output": output} if error is None else None,
+            "extra": {"metadata": merged_meta},
+            "start_time": start_time,
+            "end_time": end_time,
+            "session_name": self.project,
+        }
+        if error is not None:
+            run["error"] = error
 
-        try:
-            return await asyncio.to_thread(_send)
-        except Exception as e:
-            logger.debug("LangSmith logging failed: %s", e)
+        if not self.exporter.submit(run):
+            logger.debug("LangSmith export queue full; run dropped")
             return None
+        return run_id
 
 
 _LOGGER: Optional[LangSmithLogger] = None
@@ -118,6 +272,7 @@ def get_langsmith_logger(config: Optional[ObservabilityConfig] = None) -> Option
     endpoint = cfg.langsmith_endpoint or os.getenv("LANGSMITH_ENDPOINT")
 
     _LOGGER = LangSmithLogger(api_key=api_key, project=project, endpoint=endpoint)
+    atexit.register(shutdown_langsmith_logger)
 
     os.environ.setdefault("LANGSMITH_API_KEY", api_key)
     os.environ.setdefault("LANGSMITH_PROJECT", project)
@@ -125,3 +280,9 @@ def get_langsmith_logger(config: Optional[ObservabilityConfig] = None) -> Option
         os.environ.setdefault("LANGSMITH_ENDPOINT", endpoint)
 
     return _LOGGER
+
+
+def shutdown_langsmith_logger(timeout: float = 10.0) -> None:
+    """Flush queued LangSmith runs and stop the exporter thread."""
+    if _LOGGER is not None and _LOGGER.exporter is not None:
+        _LOGGER.exporter.shutdown(timeout)
@@ -29,7 +29,11 @@ def initialize_otel(
         return
 
     cfg = config.normalized()
-    get_span_store().set_maxlen(cfg.span_store_maxlen)
+    get_span_store().configure(
+        maxlen=cfg.span_store_maxlen,
+        max_bytes=cfg.span_store_max_bytes,
+        spill_path=cfg.span_store_spill_path,
+    )
 
     if not cfg.otel_enabled:
         logger.info("OpenTelemetry disabled")
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import heapq
+import itertools
+import json
 import threading
-from collections import deque
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
-from typing import Any, Deque, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 
 @dataclass(frozen=True)
@@ -25,33 +28,179 @@ class SpanRecord:
     resource: Dict[str, Any]
 
 
+class _Trace:
+    __slots__ = ("spans", "bytes")
+
+    def __init__(self) -> None:
+        # (seq, record, encoded size)
+        self.spans: List[Tuple[int, SpanRecord, int]] = []
+        self.bytes = 0
+
+
 class SpanStore:
-    def __init__(self, maxlen: int = 2000):
+    """In-memory span buffer indexed by trace.
+
+    Spans are grouped per trace, so one trace is returned in O(k) for its k
+    spans. When the store exceeds ``maxlen`` spans or ``max_bytes`` (encoded
+    JSON size), whole traces are evicted, least recently updated first. With
+    ``spill_path`` set, evicted traces are appended to that file as JSON lines
+    and stay queryable by ``trace_id``; only their file offsets are kept in
+    memory.
+    """
+
+    def __init__(
+        self,
+        maxlen: int = 2000,
+        max_bytes: Optional[int] = None,
+        spill_path: Optional[str] = None,
+        spill_max_bytes: int = 64 * 1024 * 1024,
+    ):
         self._lock = threading.Lock()
-        self._spans: Deque[SpanRecord] = deque(maxlen=maxlen)
+        self._traces: "OrderedDict[str, _Trace]" = OrderedDict()
+        self._seq = itertools.count()
+        self._span_count = 0
+        self._bytes = 0
+        self._maxlen = maxlen
+        self._max_bytes = max_bytes
+        self._spill_path = spill_path
+        self._spill_max_bytes = spill_max_bytes
+        # trace_id -> [(offset, length)] of spilled lines, oldest first
+        self._spilled: Dict[str, List[Tuple[int, int]]] = {}
+
+    def configure(
+        self,
+        *,
+        maxlen: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        spill_path: Optional[str] = None,
+    ) -> None:
+        """Change the budgets (and spill file); evicts right away if needed."""
+        with self._lock:
+            if maxlen is not None:
+                self._maxlen = maxlen
+            self._max_bytes = max_bytes
+            if spill_path != self._spill_path:
+                self._spill_path = spill_path
+                self._spilled.clear()
+            self._enforce_budget()
 
     def set_maxlen(self, maxlen: int) -> None:
         with self._lock:
-            old = list(self._spans)
-            self._spans = deque(old, maxlen=maxlen)
+            self._maxlen = maxlen
+            self._enforce_budget()
 
     def add(self, record: SpanRecord) -> None:
+        size = len(_encode(record))
         with self._lock:
-            self._spans.append(record)
-
-    def list(self, *, limit: int = 100, trace_id: Optional[str] = None) -> List[SpanRecord]:
+            trace = self._traces.get(record.trace_id)
+            if trace is None:
+                trace = self._traces[record.trace_id] = _Trace()
+            else:
+                self._traces.move_to_end(record.trace_id)
+            trace.spans.append((next(self._seq), record, size))
+            trace.bytes += size
+            self._span_count += 1
+            self._bytes += size
+            self._enforce_budget()
+
+    def get_trace(self, trace_id: str) -> List[SpanRecord]:
+        """All spans of one trace, oldest first (spilled spans included)."""
         with self._lock:
-            spans = list(self._spans)
+            trace = self._traces.get(trace_id)
+            in_memory = [record for _, record, _ in trace.spans] if trace is not None else []
+            offsets = list(self._spilled.get(trace_id, ()))
+            spill_path = self._spill_path
+        if offsets and spill_path:
+            return self._read_spilled(spill_path, offsets) + in_memory
+        return in_memory
 
+    def list(self, *, limit: int = 100, trace_id: Optional[str] = None) -> List[SpanRecord]:
+        """Most recent spans first, optionally for one trace."""
+        limit = max(0, limit)
         if trace_id:
-            spans = [s for s in spans if s.trace_id == trace_id]
+            return list(reversed(self.get_trace(trace_id)))[:limit]
+
+        with self._lock:
+            newest_first = [reversed(trace.spans) for trace in self._traces.values()]
+            merged = heapq.merge(*newest_first, key=lambda entry: entry[0], reverse=True)
+            return [record for _, record, _ in itertools.islice(merged, limit)]
 
-        spans = list(reversed(spans))
-        return spans[: max(0, limit)]
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "traces": len(self._traces),
+                "spans": self._span_count,
+                "bytes": self._bytes,
+                "spilled_traces": len(self._spilled),
+            }
 
     def clear(self) -> None:
         with self._lock:
-            self._spans.clear()
+            self._traces.clear()
+            self._span_count = 0
+            self._bytes = 0
+            self._spilled.clear()
+
+    def _over_budget(self) -> bool:
+        if self._span_count > self._maxlen:
+            return True
+        return self._max_bytes is not None and self._bytes > self._max_bytes
+
+    def _enforce_budget(self) -> None:
+        while self._over_budget() and self._traces:
+            if len(self._traces) == 1:
+                # A single trace larger than the budget keeps its newest spans
+                trace_id, trace = next(iter(self._traces.items()))
+                _, record, size = trace.spans.pop(0)
+                trace.bytes -= size
+                self._span_count -= 1
+                self._bytes -= size
+                self._spill(trace_id, [record])
+                if not trace.spans:
+                    del self._traces[trace_id]
+                continue
+
+            trace_id, trace = self._traces.popitem(last=False)
+            self._span_count -= len(trace.spans)
+            self._bytes -= trace.bytes
+            self._spill(trace_id, [record for _, record, _ in trace.spans])
+
+    def _spill(self, trace_id: str, records: List[SpanRecord]) -> None:
+        if not self._spill_path:
+            return
+        lines = [_encode(record) + b"\n" for record in records]
+        try:
+            with open(self._spill_path, "ab") as f:
+                offset = f.tell()
+                if offset + sum(len(line) for line in lines) > self._spill_max_bytes:
+                    # Start over rather than growing without bound
+                    f.truncate(0)
+                    self._spilled.clear()
+                    offset = 0
+                locations = self._spilled.setdefault(trace_id, [])
+                for line in lines:
+                    f.write(line)
+                    locations.append((offset, len(line)))
+                    offset += len(line)
+        except OSError:
+            # Spilling is best-effort; the spans are simply dropped
+            self._spilled.pop(trace_id, None)
+
+    @staticmethod
+    def _read_spilled(path: str, offsets: List[Tuple[int, int]]) -> List[SpanRecord]:
+        records: List[SpanRecord] = []
+        try:
+            with open(path, "rb") as f:
+                for offset, length in offsets:
+                    f.seek(offset)
+                    records.append(SpanRecord(**json.loads(f.read(length))))
+        except (OSError, ValueError, TypeError):
+            pass
+        return records
+
+
+def _encode(record: SpanRecord) -> bytes:
+    return json.dumps(asdict(record), default=str, separators=(",", ":")).encode()
 
 
 _STORE = SpanStore()
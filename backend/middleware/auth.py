@@ -5,12 +5,12 @@ Authentication Middleware
 JWT token validation middleware for protecting routes.
 """
 
-from typing import Optional
+from typing import Any, Dict, Optional
 import logging
 
-from fastapi import Request, HTTPException, status
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -19,6 +19,8 @@ from sqlalchemy import select
 from backend.config import settings
 from backend.db.session import get_session_manager
 from backend.db.models.entities import User
+from backend.middleware.pipeline import PipelineStage, RequestPipeline
+from backend.services.auth.principal_cache import get_principal_cache
 
 logger = logging.getLogger(__name__)
 
@@ -29,54 +31,83 @@ SECRET_KEY = settings.jwt_secret_key
 ALGORITHM = "HS256"
 
 
-async def get_current_user_from_token(token: str, session: AsyncSession) -> Optional[User]:
-    """Get user from JWT token."""
+def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
+    """Decode and verify an access token (CPU only); None if invalid."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        if payload.get("type") != "access":
-            return None
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            return None
     except JWTError:
         return None
-    
+    if payload.get("type") != "access" or payload.get("sub") is None:
+        return None
+    return payload
+
+
+def _user_values(user: User) -> Dict[str, Any]:
+    return {column.key: getattr(user, column.key) for column in User.__mapper__.column_attrs}
+
+
+async def get_current_user_from_token(
+    token: str,
+    session: Optional[AsyncSession] = None,
+    payload: Optional[Dict[str, Any]] = None,
+) -> Optional[User]:
+    """Get user from JWT token.
+
+    Recently validated tokens are answered from the principal cache with a
+    detached ``User``; ``session`` is only used on a cache miss (one is
+    opened if not given).
+    """
+    payload = payload or decode_access_token(token)
+    if payload is None:
+        return None
+    user_id: str = payload["sub"]
+    jti = payload.get("jti")
+
+    cache = get_principal_cache()
+    cache.ensure_listener()
+    cached = cache.get(user_id, jti)
+    if cached is not None:
+        return User(**cached)
+
+    if session is None:
+        async with get_session_manager().session() as own_session:
+            return await get_current_user_from_token(token, own_session, payload)
+
     result = await session.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if user is None or not user.is_active:
         return None
+    cache.put(user_id, jti, _user_values(user))
     return user
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    """Middleware to add current_user to request state for authenticated requests."""
+class AuthStage(PipelineStage):
+    """Pipeline stage adding current_user to request state for authenticated requests."""
     
-    def __init__(self, app: ASGIApp, optional: bool = False):
+    # Skip auth for certain paths
+    skip_paths = (
+        "/health",
+        "/docs",
+        "/redoc",
+        "/openapi.json",
+        "/api/auth/register",
+        "/api/auth/login",
+    )
+    
+    def __init__(self, optional: bool = False):
         """
-        Initialize auth middleware.
+        Initialize auth stage.
         
         Args:
-            app: ASGI application
             optional: If True, missing/invalid tokens don't cause errors (user will be None)
         """
-        super().__init__(app)
         self.optional = optional
     
-    async def dispatch(self, request: Request, call_next):
-        """Process request and add user to state if authenticated."""
-        # Skip auth for certain paths
-        skip_paths = [
-            "/health",
-            "/docs",
-            "/redoc",
-            "/openapi.json",
-            "/api/auth/register",
-            "/api/auth/login",
-        ]
-        
-        if any(request.url.path.startswith(path) for path in skip_paths):
+    async def enter(self, request: Request, ctx: Dict[str, Any]):
+        """Add user to state if authenticated; answer 401 if auth is required and fails."""
+        if request.url.path.startswith(self.skip_paths):
             request.state.current_user = None
-            return await call_next(request)
+            return None
         
         # Try to get token from Authorization header
         authorization = request.headers.get("Authorization")
@@ -86,18 +117,14 @@ class AuthMiddleware(BaseHTTPMiddleware):
         
         if token:
             try:
-                session_manager = get_session_manager()
-                async with session_manager.session() as session:
-                    user = await get_current_user_from_token(token, session)
-                    request.state.current_user = user
-                    request.state.user_id = user.id if user else None
+                # A session is only opened on a principal cache miss
+                user = await get_current_user_from_token(token)
+                request.state.current_user = user
+                request.state.user_id = user.id if user else None
             except Exception as e:
                 logger.warning(f"Error validating token: {e}")
                 if not self.optional:
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Could not validate credentials"
-                    )
+                    return _unauthorized("Could not validate credentials")
                 request.state.current_user = None
                 request.state.user_id = None
         else:
@@ -105,13 +132,32 @@ class AuthMiddleware(BaseHTTPMiddleware):
             request.state.user_id = None
             if not self.optional and request.url.path.startswith("/api/"):
                 # Only require auth for API endpoints (not auth endpoints themselves)
-                if not any(request.url.path.startswith(path) for path in ["/api/auth", "/api/health"]):
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Not authenticated"
-                    )
+                if not request.url.path.startswith(("/api/auth", "/api/health")):
+                    return _unauthorized("Not authenticated")
         
-        return await call_next(request)
+        return None
+
+
+def _unauthorized(detail: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        content={"detail": detail},
+    )
+
+
+class AuthMiddleware(RequestPipeline):
+    """Pure-ASGI middleware running ``AuthStage``."""
+    
+    def __init__(self, app: ASGIApp, optional: bool = False):
+        """
+        Initialize auth middleware.
+        
+        Args:
+            app: ASGI application
+            optional: If True, missing/invalid tokens don't cause errors (user will be None)
+        """
+        super().__init__(app, [AuthStage(optional=optional)])
+        self.optional = optional
 
 
-__all__ = ["AuthMiddleware", "get_current_user_from_token"]
+__all__ = ["AuthMiddleware", "AuthStage", "decode_access_token", "get_current_user_from_token"]
@@ -2,18 +2,18 @@
 
 from __future__ import annotations
 
-from collections.abc import Awaitable, Callable
+from typing import Any, Dict
 
 import structlog
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
 from starlette.types import ASGIApp
 
 from backend.core.feature_flag_fallback import safe_is_enabled
+from backend.middleware.pipeline import PipelineStage, RequestPipeline
 from backend.services.feature_flag_service import get_feature_flag_service
 
 
-class FeatureFlagContextMiddleware(BaseHTTPMiddleware):
+class FeatureFlagContextStage(PipelineStage):
     """Attach feature flag context to each request.
 
     - Resolves user_id and workspace_id from headers
@@ -21,12 +21,7 @@ class FeatureFlagContextMiddleware(BaseHTTPMiddleware):
     - Binds decisions into structlog contextvars for request-scoped logs
     """
 
-    def __init__(self, app: ASGIApp) -> None:
-        super().__init__(app)
-
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
+    async def enter(self, request: Request, ctx: Dict[str, Any]):
         user_id = request.headers.get("X-User-ID")
         workspace_id = request.headers.get("X-Workspace-ID")
 
@@ -49,5 +44,14 @@ class FeatureFlagContextMiddleware(BaseHTTPMiddleware):
             feature_flags=decisions,
             ab_groups=ab_groups,
         )
+        return None
+
+
+class FeatureFlagContextMiddleware(RequestPipeline):
+    """Pure-ASGI middleware running ``FeatureFlagContextStage``."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        super().__init__(app, [FeatureFlagContextStage()])
+
 
-        return await call_next(request)
+__all__ = ["FeatureFlagContextStage", "FeatureFlagContextMiddleware"]
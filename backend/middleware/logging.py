@@ -8,12 +8,13 @@ Provides JSON structured logging with correlation IDs for request/response track
 import logging
 import uuid
 import time
-from typing import Callable, Any
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from typing import Any, Dict, Optional
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message
 import structlog
 
+from backend.middleware.pipeline import PipelineStage, RequestPipeline, response_headers
+
 # Configure structlog
 structlog.configure(
     processors=[
@@ -35,9 +36,9 @@ structlog.configure(
 logger = structlog.get_logger(__name__)
 
 
-class StructuredLoggingMiddleware(BaseHTTPMiddleware):
+class StructuredLoggingStage(PipelineStage):
     """
-    Middleware for structured logging with correlation IDs.
+    Pipeline stage for structured logging with correlation IDs.
 
     Features:
     - Adds correlation ID to each request
@@ -46,19 +47,13 @@ class StructuredLoggingMiddleware(BaseHTTPMiddleware):
     - Extracts context from headers
     """
 
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def enter(self, request: Request, ctx: Dict[str, Any]):
         """
-        Process request and log with structured data.
+        Bind request context to structlog and log the request.
 
         Args:
             request: Incoming request
-            call_next: Next middleware/handler
-
-        Returns:
-            Response from next handler
+            ctx: Per-request pipeline state
         """
         # Generate or extract correlation ID
         correlation_id = self._get_correlation_id(request)
@@ -68,7 +63,7 @@ class StructuredLoggingMiddleware(BaseHTTPMiddleware):
         context = self._extract_context(request)
 
         # Start timer
-        start_time = time.time()
+        ctx["logging"] = (correlation_id, request_id, time.time())
 
         # Add context to structlog
         structlog.contextvars.bind_contextvars(
@@ -85,43 +80,43 @@ class StructuredLoggingMiddleware(BaseHTTPMiddleware):
             client_host=request.client.host if request.client else None,
             user_agent=request.headers.get("user-agent"),
         )
+        return None
 
-        try:
-            # Process request
-            response = await call_next(request)
-
-            # Calculate duration
-            duration_ms = (time.time() - start_time) * 1000
-
-            # Log successful response
-            logger.info(
-                "request_completed",
-                status_code=response.status_code,
-                duration_ms=round(duration_ms, 2),
-            )
-
-            # Add correlation ID to response headers
-            response.headers["X-Correlation-ID"] = correlation_id
-            response.headers["X-Request-ID"] = request_id
+    def response_started(self, request: Request, message: Message, ctx: Dict[str, Any]) -> None:
+        """Log the response and add correlation headers once its status is known."""
+        correlation_id, request_id, start_time = ctx["logging"]
+        ctx["logging_responded"] = True
 
-            return response
+        # Calculate duration
+        duration_ms = (time.time() - start_time) * 1000
 
-        except Exception as e:
-            # Calculate duration for failed request
-            duration_ms = (time.time() - start_time) * 1000
-
-            # Log error
-            logger.error(
-                "request_failed",
-                error=str(e),
-                error_type=type(e).__name__,
-                duration_ms=round(duration_ms, 2),
-                exc_info=True,
-            )
+        # Log successful response
+        logger.info(
+            "request_completed",
+            status_code=message["status"],
+            duration_ms=round(duration_ms, 2),
+        )
 
-            # Re-raise exception
-            raise
+        # Add correlation ID to response headers
+        headers = response_headers(message)
+        headers["X-Correlation-ID"] = correlation_id
+        headers["X-Request-ID"] = request_id
 
+    def exit(self, request: Request, ctx: Dict[str, Any], exc: Optional[BaseException]) -> None:
+        """Log failures that happened before a response was sent, then clear context."""
+        try:
+            if isinstance(exc, Exception) and not ctx.get("logging_responded"):
+                # Calculate duration for failed request
+                duration_ms = (time.time() - ctx["logging"][2]) * 1000
+
+                # Log error
+                logger.error(
+                    "request_failed",
+                    error=str(exc),
+                    error_type=type(exc).__name__,
+                    duration_ms=round(duration_ms, 2),
+                    exc_info=exc,
+                )
         finally:
             # Clear context
             structlog.contextvars.clear_contextvars()
@@ -200,6 +195,13 @@ class StructuredLoggingMiddleware(BaseHTTPMiddleware):
         return context
 
 
+class StructuredLoggingMiddleware(RequestPipeline):
+    """Pure-ASGI middleware running ``StructuredLoggingStage``."""
+
+    def __init__(self, app: ASGIApp):
+        super().__init__(app, [StructuredLoggingStage()])
+
+
 def setup_logging(log_level: str = "INFO") -> None:
     """
     Setup structured logging for the application.
@@ -233,6 +235,7 @@ def get_logger(name: str) -> structlog.stdlib.BoundLogger:
 
 
 __all__ = [
+    'StructuredLoggingStage',
     'StructuredLoggingMiddleware',
     'setup_logging',
     'get_logger',
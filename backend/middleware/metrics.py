@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP Metrics Middleware
+
+Records ``http_requests_total`` and ``http_request_duration_seconds`` for
+every request. Requests are labelled with the matched route template
+(``/api/tasks/{task_id}``), not the raw path, so label cardinality stays
+bounded.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Optional
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message
+
+from backend.middleware.pipeline import PipelineStage, RequestPipeline
+from backend.services.metrics_registry import HTTP_REQUEST_DURATION, HTTP_REQUESTS
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_template(request: Request) -> str:
+    """Path template of the route that handled ``request``."""
+    route = request.scope.get("route")
+    path = getattr(route, "path", None)
+    return path or UNMATCHED_ROUTE
+
+
+class HTTPMetricsStage(PipelineStage):
+    """Count requests and time them until the app returns.
+
+    Install it first so the recorded latency includes the other stages.
+    """
+
+    def __init__(self, excluded_paths: tuple = ("/metrics",)) -> None:
+        self.excluded_paths = excluded_paths
+
+    async def enter(self, request: Request, ctx: Dict[str, Any]) -> Optional[ASGIApp]:
+        ctx["metrics_started"] = time.perf_counter()
+        return None
+
+    def response_started(self, request: Request, message: Message, ctx: Dict[str, Any]) -> None:
+        ctx["metrics_status"] = message["status"]
+
+    def exit(self, request: Request, ctx: Dict[str, Any], exc: Optional[BaseException]) -> None:
+        if request.url.path in self.excluded_paths:
+            return
+        started = ctx.get("metrics_started")
+        if started is None:
+            return
+
+        status = ctx.get("metrics_status")
+        if status is None:
+            # Raised before a response was sent; the server answers 500
+            status = 500
+        route = route_template(request)
+        HTTP_REQUESTS.inc(method=request.method, route=route, status=status)
+        HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, method=request.method, route=route)
+
+
+class HTTPMetricsMiddleware(RequestPipeline):
+    """Pure-ASGI middleware running ``HTTPMetricsStage``."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        super().__init__(app, [HTTPMetricsStage()])
+
+
+__all__ = ["HTTPMetricsStage", "HTTPMetricsMiddleware", "route_template"]
@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.types import ASGIApp
 
+from backend.middleware.pipeline import PipelineStage, RequestPipeline
 from mgx_observability import observability_context
 
 
@@ -18,25 +18,33 @@ def _get_header_or_query(request: Request, header_name: str, query_name: str) ->
     return request.query_params.get(query_name)
 
 
-class ObservabilityContextMiddleware(BaseHTTPMiddleware):
+class ObservabilityContextStage(PipelineStage):
+    """Run the request inside an observability context built from headers/query."""
+
+    _CTX_KEY = "observability_context"
+
+    async def enter(self, request: Request, ctx: Dict[str, Any]):
+        context = observability_context(
+            workspace_id=_get_header_or_query(request, "X-Workspace-Id", "workspace_id"),
+            project_id=_get_header_or_query(request, "X-Project-Id", "project_id"),
+            agent_id=_get_header_or_query(request, "X-Agent-Id", "agent_id"),
+            execution_id=_get_header_or_query(request, "X-Execution-Id", "execution_id"),
+            run_id=_get_header_or_query(request, "X-Run-Id", "run_id"),
+        )
+        context.__enter__()
+        ctx[self._CTX_KEY] = context
+        return None
+
+    def exit(self, request: Request, ctx: Dict[str, Any], exc: Optional[BaseException]) -> None:
+        context = ctx.pop(self._CTX_KEY, None)
+        if context is not None:
+            # Only resets the context var; the exception propagates from the pipeline
+            context.__exit__(None, None, None)
+
+
+class ObservabilityContextMiddleware(RequestPipeline):
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
-
-    async def dispatch(self, request: Request, call_next):
-        workspace_id = _get_header_or_query(request, "X-Workspace-Id", "workspace_id")
-        project_id = _get_header_or_query(request, "X-Project-Id", "project_id")
-        agent_id = _get_header_or_query(request, "X-Agent-Id", "agent_id")
-        execution_id = _get_header_or_query(request, "X-Execution-Id", "execution_id")
-        run_id = _get_header_or_query(request, "X-Run-Id", "run_id")
-
-        with observability_context(
-            workspace_id=workspace_id,
-            project_id=project_id,
-            agent_id=agent_id,
-            execution_id=execution_id,
-            run_id=run_id,
-        ):
-            return await call_next(request)
-
-
-__all__ = ["ObservabilityContextMiddleware"]
+        super().__init__(app, [ObservabilityContextStage()])
+
+
+__all__ = ["ObservabilityContextStage", "ObservabilityContextMiddleware"]
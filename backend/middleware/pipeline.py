@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Request Pipeline Middleware
+
+Pure-ASGI request pipeline that runs several per-request concerns (feature
+flag context, observability context, structured logging, security headers,
+auth) as stages of a single middleware.
+
+Stacked ``BaseHTTPMiddleware`` layers each run the downstream app in a
+separate task and re-wrap the response body stream, which adds latency per
+layer and interferes with streaming responses. The pipeline calls the app
+once, in the request's own task, and forwards every ASGI message unchanged;
+stages only see the request and the ``http.response.start`` message.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class PipelineStage:
+    """One concern of the request pipeline.
+
+    Stages are shared between requests; per-request values go into the
+    ``ctx`` dict passed to every hook.
+    """
+
+    async def enter(self, request: Request, ctx: Dict[str, Any]) -> Optional[ASGIApp]:
+        """Run before the app; returning an ASGI app answers the request with it."""
+        return None
+
+    def response_started(self, request: Request, message: Message, ctx: Dict[str, Any]) -> None:
+        """Inspect or modify the ``http.response.start`` message (headers, status)."""
+
+    def exit(self, request: Request, ctx: Dict[str, Any], exc: Optional[BaseException]) -> None:
+        """Run after the app finished or raised ``exc``."""
+
+
+class RequestPipeline:
+    """Pure-ASGI middleware running ``stages`` around the app.
+
+    Stages enter in order (first = outermost), see the response start in
+    reverse order and exit in reverse order, matching how the same concerns
+    behaved as separately stacked middleware.
+
+    Usage:
+        app.add_middleware(
+            RequestPipeline,
+            stages=[StructuredLoggingStage(), SecurityHeadersStage(config)],
+        )
+    """
+
+    def __init__(self, app: ASGIApp, stages: Sequence[PipelineStage] = ()) -> None:
+        self.app = app
+        self.stages: List[PipelineStage] = list(stages)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.stages:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        ctx: Dict[str, Any] = {}
+        entered: List[PipelineStage] = []
+        error: Optional[BaseException] = None
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                for stage in reversed(entered):
+                    stage.response_started(request, message, ctx)
+            await send(message)
+
+        try:
+            app = self.app
+            for stage in self.stages:
+                entered.append(stage)
+                short_circuit = await stage.enter(request, ctx)
+                if short_circuit is not None:
+                    app = short_circuit
+                    break
+            await app(scope, receive, send_wrapper)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            for stage in reversed(entered):
+                stage.exit(request, ctx, error)
+
+
+def response_headers(message: Message) -> MutableHeaders:
+    """Mutable view of the headers of an ``http.response.start`` message."""
+    headers = message.get("headers")
+    if not isinstance(headers, list):
+        message["headers"] = list(headers or [])
+    return MutableHeaders(scope=message)
+
+
+__all__ = ["PipelineStage", "RequestPipeline", "response_headers"]
@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Callable, Awaitable
+from typing import Any, Dict
 
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message
+
+from backend.middleware.pipeline import PipelineStage, RequestPipeline, response_headers
 
 
 @dataclass(frozen=True)
@@ -18,39 +20,46 @@ class SecurityHeadersConfig:
     enable_hsts: bool = False
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    def __init__(
-        self,
-        app,
-        config: SecurityHeadersConfig | None = None,
-    ) -> None:
-        super().__init__(app)
+class SecurityHeadersStage(PipelineStage):
+    """Add security headers to every response (app-set values win)."""
+
+    def __init__(self, config: SecurityHeadersConfig | None = None) -> None:
         self._config = config or SecurityHeadersConfig()
 
-    async def dispatch(self, request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
-        response = await call_next(request)
+    def response_started(self, request: Request, message: Message, ctx: Dict[str, Any]) -> None:
+        headers = response_headers(message)
 
-        self._set_if_missing(response, "X-Content-Type-Options", "nosniff")
-        self._set_if_missing(response, "X-Frame-Options", "DENY")
-        self._set_if_missing(response, "Referrer-Policy", "no-referrer")
+        self._set_if_missing(headers, "X-Content-Type-Options", "nosniff")
+        self._set_if_missing(headers, "X-Frame-Options", "DENY")
+        self._set_if_missing(headers, "Referrer-Policy", "no-referrer")
         self._set_if_missing(
-            response,
+            headers,
             "Permissions-Policy",
             "geolocation=(), microphone=(), camera=()",
         )
 
         csp = self._config.content_security_policy
         if csp:
-            self._set_if_missing(response, "Content-Security-Policy", csp)
+            self._set_if_missing(headers, "Content-Security-Policy", csp)
 
         if self._config.enable_hsts:
-            response.headers["Strict-Transport-Security"] = (
+            headers["Strict-Transport-Security"] = (
                 f"max-age={self._config.hsts_max_age_seconds}; includeSubDomains"
             )
 
-        return response
-
     @staticmethod
-    def _set_if_missing(response: Response, header_name: str, header_value: str) -> None:
-        if header_name not in response.headers:
-            response.headers[header_name] = header_value
+    def _set_if_missing(headers: MutableHeaders, header_name: str, header_value: str) -> None:
+        if header_name not in headers:
+            headers[header_name] = header_value
+
+
+class SecurityHeadersMiddleware(RequestPipeline):
+    def __init__(
+        self,
+        app: ASGIApp,
+        config: SecurityHeadersConfig | None = None,
+    ) -> None:
+        super().__init__(app, [SecurityHeadersStage(config)])
+
+
+__all__ = ["SecurityHeadersConfig", "SecurityHeadersStage", "SecurityHeadersMiddleware"]
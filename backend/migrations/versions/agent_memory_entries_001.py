@@ -0,0 +1,162 @@
+"""Append-only agent memory entries
+
+Revision ID: agent_memory_entries_001
+Revises: mgx_history_001
+Create Date: 2026-10-18
+
+Agent memory used to be stored as full snapshots in agent_context_versions
+(one new row holding every entry per stored memory). Entries now live one
+row each in agent_memory_entries; the current snapshot of every existing
+``memory:*`` context is unpacked into rows on upgrade.
+"""
+
+import json
+import uuid
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "agent_memory_entries_001"
+down_revision = "mgx_history_001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "agent_memory_entries",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("workspace_id", sa.String(length=36), nullable=False),
+        sa.Column("project_id", sa.String(length=36), nullable=False),
+        sa.Column("agent_instance_id", sa.String(length=36), nullable=False),
+        sa.Column("memory_key", sa.String(length=255), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("metadata", sa.JSON(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("recorded_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_accessed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["agent_instance_id"], ["agent_instances.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["workspace_id"], ["workspaces.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    op.create_index(op.f("ix_agent_memory_entries_id"), "agent_memory_entries", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_agent_memory_entries_workspace_id"), "agent_memory_entries", ["workspace_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_agent_memory_entries_project_id"), "agent_memory_entries", ["project_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_agent_memory_entries_agent_instance_id"),
+        "agent_memory_entries",
+        ["agent_instance_id"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_agent_memory_entries_key_recorded",
+        "agent_memory_entries",
+        ["agent_instance_id", "memory_key", "recorded_at"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_agent_memory_entries_key_accessed",
+        "agent_memory_entries",
+        ["agent_instance_id", "memory_key", "last_accessed_at"],
+        unique=False,
+    )
+
+    with op.batch_alter_table("agent_memory_entries") as batch_op:
+        batch_op.create_foreign_key(
+            "fk_agent_memory_entries_project_in_workspace",
+            "projects",
+            ["workspace_id", "project_id"],
+            ["workspace_id", "id"],
+            ondelete="RESTRICT",
+        )
+
+    _backfill_from_context_snapshots()
+
+
+def _backfill_from_context_snapshots() -> None:
+    """Unpack the current snapshot of each memory context into entry rows."""
+    bind = op.get_bind()
+    snapshots = bind.execute(
+        sa.text(
+            """
+            SELECT c.workspace_id, c.project_id, c.instance_id, c.name, v.data
+            FROM agent_contexts c
+            JOIN agent_context_versions v
+              ON v.context_id = c.id AND v.version = c.current_version
+            WHERE c.name LIKE 'memory:%'
+            """
+        )
+    ).fetchall()
+
+    entries_table = sa.table(
+        "agent_memory_entries",
+        sa.column("id", sa.String),
+        sa.column("workspace_id", sa.String),
+        sa.column("project_id", sa.String),
+        sa.column("agent_instance_id", sa.String),
+        sa.column("memory_key", sa.String),
+        sa.column("data", sa.JSON),
+        sa.column("metadata", sa.JSON),
+        sa.column("size_bytes", sa.Integer),
+        sa.column("recorded_at", sa.DateTime(timezone=True)),
+        sa.column("last_accessed_at", sa.DateTime(timezone=True)),
+    )
+
+    rows = []
+    for workspace_id, project_id, instance_id, name, data in snapshots:
+        if isinstance(data, str):
+            data = json.loads(data)
+        for entry in (data or {}).get("entries", []):
+            try:
+                recorded_at = datetime.fromisoformat(entry.get("timestamp", ""))
+            except (TypeError, ValueError):
+                recorded_at = datetime.utcnow()
+            payload = entry.get("data")
+            rows.append({
+                "id": str(uuid.uuid4()),
+                "workspace_id": workspace_id,
+                "project_id": project_id,
+                "agent_instance_id": instance_id,
+                "memory_key": name[len("memory:"):],
+                "data": payload,
+                "metadata": entry.get("metadata") or {},
+                "size_bytes": len(json.dumps(payload, default=str)),
+                "recorded_at": recorded_at,
+                "last_accessed_at": recorded_at,
+            })
+
+    if rows:
+        op.bulk_insert(entries_table, rows)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("agent_memory_entries") as batch_op:
+        batch_op.drop_constraint("fk_agent_memory_entries_project_in_workspace", type_="foreignkey")
+
+    op.drop_index("idx_agent_memory_entries_key_accessed", table_name="agent_memory_entries")
+    op.drop_index("idx_agent_memory_entries_key_recorded", table_name="agent_memory_entries")
+    op.drop_index(op.f("ix_agent_memory_entries_agent_instance_id"), table_name="agent_memory_entries")
+    op.drop_index(op.f("ix_agent_memory_entries_project_id"), table_name="agent_memory_entries")
+    op.drop_index(op.f("ix_agent_memory_entries_workspace_id"), table_name="agent_memory_entries")
+    op.drop_index(op.f("ix_agent_memory_entries_id"), table_name="agent_memory_entries")
+
+    op.drop_table("agent_memory_entries")
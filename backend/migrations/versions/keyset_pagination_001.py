@@ -0,0 +1,40 @@
+"""Composite indexes for keyset pagination of list endpoints
+
+Revision ID: keyset_pagination_001
+Revises: agent_memory_entries_001
+Create Date: 2026-10-18
+
+Task, run and workflow lists page newest first by (created_at, id) within a
+workspace (runs also within a task); these indexes let each page be a range
+scan instead of a sort over every matching row.
+"""
+
+from alembic import op
+
+
+revision = "keyset_pagination_001"
+down_revision = "agent_memory_entries_001"
+branch_labels = None
+depends_on = None
+
+
+_INDEXES = (
+    ("idx_tasks_workspace_created_id", "tasks", ["workspace_id", "created_at", "id"]),
+    ("idx_task_runs_workspace_created_id", "task_runs", ["workspace_id", "created_at", "id"]),
+    ("idx_task_runs_task_created_id", "task_runs", ["task_id", "created_at", "id"]),
+    (
+        "idx_workflow_definitions_workspace_created_id",
+        "workflow_definitions",
+        ["workspace_id", "created_at", "id"],
+    ),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in _INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
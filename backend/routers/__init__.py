@@ -26,6 +26,7 @@ from .repositories import router as repositories_router
 from .tasks import router as tasks_router
 from .runs import router as runs_router
 from .metrics import router as metrics_router
+from .prometheus import router as prometheus_router
 from .agents import router as agents_router
 from .workflows import router as workflows_router
 from .ws import router as ws_router
@@ -67,6 +68,7 @@ __all__ = [
     "tasks_router",
     "runs_router",
     "metrics_router",
+    "prometheus_router",
     "agents_router",
     "workflows_router",
     "ws_router",
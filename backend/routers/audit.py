@@ -6,6 +6,7 @@ Audit Logging API endpoints for viewing and managing audit trails.
 
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func
 import logging
@@ -203,6 +204,41 @@ async def export_audit_logs(
         raise HTTPException(status_code=500, detail="Failed to export audit logs")
 
 
+@router.post("/workspaces/{workspace_id}/audit-logs/export/stream")
+async def stream_audit_logs(
+    workspace_id: str,
+    export_request: AuditLogExportRequest,
+    request: Request,
+    user_context = Depends(require_permission("audit", "read"))
+):
+    """Stream audit logs as CSV or JSON Lines (no record limit required)."""
+    
+    audit_logger = await get_audit_logger()
+    export_format = "csv" if (export_request.format or "").lower() == "csv" else "jsonl"
+    
+    await audit_logger.log_action(
+        user_id=user_context["user_id"],
+        workspace_id=workspace_id,
+        action="DATA_EXPORTED",
+        resource_type="audit_logs",
+        resource_id=None,
+        changes={
+            "format": export_format,
+            "streamed": True,
+            "filters": export_request.filters.dict() if export_request.filters else None
+        },
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get("User-Agent")
+    )
+    
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        audit_logger.stream_audit_logs(workspace_id, export_request, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="audit-logs-{workspace_id}.{export_format}"'},
+    )
+
+
 @router.get("/workspaces/{workspace_id}/audit-logs/statistics")
 async def get_audit_statistics(
     workspace_id: str,
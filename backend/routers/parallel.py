@@ -7,7 +7,7 @@ GET  /api/mgx/parallel/{task_id} — Arka plan görev durumunu sorgula.
 """
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
@@ -36,6 +36,18 @@ class ParallelTaskBody(BaseModel):
         default="output/parallel",
         description="Üretilen dosyaların kaydedileceği kök dizin.",
     )
+    streaming: bool = Field(
+        default=True,
+        description=(
+            "Akışlı mod: servisler spec'leri çözülür çözülmez başlar, bağımlılar "
+            "yalnızca sözleşmeleri bekler, entegrasyon yürütmeyle paralel üretilir."
+        ),
+    )
+    llm_budget_usd: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Akışlı modda tüm servisler için toplam tahmini LLM maliyet sınırı ($).",
+    )
 
 
 @router.post("")
@@ -60,6 +72,8 @@ async def create_parallel_task(body: ParallelTaskBody) -> Dict[str, Any]:
             task_text,
             max_concurrent=body.max_concurrent,
             output_dir_base=body.output_dir_base,
+            streaming=body.streaming,
+            llm_budget_usd=body.llm_budget_usd,
         )
 
     runner = get_task_runner()
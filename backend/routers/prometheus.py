@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""Prometheus Router
+
+``GET /metrics`` in the Prometheus text format, or OpenMetrics when the
+scraper asks for ``application/openmetrics-text``. Values are per worker
+process (see :mod:`backend.services.metrics_registry`).
+"""
+
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+
+from backend.services.metrics_registry import (
+    OPENMETRICS_CONTENT_TYPE,
+    PROMETHEUS_CONTENT_TYPE,
+    get_metrics_registry,
+)
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request) -> Response:
+    """Expose process metrics for scraping."""
+    openmetrics = "application/openmetrics-text" in request.headers.get("accept", "")
+    body = get_metrics_registry().render(openmetrics=openmetrics)
+    media_type = OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE
+    return Response(content=body, media_type=media_type)
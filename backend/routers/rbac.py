@@ -19,6 +19,7 @@ from ..schemas import (
     PermissionResponse, PermissionListResponse, PermissionCheck, PermissionResult
 )
 from ..services.auth.rbac import require_permission, get_rbac_service
+from ..services.auth.principal_cache import invalidate_principal
 from ..services.audit.logger import get_audit_logger
 from ..db.session import get_session
 
@@ -176,6 +177,8 @@ async def update_user_role(
     
     await session.commit()
     await session.refresh(user_role)
+    (await get_rbac_service()).invalidate_user(user_id)
+    invalidate_principal(user_id)
     
     # Log the action
     audit_logger = get_audit_logger()
@@ -382,6 +385,7 @@ async def update_role(
     
     await session.commit()
     await session.refresh(role)
+    (await get_rbac_service()).invalidate_role(role_id)
     
     # Log the action
     audit_logger = get_audit_logger()
@@ -12,10 +12,11 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import func, select, text
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
 
 from backend.db.models import Project, Task, TaskRun
 from backend.db.models.enums import RunStatus
+from backend.db.pagination import count_rows, fetch_keyset_page, page_total
 from backend.routers.deps import WorkspaceContext, get_workspace_context
 from backend.schemas import RunApprovalRequest, RunCreate, RunListResponse, RunResponse, RunStatusEnum, WorkspaceSummary, ProjectSummary
 from backend.services import get_task_executor
@@ -93,30 +94,49 @@ def run_to_response(run: TaskRun, workspace=None, project=None) -> RunResponse:
     )
 
 
+# Columns read by run_to_response; list pages skip the rest (git metadata etc.)
+_RUN_LIST_COLUMNS = (
+    TaskRun.id,
+    TaskRun.workspace_id,
+    TaskRun.project_id,
+    TaskRun.task_id,
+    TaskRun.run_number,
+    TaskRun.status,
+    TaskRun.plan,
+    TaskRun.results,
+    TaskRun.started_at,
+    TaskRun.completed_at,
+    TaskRun.duration,
+    TaskRun.error_message,
+    TaskRun.error_details,
+    TaskRun.created_at,
+    TaskRun.updated_at,
+)
+
+
 @router.get("/", response_model=RunListResponse)
 async def list_runs(
     task_id: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, description="Offset (legacy; prefer cursor)"),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    count: Optional[str] = Query(None, pattern="^(exact|estimate)$", description="Include total"),
     ctx: WorkspaceContext = Depends(get_workspace_context),
 ) -> RunListResponse:
-    """List runs in the active workspace with pagination and filtering."""
+    """List runs in the active workspace, newest first, with keyset pagination."""
 
     session = ctx.session
 
     logger.info(
-        "Listing runs (workspace_id=%s, task_id=%s, status=%s)",
+        "Listing runs (workspace_id=%s, task_id=%s, status=%s, cursor=%s)",
         ctx.workspace.id,
         task_id,
         status,
+        cursor,
     )
 
-    query = (
-        select(TaskRun)
-        .where(TaskRun.workspace_id == ctx.workspace.id)
-        .options(selectinload(TaskRun.workspace), selectinload(TaskRun.project))
-    )
+    query = select(TaskRun).where(TaskRun.workspace_id == ctx.workspace.id)
 
     if task_id:
         query = query.where(TaskRun.task_id == task_id)
@@ -128,20 +148,26 @@ async def list_runs(
             raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
         query = query.where(TaskRun.status == status_enum)
 
-    count_query = select(func.count()).select_from(TaskRun).where(TaskRun.workspace_id == ctx.workspace.id)
-    if task_id:
-        count_query = count_query.where(TaskRun.task_id == task_id)
-    if status:
-        count_query = count_query.where(TaskRun.status == status_enum)
-
-    total = (await session.execute(count_query)).scalar_one()
+    # Every run belongs to the active workspace, so its summary comes from
+    # ctx; projects are loaded with just the summary columns.
+    page_query = query.options(
+        load_only(*_RUN_LIST_COLUMNS),
+        selectinload(TaskRun.project).load_only(Project.id, Project.workspace_id, Project.name, Project.slug),
+    )
+    try:
+        page = await fetch_keyset_page(session, page_query, TaskRun, limit, cursor=cursor, skip=skip)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    result = await session.execute(query.offset(skip).limit(limit))
-    runs = result.scalars().all()
+    total, total_estimated = page_total(page, cursor, skip), False
+    if count and total is None:
+        total, total_estimated = await count_rows(session, query, count)
 
     return RunListResponse(
-        items=[run_to_response(run) for run in runs],
+        items=[run_to_response(run, workspace=ctx.workspace) for run in page.items],
         total=total,
+        total_estimated=total_estimated,
+        next_cursor=page.next_cursor,
         skip=skip,
         limit=limit,
     )
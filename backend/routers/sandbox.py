@@ -32,6 +32,7 @@ from backend.schemas import (
     SandboxExecutionStartedEvent,
     SandboxExecutionCompletedEvent,
     SandboxExecutionFailedEvent,
+    EventPayload,
     EventTypeEnum,
 )
 from backend.services.events import get_event_broadcaster
@@ -176,6 +177,16 @@ async def _execute_code_background(
             sandbox_execution.status = "running"
             await session.commit()
         
+        async def publish_output(stream: str, text: str) -> None:
+            """Forward live stdout/stderr frames to log subscribers."""
+            await broadcaster.publish(
+                event=EventPayload(
+                    event_type=EventTypeEnum.SANDBOX_EXECUTION_LOGS,
+                    data={"execution_id": execution_id, "stream": stream, "logs": text},
+                ),
+                channel=f"sandbox:{execution_id}",
+            )
+        
         # Execute code
         result = await runner.execute_code(
             execution_id=execution_id,
@@ -186,6 +197,7 @@ async def _execute_code_background(
             memory_limit_mb=request.memory_limit_mb,
             workspace_id=sandbox_execution.workspace_id if sandbox_execution else None,
             project_id=sandbox_execution.project_id if sandbox_execution else None,
+            on_output=publish_output,
         )
         
         # Update execution record with results
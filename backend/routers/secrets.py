@@ -430,15 +430,14 @@ async def rotate_encryption_key(
     session: AsyncSession = Depends(get_session),
     user_context = Depends(require_permission("settings", PermissionAction.MANAGE))
 ):
-    """Rotate encryption keys across all backends (admin only)."""
+    """Rotate shared encryption keys and re-encrypt stored secrets (admin only)."""
     try:
-        from backend.services.secrets.encryption import encryption_service
-        
-        results = await encryption_service.rotate_encryption_key()
+        rotation = await SecretManager(session).rotate_encryption_key()
         
         return {
             "message": "Encryption key rotation completed",
-            "results": results
+            "results": rotation["results"],
+            "reencryption": rotation["reencryption"]
         }
         
     except Exception as e:
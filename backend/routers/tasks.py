@@ -12,9 +12,10 @@ from pathlib import Path
 from typing import Optional, List, Dict, Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select, text
+from sqlalchemy import select, text
 
 from backend.db.models import Project, Task, TaskRun
+from backend.db.pagination import count_rows, fetch_keyset_page, page_total
 from backend.db.models.enums import TaskStatus
 from backend.routers.deps import WorkspaceContext, get_workspace_context
 from backend.schemas import TaskCreate, TaskListResponse, TaskResponse, TaskUpdate, TaskStatusEnum
@@ -71,19 +72,22 @@ def task_to_response(task: Task) -> TaskResponse:
 
 @router.get("/", response_model=TaskListResponse)
 async def list_tasks(
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, description="Offset (legacy; prefer cursor)"),
     limit: int = Query(10, ge=1, le=100),
     status: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    count: Optional[str] = Query(None, pattern="^(exact|estimate)$", description="Include total"),
     ctx: WorkspaceContext = Depends(get_workspace_context),
 ) -> TaskListResponse:
-    """List tasks in the active workspace with pagination and filtering."""
+    """List tasks in the active workspace, newest first, with keyset pagination."""
     try:
         logger.info(
-            "[list_tasks] Starting - workspace_id=%s, skip=%s, limit=%s, status=%s",
+            "[list_tasks] Starting - workspace_id=%s, skip=%s, limit=%s, status=%s, cursor=%s",
             ctx.workspace.id,
             skip,
             limit,
             status,
+            cursor,
         )
 
         session = ctx.session
@@ -101,26 +105,26 @@ async def list_tasks(
                 raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
             query = query.where(Task.status == status_enum)
 
-        count_query = select(func.count()).select_from(Task).where(Task.workspace_id == ctx.workspace.id)
-        if status:
-            count_query = count_query.where(Task.status == status_enum)
-
-        logger.debug("[list_tasks] Executing count query")
-        total = (await session.execute(count_query)).scalar_one()
-        logger.debug("[list_tasks] Total tasks: %s", total)
-
         logger.debug("[list_tasks] Executing tasks query")
-        result = await session.execute(query.offset(skip).limit(limit))
-        tasks = result.scalars().all()
-        logger.debug("[list_tasks] Found %s tasks", len(tasks))
+        try:
+            page = await fetch_keyset_page(session, query, Task, limit, cursor=cursor, skip=skip)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        logger.debug("[list_tasks] Found %s tasks", len(page.items))
+
+        total, total_estimated = page_total(page, cursor, skip), False
+        if count and total is None:
+            logger.debug("[list_tasks] Counting tasks (mode=%s)", count)
+            total, total_estimated = await count_rows(session, query, count)
 
-        logger.debug("[list_tasks] Converting tasks to response")
-        task_responses = [task_to_response(task) for task in tasks]
+        task_responses = [task_to_response(task) for task in page.items]
 
         logger.info("[list_tasks] Success - returning %s tasks (total=%s)", len(task_responses), total)
         return TaskListResponse(
             items=task_responses,
             total=total,
+            total_estimated=total_estimated,
+            next_cursor=page.next_cursor,
             skip=skip,
             limit=limit,
         )
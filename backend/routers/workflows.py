@@ -16,6 +16,7 @@ from sqlalchemy.orm import selectinload
 
 from backend.db.models import Project, WorkflowDefinition, WorkflowExecution, WorkflowStep, WorkflowVariable, WorkflowStepExecution
 from backend.db.models.enums import WorkflowStatus, WorkflowStepStatus, WorkflowStepType
+from backend.db.pagination import count_rows, fetch_keyset_page, page_total
 from backend.routers.deps import WorkspaceContext, get_workspace_context
 from backend.schemas import (
     WorkflowCreate,
@@ -41,35 +42,29 @@ router = APIRouter(prefix="/api/workflows", tags=["workflows"])
 
 @router.get("/", response_model=WorkflowListResponse)
 async def list_workflows(
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, description="Offset (legacy; prefer cursor)"),
     limit: int = Query(10, ge=1, le=100),
     project_id: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    count: Optional[str] = Query(None, pattern="^(exact|estimate)$", description="Include total"),
     ctx: WorkspaceContext = Depends(get_workspace_context),
 ) -> WorkflowListResponse:
-    """List workflows in the active workspace with pagination and filtering."""
+    """List workflows in the active workspace, newest first, with keyset pagination."""
 
     session = ctx.session
 
     logger.info(
-        "Listing workflows (workspace_id=%s, skip=%s, limit=%s, project_id=%s, is_active=%s)",
+        "Listing workflows (workspace_id=%s, skip=%s, limit=%s, project_id=%s, is_active=%s, cursor=%s)",
         ctx.workspace.id,
         skip,
         limit,
         project_id,
         is_active,
+        cursor,
     )
 
-    query = (
-        select(WorkflowDefinition)
-        .where(WorkflowDefinition.workspace_id == ctx.workspace.id)
-        .options(
-            selectinload(WorkflowDefinition.steps),
-            selectinload(WorkflowDefinition.variables),
-            selectinload(WorkflowDefinition.workspace),
-            selectinload(WorkflowDefinition.project),
-        )
-    )
+    query = select(WorkflowDefinition).where(WorkflowDefinition.workspace_id == ctx.workspace.id)
 
     if project_id:
         query = query.where(WorkflowDefinition.project_id == project_id)
@@ -77,24 +72,25 @@ async def list_workflows(
     if is_active is not None:
         query = query.where(WorkflowDefinition.is_active == is_active)
 
-    count_query = select(func.count()).select_from(WorkflowDefinition).where(
-        WorkflowDefinition.workspace_id == ctx.workspace.id
+    # WorkflowResponse embeds steps and variables but not workspace/project
+    page_query = query.options(
+        selectinload(WorkflowDefinition.steps),
+        selectinload(WorkflowDefinition.variables),
     )
+    try:
+        page = await fetch_keyset_page(session, page_query, WorkflowDefinition, limit, cursor=cursor, skip=skip)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    if project_id:
-        count_query = count_query.where(WorkflowDefinition.project_id == project_id)
-
-    if is_active is not None:
-        count_query = count_query.where(WorkflowDefinition.is_active == is_active)
-
-    total = (await session.execute(count_query)).scalar_one()
-
-    result = await session.execute(query.offset(skip).limit(limit))
-    workflows = result.scalars().all()
+    total, total_estimated = page_total(page, cursor, skip), False
+    if count and total is None:
+        total, total_estimated = await count_rows(session, query, count)
 
     return WorkflowListResponse(
-        items=[WorkflowResponse.model_validate(workflow) for workflow in workflows],
+        items=[WorkflowResponse.model_validate(workflow) for workflow in page.items],
         total=total,
+        total_estimated=total_estimated,
+        next_cursor=page.next_cursor,
         skip=skip,
         limit=limit,
     )
@@ -389,9 +389,16 @@ class TaskResponse(BaseModel):
 
 
 class TaskListResponse(BaseModel):
-    """Schema for task list responses."""
+    """Schema for task list responses.
+
+    ``total`` is only set when counted (``count`` query parameter) or known
+    for free; ``next_cursor`` continues the listing and is ``None`` on the
+    last page.
+    """
     items: List[TaskResponse]
-    total: int
+    total: Optional[int] = None
+    total_estimated: bool = False
+    next_cursor: Optional[str] = None
     skip: int
     limit: int
 
@@ -464,9 +471,16 @@ class RunResponse(BaseModel):
 
 
 class RunListResponse(BaseModel):
-    """Schema for run list responses."""
+    """Schema for run list responses.
+
+    ``total`` is only set when counted (``count`` query parameter) or known
+    for free; ``next_cursor`` continues the listing and is ``None`` on the
+    last page.
+    """
     items: List[RunResponse]
-    total: int
+    total: Optional[int] = None
+    total_estimated: bool = False
+    next_cursor: Optional[str] = None
     skip: int
     limit: int
 
@@ -1210,9 +1224,16 @@ class WorkflowResponse(BaseModel):
 
 
 class WorkflowListResponse(BaseModel):
-    """Schema for workflow list responses."""
+    """Schema for workflow list responses.
+
+    ``total`` is only set when counted (``count`` query parameter) or known
+    for free; ``next_cursor`` continues the listing and is ``None`` on the
+    last page.
+    """
     items: List[WorkflowResponse]
-    total: int
+    total: Optional[int] = None
+    total_estimated: bool = False
+    next_cursor: Optional[str] = None
     skip: int
     limit: int
 
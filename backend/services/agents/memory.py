@@ -3,64 +3,95 @@
 Agent Memory Service
 
 Manages persistent agent memory across workflow steps with LRU pruning and context threading.
+
+Memory is an append-only log: every stored memory is one ``agent_memory_entries``
+row, so storing an entry writes only that entry. The ``memory:<key>`` agent
+context is kept as a compact, periodically refreshed snapshot (entry count,
+size, last update) for versioning and change events rather than a copy of
+every entry.
 """
 
+import json
 import logging
+import time
 from collections import OrderedDict
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Any, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc
+from sqlalchemy import select, and_, delete, desc, func, update
 
 from backend.db.models import (
     AgentContext,
-    AgentContextVersion,
-    AgentInstance,
+    AgentMemoryEntry,
 )
 from backend.services.agents.context import SharedContextService
 
 logger = logging.getLogger(__name__)
 
 
+def _as_utc(value: datetime) -> datetime:
+    """Aware UTC datetime; SQLite returns ``recorded_at`` naive, Postgres aware."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
 class AgentMemoryService:
     """
     Service for managing agent memory persistence across workflow steps.
-    
+
     Features:
-    - Memory persistence across workflow steps
-    - LRU (Least Recently Used) pruning
+    - Memory persistence across workflow steps (one row per entry)
+    - LRU (Least Recently Used) and TTL pruning done in SQL
     - Context threading between agents
-    - Memory snapshots and restoration
+    - Periodic memory snapshots on the shared context
     - Memory size management
     """
-    
+
     def __init__(
         self,
         context_service: SharedContextService,
         max_memory_size_mb: int = 100,
         max_memory_entries: int = 1000,
         memory_ttl_hours: int = 24,
+        snapshot_interval: int = 50,
+        access_flush_interval: float = 30.0,
+        access_flush_size: int = 500,
     ):
         """
         Initialize the agent memory service.
-        
+
         Args:
             context_service: Shared context service
             max_memory_size_mb: Maximum memory size per agent in MB
-            max_memory_entries: Maximum number of memory entries per agent
+            max_memory_entries: Maximum number of memory entries per agent and key
             memory_ttl_hours: Memory TTL in hours
+            snapshot_interval: Stores per key between pruning + context snapshots
+            access_flush_interval: Seconds between writes of buffered access times
+            access_flush_size: Buffered accessed entries that force a write
         """
         self.context_service = context_service
         self.max_memory_size_mb = max_memory_size_mb
         self.max_memory_entries = max_memory_entries
         self.memory_ttl_hours = memory_ttl_hours
-        
-        # In-memory LRU cache for hot memory access
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.access_flush_interval = access_flush_interval
+        self.access_flush_size = max(1, access_flush_size)
+
+        # In-memory LRU cache for hot memory access; a key is only cached once
+        # its full (pruned) entry list has been loaded from the database
         self.memory_cache: Dict[str, OrderedDict] = {}
-        
+        # (agent_instance_id, memory_key) -> context id
+        self._context_ids: Dict[Tuple[str, str], str] = {}
+        # Stores per cache key since the last prune/snapshot
+        self._pending_writes: Dict[str, int] = {}
+        # Entry ids read since access times were last written
+        self._accessed_ids: set = set()
+        self._last_access_flush = time.monotonic()
+
         logger.info("AgentMemoryService initialized")
-    
+
     async def store_memory(
         self,
         session: AsyncSession,
@@ -73,7 +104,7 @@ class AgentMemoryService:
     ) -> str:
         """
         Store a memory entry for an agent.
-        
+
         Args:
             session: Database session
             agent_instance_id: Agent instance ID
@@ -82,69 +113,48 @@ class AgentMemoryService:
             memory_key: Memory key (e.g., "workflow_context", "task_history")
             memory_data: Memory data to store
             metadata: Optional metadata
-            
+
         Returns:
             Context ID
         """
-        # Get or create context for this memory key
-        context = await self.context_service.get_or_create_context(
-            session,
-            instance_id=agent_instance_id,
-            context_name=f"memory:{memory_key}",
+        context_id = await self._get_context_id(
+            session, agent_instance_id, workspace_id, project_id, memory_key
+        )
+
+        # Append the entry; nothing already stored is rewritten
+        timestamp = datetime.now(timezone.utc)
+        entry = AgentMemoryEntry(
             workspace_id=workspace_id,
             project_id=project_id,
+            agent_instance_id=agent_instance_id,
+            memory_key=memory_key,
+            data=memory_data,
+            meta_data=metadata or {},
+            size_bytes=len(json.dumps(memory_data, default=str)),
+            recorded_at=timestamp,
+            last_accessed_at=timestamp,
         )
-        
-        # Prepare memory entry
-        timestamp = datetime.utcnow()
-        memory_entry = {
-            "data": memory_data,
-            "timestamp": timestamp.isoformat(),
-            "metadata": metadata or {},
-        }
-        
-        # Read current memory
-        current_memory = await self.context_service.read_context(session, context.id)
-        if current_memory is None:
-            current_memory = {"entries": [], "total_size_bytes": 0}
-        
-        # Add new entry
-        entries = current_memory.get("entries", [])
-        entries.append(memory_entry)
-        
-        # Apply LRU pruning if needed
-        entries = await self._apply_lru_pruning(entries)
-        
-        # Calculate total size
-        import sys
-        total_size = sys.getsizeof(str(entries))
-        
-        # Update memory context
-        updated_memory = {
-            "entries": entries,
-            "total_size_bytes": total_size,
-            "last_updated": timestamp.isoformat(),
-        }
-        
-        await self.context_service.write_context(
-            session,
-            context_id=context.id,
-            data=updated_memory,
-            change_description=f"Stored memory: {memory_key}",
-            created_by=agent_instance_id,
-        )
-        
-        # Update in-memory cache
+        session.add(entry)
+        await session.flush()
+
+        # Update in-memory cache (only if it already holds the full list)
         cache_key = f"{agent_instance_id}:{memory_key}"
-        if cache_key not in self.memory_cache:
-            self.memory_cache[cache_key] = OrderedDict()
-        
-        self.memory_cache[cache_key][timestamp.isoformat()] = memory_entry
-        self.memory_cache[cache_key].move_to_end(timestamp.isoformat())
-        
+        cached = self.memory_cache.get(cache_key)
+        if cached is not None:
+            cached[entry.id] = self._entry_to_dict(entry)
+            while len(cached) > self.max_memory_entries:
+                cached.popitem(last=False)
+
+        # Prune and snapshot periodically rather than on every write
+        pending = self._pending_writes.get(cache_key, 0) + 1
+        if pending >= self.snapshot_interval:
+            await self.compact_memory(session, agent_instance_id, workspace_id, memory_key)
+            pending = 0
+        self._pending_writes[cache_key] = pending
+
         logger.info(f"Stored memory for agent {agent_instance_id}, key: {memory_key}")
-        return context.id
-    
+        return context_id
+
     async def retrieve_memory(
         self,
         session: AsyncSession,
@@ -152,64 +162,89 @@ class AgentMemoryService:
         workspace_id: str,
         memory_key: str,
         limit: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
     ) -> List[Dict[str, Any]]:
         """
-        Retrieve memory entries for an agent.
-        
+        Retrieve memory entries for an agent (oldest first).
+
         Args:
             session: Database session
             agent_instance_id: Agent instance ID
             workspace_id: Workspace ID
             memory_key: Memory key
-            limit: Maximum number of entries to return
-            
+            limit: Maximum number of (most recent) entries to return
+            since: Only entries recorded at or after this time
+            until: Only entries recorded before this time
+
         Returns:
             List of memory entries
         """
-        # Check in-memory cache first
         cache_key = f"{agent_instance_id}:{memory_key}"
-        if cache_key in self.memory_cache:
-            cached_entries = list(self.memory_cache[cache_key].values())
+        cached = self.memory_cache.get(cache_key)
+
+        if cached is not None and since is None and until is None:
+            self._drop_expired(cached)
+            entries = list(cached.values())
             if limit:
-                cached_entries = cached_entries[-limit:]
-            return cached_entries
-        
-        # Query context
-        result = await session.execute(
-            select(AgentContext).where(
-                and_(
-                    AgentContext.instance_id == agent_instance_id,
-                    AgentContext.name == f"memory:{memory_key}",
-                    AgentContext.workspace_id == workspace_id,
-                )
+                entries = entries[-limit:]
+        else:
+            conditions = [
+                AgentMemoryEntry.agent_instance_id == agent_instance_id,
+                AgentMemoryEntry.memory_key == memory_key,
+                AgentMemoryEntry.workspace_id == workspace_id,
+                AgentMemoryEntry.recorded_at > self._ttl_cutoff(),
+            ]
+            if since is not None:
+                conditions.append(AgentMemoryEntry.recorded_at >= since)
+            if until is not None:
+                conditions.append(AgentMemoryEntry.recorded_at < until)
+
+            row_limit = min(limit, self.max_memory_entries) if limit else self.max_memory_entries
+            result = await session.execute(
+                select(AgentMemoryEntry)
+                .where(and_(*conditions))
+                .order_by(desc(AgentMemoryEntry.recorded_at))
+                .limit(row_limit)
             )
-        )
-        context = result.scalar_one_or_none()
-        
-        if not context:
-            return []
-        
-        # Read memory
-        memory_data = await self.context_service.read_context(session, context.id)
-        
-        if not memory_data:
-            return []
-        
-        entries = memory_data.get("entries", [])
-        
-        if limit:
-            entries = entries[-limit:]
-        
-        # Update cache
-        if cache_key not in self.memory_cache:
-            self.memory_cache[cache_key] = OrderedDict()
-        
-        for entry in entries:
-            timestamp = entry.get("timestamp", datetime.utcnow().isoformat())
-            self.memory_cache[cache_key][timestamp] = entry
-        
+            rows = list(reversed(result.scalars().all()))
+            entries = [self._entry_to_dict(row) for row in rows]
+
+            # A full, unfiltered read is the whole key: cache it
+            if not limit and since is None and until is None:
+                self.memory_cache[cache_key] = OrderedDict((e["id"], e) for e in entries)
+
+        if entries:
+            await self._record_access(session, [e["id"] for e in entries])
+
         return entries
-    
+
+    async def flush_access_times(self, session: AsyncSession) -> int:
+        """
+        Write buffered access times in one bulk update.
+
+        Reads only buffer the ids of the entries they return, so the LRU
+        order is as fine-grained as ``access_flush_interval``.
+
+        Returns:
+            Number of entries touched
+        """
+        ids = list(self._accessed_ids)
+        self._accessed_ids.clear()
+        self._last_access_flush = time.monotonic()
+        if not ids:
+            return 0
+
+        accessed_at = datetime.now(timezone.utc)
+        for start in range(0, len(ids), self.access_flush_size):
+            await session.execute(
+                update(AgentMemoryEntry)
+                .where(AgentMemoryEntry.id.in_(ids[start:start + self.access_flush_size]))
+                .values(last_accessed_at=accessed_at)
+                .execution_options(synchronize_session=False)
+            )
+        return len(ids)
+
     async def thread_context_between_steps(
         self,
         session: AsyncSession,
@@ -221,7 +256,7 @@ class AgentMemoryService:
     ) -> Dict[str, Any]:
         """
         Thread context from one agent to another.
-        
+
         Args:
             session: Database session
             from_agent_id: Source agent instance ID
@@ -229,21 +264,22 @@ class AgentMemoryService:
             workspace_id: Workspace ID
             project_id: Project ID
             context_keys: List of context keys to thread
-            
+
         Returns:
             Threaded context data
         """
         threaded_context = {}
-        
+
         for key in context_keys:
-            # Retrieve from source agent
+            # Only the latest entry is threaded
             entries = await self.retrieve_memory(
                 session,
                 agent_instance_id=from_agent_id,
                 workspace_id=workspace_id,
                 memory_key=key,
+                limit=1,
             )
-            
+
             if entries:
                 # Store to target agent
                 latest_entry = entries[-1]
@@ -256,18 +292,18 @@ class AgentMemoryService:
                     memory_data=latest_entry.get("data"),
                     metadata={
                         "threaded_from": from_agent_id,
-                        "threaded_at": datetime.utcnow().isoformat(),
+                        "threaded_at": datetime.now(timezone.utc).isoformat(),
                     },
                 )
-                
+
                 threaded_context[key] = latest_entry.get("data")
-        
+
         logger.info(
             f"Threaded context from agent {from_agent_id} to {to_agent_id}, "
             f"keys: {context_keys}"
         )
         return threaded_context
-    
+
     async def clear_memory(
         self,
         session: AsyncSession,
@@ -277,71 +313,52 @@ class AgentMemoryService:
     ):
         """
         Clear memory for an agent.
-        
+
         Args:
             session: Database session
             agent_instance_id: Agent instance ID
             workspace_id: Workspace ID
             memory_key: Optional memory key to clear (None = clear all)
         """
+        conditions = [
+            AgentMemoryEntry.agent_instance_id == agent_instance_id,
+            AgentMemoryEntry.workspace_id == workspace_id,
+        ]
+        context_filter = [
+            AgentContext.instance_id == agent_instance_id,
+            AgentContext.workspace_id == workspace_id,
+        ]
         if memory_key:
-            # Clear specific key
-            context_name = f"memory:{memory_key}"
-            result = await session.execute(
-                select(AgentContext).where(
-                    and_(
-                        AgentContext.instance_id == agent_instance_id,
-                        AgentContext.name == context_name,
-                        AgentContext.workspace_id == workspace_id,
-                    )
-                )
-            )
-            context = result.scalar_one_or_none()
-            
-            if context:
-                await self.context_service.write_context(
-                    session,
-                    context_id=context.id,
-                    data={"entries": [], "total_size_bytes": 0},
-                    change_description=f"Cleared memory: {memory_key}",
-                    created_by=agent_instance_id,
-                )
-            
-            # Clear cache
-            cache_key = f"{agent_instance_id}:{memory_key}"
-            self.memory_cache.pop(cache_key, None)
+            conditions.append(AgentMemoryEntry.memory_key == memory_key)
+            context_filter.append(AgentContext.name == f"memory:{memory_key}")
         else:
-            # Clear all memory for agent
-            result = await session.execute(
-                select(AgentContext).where(
-                    and_(
-                        AgentContext.instance_id == agent_instance_id,
-                        AgentContext.workspace_id == workspace_id,
-                        AgentContext.name.like("memory:%"),
-                    )
-                )
+            context_filter.append(AgentContext.name.like("memory:%"))
+
+        await session.execute(
+            delete(AgentMemoryEntry)
+            .where(and_(*conditions))
+            .execution_options(synchronize_session=False)
+        )
+
+        result = await session.execute(select(AgentContext).where(and_(*context_filter)))
+        for context in result.scalars().all():
+            await self.context_service.write_context(
+                session,
+                context_id=context.id,
+                data={"entry_count": 0, "total_size_bytes": 0, "last_updated": datetime.now(timezone.utc).isoformat()},
+                change_description=f"Cleared memory: {memory_key}" if memory_key else "Cleared all memory",
+                created_by=agent_instance_id,
             )
-            contexts = result.scalars().all()
-            
-            for context in contexts:
-                await self.context_service.write_context(
-                    session,
-                    context_id=context.id,
-                    data={"entries": [], "total_size_bytes": 0},
-                    change_description="Cleared all memory",
-                    created_by=agent_instance_id,
-                )
-            
-            # Clear cache
-            cache_keys_to_remove = [
-                key for key in self.memory_cache.keys()
-                if key.startswith(f"{agent_instance_id}:")
-            ]
-            for key in cache_keys_to_remove:
-                self.memory_cache.pop(key, None)
-        
+
+        # Clear cache
+        prefix = f"{agent_instance_id}:"
+        for cache_key in list(self.memory_cache.keys()):
+            if cache_key == f"{prefix}{memory_key}" or (not memory_key and cache_key.startswith(prefix)):
+                self.memory_cache.pop(cache_key, None)
+                self._pending_writes.pop(cache_key, None)
+
         logger.info(f"Cleared memory for agent {agent_instance_id}, key: {memory_key or 'all'}")
-    
+
     async def get_memory_stats(
         self,
         session: AsyncSession,
@@ -350,37 +367,35 @@ class AgentMemoryService:
     ) -> Dict[str, Any]:
         """
         Get memory statistics for an agent.
-        
+
         Args:
             session: Database session
             agent_instance_id: Agent instance ID
             workspace_id: Workspace ID
-            
+
         Returns:
             Memory statistics
         """
         result = await session.execute(
-            select(AgentContext).where(
+            select(
+                AgentMemoryEntry.memory_key,
+                func.count(AgentMemoryEntry.id),
+                func.coalesce(func.sum(AgentMemoryEntry.size_bytes), 0),
+            )
+            .where(
                 and_(
-                    AgentContext.instance_id == agent_instance_id,
-                    AgentContext.workspace_id == workspace_id,
-                    AgentContext.name.like("memory:%"),
+                    AgentMemoryEntry.agent_instance_id == agent_instance_id,
+                    AgentMemoryEntry.workspace_id == workspace_id,
                 )
             )
+            .group_by(AgentMemoryEntry.memory_key)
         )
-        contexts = result.scalars().all()
-        
-        total_size = 0
-        total_entries = 0
-        memory_keys = []
-        
-        for context in contexts:
-            memory_data = await self.context_service.read_context(session, context.id)
-            if memory_data:
-                total_size += memory_data.get("total_size_bytes", 0)
-                total_entries += len(memory_data.get("entries", []))
-                memory_keys.append(context.name.replace("memory:", ""))
-        
+        rows = result.all()
+
+        total_size = sum(int(size) for _, _, size in rows)
+        total_entries = sum(int(count) for _, count, _ in rows)
+        memory_keys = sorted(key for key, _, _ in rows)
+
         return {
             "agent_instance_id": agent_instance_id,
             "total_size_bytes": total_size,
@@ -389,43 +404,186 @@ class AgentMemoryService:
             "memory_keys": memory_keys,
             "memory_key_count": len(memory_keys),
         }
-    
+
+    async def compact_memory(
+        self,
+        session: AsyncSession,
+        agent_instance_id: str,
+        workspace_id: str,
+        memory_key: str,
+    ) -> int:
+        """
+        Prune a memory key in SQL and refresh its context snapshot.
+
+        Drops expired entries, keeps the ``max_memory_entries`` most recently
+        used entries of the key, and evicts least recently used entries of the
+        agent beyond ``max_memory_size_mb``.
+
+        Returns:
+            Number of entries removed
+        """
+        # Pruning ranks by access time, so write the buffered ones first
+        await self.flush_access_times(session)
+        removed = await self._apply_lru_pruning(session, agent_instance_id, workspace_id, memory_key)
+
+        stats = await session.execute(
+            select(
+                func.count(AgentMemoryEntry.id),
+                func.coalesce(func.sum(AgentMemoryEntry.size_bytes), 0),
+            ).where(
+                and_(
+                    AgentMemoryEntry.agent_instance_id == agent_instance_id,
+                    AgentMemoryEntry.memory_key == memory_key,
+                )
+            )
+        )
+        entry_count, total_size = stats.one()
+
+        context_id = self._context_ids.get((agent_instance_id, memory_key))
+        if context_id:
+            await self.context_service.write_context(
+                session,
+                context_id=context_id,
+                data={
+                    "entry_count": int(entry_count),
+                    "total_size_bytes": int(total_size),
+                    "last_updated": datetime.now(timezone.utc).isoformat(),
+                },
+                change_description=f"Memory snapshot: {memory_key}",
+                created_by=agent_instance_id,
+            )
+
+        if removed:
+            # Cached lists may hold evicted entries; reload on next read
+            for cache_key in [k for k in self.memory_cache if k.startswith(f"{agent_instance_id}:")]:
+                self.memory_cache.pop(cache_key, None)
+
+        return removed
+
+    async def _get_context_id(
+        self,
+        session: AsyncSession,
+        agent_instance_id: str,
+        workspace_id: str,
+        project_id: str,
+        memory_key: str,
+    ) -> str:
+        """Get (once per process) the ``memory:<key>`` context of an agent."""
+        cached = self._context_ids.get((agent_instance_id, memory_key))
+        if cached:
+            return cached
+
+        context = await self.context_service.get_or_create_context(
+            session,
+            instance_id=agent_instance_id,
+            context_name=f"memory:{memory_key}",
+            workspace_id=workspace_id,
+            project_id=project_id,
+        )
+        self._context_ids[(agent_instance_id, memory_key)] = context.id
+        return context.id
+
+    def _ttl_cutoff(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(hours=self.memory_ttl_hours)
+
+    def _drop_expired(self, cached: OrderedDict) -> None:
+        """Evict expired entries from a cached list (kept oldest first)."""
+        cutoff = self._ttl_cutoff()
+        while cached:
+            oldest = next(iter(cached.values()))
+            if datetime.fromisoformat(oldest["timestamp"]) > cutoff:
+                break
+            cached.popitem(last=False)
+
+    async def _record_access(self, session: AsyncSession, entry_ids: List[str]) -> None:
+        self._accessed_ids.update(entry_ids)
+        if (
+            len(self._accessed_ids) >= self.access_flush_size
+            or time.monotonic() - self._last_access_flush >= self.access_flush_interval
+        ):
+            await self.flush_access_times(session)
+
+    @staticmethod
+    def _entry_to_dict(entry: AgentMemoryEntry) -> Dict[str, Any]:
+        return {
+            "id": entry.id,
+            "data": entry.data,
+            "timestamp": _as_utc(entry.recorded_at).isoformat(),
+            "metadata": entry.meta_data or {},
+        }
+
     async def _apply_lru_pruning(
         self,
-        entries: List[Dict[str, Any]],
-    ) -> List[Dict[str, Any]]:
+        session: AsyncSession,
+        agent_instance_id: str,
+        workspace_id: str,
+        memory_key: str,
+    ) -> int:
         """
-        Apply LRU pruning to memory entries.
-        
+        Apply TTL, entry-count and size pruning in SQL.
+
         Args:
-            entries: Memory entries
-            
+            session: Database session
+            agent_instance_id: Agent instance ID
+            workspace_id: Workspace ID
+            memory_key: Memory key whose entry count is capped
+
         Returns:
-            Pruned entries
+            Number of entries removed
         """
-        # Sort by timestamp (oldest first)
-        sorted_entries = sorted(
-            entries,
-            key=lambda e: e.get("timestamp", ""),
+        agent_filter = and_(
+            AgentMemoryEntry.agent_instance_id == agent_instance_id,
+            AgentMemoryEntry.workspace_id == workspace_id,
         )
-        
-        # Keep only the most recent entries
-        if len(sorted_entries) > self.max_memory_entries:
-            pruned_entries = sorted_entries[-self.max_memory_entries:]
-            logger.info(f"Pruned {len(sorted_entries) - len(pruned_entries)} old memory entries")
-            return pruned_entries
-        
+        lru_order = (desc(AgentMemoryEntry.last_accessed_at), desc(AgentMemoryEntry.recorded_at))
+
         # Prune by age
-        cutoff_time = datetime.utcnow() - timedelta(hours=self.memory_ttl_hours)
-        recent_entries = [
-            entry for entry in sorted_entries
-            if datetime.fromisoformat(entry.get("timestamp", "")) > cutoff_time
-        ]
-        
-        if len(recent_entries) < len(sorted_entries):
-            logger.info(f"Pruned {len(sorted_entries) - len(recent_entries)} expired memory entries")
-        
-        return recent_entries
+        expired = await session.execute(
+            delete(AgentMemoryEntry)
+            .where(and_(agent_filter, AgentMemoryEntry.recorded_at <= self._ttl_cutoff()))
+            .execution_options(synchronize_session=False)
+        )
+
+        # Keep only the most recently used entries of this key
+        ranked = (
+            select(
+                AgentMemoryEntry.id.label("id"),
+                func.row_number().over(order_by=lru_order).label("rank"),
+            )
+            .where(and_(agent_filter, AgentMemoryEntry.memory_key == memory_key))
+            .subquery()
+        )
+        over_count = await session.execute(
+            delete(AgentMemoryEntry)
+            .where(AgentMemoryEntry.id.in_(
+                select(ranked.c.id).where(ranked.c.rank > self.max_memory_entries)
+            ))
+            .execution_options(synchronize_session=False)
+        )
+
+        # Evict least recently used entries of the agent beyond the size budget
+        running = (
+            select(
+                AgentMemoryEntry.id.label("id"),
+                func.sum(AgentMemoryEntry.size_bytes).over(order_by=lru_order).label("running_size"),
+            )
+            .where(agent_filter)
+            .subquery()
+        )
+        over_size = await session.execute(
+            delete(AgentMemoryEntry)
+            .where(AgentMemoryEntry.id.in_(
+                select(running.c.id).where(
+                    running.c.running_size > self.max_memory_size_mb * 1024 * 1024
+                )
+            ))
+            .execution_options(synchronize_session=False)
+        )
+
+        removed = sum(max(r.rowcount or 0, 0) for r in (expired, over_count, over_size))
+        if removed:
+            logger.info(f"Pruned {removed} memory entries for agent {agent_instance_id}")
+        return removed
 
 
 __all__ = ["AgentMemoryService"]
@@ -5,16 +5,24 @@ Persists agent messages and publishes them to the EventBroadcaster.
 
 Delivery guarantees are intentionally simple:
 - messages are always persisted before being published
-- retention is capped per-agent (count based)
+- retention is capped per-agent (count based), enforced every
+  ``retention_check_interval`` appends rather than on each one, so an agent
+  may briefly hold up to that many messages over the limit
 - clients may ACK the last seen message id for best-effort replay logic
+
+Chatty runs should write through an :class:`AgentMessageBatch`
+(``bus.batch(session_factory)``), which buffers messages and inserts them
+in one session/commit per flush before broadcasting them.
 """
 
 from __future__ import annotations
 
+import asyncio
+import inspect
 import logging
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import sqlalchemy as sa
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -38,10 +46,18 @@ class AgentMessageBus:
         self,
         retention_limit: Optional[int] = None,
         ack_window_seconds: Optional[int] = None,
+        retention_check_interval: Optional[int] = None,
     ):
         self.retention_limit = retention_limit or getattr(settings, "agent_message_retention_limit", 1000)
         self.ack_window_seconds = ack_window_seconds or getattr(settings, "agent_message_ack_window_seconds", 3600)
+        self.retention_check_interval = max(
+            1,
+            retention_check_interval
+            or getattr(settings, "agent_message_retention_check_interval", 100),
+        )
         self._acks: dict[str, SubscriberAckState] = {}
+        # Appends per agent since retention last ran
+        self._appends_since_retention: dict[str, int] = {}
 
     def ack(self, subscriber_id: str, message_id: str) -> None:
         self._acks[subscriber_id] = SubscriberAckState(last_message_id=message_id, updated_at=datetime.utcnow())
@@ -74,6 +90,116 @@ class AgentMessageBus:
         recipient_agent_id: Optional[str] = None,
         llm_provider: Optional[str] = None,
         llm_model: Optional[str] = None,
+    ) -> AgentMessage:
+        message = self._build_message(
+            workspace_id=workspace_id,
+            project_id=project_id,
+            agent_instance_id=agent_instance_id,
+            direction=direction,
+            payload=payload,
+            correlation_id=correlation_id,
+            task_id=task_id,
+            run_id=run_id,
+            sender_agent_id=sender_agent_id,
+            recipient_agent_id=recipient_agent_id,
+            llm_provider=llm_provider,
+            llm_model=llm_model,
+        )
+        session.add(message)
+        await session.flush()
+
+        self._appends_since_retention.update(
+            await self._maybe_apply_retention(session=session, agent_instance_ids=[agent_instance_id])
+        )
+
+        if broadcast:
+            await self._broadcast_message(message)
+
+        return message
+
+    async def append_many(
+        self,
+        session: AsyncSession,
+        messages: List[Dict[str, Any]],
+        *,
+        broadcast: bool = True,
+    ) -> list[AgentMessage]:
+        """Insert several messages with one flush.
+
+        Each item takes the keyword arguments of :meth:`append` (except
+        ``broadcast``). Retention is checked once per affected agent.
+        """
+        built, retention_counts = await self._insert_many(session, messages)
+        self._appends_since_retention.update(retention_counts)
+
+        if broadcast:
+            await self.broadcast_messages(built)
+
+        return built
+
+    async def _insert_many(
+        self,
+        session: AsyncSession,
+        messages: List[Dict[str, Any]],
+    ) -> Tuple[list[AgentMessage], Dict[str, int]]:
+        """Insert messages with one flush and run any due retention.
+
+        Returns the messages and the new per-agent append counts, which the
+        caller stores once the insert is committed.
+        """
+        if not messages:
+            return [], {}
+
+        built = [self._build_message(**fields) for fields in messages]
+        session.add_all(built)
+        await session.flush()
+
+        agent_ids = list(dict.fromkeys(m.agent_instance_id for m in built))
+        retention_counts = await self._maybe_apply_retention(
+            session=session,
+            agent_instance_ids=agent_ids,
+            appended=[sum(1 for m in built if m.agent_instance_id == a) for a in agent_ids],
+        )
+        return built, retention_counts
+
+    def batch(
+        self,
+        session_factory: Callable[[], Any],
+        *,
+        max_pending: int = 50,
+        flush_interval_seconds: float = 0.25,
+        max_buffered: int = 5000,
+    ) -> "AgentMessageBatch":
+        """Create a write-behind buffer that persists messages through ``session_factory``."""
+        return AgentMessageBatch(
+            self,
+            session_factory,
+            max_pending=max_pending,
+            flush_interval_seconds=flush_interval_seconds,
+            max_buffered=max_buffered,
+        )
+
+    async def broadcast_messages(self, messages: List[AgentMessage]) -> None:
+        """Publish already persisted messages in order."""
+        for message in messages:
+            await self._broadcast_message(message)
+
+    @staticmethod
+    def _build_message(
+        *,
+        workspace_id: str,
+        project_id: str,
+        agent_instance_id: str,
+        direction: AgentMessageDirection,
+        payload: Dict[str, Any],
+        correlation_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        sender_agent_id: Optional[str] = None,
+        recipient_agent_id: Optional[str] = None,
+        llm_provider: Optional[str] = None,
+        llm_model: Optional[str] = None,
+        created_at: Optional[datetime] = None,
     ) -> AgentMessage:
         # Enhance payload with agent coordination metadata
         enhanced_payload = payload.copy() if payload else {}
@@ -85,21 +211,13 @@ class AgentMessageBus:
             enhanced_payload["llm_provider"] = llm_provider
         if llm_model:
             enhanced_payload["llm_model"] = llm_model
-        
-        # Explicitly set created_at to ensure each message has a unique timestamp
-        # This prevents all messages from having the same timestamp when created in the same transaction
-        from datetime import datetime, timezone, timedelta
-        import time as time_module
-        
-        # Use current time with microsecond precision to ensure uniqueness
-        # Add a small delay if needed to prevent identical timestamps for rapid messages
-        now = datetime.now(timezone.utc)
-        
-        # If messages are created very rapidly, add microsecond offset
-        # This ensures each message has a unique timestamp even in rapid succession
-        # The database will still store with microsecond precision
-        
-        message = AgentMessage(
+
+        # Explicitly set created_at so messages created in the same
+        # transaction keep distinct, ordered timestamps (batches pass the
+        # time the message was buffered)
+        now = created_at or datetime.now(timezone.utc)
+
+        return AgentMessage(
             workspace_id=workspace_id,
             project_id=project_id,
             agent_instance_id=agent_instance_id,
@@ -108,18 +226,9 @@ class AgentMessageBus:
             correlation_id=correlation_id,
             task_id=task_id,
             run_id=run_id,
-            created_at=now,  # Explicitly set to ensure unique timestamp
-            updated_at=now,  # Explicitly set to ensure unique timestamp
+            created_at=now,
+            updated_at=now,
         )
-        session.add(message)
-        await session.flush()
-
-        await self._apply_retention(session=session, agent_instance_id=agent_instance_id)
-
-        if broadcast:
-            await self._broadcast_message(message)
-
-        return message
 
     async def list_history(
         self,
@@ -148,6 +257,28 @@ class AgentMessageBus:
         result = await session.execute(query)
         return list(result.scalars().all())
 
+    async def _maybe_apply_retention(
+        self,
+        *,
+        session: AsyncSession,
+        agent_instance_ids: List[str],
+        appended: Optional[List[int]] = None,
+    ) -> Dict[str, int]:
+        """Run retention for agents that reached ``retention_check_interval`` appends.
+
+        Returns the new per-agent append counts; they are not stored here so
+        that an append which is never committed does not advance them.
+        """
+        counts: Dict[str, int] = {}
+        for index, agent_instance_id in enumerate(agent_instance_ids):
+            count = self._appends_since_retention.get(agent_instance_id, 0)
+            count += appended[index] if appended else 1
+            if count >= self.retention_check_interval:
+                await self._apply_retention(session=session, agent_instance_id=agent_instance_id)
+                count = 0
+            counts[agent_instance_id] = count
+        return counts
+
     async def _apply_retention(self, *, session: AsyncSession, agent_instance_id: str) -> None:
         if not self.retention_limit or self.retention_limit <= 0:
             return
@@ -179,6 +310,126 @@ class AgentMessageBus:
         await broadcaster.publish(event)
 
 
+class AgentMessageBatch:
+    """Write-behind buffer of agent messages.
+
+    Messages are inserted in bulk once ``max_pending`` are buffered, once
+    ``flush_interval_seconds`` have passed since the first buffered message,
+    or on :meth:`flush` / leaving the ``async with`` block. Each flush uses
+    one session and one commit; messages are broadcast after the commit.
+    If the commit fails the messages go back into the buffer, and a timed
+    flush is retried with backoff. While commits keep failing the buffer
+    holds at most ``max_buffered`` messages; beyond that the oldest are
+    dropped (counted in :attr:`dropped`).
+    """
+
+    MAX_RETRY_DELAY_SECONDS = 30.0
+
+    def __init__(
+        self,
+        bus: AgentMessageBus,
+        session_factory: Callable[[], Any],
+        *,
+        max_pending: int = 50,
+        flush_interval_seconds: float = 0.25,
+        max_buffered: int = 5000,
+    ):
+        self.bus = bus
+        self.session_factory = session_factory
+        self.max_pending = max(1, max_pending)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_buffered = max(self.max_pending, max_buffered)
+        self.dropped = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_broadcast: List[bool] = []
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._retry_delay = 0.0
+
+    async def __aenter__(self) -> "AgentMessageBatch":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.flush()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def add(self, *, broadcast: bool = True, **fields: Any) -> None:
+        """Buffer one message (same keyword arguments as :meth:`AgentMessageBus.append`)."""
+        # Stamp now so ordering and timestamps do not depend on when the batch flushes
+        fields.setdefault("created_at", datetime.now(timezone.utc))
+        self._pending.append(fields)
+        self._pending_broadcast.append(broadcast)
+        self._drop_overflow()
+
+        if len(self._pending) >= self.max_pending:
+            await self.flush()
+        elif self._timer is None and self.flush_interval_seconds > 0:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> list[AgentMessage]:
+        """Persist all buffered messages in one transaction, then broadcast them."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        async with self._lock:
+            if not self._pending:
+                return []
+            pending, self._pending = self._pending, []
+            broadcast_flags, self._pending_broadcast = self._pending_broadcast, []
+
+            session = self.session_factory()
+            if inspect.isawaitable(session):
+                session = await session
+            try:
+                messages, retention_counts = await self.bus._insert_many(session, pending)
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                # Keep them, ahead of anything buffered meanwhile
+                self._pending[:0] = pending
+                self._pending_broadcast[:0] = broadcast_flags
+                self._drop_overflow()
+                raise
+            finally:
+                await session.close()
+            self.bus._appends_since_retention.update(retention_counts)
+            self._retry_delay = 0.0
+
+        await self.bus.broadcast_messages([m for m, flag in zip(messages, broadcast_flags) if flag])
+        return messages
+
+    def _drop_overflow(self) -> None:
+        overflow = len(self._pending) - self.max_buffered
+        if overflow <= 0:
+            return
+        del self._pending[:overflow]
+        del self._pending_broadcast[:overflow]
+        self.dropped += overflow
+        logger.warning(f"Agent message buffer full, dropped {overflow} oldest unpersisted messages")
+
+    async def _flush_later(self, delay: Optional[float] = None) -> None:
+        await asyncio.sleep(self.flush_interval_seconds if delay is None else delay)
+        # Detach first so a concurrent flush() cannot cancel us mid-commit
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception as e:
+            self._retry_delay = min(
+                max(self._retry_delay * 2, self.flush_interval_seconds, 0.1),
+                self.MAX_RETRY_DELAY_SECONDS,
+            )
+            logger.warning(
+                f"Failed to flush {len(self._pending)} buffered agent messages, "
+                f"retrying in {self._retry_delay:.2f}s: {e}"
+            )
+            if self._pending and self._timer is None:
+                self._timer = asyncio.create_task(self._flush_later(self._retry_delay))
+
+
 _bus: Optional[AgentMessageBus] = None
 
 
@@ -189,4 +440,4 @@ def get_agent_message_bus() -> AgentMessageBus:
     return _bus
 
 
-__all__ = ["AgentMessageBus", "get_agent_message_bus"]
+__all__ = ["AgentMessageBatch", "AgentMessageBus", "get_agent_message_bus"]
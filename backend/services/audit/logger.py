@@ -2,11 +2,17 @@
 """backend.services.audit.logger
 
 Audit logging service for tracking user actions and system changes.
+
+Writes go through an :class:`AuditWriter` (bounded queue, bulk inserts,
+optional fsync'd spool); reads flush it first so callers always see their
+own writes.
 """
 
-from typing import List, Optional, Dict, Any, Union
-from uuid import UUID
-from datetime import datetime, timedelta
+import csv
+import io
+from typing import AsyncIterator, List, Optional, Dict, Any, Union
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, desc, asc, func
 from sqlalchemy.orm import selectinload
@@ -15,6 +21,7 @@ import logging
 
 from ...db.models.entities import AuditLog, Workspace, UserRole
 from ...db.models.enums import AuditAction, AuditLogStatus
+from .writer import AuditWriter
 from ...schemas import (
     AuditLogCreate, AuditLogResponse, AuditLogFilter, 
     AuditLogExportRequest, AuditLogExportResponse
@@ -22,13 +29,36 @@ from ...schemas import (
 
 logger = logging.getLogger(__name__)
 
+EXPORT_COLUMNS = [
+    "ID", "Timestamp", "User ID", "Action", "Resource Type",
+    "Resource ID", "Status", "IP Address", "User Agent",
+    "Execution Time (ms)", "Error Message", "Changes"
+]
+
 
 class AuditLogger:
     """Service for comprehensive audit logging and trail management."""
     
-    def __init__(self, session_factory):
-        """Initialize audit logger with database session factory."""
+    def __init__(self, session_factory, writer: Optional[AuditWriter] = None):
+        """Initialize audit logger with database session factory.
+        
+        Args:
+            session_factory: Async session factory
+            writer: Write-behind pipeline (one is created if omitted)
+        """
         self.session_factory = session_factory
+        self.writer = writer or AuditWriter(session_factory)
+        from ...db.models.entities import SecretAudit
+        self.writer.register_model(AuditLog)
+        self.writer.register_model(SecretAudit)
+    
+    async def flush(self) -> None:
+        """Wait until all buffered audit records are written."""
+        await self.writer.flush()
+    
+    async def close(self) -> None:
+        """Flush buffered audit records; call on shutdown."""
+        await self.writer.close()
     
     async def log_action(
         self,
@@ -75,31 +105,34 @@ class AuditLogger:
             # Prepare changes data
             changes_data = self._prepare_changes(changes, context)
             
-            async with self.session_factory() as session:
-                audit_log = AuditLog(
-                    workspace_id=workspace_id,
-                    user_id=user_id,
-                    action=action,
-                    resource_type=resource_type,
-                    resource_id=resource_id,
-                    changes=changes_data,
-                    status=status,
-                    ip_address=ip_address,
-                    user_agent=user_agent,
-                    execution_time_ms=execution_time_ms,
-                    error_message=error_message
-                )
-                
-                session.add(audit_log)
-                await session.commit()
-                await session.refresh(audit_log)
-                
-                logger.debug(
-                    f"Logged audit action: {action.value} by {user_id} "
-                    f"on {resource_type}:{resource_id} in workspace {workspace_id}"
-                )
-                
-                return audit_log
+            now = datetime.now(timezone.utc)
+            row = {
+                "id": str(uuid4()),
+                "workspace_id": workspace_id,
+                "user_id": user_id,
+                "action": action,
+                "resource_type": resource_type,
+                "resource_id": resource_id,
+                "changes": changes_data,
+                "status": status,
+                "ip_address": ip_address,
+                "user_agent": user_agent,
+                "execution_time_ms": execution_time_ms,
+                "error_message": error_message,
+                "created_at": now,
+                "updated_at": now,
+            }
+            
+            # Queued for a bulk insert; the returned object is not session-bound
+            await self.writer.submit(AuditLog, row)
+            audit_log = AuditLog(**row)
+            
+            logger.debug(
+                f"Logged audit action: {action.value} by {user_id} "
+                f"on {resource_type}:{resource_id} in workspace {workspace_id}"
+            )
+            
+            return audit_log
                 
         except Exception as e:
             logger.error(f"Failed to log audit action: {e}")
@@ -130,6 +163,7 @@ class AuditLogger:
         """
         try:
             filters = filters or AuditLogFilter()
+            await self.flush()
             
             async with self.session_factory() as session:
                 # Build base query
@@ -178,6 +212,8 @@ class AuditLogger:
             AuditLog object or None
         """
         try:
+            await self.flush()
+            
             async with self.session_factory() as session:
                 stmt = select(AuditLog).where(
                     and_(
@@ -259,6 +295,7 @@ class AuditLogger:
             Dictionary with statistics
         """
         try:
+            await self.flush()
             end_date = datetime.utcnow()
             start_date = end_date - timedelta(days=date_range_days)
             
@@ -346,6 +383,7 @@ class AuditLogger:
             Number of logs deleted
         """
         try:
+            await self.flush()
             cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
             
             async with self.session_factory() as session:
@@ -472,56 +510,111 @@ class AuditLogger:
             Formatted data
         """
         if format_type.lower() == "csv":
-            import csv
-            import io
-            
             output = io.StringIO()
             writer = csv.writer(output)
-            
-            # Header
-            writer.writerow([
-                "ID", "Timestamp", "User ID", "Action", "Resource Type",
-                "Resource ID", "Status", "IP Address", "User Agent",
-                "Execution Time (ms)", "Error Message", "Changes"
-            ])
-            
-            # Data rows
+            writer.writerow(EXPORT_COLUMNS)
             for log in logs:
-                writer.writerow([
-                    log.id,
-                    log.created_at.isoformat() if log.created_at else "",
-                    log.user_id or "",
-                    log.action.value if log.action else "",
-                    log.resource_type,
-                    log.resource_id or "",
-                    log.status.value if log.status else "",
-                    log.ip_address or "",
-                    log.user_agent or "",
-                    log.execution_time_ms or "",
-                    log.error_message or "",
-                    json.dumps(log.changes, default=str) if log.changes else ""
-                ])
-            
+                writer.writerow(self._export_csv_row(log))
             return output.getvalue()
         
         else:  # JSON format
-            return [
-                {
-                    "id": log.id,
-                    "timestamp": log.created_at.isoformat() if log.created_at else None,
-                    "user_id": log.user_id,
-                    "action": log.action.value if log.action else None,
-                    "resource_type": log.resource_type,
-                    "resource_id": log.resource_id,
-                    "status": log.status.value if log.status else None,
-                    "ip_address": log.ip_address,
-                    "user_agent": log.user_agent,
-                    "execution_time_ms": log.execution_time_ms,
-                    "error_message": log.error_message,
-                    "changes": log.changes
-                }
-                for log in logs
-            ]
+            return [self._export_dict(log) for log in logs]
+    
+    async def stream_audit_logs(
+        self,
+        workspace_id: str,
+        export_request: AuditLogExportRequest,
+        export_format: str = "jsonl",
+        chunk_size: int = 500
+    ) -> AsyncIterator[str]:
+        """Stream audit logs as CSV or JSON Lines without loading them all.
+        
+        Rows are fetched through a server-side cursor ``chunk_size`` at a
+        time and yielded as text chunks.
+        
+        Args:
+            workspace_id: Workspace ID
+            export_request: Export request parameters (limit is optional)
+            export_format: 'csv' or 'jsonl'
+            chunk_size: Rows fetched per round trip
+            
+        Yields:
+            Encoded text chunks
+        """
+        await self.flush()
+        
+        stmt = select(AuditLog).where(AuditLog.workspace_id == workspace_id)
+        stmt = self._apply_filters(stmt, export_request.filters or AuditLogFilter())
+        sort_field = getattr(AuditLog, export_request.sort_by or "created_at", AuditLog.created_at)
+        if (export_request.sort_order or "desc").lower() == "desc":
+            stmt = stmt.order_by(desc(sort_field), desc(AuditLog.id))
+        else:
+            stmt = stmt.order_by(asc(sort_field), asc(AuditLog.id))
+        if export_request.offset:
+            stmt = stmt.offset(export_request.offset)
+        if export_request.limit:
+            stmt = stmt.limit(export_request.limit)
+        
+        is_csv = export_format.lower() == "csv"
+        output = io.StringIO()
+        writer = csv.writer(output)
+        if is_csv:
+            writer.writerow(EXPORT_COLUMNS)
+            yield output.getvalue()
+        
+        exported = 0
+        async with self.session_factory() as session:
+            result = await session.stream(stmt.execution_options(yield_per=chunk_size))
+            async for partition in result.scalars().partitions(chunk_size):
+                output.seek(0)
+                output.truncate()
+                for log in partition:
+                    if is_csv:
+                        writer.writerow(self._export_csv_row(log))
+                    else:
+                        output.write(json.dumps(self._export_dict(log), default=str))
+                        output.write("\n")
+                exported += len(partition)
+                yield output.getvalue()
+        
+        logger.info(
+            f"Streamed {exported} audit logs for workspace {workspace_id} "
+            f"in {export_format} format"
+        )
+    
+    @staticmethod
+    def _export_dict(log: AuditLog) -> Dict[str, Any]:
+        return {
+            "id": log.id,
+            "timestamp": log.created_at.isoformat() if log.created_at else None,
+            "user_id": log.user_id,
+            "action": log.action.value if log.action else None,
+            "resource_type": log.resource_type,
+            "resource_id": log.resource_id,
+            "status": log.status.value if log.status else None,
+            "ip_address": log.ip_address,
+            "user_agent": log.user_agent,
+            "execution_time_ms": log.execution_time_ms,
+            "error_message": log.error_message,
+            "changes": log.changes
+        }
+    
+    @staticmethod
+    def _export_csv_row(log: AuditLog) -> List[Any]:
+        return [
+            log.id,
+            log.created_at.isoformat() if log.created_at else "",
+            log.user_id or "",
+            log.action.value if log.action else "",
+            log.resource_type,
+            log.resource_id or "",
+            log.status.value if log.status else "",
+            log.ip_address or "",
+            log.user_agent or "",
+            log.execution_time_ms or "",
+            log.error_message or "",
+            json.dumps(log.changes, default=str) if log.changes else ""
+        ]
 
     async def log_secret_action(
         self,
@@ -561,26 +654,28 @@ class AuditLogger:
             if isinstance(action, str):
                 action = SecretAuditAction(action)
             
-            secret_audit = SecretAudit(
-                secret_id=secret_id,
-                action=action,
-                user_id=user_id,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                request_id=request_id,
-                details=details or {},
-                metadata=metadata or {},
-                success=success,
-                error_message=error_message
-            )
+            now = datetime.now(timezone.utc)
+            row = {
+                "id": str(uuid4()),
+                "secret_id": secret_id,
+                "action": action,
+                "user_id": user_id,
+                "ip_address": ip_address,
+                "user_agent": user_agent,
+                "request_id": request_id,
+                "details": details or {},
+                "meta_data": metadata or {},
+                "success": success,
+                "error_message": error_message,
+                "created_at": now,
+                "updated_at": now,
+            }
             
-            async with self.session_factory() as session:
-                session.add(secret_audit)
-                await session.commit()
-                await session.refresh(secret_audit)
-                
-                logger.debug(f"Logged secret audit: {action} for secret {secret_id}")
-                return secret_audit
+            await self.writer.submit(SecretAudit, row)
+            secret_audit = SecretAudit(**row)
+            
+            logger.debug(f"Logged secret audit: {action} for secret {secret_id}")
+            return secret_audit
                 
         except Exception as e:
             logger.error(f"Failed to log secret action: {e}")
@@ -597,6 +692,21 @@ async def get_audit_logger() -> AuditLogger:
     global audit_logger
     if audit_logger is None:
         from ...db.engine import get_session_factory
+        from ...config import settings
         session_factory = await get_session_factory()
-        audit_logger = AuditLogger(session_factory)
-    return audit_logger
\ No newline at end of file
+        audit_logger = AuditLogger(
+            session_factory,
+            writer=AuditWriter(
+                session_factory,
+                max_queue_size=settings.audit_queue_max_size,
+                batch_size=settings.audit_batch_size,
+                spool_path=settings.audit_spool_path,
+            ),
+        )
+    return audit_logger
+
+
+async def shutdown_audit_logger() -> None:
+    """Flush the global audit logger, if one was created."""
+    if audit_logger is not None:
+        await audit_logger.close()
\ No newline at end of file
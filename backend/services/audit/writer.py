@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""backend.services.audit.writer
+
+Write-behind pipeline for audit records.
+
+Audit rows are put on a bounded in-memory queue and inserted by a writer
+task in bulk ``INSERT ... VALUES`` batches, one transaction per batch, so
+audited requests no longer wait for their own commit. Records that arrive
+while a batch is being committed form the next batch (group commit).
+
+If a batch fails its rows are inserted one by one, so a single bad row
+does not take the rest of the batch with it; rows that still fail are
+retried a few times before they are given up.
+
+When a spool path is configured every record is first appended to a local
+JSON Lines file and fsync'd; the spool is truncated once everything in it
+has been committed and replayed on start-up otherwise, so records accepted
+before a crash are not lost. Rows given up on stay in the spool and are
+replayed ("re-drained") after the next successful write.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from sqlalchemy import DateTime, Enum as SQLEnum, insert, inspect as sa_inspect, select
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class AuditWriter:
+    """Bounded queue plus on-demand writer task for audit rows."""
+
+    def __init__(
+        self,
+        session_factory,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        spool_path: Optional[str] = None,
+        max_attempts: int = 3,
+        retry_delay: float = 0.5,
+    ):
+        """Initialize the writer.
+
+        Args:
+            session_factory: Async session factory used for inserts
+            max_queue_size: Maximum buffered records; producers wait beyond it
+            batch_size: Maximum rows per INSERT batch
+            spool_path: Optional JSON Lines spool file for durability
+            max_attempts: Write attempts per row before it is given up
+            retry_delay: Seconds to wait before retrying failed rows
+        """
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.spool_path = spool_path
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_queue_size))
+        self._worker: Optional[asyncio.Task] = None
+        # Failed (model, row, attempts) awaiting another try; not yet task_done
+        self._retry: List[Tuple[Type, Dict[str, Any], int]] = []
+        self._models: Dict[str, Type] = {}
+        self._started = False
+        self._start_lock = asyncio.Lock()
+
+        # Spool bookkeeping, shared with worker threads
+        self._spool_lock = threading.Lock()
+        self._spool_file = None
+        self._spooled_unwritten = 0
+        self._spool_dirty = False
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    async def submit(self, model: Type, row: Dict[str, Any]) -> None:
+        """Queue one row of ``model`` (ORM attribute names as keys) for insertion."""
+        await self.start()
+        self._models.setdefault(model.__tablename__, model)
+
+        if self.spool_path:
+            line = json.dumps({"table": model.__tablename__, "row": row}, default=_json_default)
+            await asyncio.to_thread(self._spool_append, line)
+
+        await self._queue.put((model, row))
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def flush(self) -> None:
+        """Wait until every queued row has been written."""
+        if self._queue.empty() and (self._worker is None or self._worker.done()):
+            return
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        await self._queue.join()
+        # Let the worker finish a spool re-drain it started after the last batch
+        if self._worker is not None and not self._worker.done():
+            await asyncio.shield(self._worker)
+
+    async def start(self) -> None:
+        """Replay any spooled rows left over from a previous process (once).
+
+        A failed replay is logged and tried again on the next call.
+        """
+        if self._started:
+            return
+        async with self._start_lock:
+            if self._started:
+                return
+            if self.spool_path:
+                try:
+                    self._spool_dirty = not await self._replay_spool()
+                except Exception as e:
+                    logger.error(f"Failed to replay audit spool (will retry): {e}")
+                    return
+            self._started = True
+
+    async def close(self) -> None:
+        """Flush outstanding rows and release the spool."""
+        await self.flush()
+        with self._spool_lock:
+            if self._spool_file is not None:
+                self._spool_file.close()
+                self._spool_file = None
+
+    def register_model(self, model: Type) -> None:
+        """Make ``model`` known for spool replay before any row was submitted."""
+        self._models[model.__tablename__] = model
+
+    async def _run(self) -> None:
+        wrote = False
+        while not self._queue.empty() or self._retry:
+            if self._retry and self._queue.empty():
+                await asyncio.sleep(self.retry_delay)
+
+            batch = self._retry[:self.batch_size]
+            del self._retry[:len(batch)]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                model, row = self._queue.get_nowait()
+                batch.append((model, row, 0))
+
+            finished = len(batch)
+            try:
+                failed = await self._write_with_fallback(batch)
+                wrote = wrote or len(failed) < len(batch)
+                for (model, row, attempts), error in failed:
+                    if attempts + 1 < self.max_attempts:
+                        self._retry.append((model, row, attempts + 1))
+                        finished -= 1
+                    elif self.spool_path:
+                        self._spool_dirty = True
+                        logger.error(f"Failed to write audit record {row.get('id')} (kept in spool): {error}")
+                    else:
+                        logger.error(f"Dropping audit record {row.get('id')} after {attempts + 1} attempts: {error}")
+                if self.spool_path:
+                    await asyncio.to_thread(self._spool_release, finished)
+            finally:
+                for _ in range(finished):
+                    self._queue.task_done()
+
+        # The database is reachable again: re-drain rows left in the spool
+        if wrote and self._spool_dirty:
+            try:
+                self._spool_dirty = not await self._replay_spool()
+            except Exception as e:
+                logger.warning(f"Failed to re-drain audit spool: {e}")
+
+    async def _write_with_fallback(self, batch: List[Tuple]) -> List[Tuple[Tuple, Exception]]:
+        """Write a batch, falling back to one row per transaction; return the rows that failed."""
+        if len(batch) > 1:
+            try:
+                await self._write(batch)
+                return []
+            except Exception as e:
+                logger.warning(f"Audit batch of {len(batch)} rows failed, writing rows one by one: {e}")
+
+        failed = []
+        for item in batch:
+            try:
+                await self._write([item])
+            except Exception as e:
+                # Possibly committed already (e.g. by a spool replay)
+                if not await self._exists(item[0], item[1]):
+                    failed.append((item, e))
+        return failed
+
+    async def _exists(self, model: Type, row: Dict[str, Any]) -> bool:
+        if row.get("id") is None:
+            return False
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(select(model.id).where(model.id == row["id"]))
+                return result.first() is not None
+        except Exception:
+            return False
+
+    async def _write(self, batch: List[Tuple]) -> None:
+        by_model: Dict[Type, List[Dict[str, Any]]] = {}
+        for model, row, *_ in batch:
+            by_model.setdefault(model, []).append(row)
+
+        async with self.session_factory() as session:
+            for model, rows in by_model.items():
+                await session.execute(insert(model), rows)
+            await session.commit()
+
+    # ------------------------------------------------------------------
+    # Spool
+    # ------------------------------------------------------------------
+
+    def _spool_append(self, line: str) -> None:
+        with self._spool_lock:
+            if self._spool_file is None:
+                directory = os.path.dirname(os.path.abspath(self.spool_path))
+                os.makedirs(directory, exist_ok=True)
+                self._spool_file = open(self.spool_path, "a", encoding="utf-8")
+            self._spool_file.write(line + "\n")
+            self._spool_file.flush()
+            os.fsync(self._spool_file.fileno())
+            self._spooled_unwritten += 1
+
+    def _spool_release(self, written: int) -> None:
+        with self._spool_lock:
+            self._spooled_unwritten = max(0, self._spooled_unwritten - written)
+            if self._spooled_unwritten == 0 and not self._spool_dirty and self._spool_file is not None:
+                self._spool_file.truncate(0)
+                self._spool_file.seek(0)
+                os.fsync(self._spool_file.fileno())
+
+    async def _replay_spool(self) -> bool:
+        """Insert spooled rows missing from the database and shrink the spool.
+
+        Lines that still fail to insert are written back to the spool.
+        Returns True when the spool is empty afterwards.
+        """
+        if not os.path.exists(self.spool_path):
+            return True
+
+        def read_spool() -> Tuple[int, List[str]]:
+            with self._spool_lock:
+                with open(self.spool_path, "r", encoding="utf-8") as handle:
+                    content = handle.read()
+            return len(content.encode("utf-8")), content.splitlines()
+
+        size, lines = await asyncio.to_thread(read_spool)
+        by_model: Dict[Type, List[Tuple[str, Dict[str, Any]]]] = {}
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn write at crash time
+            model = self._models.get(record.get("table"))
+            if model is None:
+                logger.warning(f"Skipping spooled audit row for unknown table {record.get('table')}")
+                continue
+            by_model.setdefault(model, []).append((line, self._decode_row(model, record["row"])))
+
+        replayed = 0
+        remaining: List[str] = []
+        for model, entries in by_model.items():
+            # Rows may already have been committed before the crash
+            ids = [row["id"] for _, row in entries]
+            existing = set()
+            async with self.session_factory() as session:
+                for i in range(0, len(ids), 500):
+                    result = await session.execute(select(model.id).where(model.id.in_(ids[i:i + 500])))
+                    existing.update(result.scalars().all())
+            missing = [(model, row, line) for line, row in entries if row["id"] not in existing]
+            for i in range(0, len(missing), self.batch_size):
+                chunk = missing[i:i + self.batch_size]
+                failed = await self._write_with_fallback(chunk)
+                for (_, row, line), error in failed:
+                    logger.error(f"Failed to replay spooled audit record {row.get('id')}: {error}")
+                    remaining.append(line)
+                replayed += len(chunk) - len(failed)
+
+        def rewrite_spool() -> bool:
+            with self._spool_lock:
+                if os.path.getsize(self.spool_path) != size:
+                    return False  # appended to meanwhile; try again later
+                if self._spool_file is not None:
+                    handle = self._spool_file
+                    handle.truncate(0)
+                    handle.seek(0)
+                else:
+                    handle = open(self.spool_path, "w", encoding="utf-8")
+                try:
+                    handle.writelines(line + "\n" for line in remaining)
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                finally:
+                    if handle is not self._spool_file:
+                        handle.close()
+            return not remaining
+
+        if replayed:
+            logger.info(f"Replayed {replayed} spooled audit records")
+        return await asyncio.to_thread(rewrite_spool)
+
+    @staticmethod
+    def _decode_row(model: Type, row: Dict[str, Any]) -> Dict[str, Any]:
+        decoded = dict(row)
+        for attr in sa_inspect(model).column_attrs:
+            value = decoded.get(attr.key)
+            if value is None:
+                continue
+            column_type = attr.columns[0].type
+            if isinstance(column_type, SQLEnum) and column_type.enum_class is not None:
+                decoded[attr.key] = column_type.enum_class(value)
+            elif isinstance(column_type, DateTime) and isinstance(value, str):
+                decoded[attr.key] = datetime.fromisoformat(value)
+        return decoded
+
+
+__all__ = ["AuditWriter"]
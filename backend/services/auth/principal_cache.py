@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""backend.services.auth.principal_cache
+
+Short-lived cache of authenticated principals.
+
+Token validation only needs the user's row to check ``is_active``. Once a
+token's ``(sub, jti)`` has been resolved the user's column values are kept
+in an in-process LRU for a few seconds, so repeated requests with the same
+token are validated without touching the database. Entries are dropped when
+a user is deactivated or their roles change; with Redis configured the
+invalidation is broadcast to every process on a pub/sub channel.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "mgx:auth:principal-invalidate"
+
+CacheKey = Tuple[str, str]
+
+
+class PrincipalCache:
+    """In-process LRU of resolved principals with optional Redis invalidation."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 30.0,
+        max_entries: int = 10000,
+        redis_url: Optional[str] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: How long a resolved principal stays valid
+            max_entries: Maximum cached tokens (least recently used evicted)
+            redis_url: Redis URL for cross-process invalidation (optional)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.redis_url = redis_url
+
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._keys_by_user: Dict[str, Set[CacheKey]] = {}
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str, jti: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Cached user column values for a token, or None."""
+        key = (user_id, jti or "")
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, values = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return values
+
+    def put(self, user_id: str, jti: Optional[str], values: Dict[str, Any]) -> None:
+        """Cache user column values for a token."""
+        if self.ttl_seconds <= 0:
+            return
+        key = (user_id, jti or "")
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, values)
+        self._entries.move_to_end(key)
+        self._keys_by_user.setdefault(user_id, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def invalidate_user(self, user_id: str, broadcast: bool = True) -> None:
+        """Drop every cached token of a user (deactivation, role change)."""
+        for key in list(self._keys_by_user.get(user_id, ())):
+            self._remove(key)
+        self._keys_by_user.pop(user_id, None)
+
+        if broadcast and self.redis_url:
+            try:
+                asyncio.get_running_loop().create_task(self._publish(user_id))
+            except RuntimeError:
+                pass  # no running loop; other processes expire by TTL
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_user.clear()
+
+    def _remove(self, key: CacheKey) -> None:
+        self._entries.pop(key, None)
+        keys = self._keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                self._keys_by_user.pop(key[0], None)
+
+    async def _get_redis(self):
+        if self._redis is None:
+            import redis.asyncio as aioredis
+            self._redis = await aioredis.from_url(self.redis_url, decode_responses=True)
+        return self._redis
+
+    async def _publish(self, user_id: str) -> None:
+        try:
+            redis = await self._get_redis()
+            await redis.publish(INVALIDATION_CHANNEL, user_id)
+        except Exception as e:
+            logger.warning(f"Failed to publish principal invalidation for {user_id}: {e}")
+
+    def ensure_listener(self) -> None:
+        """Start the Redis invalidation listener once (no-op without Redis)."""
+        if not self.redis_url or (self._listener is not None and not self._listener.done()):
+            return
+        self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self) -> None:
+        try:
+            redis = await self._get_redis()
+            pubsub = redis.pubsub()
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    self.invalidate_user(message["data"], broadcast=False)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Without the channel, entries still expire after ttl_seconds
+            logger.warning(f"Principal invalidation listener stopped: {e}")
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+
+_principal_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    """Get the global principal cache."""
+    global _principal_cache
+    if _principal_cache is None:
+        _principal_cache = PrincipalCache(
+            ttl_seconds=settings.auth_principal_cache_ttl_seconds,
+            max_entries=settings.auth_principal_cache_max_entries,
+            redis_url=settings.redis_url,
+        )
+    return _principal_cache
+
+
+def invalidate_principal(user_id: str) -> None:
+    """Drop cached tokens of ``user_id`` in this and (via Redis) other processes."""
+    get_principal_cache().invalidate_user(user_id)
+
+
+__all__ = ["PrincipalCache", "get_principal_cache", "invalidate_principal"]
@@ -2,11 +2,20 @@
 """backend.services.auth.rbac
 
 Role-Based Access Control (RBAC) service for permission checking and user authorization.
+
+Permissions are compiled once per (user, workspace) into a bitset over
+resource x action plus precompiled condition predicates, so checks after
+the first are pure in-memory lookups. Compiled sets live in a bounded LRU
+and are invalidated per user or per role through version counters.
 """
 
-from typing import List, Optional, Dict, Any, Set, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Callable, List, Optional, Dict, Any, Sequence, Set, Tuple, Union
 from uuid import UUID
 import asyncio
+import time
 from fastapi import HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_
@@ -18,18 +27,95 @@ from ...schemas import (
     RoleCreate, RoleUpdate, UserRoleCreate, UserRoleUpdate, 
     PermissionCheck, PermissionResult
 )
+from .principal_cache import invalidate_principal
 
 logger = logging.getLogger(__name__)
 
+# Bit position of every (resource, action) pair
+PERMISSION_BITS: Dict[Tuple[PermissionResource, PermissionAction], int] = {
+    pair: index for index, pair in enumerate(product(PermissionResource, PermissionAction))
+}
+
+ConditionPredicate = Callable[[Optional[Dict[str, Any]]], bool]
+
+PermissionCheckItem = Union[Tuple[str, str], Tuple[str, str, Optional[Dict[str, Any]]]]
+
+
+def compile_conditions(conditions: Dict[str, Any]) -> ConditionPredicate:
+    """Compile permission conditions into a predicate over the check context.
+
+    Every condition key must be present in the context with an equal value.
+    """
+    items = tuple(conditions.items())
+
+    def predicate(context: Optional[Dict[str, Any]]) -> bool:
+        if not context:
+            return False
+        for key, expected_value in items:
+            if key not in context or context[key] != expected_value:
+                return False
+        return True
+
+    return predicate
+
+
+def _permission_bit(resource: PermissionResource, action: PermissionAction) -> int:
+    return 1 << PERMISSION_BITS[(resource, action)]
+
+
+@dataclass
+class CompiledPermissions:
+    """All permissions of one user in one workspace."""
+
+    user_id: str
+    workspace_id: str
+    allowed: int = 0
+    conditional: Dict[int, List[ConditionPredicate]] = field(default_factory=dict)
+    role_ids: Tuple[str, ...] = ()
+    user_version: int = 0
+    role_versions: Tuple[int, ...] = ()
+    global_version: int = 0
+    compiled_at: float = field(default_factory=time.monotonic)
+
+    def allows(
+        self,
+        resource: PermissionResource,
+        action: PermissionAction,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        bit = _permission_bit(resource, action)
+        if self.allowed & bit:
+            return True
+        return any(predicate(context) for predicate in self.conditional.get(bit, ()))
+
+    def actions_for(self, resource: PermissionResource) -> List[str]:
+        """Actions granted on ``resource`` (conditional grants included)."""
+        return [
+            action.value
+            for action in PermissionAction
+            if self.allowed & _permission_bit(resource, action)
+            or _permission_bit(resource, action) in self.conditional
+        ]
+
 
 class RBACService:
     """Service for handling role-based access control and permissions."""
     
-    def __init__(self, session_factory):
-        """Initialize RBAC service with database session factory."""
+    def __init__(self, session_factory, max_cached_principals: int = 10000, cache_ttl: int = 300):
+        """Initialize RBAC service with database session factory.
+        
+        Args:
+            session_factory: Async session factory
+            max_cached_principals: Maximum compiled (user, workspace) sets kept
+            cache_ttl: Seconds before a compiled set is rebuilt regardless of versions
+        """
         self.session_factory = session_factory
-        self._cache = {}  # Simple cache for permissions
-        self._cache_ttl = 300  # 5 minutes
+        self._cache: "OrderedDict[Tuple[str, str], CompiledPermissions]" = OrderedDict()
+        self._cache_ttl = cache_ttl
+        self._max_cached = max(1, max_cached_principals)
+        self._user_versions: Dict[str, int] = {}
+        self._role_versions: Dict[str, int] = {}
+        self._global_version = 0
     
     async def check_permission(
         self, 
@@ -58,27 +144,8 @@ class RBACService:
             resource = PermissionResource(resource)
             action = PermissionAction(action)
             
-            # Check cache first
-            cache_key = f"{user_id}:{workspace_id}:{resource}:{action}"
-            cached_result = self._get_cached_permission(cache_key)
-            if cached_result is not None:
-                return cached_result
-            
-            # Get user roles for workspace
-            user_roles = await self.get_user_roles(user_id, workspace_id)
-            if not user_roles:
-                logger.debug(f"No roles found for user {user_id} in workspace {workspace_id}")
-                self._cache_permission(cache_key, False)
-                return False
-            
-            # Check each role for the permission
-            for role in user_roles:
-                if await self._role_has_permission(role, resource, action, context):
-                    self._cache_permission(cache_key, True)
-                    return True
-            
-            self._cache_permission(cache_key, False)
-            return False
+            compiled = await self.get_compiled_permissions(user_id, workspace_id)
+            return compiled.allows(resource, action, context)
             
         except ValueError as e:
             logger.error(f"Invalid permission resource/action: {e}")
@@ -87,6 +154,71 @@ class RBACService:
             logger.error(f"Error checking permission: {e}")
             return False
     
+    async def check_permissions(
+        self,
+        user_id: str,
+        workspace_id: str,
+        checks: Sequence[PermissionCheckItem],
+    ) -> List[bool]:
+        """Check many permissions for one user with a single compiled lookup.
+        
+        Service API for per-row checks (e.g. a context per listed item). Routers
+        currently authorize once per request through ``require_permission``,
+        so no endpoint calls this yet.
+        
+        Args:
+            user_id: User ID to check
+            workspace_id: Workspace ID
+            checks: ``(resource, action)`` or ``(resource, action, context)`` items
+            
+        Returns:
+            One result per item, in order (invalid items are denied)
+        """
+        try:
+            compiled = await self.get_compiled_permissions(user_id, workspace_id)
+        except Exception as e:
+            logger.error(f"Error checking permissions: {e}")
+            return [False] * len(checks)
+        
+        results = []
+        for item in checks:
+            resource, action = item[0], item[1]
+            context = item[2] if len(item) > 2 else None
+            try:
+                results.append(
+                    compiled.allows(PermissionResource(resource), PermissionAction(action), context)
+                )
+            except ValueError:
+                results.append(False)
+        return results
+    
+    async def get_compiled_permissions(
+        self,
+        user_id: str,
+        workspace_id: str,
+    ) -> CompiledPermissions:
+        """Get (compiling on a miss) the permission set of a user in a workspace."""
+        key = (user_id, workspace_id)
+        compiled = self._cache.get(key)
+        if compiled is not None and self._is_current(compiled):
+            self._cache.move_to_end(key)
+            return compiled
+        
+        compiled = await self._compile_permissions(user_id, workspace_id)
+        self._cache[key] = compiled
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._max_cached:
+            self._cache.popitem(last=False)
+        return compiled
+    
+    def invalidate_user(self, user_id: str) -> None:
+        """Recompile a user's permissions on next check (role assigned/revoked)."""
+        self._user_versions[user_id] = self._user_versions.get(user_id, 0) + 1
+    
+    def invalidate_role(self, role_id: str) -> None:
+        """Recompile permissions of every holder of a role on next check."""
+        self._role_versions[role_id] = self._role_versions.get(role_id, 0) + 1
+    
     async def get_user_roles(
         self, 
         user_id: str, 
@@ -155,17 +287,8 @@ class RBACService:
             List of permitted action strings
         """
         resource = PermissionResource(resource_type)
-        user_roles = await self.get_user_roles(user_id, workspace_id)
-        
-        permitted_actions = set()
-        
-        for role in user_roles:
-            permissions = await self._get_role_permissions(role.id)
-            for permission in permissions:
-                if permission.resource == resource and permission.is_active:
-                    permitted_actions.add(permission.action.value)
-        
-        return list(permitted_actions)
+        compiled = await self.get_compiled_permissions(user_id, workspace_id)
+        return compiled.actions_for(resource)
     
     async def create_role(
         self, 
@@ -213,8 +336,7 @@ class RBACService:
             await session.commit()
             await session.refresh(role)
             
-            # Clear cache
-            self._clear_cache()
+            # A new role has no holders, so no compiled set is affected
             
             logger.info(f"Created role '{role_data.name}' in workspace {workspace_id}")
             return role
@@ -268,8 +390,8 @@ class RBACService:
             await session.commit()
             await session.refresh(user_role)
             
-            # Clear cache
-            self._clear_cache()
+            self.invalidate_user(user_id)
+            invalidate_principal(user_id)
             
             logger.info(f"Assigned role {role_id} to user {user_id} in workspace {workspace_id}")
             return user_role
@@ -308,130 +430,103 @@ class RBACService:
             user_role.is_active = False
             await session.commit()
             
-            # Clear cache
-            self._clear_cache()
+            self.invalidate_user(user_id)
+            invalidate_principal(user_id)
             
             logger.info(f"Revoked role {role_id} from user {user_id} in workspace {workspace_id}")
             return True
     
-    async def _role_has_permission(
-        self, 
-        role: Role, 
-        resource: PermissionResource, 
-        action: PermissionAction,
-        context: Optional[Dict[str, Any]] = None
-    ) -> bool:
-        """Check if role has specific permission.
+    async def _compile_permissions(self, user_id: str, workspace_id: str) -> CompiledPermissions:
+        """Build the permission set of a user with two queries (roles, permissions).
         
         Args:
-            role: Role to check
-            resource: Resource type
-            action: Action type
-            context: Additional context
+            user_id: User ID
+            workspace_id: Workspace ID
             
         Returns:
-            True if role has permission
+            Compiled permissions
         """
-        # Check system permissions list
-        permission_str = f"{resource.value}:{action.value}"
-        wildcard_str = f"{resource.value}:*"
+        # Snapshot versions first so a concurrent invalidation is not lost
+        user_version = self._user_versions.get(user_id, 0)
+        global_version = self._global_version
         
-        if permission_str in role.permissions or wildcard_str in role.permissions:
-            return True
+        roles = await self.get_user_roles(user_id, workspace_id)
+        role_ids = tuple(role.id for role in roles)
+        compiled = CompiledPermissions(
+            user_id=user_id,
+            workspace_id=workspace_id,
+            role_ids=role_ids,
+            user_version=user_version,
+            role_versions=tuple(self._role_versions.get(role_id, 0) for role_id in role_ids),
+            global_version=global_version,
+        )
+        if not roles:
+            logger.debug(f"No roles found for user {user_id} in workspace {workspace_id}")
+            return compiled
         
-        # Check database permissions table for fine-grained control
-        permissions = await self._get_role_permissions(role.id)
-        for permission in permissions:
-            if permission.resource == resource and permission.action == action:
-                # Apply additional conditions if any
-                if permission.conditions:
-                    if not self._evaluate_conditions(permission.conditions, context):
+        # System permissions list ("resource:action" / "resource:*")
+        for role in roles:
+            for permission_str in role.permissions or []:
+                resource_name, _, action_name = str(permission_str).partition(":")
+                try:
+                    resource = PermissionResource(resource_name)
+                except ValueError:
+                    continue
+                if action_name == "*":
+                    for action in PermissionAction:
+                        compiled.allowed |= _permission_bit(resource, action)
+                else:
+                    try:
+                        compiled.allowed |= _permission_bit(resource, PermissionAction(action_name))
+                    except ValueError:
                         continue
-                return True
         
-        return False
+        # Fine-grained permissions table
+        for permission in await self._get_permissions_for_roles(role_ids):
+            bit = _permission_bit(permission.resource, permission.action)
+            if permission.conditions:
+                compiled.conditional.setdefault(bit, []).append(compile_conditions(permission.conditions))
+            else:
+                compiled.allowed |= bit
+        
+        return compiled
+    
+    def _is_current(self, compiled: CompiledPermissions) -> bool:
+        if time.monotonic() - compiled.compiled_at >= self._cache_ttl:
+            return False
+        if compiled.global_version != self._global_version:
+            return False
+        if compiled.user_version != self._user_versions.get(compiled.user_id, 0):
+            return False
+        return all(
+            version == self._role_versions.get(role_id, 0)
+            for role_id, version in zip(compiled.role_ids, compiled.role_versions)
+        )
     
-    async def _get_role_permissions(self, role_id: str) -> List[Permission]:
-        """Get all permissions for a role.
+    async def _get_permissions_for_roles(self, role_ids: Sequence[str]) -> List[Permission]:
+        """Get all active permissions of several roles in one query.
         
         Args:
-            role_id: Role ID
+            role_ids: Role IDs
             
         Returns:
             List of Permission objects
         """
+        if not role_ids:
+            return []
         async with self.session_factory() as session:
             stmt = select(Permission).where(
                 and_(
-                    Permission.role_id == role_id,
+                    Permission.role_id.in_(role_ids),
                     Permission.is_active == True  # noqa: E712
                 )
             )
             result = await session.execute(stmt)
             return list(result.scalars().all())
     
-    def _evaluate_conditions(
-        self, 
-        conditions: Dict[str, Any], 
-        context: Optional[Dict[str, Any]] = None
-    ) -> bool:
-        """Evaluate permission conditions against context.
-        
-        Args:
-            conditions: Permission conditions
-            context: Execution context
-            
-        Returns:
-            True if conditions are met
-        """
-        if not conditions:
-            return True
-        
-        context = context or {}
-        
-        # Simple condition evaluation - can be extended
-        for key, expected_value in conditions.items():
-            if key in context:
-                if context[key] != expected_value:
-                    return False
-            else:
-                return False
-        
-        return True
-    
-    def _get_cached_permission(self, cache_key: str) -> Optional[bool]:
-        """Get permission from cache.
-        
-        Args:
-            cache_key: Cache key
-            
-        Returns:
-            Cached result or None
-        """
-        if cache_key in self._cache:
-            entry = self._cache[cache_key]
-            import time
-            if time.time() - entry['timestamp'] < self._cache_ttl:
-                return entry['result']
-            else:
-                del self._cache[cache_key]
-        return None
-    
-    def _cache_permission(self, cache_key: str, result: bool) -> None:
-        """Cache permission result.
-        
-        Args:
-            cache_key: Cache key
-            result: Permission result
-        """
-        import time
-        self._cache[cache_key] = {
-            'result': result,
-            'timestamp': time.time()
-        }
-    
     def _clear_cache(self) -> None:
-        """Clear permission cache."""
+        """Invalidate every compiled permission set."""
+        self._global_version += 1
         self._cache.clear()
 
 
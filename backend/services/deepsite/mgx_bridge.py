@@ -32,6 +32,7 @@ import logging
 import os
 import re
 import time as _time
+from functools import lru_cache
 from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
@@ -41,13 +42,46 @@ logger = logging.getLogger(__name__)
 # Skill / rule loader
 # ---------------------------------------------------------------------------
 
+_SKILLS_DIR = os.path.join(os.path.dirname(__file__), "skills")
+_RULES_DIR = os.path.join(os.path.dirname(__file__), "rules")
+
+# path -> (mtime_ns, size, içerik); dosya değişince yeniden okunur
+_file_cache: Dict[str, Tuple[int, int, str]] = {}
+# kaynak kombinasyonu -> (dosya imzaları, birleştirilmiş context)
+_skill_context_cache: Dict[Tuple, Tuple[Tuple, str]] = {}
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_cached(path: str) -> str:
+    """Dosyayı okur; mtime/boyut değişmediyse bellekteki kopyayı döner.
+
+    Dosya yoksa FileNotFoundError fırlatır (çağıranlar boş string'e çevirir).
+    """
+    signature = _file_signature(path)
+    if signature is None:
+        _file_cache.pop(path, None)
+        raise FileNotFoundError(path)
+    cached = _file_cache.get(path)
+    if cached is not None and cached[:2] == signature:
+        return cached[2]
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    _file_cache[path] = (signature[0], signature[1], content)
+    return content
+
+
 def _load_skill(name: str, max_chars: int = 3000) -> str:
     """Skills dizininden markdown dosyasını yükler. Bulunamazsa boş string döner."""
-    skills_dir = os.path.join(os.path.dirname(__file__), "skills")
-    path = os.path.join(skills_dir, name)
+    path = os.path.join(_SKILLS_DIR, name)
     try:
-        with open(path, encoding="utf-8") as f:
-            return f.read()[:max_chars]
+        return _read_cached(path)[:max_chars]
     except FileNotFoundError:
         logger.debug("Skill file not found: %s", path)
         return ""
@@ -58,11 +92,9 @@ def _load_skill(name: str, max_chars: int = 3000) -> str:
 
 def _load_rule(path_parts: list[str], max_chars: int = 800) -> str:
     """rules/ dizininden kural dosyası yükler."""
-    rules_dir = os.path.join(os.path.dirname(__file__), "rules")
-    path = os.path.join(rules_dir, *path_parts)
+    path = os.path.join(_RULES_DIR, *path_parts)
     try:
-        with open(path, encoding="utf-8") as f:
-            return f.read()[:max_chars]
+        return _read_cached(path)[:max_chars]
     except FileNotFoundError:
         return ""
     except Exception as exc:
@@ -70,27 +102,17 @@ def _load_rule(path_parts: list[str], max_chars: int = 800) -> str:
         return ""
 
 
-def _build_skill_context(stack_hint: str = "html") -> str:
+def _skill_context_sources(stack_hint: str) -> Tuple[int, Tuple[Tuple[str, str, int], ...]]:
     """
-    Stack'e göre ilgili skill + rule dosyalarını yükler.
-    Toplam token bütçesi: max 4000 karakter.
+    Stack için toplam bütçe ve (etiket, dosya yolu, karakter limiti) listesi.
     Öncelik: security > architect skill > stack rules > design
     """
     # Laravel stack için daha geniş bütçe: tam skill dosyası + örnekler yüklenir
     is_laravel = stack_hint.lower() in ("laravel-blade", "laravel", "laravel-react", "flutter-laravel")
-    _TOKEN_BUDGET = 8000 if is_laravel else 4000
-    sections: list[str] = []
-    used = 0
-
-    def _add(label: str, content: str, budget: int) -> None:
-        nonlocal used
-        if not content or used >= _TOKEN_BUDGET:
-            return
-        snippet = content[:budget]
-        sections.append(f"--- {label} ---\n{snippet}")
-        used += len(snippet)
-
-    _add("SECURITY STANDARDS", _load_skill("security-review.md", 800), min(800, _TOKEN_BUDGET - used))
+    total_budget = 8000 if is_laravel else 4000
+    sources: list[Tuple[str, str, int]] = [
+        ("SECURITY STANDARDS", os.path.join(_SKILLS_DIR, "security-review.md"), 800),
+    ]
 
     arch_map = {
         "laravel-blade":   "laravel-blade-architect.md",
@@ -104,7 +126,7 @@ def _build_skill_context(stack_hint: str = "html") -> str:
     arch_budget = 5000 if is_laravel else 1200
     arch_file = arch_map.get(stack_hint.lower(), "")
     if arch_file:
-        _add("ARCHITECTURE GUIDE", _load_skill(arch_file, arch_budget), min(arch_budget, _TOKEN_BUDGET - used))
+        sources.append(("ARCHITECTURE GUIDE", os.path.join(_SKILLS_DIR, arch_file), arch_budget))
 
     rule_map = {
         "laravel-blade":   [["php", "laravel.md"], ["postgresql", "best-practices.md"]],
@@ -114,22 +136,60 @@ def _build_skill_context(stack_hint: str = "html") -> str:
         "laravel-react":   [["php", "laravel.md"], ["postgresql", "best-practices.md"]],
     }
     for rule_path in rule_map.get(stack_hint.lower(), []):
-        rule_content = _load_rule(rule_path, 600)
         label = rule_path[-1].replace(".md", "").replace("-", " ").upper() + " RULES"
-        _add(label, rule_content, min(600, _TOKEN_BUDGET - used))
+        sources.append((label, os.path.join(_RULES_DIR, *rule_path), 600))
 
-    _add("COMMON SECURITY RULES", _load_rule(["common", "security.md"], 500), min(500, _TOKEN_BUDGET - used))
+    sources.append(("COMMON SECURITY RULES", os.path.join(_RULES_DIR, "common", "security.md"), 500))
 
     if stack_hint == "html":
-        _add("HTML DESIGN QUALITY", _load_skill("html-design.md", 800), min(800, _TOKEN_BUDGET - used))
+        sources.append(("HTML DESIGN QUALITY", os.path.join(_SKILLS_DIR, "html-design.md"), 800))
 
     # Laravel projeleri için Alex'in tam-stack manifesto'sunu yükle
     if is_laravel:
-        _add("ALEX ENGINEERING MANIFESTO", _load_skill("alex-laravel.md", 4000), min(4000, _TOKEN_BUDGET - used))
+        sources.append(("ALEX ENGINEERING MANIFESTO", os.path.join(_SKILLS_DIR, "alex-laravel.md"), 4000))
 
-    _add("PLANNING PROTOCOL", _load_skill("mike-planner.md", 800), min(800, _TOKEN_BUDGET - used))
+    sources.append(("PLANNING PROTOCOL", os.path.join(_SKILLS_DIR, "mike-planner.md"), 800))
+    return total_budget, tuple(sources)
 
-    return "\n\n".join(sections) if sections else ""
+
+def _build_skill_context(stack_hint: str = "html") -> str:
+    """
+    Stack'e göre ilgili skill + rule dosyalarını yükler.
+    Toplam token bütçesi: max 4000 karakter (Laravel: 8000).
+
+    Sonuç, skill/rule kombinasyonu başına önbelleğe alınır; kaynak
+    dosyalardan birinin mtime/boyutu değişirse yeniden oluşturulur.
+    """
+    key = _skill_context_sources(stack_hint)
+    total_budget, sources = key
+    signatures = tuple(_file_signature(path) for _, path, _ in sources)
+
+    cached = _skill_context_cache.get(key)
+    if cached is not None and cached[0] == signatures:
+        return cached[1]
+
+    sections: list[str] = []
+    used = 0
+    for label, path, limit in sources:
+        if used >= total_budget:
+            break
+        try:
+            content = _read_cached(path)[:limit]
+        except FileNotFoundError:
+            logger.debug("Skill/rule file not found: %s", path)
+            continue
+        except Exception as exc:
+            logger.warning("Could not load skill/rule %s: %s", path, exc)
+            continue
+        if not content:
+            continue
+        snippet = content[:min(limit, total_budget - used)]
+        sections.append(f"--- {label} ---\n{snippet}")
+        used += len(snippet)
+
+    context = "\n\n".join(sections) if sections else ""
+    _skill_context_cache[key] = (signatures, context)
+    return context
 
 
 # ---------------------------------------------------------------------------
@@ -248,6 +308,40 @@ _STACK_TYPE_MAP = {
 # Task builder
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=32)
+def _stack_preamble(stack_hint: str) -> str:
+    """Stack'e özel sabit görev başlığı; stack başına bir kez oluşturulur."""
+    stack_desc = {
+        "laravel-blade": "Laravel 11 + Blade + PostgreSQL 16",
+        "laravel-react": "Laravel 11 API + React + PostgreSQL 16",
+        "flutter-laravel": "Flutter 3 + Laravel 11 API + PostgreSQL 16",
+    }.get(stack_hint, stack_hint)
+
+    return (
+        f"## STACK: {stack_desc}\n\n"
+        f"Generate a COMPLETE, FULLY FUNCTIONAL {stack_desc} project with ALL layers.\n"
+        f"Output ALL files using the FILE: manifest format:\n\n"
+        f"FILE: path/to/file.ext\n"
+        f"[file content]\n\n"
+        f"FILE: path/to/another.ext\n"
+        f"[file content]\n\n"
+        f"## MANDATORY FILE CHECKLIST — you MUST include ALL of these:\n"
+        f"- routes/web.php (or api.php) — all CRUD routes for every entity\n"
+        f"- app/Http/Controllers/ — one controller per entity with index/show/create/store/edit/update/destroy\n"
+        f"- resources/views/ — Blade templates for every page (list, create/edit forms, show detail)\n"
+        f"- resources/views/layouts/app.blade.php — shared layout with working nav links\n"
+        f"- app/Models/ — Eloquent models with relationships\n"
+        f"- database/migrations/ — all table migrations\n"
+        f"- database/seeders/ — sample data seeders\n"
+        f"- public/index.php — Laravel entry point (if not using artisan serve)\n"
+        f"- composer.json — with correct Laravel dependencies\n\n"
+        f"CRITICAL: Do NOT stop at migrations/models only. "
+        f"A working web app REQUIRES controllers, routes, and views. "
+        f"Every menu item in the UI MUST have a working route, controller action, and view.\n\n"
+        f"## USER REQUEST\n"
+    )
+
+
 def _build_task(
     user_prompt: str,
     context: Optional[str],
@@ -272,35 +366,7 @@ def _build_task(
         parts.append(_HTML_TASK_PREFIX + user_prompt.strip())
     else:
         # Gerçek proje stack'leri: mimari odaklı
-        stack_desc = {
-            "laravel-blade": "Laravel 11 + Blade + PostgreSQL 16",
-            "laravel-react": "Laravel 11 API + React + PostgreSQL 16",
-            "flutter-laravel": "Flutter 3 + Laravel 11 API + PostgreSQL 16",
-        }.get(stack_hint, stack_hint)
-
-        parts.append(
-            f"## STACK: {stack_desc}\n\n"
-            f"Generate a COMPLETE, FULLY FUNCTIONAL {stack_desc} project with ALL layers.\n"
-            f"Output ALL files using the FILE: manifest format:\n\n"
-            f"FILE: path/to/file.ext\n"
-            f"[file content]\n\n"
-            f"FILE: path/to/another.ext\n"
-            f"[file content]\n\n"
-            f"## MANDATORY FILE CHECKLIST — you MUST include ALL of these:\n"
-            f"- routes/web.php (or api.php) — all CRUD routes for every entity\n"
-            f"- app/Http/Controllers/ — one controller per entity with index/show/create/store/edit/update/destroy\n"
-            f"- resources/views/ — Blade templates for every page (list, create/edit forms, show detail)\n"
-            f"- resources/views/layouts/app.blade.php — shared layout with working nav links\n"
-            f"- app/Models/ — Eloquent models with relationships\n"
-            f"- database/migrations/ — all table migrations\n"
-            f"- database/seeders/ — sample data seeders\n"
-            f"- public/index.php — Laravel entry point (if not using artisan serve)\n"
-            f"- composer.json — with correct Laravel dependencies\n\n"
-            f"CRITICAL: Do NOT stop at migrations/models only. "
-            f"A working web app REQUIRES controllers, routes, and views. "
-            f"Every menu item in the UI MUST have a working route, controller action, and view.\n\n"
-            f"## USER REQUEST\n{user_prompt.strip()}"
-        )
+        parts.append(_stack_preamble(stack_hint) + user_prompt.strip())
 
     # Skill/mimari context
     if skill_ctx:
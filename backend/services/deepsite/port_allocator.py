@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+"""
+DeepSite preview port allocator
+
+Preview container'ları için host port kiralama (lease) yönetimi.
+
+Redis varsa:
+  - Boş portlar bir Redis SET'inde tutulur (free-list); tahsis SPOP ile O(1).
+  - Kiralar ``deepsite:ports:leases`` ZSET'inde bitiş zamanına göre skorlanır;
+    süresi dolan (sızmış) portlar sonraki tahsislerde geri kazanılır.
+  - Tahsis / bırakma / yenileme tek bir Lua script'i ile atomik yapılır
+    (tek round-trip, yarış koşulu yok).
+  - Tüm çağrılar tek, havuzlu (pooled) async Redis client'ı paylaşır.
+
+Redis yapılandırılmamışsa aynı semantiği süreç içi bir free-list +
+süre-sonu heap'i ile sağlar (yalnızca tek süreç için tutarlıdır). Redis
+yapılandırılmış ama erişilemiyorsa işlem hata verir: süreç içi havuza geçmek
+başka instance'ların tuttuğu portları dağıtır ve Redis kiralarını sızdırır.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "deepsite"
+# Eski (lineer tarama) tahsisçinin port anahtarı; ilk tohumlamada kira olarak içe alınır
+_LEGACY_PORT_PREFIX = f"{_KEY_PREFIX}:port_used:"
+_PROJECT_PORT_PREFIX = f"{_KEY_PREFIX}:project_port:"
+
+DEFAULT_LEASE_TTL = int(os.getenv("PROJECT_PREVIEW_PORT_TTL", "86400"))
+_REDIS_TIMEOUT = 3.0
+
+# KEYS: free, leases, owners, project key, init marker
+# ARGV: project_id, now, ttl, port_min, port_max, reclaim_batch, project prefix, legacy prefix
+_ALLOCATE_LUA = """
+local free, leases, owners, proj_key, init_key = KEYS[1], KEYS[2], KEYS[3], KEYS[4], KEYS[5]
+local pid, now, ttl = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3])
+local pmin, pmax, batch = tonumber(ARGV[4]), tonumber(ARGV[5]), tonumber(ARGV[6])
+local proj_prefix, legacy_prefix = ARGV[7], ARGV[8]
+
+local existing = redis.call('GET', proj_key)
+if existing then
+  if redis.call('HGET', owners, existing) == pid then
+    redis.call('ZADD', leases, now + ttl, existing)
+    redis.call('EXPIRE', proj_key, ttl)
+    return tonumber(existing)
+  end
+  redis.call('DEL', proj_key)
+end
+
+if redis.call('EXISTS', init_key) == 0 then
+  for p = pmin, pmax do
+    if not redis.call('ZSCORE', leases, p) then
+      local legacy_owner = redis.call('GET', legacy_prefix .. p)
+      if legacy_owner then
+        local legacy_ttl = redis.call('TTL', legacy_prefix .. p)
+        if legacy_ttl < 0 then legacy_ttl = ttl end
+        redis.call('ZADD', leases, now + legacy_ttl, p)
+        redis.call('HSET', owners, p, legacy_owner)
+      else
+        redis.call('SADD', free, p)
+      end
+    end
+  end
+  redis.call('SET', init_key, now)
+end
+
+local expired = redis.call('ZRANGEBYSCORE', leases, '-inf', now, 'LIMIT', 0, batch)
+for _, p in ipairs(expired) do
+  local owner = redis.call('HGET', owners, p)
+  if owner and redis.call('GET', proj_prefix .. owner) == p then
+    redis.call('DEL', proj_prefix .. owner)
+  end
+  redis.call('HDEL', owners, p)
+  redis.call('ZREM', leases, p)
+  local n = tonumber(p)
+  if n >= pmin and n <= pmax then
+    redis.call('SADD', free, p)
+  end
+end
+
+local port = redis.call('SPOP', free)
+if not port then
+  return -1
+end
+redis.call('ZADD', leases, now + ttl, port)
+redis.call('HSET', owners, port, pid)
+redis.call('SET', proj_key, port, 'EX', ttl)
+return tonumber(port)
+"""
+
+# KEYS: free, leases, owners, project key
+# ARGV: project_id, port_min, port_max, legacy prefix
+_RELEASE_LUA = """
+local free, leases, owners, proj_key = KEYS[1], KEYS[2], KEYS[3], KEYS[4]
+local pid, pmin, pmax, legacy_prefix = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3]), ARGV[4]
+
+local port = redis.call('GET', proj_key)
+if not port then
+  return -1
+end
+redis.call('DEL', proj_key)
+redis.call('DEL', legacy_prefix .. port)
+if redis.call('HGET', owners, port) == pid then
+  redis.call('HDEL', owners, port)
+  redis.call('ZREM', leases, port)
+  local n = tonumber(port)
+  if n >= pmin and n <= pmax then
+    redis.call('SADD', free, port)
+  end
+end
+return tonumber(port)
+"""
+
+# KEYS: leases, owners, project key
+# ARGV: project_id, now, ttl
+_RENEW_LUA = """
+local leases, owners, proj_key = KEYS[1], KEYS[2], KEYS[3]
+local pid, now, ttl = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3])
+
+local port = redis.call('GET', proj_key)
+if not port or redis.call('HGET', owners, port) ~= pid then
+  return -1
+end
+redis.call('ZADD', leases, now + ttl, port)
+redis.call('EXPIRE', proj_key, ttl)
+return tonumber(port)
+"""
+
+_SCRIPTS = {"allocate": _ALLOCATE_LUA, "release": _RELEASE_LUA, "renew": _RENEW_LUA}
+# Redis yapılandırılmadığında script sonucu yerine dönen işaret
+_NO_REDIS = object()
+
+
+class _LocalPortPool:
+    """Süreç içi free-list; süresi dolan kiralar heap üzerinden geri kazanılır."""
+
+    def __init__(self, port_min: int, port_max: int, ttl: int) -> None:
+        self.port_min = port_min
+        self.port_max = port_max
+        self.ttl = ttl
+        self._free: Deque[int] = deque(range(port_min, port_max + 1))
+        self._leases: Dict[str, Tuple[int, float]] = {}
+        self._owners: Dict[int, str] = {}
+        self._expiries: List[Tuple[float, int, str]] = []
+
+    def allocate(self, project_id: str) -> Optional[int]:
+        now = time.time()
+        lease = self._leases.get(project_id)
+        if lease is not None and lease[1] > now:
+            return self._renew(project_id, lease[0], now)
+
+        self._reclaim(now)
+        if not self._free:
+            return None
+        port = self._free.popleft()
+        self._owners[port] = project_id
+        expires_at = now + self.ttl
+        self._leases[project_id] = (port, expires_at)
+        heapq.heappush(self._expiries, (expires_at, port, project_id))
+        return port
+
+    def release(self, project_id: str) -> Optional[int]:
+        lease = self._leases.pop(project_id, None)
+        if lease is None:
+            return None
+        port = lease[0]
+        if self._owners.get(port) == project_id:
+            del self._owners[port]
+            self._free.append(port)
+        return port
+
+    def renew(self, project_id: str) -> Optional[int]:
+        now = time.time()
+        lease = self._leases.get(project_id)
+        if lease is None or lease[1] <= now:
+            return None
+        return self._renew(project_id, lease[0], now)
+
+    def _renew(self, project_id: str, port: int, now: float) -> int:
+        # Heap kaydı güncellenmez; _reclaim eski kaydı görünce yeni süreyle geri koyar
+        self._leases[project_id] = (port, now + self.ttl)
+        return port
+
+    def _reclaim(self, now: float) -> None:
+        while self._expiries and self._expiries[0][0] <= now:
+            expires_at, port, project_id = heapq.heappop(self._expiries)
+            lease = self._leases.get(project_id)
+            if lease is None or lease[0] != port:
+                continue
+            if lease[1] > now:
+                # Kira yenilenmiş: yeni bitiş zamanıyla tekrar sıraya al
+                heapq.heappush(self._expiries, (lease[1], port, project_id))
+                continue
+            del self._leases[project_id]
+            if self._owners.get(port) == project_id:
+                del self._owners[port]
+                self._free.append(port)
+            logger.info("Reclaimed expired preview port %d from project %s", port, project_id)
+
+    def stats(self) -> Dict[str, int]:
+        return {"free": len(self._free), "leased": len(self._leases)}
+
+
+class PortAllocator:
+    """Preview port kiralarını Redis (varsa) veya süreç içi havuz üzerinden yönetir."""
+
+    def __init__(
+        self,
+        port_min: int,
+        port_max: int,
+        *,
+        redis_url: Optional[str] = None,
+        lease_ttl: int = DEFAULT_LEASE_TTL,
+        reclaim_batch: int = 32,
+    ) -> None:
+        if port_min > port_max:
+            raise ValueError(f"Invalid port range {port_min}-{port_max}")
+        self.port_min = port_min
+        self.port_max = port_max
+        self.redis_url = redis_url
+        self.lease_ttl = lease_ttl
+        self.reclaim_batch = reclaim_batch
+        self._local = _LocalPortPool(port_min, port_max, lease_ttl)
+        self._redis = None
+        self._scripts: Dict[str, object] = {}
+
+        range_key = f"{port_min}-{port_max}"
+        self._free_key = f"{_KEY_PREFIX}:ports:free:{range_key}"
+        self._init_key = f"{_KEY_PREFIX}:ports:init:{range_key}"
+        self._leases_key = f"{_KEY_PREFIX}:ports:leases"
+        self._owners_key = f"{_KEY_PREFIX}:ports:owners"
+
+    async def allocate(self, project_id: str) -> int:
+        """Projeye port kiralar; mevcut kira varsa yenileyip aynı portu döner."""
+        port = await self._run_script(
+            "allocate",
+            [self._free_key, self._leases_key, self._owners_key,
+             _PROJECT_PORT_PREFIX + project_id, self._init_key],
+            [project_id, int(time.time()), self.lease_ttl, self.port_min, self.port_max,
+             self.reclaim_batch, _PROJECT_PORT_PREFIX, _LEGACY_PORT_PREFIX],
+        )
+        if port is _NO_REDIS:
+            port = self._local.allocate(project_id)
+        if port is None or port < 0:
+            raise RuntimeError(f"No free ports in range {self.port_min}-{self.port_max}")
+        logger.info("Allocated port %d for project %s", port, project_id)
+        return port
+
+    async def release(self, project_id: str) -> Optional[int]:
+        """Projenin kirasını bırakır ve portu free-list'e geri koyar."""
+        port = await self._run_script(
+            "release",
+            [self._free_key, self._leases_key, self._owners_key, _PROJECT_PORT_PREFIX + project_id],
+            [project_id, self.port_min, self.port_max, _LEGACY_PORT_PREFIX],
+        )
+        if port is _NO_REDIS:
+            return self._local.release(project_id)
+        return port if port is not None and port >= 0 else None
+
+    async def renew(self, project_id: str) -> Optional[int]:
+        """Çalışan preview'in kirasını uzatır; kira yoksa None döner."""
+        port = await self._run_script(
+            "renew",
+            [self._leases_key, self._owners_key, _PROJECT_PORT_PREFIX + project_id],
+            [project_id, int(time.time()), self.lease_ttl],
+        )
+        if port is _NO_REDIS:
+            return self._local.renew(project_id)
+        return port if port is not None and port >= 0 else None
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            try:
+                await self._redis.aclose()
+            except Exception as exc:
+                logger.debug("Closing port allocator Redis client failed: %s", exc)
+            self._redis = None
+            self._scripts = {}
+
+    async def _run_script(self, name: str, keys: List[str], args: List[object]):
+        client = self._get_redis()
+        if client is None:
+            return _NO_REDIS
+        try:
+            script = self._scripts.get(name)
+            if script is None:
+                script = client.register_script(_SCRIPTS[name])
+                self._scripts[name] = script
+            result = await asyncio.wait_for(script(keys=keys, args=args), timeout=_REDIS_TIMEOUT)
+            return int(result)
+        except Exception as exc:
+            # Süreç içi havuza düşülmez: diğer instance'ların kiralarını göremez
+            logger.warning("Port allocator Redis %s failed: %s", name, exc)
+            raise RuntimeError(f"Port allocator Redis {name} failed: {exc}") from exc
+
+    def _get_redis(self):
+        if not self.redis_url:
+            return None
+        if self._redis is None:
+            try:
+                import redis.asyncio as aioredis
+            except ImportError:
+                logger.warning("redis package not installed; preview ports use the in-process pool")
+                self.redis_url = None
+                return None
+            self._redis = aioredis.from_url(
+                self.redis_url,
+                decode_responses=True,
+                socket_connect_timeout=2,
+                max_connections=32,
+            )
+        return self._redis
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "range": [self.port_min, self.port_max],
+            "backend": "redis" if self._redis is not None else "local",
+            "local": self._local.stats(),
+        }
+
+
+_port_allocator: Optional[PortAllocator] = None
+
+
+def get_port_allocator() -> PortAllocator:
+    """Süreç genelinde paylaşılan port allocator'ı döner."""
+    global _port_allocator
+    if _port_allocator is None:
+        _port_allocator = PortAllocator(
+            int(os.getenv("PROJECT_PREVIEW_PORT_MIN", "9100")),
+            int(os.getenv("PROJECT_PREVIEW_PORT_MAX", "9999")),
+            redis_url=os.getenv("REDIS_URL", "redis://redis:6379"),
+        )
+    return _port_allocator
+
+
+async def shutdown_port_allocator() -> None:
+    """Paylaşılan Redis bağlantı havuzunu kapatır."""
+    global _port_allocator
+    if _port_allocator is not None:
+        await _port_allocator.close()
+        _port_allocator = None
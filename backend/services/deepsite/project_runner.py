@@ -10,13 +10,12 @@ Akış:
   1. Proje dosyaları DB'den alınır.
   2. /tmp/deepsite_projects/{project_id}/ altına yazılır.
   3. Stack'e uygun Docker image ile container başlatılır.
-  4. Port Redis'ten tahsis edilir (9100-9999 aralığı).
+  4. Port Redis free-list'inden kiralanır (9100-9999 aralığı, TTL'li lease).
   5. Frontend preview URL'si döner: http://localhost:{port}
 """
 
 from __future__ import annotations
 
-import asyncio
 import base64
 import io
 import json
@@ -30,11 +29,10 @@ from typing import Dict, List, Optional
 
 import httpx
 
+from backend.services.deepsite.port_allocator import get_port_allocator
+
 logger = logging.getLogger(__name__)
 
-# Port aralığı
-PORT_MIN = int(os.getenv("PROJECT_PREVIEW_PORT_MIN", "9100"))
-PORT_MAX = int(os.getenv("PROJECT_PREVIEW_PORT_MAX", "9999"))
 PREVIEW_HOST = os.getenv("PROJECT_PREVIEW_HOST", "localhost")
 
 # Docker daemon URL (DinD veya lokal socket)
@@ -90,66 +88,12 @@ async def _docker_available() -> bool:
 # ---------------------------------------------------------------------------
 
 async def allocate_port(project_id: str) -> int:
-    """Redis veya dosya tabanlı port tahsisi."""
-    try:
-        import redis.asyncio as aioredis
-        redis_url = os.getenv("REDIS_URL", "redis://redis:6379")
-        r = await aioredis.from_url(redis_url, decode_responses=True, socket_connect_timeout=2)
-
-        existing = await asyncio.wait_for(r.get(f"deepsite:project_port:{project_id}"), timeout=3)
-        if existing:
-            return int(existing)
-
-        for port in range(PORT_MIN, PORT_MAX + 1):
-            acquired = await r.set(f"deepsite:port_used:{port}", project_id, nx=True, ex=86400)
-            if acquired:
-                await r.set(f"deepsite:project_port:{project_id}", str(port), ex=86400)
-                logger.info("Allocated port %d for project %s", port, project_id)
-                return port
-
-        raise RuntimeError(f"No free ports in range {PORT_MIN}-{PORT_MAX}")
-
-    except ImportError:
-        return await _allocate_port_file(project_id)
-
-
-async def _allocate_port_file(project_id: str) -> int:
-    lock_dir = pathlib.Path("/tmp/deepsite_ports")
-    lock_dir.mkdir(parents=True, exist_ok=True)
-
-    proj_lock = lock_dir / f"project_{project_id}.port"
-    if proj_lock.exists():
-        return int(proj_lock.read_text().strip())
-
-    for port in range(PORT_MIN, PORT_MAX + 1):
-        port_lock = lock_dir / f"port_{port}.lock"
-        if not port_lock.exists():
-            port_lock.write_text(project_id)
-            proj_lock.write_text(str(port))
-            return port
-
-    raise RuntimeError(f"No free ports in range {PORT_MIN}-{PORT_MAX}")
+    """Projeye preview portu kiralar (Redis free-list; Redis yapılandırılmamışsa süreç içi havuz)."""
+    return await get_port_allocator().allocate(project_id)
 
 
 async def release_port(project_id: str) -> None:
-    try:
-        import redis.asyncio as aioredis
-        redis_url = os.getenv("REDIS_URL", "redis://redis:6379")
-        r = await aioredis.from_url(redis_url, decode_responses=True, socket_connect_timeout=2)
-        port_str = await asyncio.wait_for(
-            r.get(f"deepsite:project_port:{project_id}"),
-            timeout=3,
-        )
-        if port_str:
-            await r.delete(f"deepsite:port_used:{port_str}")
-            await r.delete(f"deepsite:project_port:{project_id}")
-    except Exception:
-        lock_dir = pathlib.Path("/tmp/deepsite_ports")
-        proj_lock = lock_dir / f"project_{project_id}.port"
-        if proj_lock.exists():
-            port = int(proj_lock.read_text().strip())
-            (lock_dir / f"port_{port}.lock").unlink(missing_ok=True)
-            proj_lock.unlink(missing_ok=True)
+    await get_port_allocator().release(project_id)
 
 
 # ---------------------------------------------------------------------------
@@ -666,15 +610,12 @@ async def get_project_status(project_id: str) -> Dict[str, object]:
         pass
 
     if running:
+        # Çalışan preview'in kirasını uzat (sızan portlar TTL ile geri kazanılır)
         try:
-            import redis.asyncio as aioredis
-            redis_url = os.getenv("REDIS_URL", "redis://redis:6379")
-            r = await aioredis.from_url(redis_url, decode_responses=True)
-            port_str = await r.get(f"deepsite:project_port:{project_id}")
-            port = int(port_str) if port_str else None
-        except Exception:
-            proj_lock = pathlib.Path("/tmp/deepsite_ports") / f"project_{project_id}.port"
-            port = int(proj_lock.read_text().strip()) if proj_lock.exists() else None
+            port = await get_port_allocator().renew(project_id)
+        except RuntimeError as e:
+            logger.warning("Preview port lease renewal failed for %s: %s", project_id, e)
+            port = None
 
         # Proxy için DinD hostname kullan (docker compose network üzerinden erişilebilir)
         dind_host = os.getenv("DIND_HOST", "dind")
@@ -13,6 +13,7 @@ import asyncio
 import logging
 import re
 import shutil
+import time
 from pathlib import Path
 from typing import Optional, Callable, Any, Dict
 from datetime import datetime
@@ -20,6 +21,7 @@ from enum import Enum
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.config import settings
 from backend.db.models.enums import RunStatus as DBRunStatus
 from backend.schemas import (
     EventPayload,
@@ -47,6 +49,7 @@ from backend.services.git import GitService, get_git_service, GitServiceError
 from backend.db.models import AgentDefinition, AgentInstance, Task
 from backend.db.models.enums import AgentStatus, AgentMessageDirection
 from backend.services.agents.messages import get_agent_message_bus
+from backend.services.metrics_registry import TASK_RUN_DURATION, TASK_RUNS, TASK_RUNS_IN_PROGRESS
 from sqlalchemy import select
 
 logger = logging.getLogger(__name__)
@@ -94,7 +97,29 @@ class TaskExecutor:
         self._approval_decisions: Dict[str, bool] = {}
         logger.info("TaskExecutor initialized")
     
-    async def execute_task(
+    async def execute_task(self, *args, **kwargs) -> Dict[str, Any]:
+        """
+        Execute a task with full event lifecycle (see ``_execute_task``).
+
+        Records ``task_runs_total`` and ``task_run_duration_seconds``.
+        """
+        started = time.perf_counter()
+        result_label, mode = "cancelled", "team"
+        TASK_RUNS_IN_PROGRESS.inc()
+        try:
+            result = await self._execute_task(*args, **kwargs)
+            result_label = result.get("status", "completed")
+            mode = result.get("mode", mode)
+            return result
+        except Exception:
+            result_label = "failed"
+            raise
+        finally:
+            TASK_RUNS_IN_PROGRESS.dec()
+            TASK_RUNS.inc(result=result_label, mode=mode, provider=settings.llm_default_provider)
+            TASK_RUN_DURATION.observe(time.perf_counter() - started, mode=mode)
+
+    async def _execute_task(
         self,
         task_id: str,
         run_id: str,
@@ -319,6 +344,9 @@ class TaskExecutor:
                     # Fall through to complex task execution
             
             # Complex task mode - full MGXStyleTeam execution
+            team = None
+            subscription = None
+            message_forwarder = None
             try:
                 # Send execution started message (create new session for message)
                 if agent_instance_id and task_obj and self.session_factory:
@@ -351,141 +379,123 @@ class TaskExecutor:
                     except Exception as msg_error:
                         logger.warning(f"Failed to send execution started message: {msg_error}")
                 
-                team = await self.team_provider.get_team()
+                # Each run gets its own pooled team so concurrent runs don't share state
+                team = await self.team_provider.acquire_team(
+                    workspace_id=task_obj.workspace_id if task_obj else None
+                )
                 
-                # Helper function to capture and send agent messages
-                async def capture_and_send_messages(env, initial_count: int = 0):
-                    """Capture agent messages from MetaGPT team environment and send them."""
-                    if not agent_instance_id or not task_obj or not self.session_factory:
-                        return
-                    
-                    try:
-                        if not hasattr(env, 'messages'):
-                            return
-                        
-                        # Get new messages since initial_count
-                        all_messages = env.messages
-                        new_messages = all_messages[initial_count:] if initial_count < len(all_messages) else all_messages
-                        
-                        if not new_messages:
-                            return
-                        
-                        logger.info(f"Capturing {len(new_messages)} agent messages from team execution")
-                        
-                        # Map MetaGPT roles to agent names
-                        role_name_map = {
-                            "TeamLeader": "Mike",
-                            "Engineer": "Alex", 
-                            "Tester": "Bob",
-                            "Reviewer": "Charlie",
-                        }
-                        
-                        # Send each agent message
-                        for msg in new_messages:
-                            try:
-                                # Extract agent name from message role
-                                msg_role = msg.role if hasattr(msg, 'role') else None
-                                agent_name = role_name_map.get(msg_role, msg_role) if msg_role else "Agent"
-                                
-                                # Get content
-                                content = msg.content if hasattr(msg, 'content') else str(msg)
-                                
-                                # Skip empty or system messages
-                                if not content or not content.strip():
-                                    continue
-                                
-                                # Determine message type
-                                msg_type = "agent_message"
-                                if hasattr(msg, 'cause_by'):
-                                    cause_by = str(msg.cause_by) if msg.cause_by else ""
-                                    if "AnalyzeTask" in cause_by or "DraftPlan" in cause_by:
-                                        msg_type = "planning"
-                                    elif "WriteCode" in cause_by:
-                                        msg_type = "coding"
-                                    elif "WriteTest" in cause_by:
-                                        msg_type = "testing"
-                                    elif "ReviewCode" in cause_by:
-                                        msg_type = "review"
-                                
-                                # Send message via agent message bus
-                                msg_session = await self.session_factory()
-                                try:
-                                    message_bus = get_agent_message_bus()
-                                    await message_bus.append(
-                                        msg_session,
-                                        workspace_id=task_obj.workspace_id,
-                                        project_id=task_obj.project_id,
-                                        agent_instance_id=agent_instance_id,
-                                        direction=AgentMessageDirection.OUTBOUND,
-                                        payload={
-                                            "type": msg_type,
-                                            "agent_name": agent_name,
-                                            "role": msg_role or "assistant",
-                                            "content": content,
-                                            "task_id": task_id,
-                                            "run_id": run_id,
-                                            "message": content[:200] + "..." if len(content) > 200 else content,
-                                        },
-                                        task_id=task_id,
-                                        run_id=run_id,
-                                        broadcast=True,
-                                    )
-                                    await msg_session.commit()
-                                    logger.debug(f"Sent agent message from {agent_name}: {content[:50]}...")
-                                finally:
-                                    await msg_session.close()
-                            except Exception as msg_error:
-                                logger.warning(f"Failed to send agent message: {msg_error}", exc_info=True)
+                # Agent chatter for this run is written behind in batches
+                message_batch = (
+                    get_agent_message_bus().batch(self.session_factory)
+                    if self.session_factory
+                    else None
+                )
+                
+                # Map MetaGPT roles to agent names
+                role_name_map = {
+                    "TeamLeader": "Mike",
+                    "Engineer": "Alex", 
+                    "Tester": "Bob",
+                    "Reviewer": "Charlie",
+                }
+                
+                async def forward_agent_messages(messages):
+                    """Send each message published by the team as soon as it is published."""
+                    async for msg in messages:
+                        try:
+                            # Extract agent name from message role
+                            msg_role = msg.role if hasattr(msg, 'role') else None
+                            agent_name = role_name_map.get(msg_role, msg_role) if msg_role else "Agent"
+                            
+                            # Get content
+                            content = msg.content if hasattr(msg, 'content') else str(msg)
+                            
+                            # Skip empty or system messages
+                            if not content or not content.strip():
                                 continue
-                    except Exception as capture_error:
-                        logger.warning(f"Failed to capture agent messages: {capture_error}", exc_info=True)
+                            
+                            # Determine message type
+                            msg_type = "agent_message"
+                            if hasattr(msg, 'cause_by'):
+                                cause_by = str(msg.cause_by) if msg.cause_by else ""
+                                if "AnalyzeTask" in cause_by or "DraftPlan" in cause_by:
+                                    msg_type = "planning"
+                                elif "WriteCode" in cause_by:
+                                    msg_type = "coding"
+                                elif "WriteTest" in cause_by:
+                                    msg_type = "testing"
+                                elif "ReviewCode" in cause_by:
+                                    msg_type = "review"
+                            
+                            # Buffer message; the batch inserts them in bulk
+                            await message_batch.add(
+                                workspace_id=task_obj.workspace_id,
+                                project_id=task_obj.project_id,
+                                agent_instance_id=agent_instance_id,
+                                direction=AgentMessageDirection.OUTBOUND,
+                                payload={
+                                    "type": msg_type,
+                                    "message_id": team.message_stream.message_id(msg),
+                                    "agent_name": agent_name,
+                                    "role": msg_role or "assistant",
+                                    "content": content,
+                                    "task_id": task_id,
+                                    "run_id": run_id,
+                                    "message": content[:200] + "..." if len(content) > 200 else content,
+                                },
+                                task_id=task_id,
+                                run_id=run_id,
+                            )
+                            logger.debug(f"Queued agent message from {agent_name}: {content[:50]}...")
+                        except Exception as msg_error:
+                            logger.warning(f"Failed to send agent message: {msg_error}", exc_info=True)
                 
-                # Track agent messages during execution
-                # MetaGPT stores messages in team.env.messages
-                initial_message_count = 0
-                if hasattr(team, 'env') and hasattr(team.env, 'messages'):
-                    initial_message_count = len(team.env.messages)
-                    logger.info(f"Initial message count: {initial_message_count}")
+                # Agent messages are pushed by the team as roles publish them
+                if (
+                    getattr(team, "message_stream", None) is not None
+                    and agent_instance_id and task_obj and self.session_factory
+                ):
+                    subscription = team.message_stream.subscribe()
+                    message_forwarder = asyncio.create_task(forward_agent_messages(subscription))
                 
                 # Create progress callback for real-time agent updates
                 async def agent_progress_callback(agent_name: str, status: str, message: str):
                     """Broadcast agent progress as WebSocket events."""
                     if agent_instance_id and task_obj and self.session_factory:
                         try:
-                            msg_session = await self.session_factory()
-                            try:
-                                message_bus = get_agent_message_bus()
-                                await message_bus.append(
-                                    msg_session,
-                                    workspace_id=task_obj.workspace_id,
-                                    project_id=task_obj.project_id,
-                                    agent_instance_id=agent_instance_id,
-                                    direction=AgentMessageDirection.OUTBOUND,
-                                    payload={
-                                        "type": "agent_progress",
-                                        "agent_name": agent_name,
-                                        "status": status,
-                                        "task_id": task_id,
-                                        "run_id": run_id,
-                                        "message": message,
-                                        "content": message,
-                                    },
-                                    task_id=task_id,
-                                    run_id=run_id,
-                                    broadcast=True,
-                                )
-                                await msg_session.commit()
-                            finally:
-                                await msg_session.close()
+                            await message_batch.add(
+                                workspace_id=task_obj.workspace_id,
+                                project_id=task_obj.project_id,
+                                agent_instance_id=agent_instance_id,
+                                direction=AgentMessageDirection.OUTBOUND,
+                                payload={
+                                    "type": "agent_progress",
+                                    "agent_name": agent_name,
+                                    "status": status,
+                                    "task_id": task_id,
+                                    "run_id": run_id,
+                                    "message": message,
+                                    "content": message,
+                                },
+                                task_id=task_id,
+                                run_id=run_id,
+                            )
                         except Exception as cb_error:
                             logger.warning(f"Failed to send agent progress: {cb_error}")
                 
                 # Execute task via team_provider which calls analyze_and_plan and execute
-                result = await self.team_provider.run_task(task_description)
+                result = await self.team_provider.run_task(task_description, team=team)
                 
-                # Capture agent messages from team execution
-                if hasattr(team, 'env') and hasattr(team.env, 'messages'):
-                    await capture_and_send_messages(team.env, initial_message_count)
+                # Forward whatever the team published last
+                if message_forwarder is not None:
+                    subscription.close()
+                    await message_forwarder
+                if message_batch is not None:
+                    # Persist buffered chatter before the completion message
+                    try:
+                        await message_batch.flush()
+                    except Exception as flush_error:
+                        logger.warning(f"Failed to flush agent messages: {flush_error}")
                 
                 # Send execution completed message
                 if agent_instance_id and task_obj and self.session_factory:
@@ -568,6 +578,18 @@ class TaskExecutor:
                             await msg_session.close()
                     except Exception as msg_error:
                         logger.warning(f"Failed to send error message: {msg_error}")
+            finally:
+                if subscription is not None:
+                    subscription.close()
+                if message_forwarder is not None and not message_forwarder.done():
+                    # Failed run: stop forwarding and wait so the task isn't destroyed mid-flight
+                    message_forwarder.cancel()
+                    try:
+                        await message_forwarder
+                    except asyncio.CancelledError:
+                        pass
+                if team is not None:
+                    await self.team_provider.release_team(team)
             
             # Phase 4.5: Git commit and push (if git was setup)
             if result and repo_dir and branch_name:
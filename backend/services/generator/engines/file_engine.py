@@ -1,17 +1,104 @@
 # -*- coding: utf-8 -*-
 """File generation engine for project templates."""
 
-import os
+import asyncio
+import hashlib
 import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+# Placeholder like {{PROJECT_NAME}}; conditional markers ({{#IF_X}}, {{/IF_X}}) are not placeholders
+_PLACEHOLDER_RE = re.compile(r"\{\{([^{}#/]+)\}\}")
+_CONDITIONAL_BLOCK_RE = re.compile(r'\{\{#IF_[^}]+\}\}.*?\{\{/IF_[^}]+\}\}', flags=re.DOTALL)
+
+# Placeholder -> (custom setting key, default)
+_COMMON_VARIABLES: Dict[str, Tuple[str, Any]] = {
+    "PROJECT_NAME": ("project_name", "my-project"),
+    "PROJECT_VERSION": ("version", "1.0.0"),
+    "DESCRIPTION": ("description", ""),
+    "AUTHOR": ("author", ""),
+    "PORT": ("port", 3000),
+    "NODE_ENV": ("node_env", "development"),
+    "DATABASE_URL": ("database_url", ""),
+    "LOG_LEVEL": ("log_level", "info"),
+    "API_PREFIX": ("api_prefix", "/api"),
+    "JWT_SECRET": ("jwt_secret", ""),
+    "CORS_ORIGIN": ("cors_origin", "*"),
+}
+
+_AUTH_IMPORTS = (
+    "import jwt from 'jsonwebtoken';",
+    "import bcrypt from 'bcrypt';",
+    "import { authenticate, requireAuth } from './middleware/auth';",
+)
+_DATABASE_IMPORTS = (
+    "import { sequelize } from './database/connection';",
+    "import { initializeModels } from './database/models';",
+)
+
+_COMPILED_CACHE_SIZE = 512
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """Template split once into literal text and the placeholders between it."""
+
+    literals: Tuple[str, ...]
+    names: Tuple[str, ...]
+
+    def render(self, values: Dict[str, str]) -> str:
+        """Render in a single pass; unknown placeholders are left as they are."""
+        parts = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            value = values.get(name)
+            parts.append(value if value is not None else "{{" + name + "}}")
+            parts.append(literal)
+        return "".join(parts)
+
+
+def compile_template(content: str, auth: bool = False, database: bool = False) -> CompiledTemplate:
+    """Resolve conditional blocks for the feature flags and split out placeholders."""
+    content = _resolve_conditionals(content, auth, database)
+    literals = []
+    names = []
+    position = 0
+    for match in _PLACEHOLDER_RE.finditer(content):
+        literals.append(content[position:match.start()])
+        names.append(match.group(1))
+        position = match.end()
+    literals.append(content[position:])
+    return CompiledTemplate(tuple(literals), tuple(names))
+
+
+def _resolve_conditionals(content: str, auth: bool, database: bool) -> str:
+    """Keep enabled single-import blocks and drop every other conditional block."""
+    enabled = []
+    if auth:
+        enabled.append(("AUTH", _AUTH_IMPORTS))
+    if database:
+        enabled.append(("DATABASE", _DATABASE_IMPORTS))
+
+    for feature, imports in enabled:
+        marker = f"{{{{#IF_{feature}}}}}"
+        for feature_import in imports:
+            if marker in content and feature_import not in content:
+                content = content.replace(f"{marker}{feature_import}\n{{{{/IF_{feature}}}}}", feature_import)
+
+    return _CONDITIONAL_BLOCK_RE.sub('', content)
 
 
 class FileEngine:
     """Handles generation of project files from templates."""
 
-    def __init__(self, templates_path: Optional[Path] = None):
+    def __init__(self, templates_path: Optional[Path] = None, concurrency: int = 16):
         self.templates_path = templates_path or Path(__file__).parent.parent / "templates"
+        self.concurrency = concurrency
+        self._compiled: "OrderedDict[Tuple[str, bool, bool], CompiledTemplate]" = OrderedDict()
+        # Files render in worker threads
+        self._compiled_lock = threading.Lock()
 
     async def generate_file(
         self,
@@ -21,22 +108,62 @@ class FileEngine:
         custom_settings: Dict[str, Any]
     ):
         """Generate a single file from a template."""
+        await asyncio.to_thread(
+            self._generate_file_sync,
+            project_path,
+            relative_path,
+            template_name,
+            custom_settings,
+            self._template_values(custom_settings),
+        )
+
+    async def generate_files(
+        self,
+        project_path: Path,
+        files: Dict[str, str],
+        custom_settings: Dict[str, Any]
+    ):
+        """Generate several files concurrently (relative path -> template name)."""
+        values = self._template_values(custom_settings)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _generate(relative_path: str, template_name: str):
+            async with semaphore:
+                await asyncio.to_thread(
+                    self._generate_file_sync,
+                    project_path,
+                    relative_path,
+                    template_name,
+                    custom_settings,
+                    values,
+                )
+
+        await asyncio.gather(*(_generate(path, name) for path, name in files.items()))
+
+    def _generate_file_sync(
+        self,
+        project_path: Path,
+        relative_path: str,
+        template_name: str,
+        custom_settings: Dict[str, Any],
+        values: Dict[str, str],
+    ):
         template_path = self._find_template(template_name)
-        
+
         if not template_path or not template_path.exists():
             raise FileNotFoundError(f"Template not found: {template_name}")
-        
+
         # Read template content
         with open(template_path, 'r') as f:
             template_content = f.read()
-        
+
         # Process template variables
-        processed_content = self._process_template(template_content, custom_settings)
-        
+        processed_content = self._render(template_content, custom_settings, values)
+
         # Create file in project
         target_path = project_path / relative_path
         target_path.parent.mkdir(parents=True, exist_ok=True)
-        
+
         with open(target_path, 'w') as f:
             f.write(processed_content)
 
@@ -48,80 +175,54 @@ class FileEngine:
                 template_path = template_dir / template_name
                 if template_path.exists():
                     return template_path
-        
+
         # If not found in subdirectories, check templates root
         template_path = self.templates_path / template_name
         if template_path.exists():
             return template_path
-            
+
         return None
 
     def _process_template(self, template_content: str, custom_settings: Dict[str, Any]) -> str:
-        """Process template variables and replace them with actual values."""
-        processed = template_content
-        
-        # Replace common variables
-        replacements = {
-            "{{PROJECT_NAME}}": custom_settings.get("project_name", "my-project"),
-            "{{PROJECT_VERSION}}": custom_settings.get("version", "1.0.0"),
-            "{{DESCRIPTION}}": custom_settings.get("description", ""),
-            "{{AUTHOR}}": custom_settings.get("author", ""),
-            "{{PORT}}": str(custom_settings.get("port", 3000)),
-            "{{NODE_ENV}}": custom_settings.get("node_env", "development"),
-            "{{DATABASE_URL}}": custom_settings.get("database_url", ""),
-            "{{LOG_LEVEL}}": custom_settings.get("log_level", "info"),
-            "{{API_PREFIX}}": custom_settings.get("api_prefix", "/api"),
-            "{{JWT_SECRET}}": custom_settings.get("jwt_secret", ""),
-            "{{CORS_ORIGIN}}": custom_settings.get("cors_origin", "*"),
+        """Process template variables and replace them with actual values.
+
+        Substituted values are inserted verbatim; they are not expanded again
+        or scanned for conditional markers.
+        """
+        return self._render(template_content, custom_settings, self._template_values(custom_settings))
+
+    def _render(self, template_content: str, custom_settings: Dict[str, Any], values: Dict[str, str]) -> str:
+        features = custom_settings.get("features", {})
+        compiled = self._get_compiled(
+            template_content,
+            bool(features.get("auth", False)),
+            bool(features.get("database", False)),
+        )
+        return compiled.render(values)
+
+    def _get_compiled(self, template_content: str, auth: bool, database: bool) -> CompiledTemplate:
+        """Return the compiled template, cached by content hash and feature flags."""
+        key = (hashlib.sha256(template_content.encode()).hexdigest(), auth, database)
+        with self._compiled_lock:
+            compiled = self._compiled.get(key)
+            if compiled is not None:
+                self._compiled.move_to_end(key)
+                return compiled
+
+        compiled = compile_template(template_content, auth, database)
+        with self._compiled_lock:
+            self._compiled[key] = compiled
+            if len(self._compiled) > _COMPILED_CACHE_SIZE:
+                self._compiled.popitem(last=False)
+        return compiled
+
+    @staticmethod
+    def _template_values(custom_settings: Dict[str, Any]) -> Dict[str, str]:
+        """Placeholder name -> value; common variables win over raw custom settings."""
+        values = {
+            name: str(custom_settings.get(key, default))
+            for name, (key, default) in _COMMON_VARIABLES.items()
         }
-        
-        for placeholder, value in replacements.items():
-            processed = processed.replace(placeholder, str(value))
-        
-        # Replace custom settings
         for key, value in custom_settings.items():
-            placeholder = f"{{{{{key.upper()}}}}}"
-            processed = processed.replace(placeholder, str(value))
-        
-        # Process conditional blocks
-        processed = self._process_conditionals(processed, custom_settings)
-        
-        return processed
-
-    def _process_conditionals(self, content: str, custom_settings: Dict[str, Any]) -> str:
-        """Process conditional blocks in templates."""
-        # Simple conditional processing for common patterns
-        
-        # Authentication feature
-        if custom_settings.get("features", {}).get("auth", False):
-            auth_imports = [
-                "import jwt from 'jsonwebtoken';",
-                "import bcrypt from 'bcrypt';",
-                "import { authenticate, requireAuth } from './middleware/auth';"
-            ]
-            
-            for auth_import in auth_imports:
-                if "{{#IF_AUTH}}" in content and auth_import not in content:
-                    content = content.replace(
-                        "{{#IF_AUTH}}" + auth_import + "\n{{/IF_AUTH}}",
-                        auth_import
-                    )
-        
-        # Database feature
-        if custom_settings.get("features", {}).get("database", False):
-            db_imports = [
-                "import { sequelize } from './database/connection';",
-                "import { initializeModels } from './database/models';"
-            ]
-            
-            for db_import in db_imports:
-                if "{{#IF_DATABASE}}" in content and db_import not in content:
-                    content = content.replace(
-                        "{{#IF_DATABASE}}" + db_import + "\n{{/IF_DATABASE}}",
-                        db_import
-                    )
-        
-        # Remove unused conditional blocks
-        content = re.sub(r'\{\{#IF_[^}]+\}\}.*?\{\{/IF_[^}]+\}\}', '', content, flags=re.DOTALL)
-        
-        return content
\ No newline at end of file
+            values.setdefault(key.upper(), str(value))
+        return values
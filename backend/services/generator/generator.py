@@ -213,13 +213,7 @@ class ProjectGenerator:
         manifest = template["manifest"]
         files = manifest.get("files", {})
         
-        for relative_path, template_file in files.items():
-            await self.file_engine.generate_file(
-                project_path,
-                relative_path,
-                template_file,
-                custom_settings
-            )
+        await self.file_engine.generate_files(project_path, files, custom_settings)
 
     async def _generate_env_files(
         self,
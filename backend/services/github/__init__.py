@@ -3,6 +3,7 @@
 
 from .webhook_validator import WebhookValidator, WebhookValidationError
 from .webhook_processor import WebhookProcessor
+from .api_client import GitHubAPIClient, GitHubAPIError, get_github_api_client
 from .pr_manager import PRManager, get_pr_manager
 from .issues_manager import IssuesManager, get_issues_manager
 from .activity_feed import ActivityFeed, get_activity_feed
@@ -13,6 +14,9 @@ __all__ = [
     "WebhookValidator",
     "WebhookValidationError",
     "WebhookProcessor",
+    "GitHubAPIClient",
+    "GitHubAPIError",
+    "get_github_api_client",
     "PRManager",
     "get_pr_manager",
     "IssuesManager",
@@ -11,6 +11,12 @@ from dataclasses import dataclass, field
 from datetime import datetime
 
 from backend.services.git import GitService, get_git_service
+from backend.services.github.api_client import (
+    GitHubAPIClient,
+    GitHubAPIError,
+    get_github_api_client,
+    iso_timestamp,
+)
 from backend.services.github.pr_manager import PRManager, get_pr_manager
 from backend.services.github.issues_manager import IssuesManager, get_issues_manager
 
@@ -38,6 +44,7 @@ class ActivityFeed:
         git_service: Optional[GitService] = None,
         pr_manager: Optional[PRManager] = None,
         issues_manager: Optional[IssuesManager] = None,
+        api_client: Optional[GitHubAPIClient] = None,
     ):
         """
         Initialize Activity feed.
@@ -46,18 +53,12 @@ class ActivityFeed:
             git_service: Git service instance
             pr_manager: PR manager instance
             issues_manager: Issues manager instance
+            api_client: Caching GitHub API client instance
         """
         self._git_service = git_service or get_git_service()
         self._pr_manager = pr_manager or get_pr_manager()
         self._issues_manager = issues_manager or get_issues_manager()
-    
-    def _get_github_api(self, installation_id: Optional[int] = None, token_override: Optional[str] = None):
-        """Get GitHub API instance."""
-        from github import Github
-        from github.GithubException import GithubException
-        
-        token = self._git_service._resolve_token(installation_id=installation_id, token_override=token_override)
-        return Github(login_or_token=token), GithubException
+        self._api_client = api_client or get_github_api_client()
     
     async def get_commit_history(
         self,
@@ -80,40 +81,39 @@ class ActivityFeed:
         Returns:
             List of commit activity events
         """
-        def _get_commits():
-            gh, GithubException = self._get_github_api(installation_id, token_override)
-            try:
-                repo = gh.get_repo(repo_full_name)
-                branch_ref = repo.get_branch(branch)
-                commits = repo.get_commits(sha=branch_ref.commit.sha)
-                
-                result = []
-                count = 0
-                for commit in commits:
-                    if count >= limit:
-                        break
-                    
-                    result.append(ActivityEvent(
-                        id=f"commit_{commit.sha}",
-                        type="commit",
-                        timestamp=commit.commit.author.date.isoformat() if commit.commit.author.date else "",
-                        actor=commit.commit.author.name if commit.commit.author else None,
-                        title=commit.commit.message.split("\n")[0] if commit.commit.message else None,
-                        body=commit.commit.message,
-                        url=commit.html_url,
-                        metadata={
-                            "sha": commit.sha,
-                            "branch": branch,
-                        },
-                    ))
-                    count += 1
-                
-                return result
-            except GithubException as e:
-                logger.error(f"Error getting commit history: {e}")
-                raise
+        token = await asyncio.to_thread(
+            self._git_service._resolve_token, installation_id=installation_id, token_override=token_override
+        )
+        try:
+            commits = await self._api_client.get_paginated(
+                f"/repos/{repo_full_name}/commits",
+                token=token,
+                params={"sha": branch},
+                limit=limit,
+            )
+        except GitHubAPIError as e:
+            logger.error(f"Error getting commit history: {e}")
+            raise
         
-        return await asyncio.to_thread(_get_commits)
+        result = []
+        for commit in commits:
+            detail = commit.get("commit") or {}
+            author = detail.get("author") or {}
+            message = detail.get("message")
+            result.append(ActivityEvent(
+                id=f"commit_{commit['sha']}",
+                type="commit",
+                timestamp=iso_timestamp(author.get("date")) or "",
+                actor=author.get("name"),
+                title=message.split("\n")[0] if message else None,
+                body=message,
+                url=commit.get("html_url"),
+                metadata={
+                    "sha": commit["sha"],
+                    "branch": branch,
+                },
+            ))
+        return result
     
     async def get_activity_feed(
         self,
@@ -172,6 +172,7 @@ class ActivityFeed:
             state="all",
             installation_id=installation_id,
             token_override=token_override,
+            limit=limit,
         )
         
         events = []
@@ -207,6 +208,7 @@ class ActivityFeed:
             state="all",
             installation_id=installation_id,
             token_override=token_override,
+            limit=limit,
         )
         
         events = []
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""Async GitHub REST client with conditional-request caching.
+
+Read paths of the GitHub services go through this client instead of
+PyGithub. Every successful GET stores the response's ``ETag`` and
+``Last-Modified`` values. Later lookups of the same URL and token are
+revalidated with ``If-None-Match`` / ``If-Modified-Since``; a ``304 Not
+Modified`` reply is served from the cache and does not count against the
+GitHub rate limit. Concurrent identical lookups share one upstream request.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import httpx
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+_NEXT_LINK_RE = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+CacheKey = Tuple[str, str]
+
+
+class GitHubAPIError(Exception):
+    """Raised when the GitHub API answers with an error status."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"GitHub API error {status_code}: {message}")
+        self.status_code = status_code
+
+
+@dataclass
+class _CachedResponse:
+    """Validators and decoded body of a cached GET."""
+    data: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    next_url: Optional[str]
+
+
+def iso_timestamp(value: Optional[str]) -> Optional[str]:
+    """Normalize a GitHub timestamp (``...Z``) to ``datetime.isoformat()`` output."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).isoformat()
+    except ValueError:
+        return value
+
+
+class GitHubAPIClient:
+    """Caching, request-collapsing GitHub REST client."""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        timeout: float = 15.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            base_url: API root (defaults to ``settings.github_api_url``)
+            max_entries: Maximum cached responses, least recently used evicted first
+            timeout: Request timeout in seconds
+            transport: Custom httpx transport (for testing)
+        """
+        self.base_url = (base_url or settings.github_api_url).rstrip("/")
+        self.max_entries = max_entries if max_entries is not None else settings.github_api_cache_entries
+        self._timeout = timeout
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._cache: "OrderedDict[CacheKey, _CachedResponse]" = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self._stats = {"requests": 0, "not_modified": 0, "collapsed": 0}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                transport=self._transport,
+                headers={
+                    "Accept": "application/vnd.github+json",
+                    "X-GitHub-Api-Version": "2022-11-28",
+                },
+            )
+        return self._client
+
+    def _url(self, path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        url = path if path.startswith("http") else f"{self.base_url}/{path.lstrip('/')}"
+        if params:
+            url = f"{url}?{urlencode(sorted(params.items()))}"
+        return url
+
+    async def get_json(self, path: str, *, token: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        GET a JSON resource, revalidating any cached copy.
+
+        Args:
+            path: API path (``/repos/...``) or absolute URL
+            token: GitHub token used for the request
+            params: Query parameters
+
+        Returns:
+            Decoded JSON body
+        """
+        response = await self._get(self._url(path, params), token)
+        return response.data
+
+    async def get_paginated(
+        self,
+        path: str,
+        *,
+        token: str,
+        params: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        keep: Optional[Callable[[Any], bool]] = None,
+    ) -> List[Any]:
+        """
+        GET a list resource, following ``Link: rel="next"`` pages.
+
+        Each page is cached and revalidated on its own. Items rejected by
+        ``keep`` are skipped; stops once ``limit`` items are collected.
+        """
+        params = dict(params or {})
+        params.setdefault("per_page", min(limit, 100) if limit else 100)
+        url: Optional[str] = self._url(path, params)
+        items: List[Any] = []
+        while url:
+            page = await self._get(url, token)
+            page_items = page.data or []
+            items.extend(page_items if keep is None else [item for item in page_items if keep(item)])
+            if limit is not None and len(items) >= limit:
+                return items[:limit]
+            url = page.next_url
+        return items
+
+    async def _get(self, url: str, token: str) -> _CachedResponse:
+        key = (hashlib.sha256(token.encode()).hexdigest()[:16], url)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._stats["collapsed"] += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._fetch(key, url, token)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Waiters re-raise it; mark retrieved so an unawaited future does not warn
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    async def _fetch(self, key: CacheKey, url: str, token: str) -> _CachedResponse:
+        cached = self._cache.get(key)
+        headers = {"Authorization": f"Bearer {token}"}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        self._stats["requests"] += 1
+        response = await self._get_client().get(url, headers=headers)
+
+        if response.status_code == 304 and cached is not None:
+            self._stats["not_modified"] += 1
+            self._cache.move_to_end(key)
+            return cached
+
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            raise GitHubAPIError(response.status_code, message)
+
+        match = _NEXT_LINK_RE.search(response.headers.get("Link", ""))
+        entry = _CachedResponse(
+            data=response.json(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            next_url=match.group(1) if match else None,
+        )
+        if entry.etag or entry.last_modified:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.pop(key, None)
+        return entry
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Request counters and cache size."""
+        return {**self._stats, "cached": len(self._cache)}
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_github_api_client: Optional[GitHubAPIClient] = None
+
+
+def get_github_api_client() -> GitHubAPIClient:
+    """Get GitHub API client instance."""
+    global _github_api_client
+    if _github_api_client is None:
+        _github_api_client = GitHubAPIClient()
+    return _github_api_client
+
+
+def set_github_api_client(client: Optional[GitHubAPIClient]) -> None:
+    """Set GitHub API client instance (for testing)."""
+    global _github_api_client
+    _github_api_client = client
+
+
+__all__ = [
+    "GitHubAPIClient",
+    "GitHubAPIError",
+    "iso_timestamp",
+    "get_github_api_client",
+    "set_github_api_client",
+]
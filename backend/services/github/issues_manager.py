@@ -7,6 +7,12 @@ from typing import List, Optional, Dict, Any
 from dataclasses import dataclass, field
 
 from backend.services.git import GitService, get_git_service
+from backend.services.github.api_client import (
+    GitHubAPIClient,
+    GitHubAPIError,
+    get_github_api_client,
+    iso_timestamp,
+)
 from backend.config import settings
 
 logger = logging.getLogger(__name__)
@@ -39,17 +45,41 @@ class IssueComment:
     updated_at: Optional[str] = None
 
 
+def _issue_from_json(issue: Dict[str, Any]) -> IssueInfo:
+    """Build IssueInfo from a GitHub REST issue payload."""
+    return IssueInfo(
+        number=issue["number"],
+        title=issue.get("title") or "",
+        body=issue.get("body") or "",
+        state=issue.get("state") or "",
+        html_url=issue.get("html_url") or "",
+        created_at=iso_timestamp(issue.get("created_at")) or "",
+        updated_at=iso_timestamp(issue.get("updated_at")) or "",
+        closed_at=iso_timestamp(issue.get("closed_at")),
+        author=(issue.get("user") or {}).get("login"),
+        labels=[label["name"] for label in issue.get("labels") or []],
+        assignees=[assignee["login"] for assignee in issue.get("assignees") or []],
+        comment_count=issue.get("comments") or 0,
+    )
+
+
 class IssuesManager:
     """Manages GitHub Issues."""
     
-    def __init__(self, git_service: Optional[GitService] = None):
+    def __init__(
+        self,
+        git_service: Optional[GitService] = None,
+        api_client: Optional[GitHubAPIClient] = None,
+    ):
         """
         Initialize Issues manager.
         
         Args:
             git_service: Git service instance (uses default if not provided)
+            api_client: Caching GitHub API client for read calls (uses default if not provided)
         """
         self._git_service = git_service or get_git_service()
+        self._api_client = api_client or get_github_api_client()
     
     def _get_github_api(self, installation_id: Optional[int] = None, token_override: Optional[str] = None):
         """Get GitHub API instance."""
@@ -59,12 +89,19 @@ class IssuesManager:
         token = self._git_service._resolve_token(installation_id=installation_id, token_override=token_override)
         return Github(login_or_token=token), GithubException
     
+    async def _resolve_token(self, installation_id: Optional[int], token_override: Optional[str]) -> str:
+        """Resolve the API token (may request an installation token)."""
+        return await asyncio.to_thread(
+            self._git_service._resolve_token, installation_id=installation_id, token_override=token_override
+        )
+    
     async def list_issues(
         self,
         repo_full_name: str,
         state: str = "open",  # open, closed, all
         installation_id: Optional[int] = None,
         token_override: Optional[str] = None,
+        limit: Optional[int] = None,
     ) -> List[IssueInfo]:
         """
         List issues for a repository.
@@ -74,44 +111,25 @@ class IssuesManager:
             state: Issue state filter (open, closed, all)
             installation_id: GitHub App installation ID
             token_override: Override token
+            limit: Maximum number of issues (most recently updated first)
         
         Returns:
             List of issue info
         """
-        def _list_issues():
-            gh, GithubException = self._get_github_api(installation_id, token_override)
-            try:
-                repo = gh.get_repo(repo_full_name)
-                issues = repo.get_issues(state=state, sort="updated", direction="desc")
-                
-                result = []
-                for issue in issues:
-                    # Skip pull requests (they have pull_request attribute)
-                    if hasattr(issue, 'pull_request') and issue.pull_request:
-                        continue
-                    
-                    labels = [label.name for label in issue.labels] if issue.labels else []
-                    assignees = [assignee.login for assignee in issue.assignees] if issue.assignees else []
-                    result.append(IssueInfo(
-                        number=issue.number,
-                        title=issue.title,
-                        body=issue.body or "",
-                        state=issue.state,
-                        html_url=issue.html_url,
-                        created_at=issue.created_at.isoformat() if issue.created_at else "",
-                        updated_at=issue.updated_at.isoformat() if issue.updated_at else "",
-                        closed_at=issue.closed_at.isoformat() if issue.closed_at else None,
-                        author=issue.user.login if issue.user else None,
-                        labels=labels,
-                        assignees=assignees,
-                        comment_count=issue.comments,
-                    ))
-                return result
-            except GithubException as e:
-                logger.error(f"Error listing issues: {e}")
-                raise
-        
-        return await asyncio.to_thread(_list_issues)
+        token = await self._resolve_token(installation_id, token_override)
+        try:
+            issues = await self._api_client.get_paginated(
+                f"/repos/{repo_full_name}/issues",
+                token=token,
+                params={"state": state, "sort": "updated", "direction": "desc"},
+                limit=limit,
+                # Skip pull requests (the issues endpoint returns them too)
+                keep=lambda issue: not issue.get("pull_request"),
+            )
+        except GitHubAPIError as e:
+            logger.error(f"Error listing issues: {e}")
+            raise
+        return [_issue_from_json(issue) for issue in issues]
     
     async def get_issue(
         self,
@@ -132,33 +150,13 @@ class IssuesManager:
         Returns:
             Issue info
         """
-        def _get_issue():
-            gh, GithubException = self._get_github_api(installation_id, token_override)
-            try:
-                repo = gh.get_repo(repo_full_name)
-                issue = repo.get_issue(issue_number)
-                
-                labels = [label.name for label in issue.labels] if issue.labels else []
-                assignees = [assignee.login for assignee in issue.assignees] if issue.assignees else []
-                return IssueInfo(
-                    number=issue.number,
-                    title=issue.title,
-                    body=issue.body or "",
-                    state=issue.state,
-                    html_url=issue.html_url,
-                    created_at=issue.created_at.isoformat() if issue.created_at else "",
-                    updated_at=issue.updated_at.isoformat() if issue.updated_at else "",
-                    closed_at=issue.closed_at.isoformat() if issue.closed_at else None,
-                    author=issue.user.login if issue.user else None,
-                    labels=labels,
-                    assignees=assignees,
-                    comment_count=issue.comments,
-                )
-            except GithubException as e:
-                logger.error(f"Error getting issue {issue_number}: {e}")
-                raise
-        
-        return await asyncio.to_thread(_get_issue)
+        token = await self._resolve_token(installation_id, token_override)
+        try:
+            issue = await self._api_client.get_json(f"/repos/{repo_full_name}/issues/{issue_number}", token=token)
+        except GitHubAPIError as e:
+            logger.error(f"Error getting issue {issue_number}: {e}")
+            raise
+        return _issue_from_json(issue)
     
     async def create_issue(
         self,
@@ -379,28 +377,24 @@ class IssuesManager:
         Returns:
             List of comments
         """
-        def _list_comments():
-            gh, GithubException = self._get_github_api(installation_id, token_override)
-            try:
-                repo = gh.get_repo(repo_full_name)
-                issue = repo.get_issue(issue_number)
-                
-                comments = issue.get_comments()
-                result = []
-                for comment in comments:
-                    result.append(IssueComment(
-                        id=comment.id,
-                        body=comment.body,
-                        author=comment.user.login if comment.user else None,
-                        created_at=comment.created_at.isoformat() if comment.created_at else "",
-                        updated_at=comment.updated_at.isoformat() if comment.updated_at else None,
-                    ))
-                return result
-            except GithubException as e:
-                logger.error(f"Error listing comments for issue {issue_number}: {e}")
-                raise
-        
-        return await asyncio.to_thread(_list_comments)
+        token = await self._resolve_token(installation_id, token_override)
+        try:
+            comments = await self._api_client.get_paginated(
+                f"/repos/{repo_full_name}/issues/{issue_number}/comments", token=token
+            )
+        except GitHubAPIError as e:
+            logger.error(f"Error listing comments for issue {issue_number}: {e}")
+            raise
+        return [
+            IssueComment(
+                id=comment["id"],
+                body=comment.get("body"),
+                author=(comment.get("user") or {}).get("login"),
+                created_at=iso_timestamp(comment.get("created_at")) or "",
+                updated_at=iso_timestamp(comment.get("updated_at")),
+            )
+            for comment in comments
+        ]
 
 
 _issues_manager: Optional[IssuesManager] = None
@@ -7,6 +7,12 @@ from typing import List, Optional, Dict, Any
 from dataclasses import dataclass, field
 
 from backend.services.git import GitService, get_git_service
+from backend.services.github.api_client import (
+    GitHubAPIClient,
+    GitHubAPIError,
+    get_github_api_client,
+    iso_timestamp,
+)
 from backend.config import settings
 
 logger = logging.getLogger(__name__)
@@ -56,17 +62,49 @@ class PRComment:
     line: Optional[int] = None  # Line number for inline comments
 
 
+def _pr_from_json(pr: Dict[str, Any], review_count: int = 0) -> PullRequestInfo:
+    """Build PullRequestInfo from a GitHub REST pull request payload."""
+    head = pr.get("head") or {}
+    base = pr.get("base") or {}
+    return PullRequestInfo(
+        number=pr["number"],
+        title=pr.get("title") or "",
+        body=pr.get("body") or "",
+        state=pr.get("state") or "",
+        head_branch=head.get("ref") or "",
+        base_branch=base.get("ref") or "",
+        head_sha=head.get("sha") or "",
+        base_sha=base.get("sha") or "",
+        html_url=pr.get("html_url") or "",
+        created_at=iso_timestamp(pr.get("created_at")) or "",
+        updated_at=iso_timestamp(pr.get("updated_at")) or "",
+        merged_at=iso_timestamp(pr.get("merged_at")),
+        mergeable=pr.get("mergeable"),
+        mergeable_state=pr.get("mergeable_state"),
+        author=(pr.get("user") or {}).get("login"),
+        labels=[label["name"] for label in pr.get("labels") or []],
+        review_count=review_count,
+        comment_count=pr.get("comments") or 0,
+    )
+
+
 class PRManager:
     """Manages GitHub Pull Requests."""
     
-    def __init__(self, git_service: Optional[GitService] = None):
+    def __init__(
+        self,
+        git_service: Optional[GitService] = None,
+        api_client: Optional[GitHubAPIClient] = None,
+    ):
         """
         Initialize PR manager.
         
         Args:
             git_service: Git service instance (uses default if not provided)
+            api_client: Caching GitHub API client for read calls (uses default if not provided)
         """
         self._git_service = git_service or get_git_service()
+        self._api_client = api_client or get_github_api_client()
     
     def _get_github_api(self, installation_id: Optional[int] = None, token_override: Optional[str] = None):
         """Get GitHub API instance."""
@@ -77,60 +115,48 @@ class PRManager:
         token = self._git_service._resolve_token(installation_id=installation_id, token_override=token_override)
         return Github(login_or_token=token), GithubException
     
+    async def _resolve_token(self, installation_id: Optional[int], token_override: Optional[str]) -> str:
+        """Resolve the API token (may request an installation token)."""
+        return await asyncio.to_thread(
+            self._git_service._resolve_token, installation_id=installation_id, token_override=token_override
+        )
+    
     async def list_pull_requests(
         self,
         repo_full_name: str,
         state: str = "open",  # open, closed, all
         installation_id: Optional[int] = None,
         token_override: Optional[str] = None,
+        limit: Optional[int] = None,
     ) -> List[PullRequestInfo]:
         """
         List pull requests for a repository.
         
+        The list payload carries no mergeability or review/comment counts;
+        use ``get_pull_request`` for those.
+        
         Args:
             repo_full_name: Repository full name (owner/repo)
             state: PR state filter (open, closed, all)
             installation_id: GitHub App installation ID
             token_override: Override token
+            limit: Maximum number of PRs (most recently updated first)
         
         Returns:
             List of pull request info
         """
-        def _list_prs():
-            gh, GithubException = self._get_github_api(installation_id, token_override)
-            try:
-                repo = gh.get_repo(repo_full_name)
-                prs = repo.get_pulls(state=state, sort="updated", direction="desc")
-                
-                result = []
-                for pr in prs:
-                    labels = [label.name for label in pr.labels] if pr.labels else []
-                    result.append(PullRequestInfo(
-                        number=pr.number,
-                        title=pr.title,
-                        body=pr.body or "",
-                        state=pr.state,
-                        head_branch=pr.head.ref,
-                        base_branch=pr.base.ref,
-                        head_sha=pr.head.sha,
-                        base_sha=pr.base.sha,
-                        html_url=pr.html_url,
-                        created_at=pr.created_at.isoformat() if pr.created_at else "",
-                        updated_at=pr.updated_at.isoformat() if pr.updated_at else "",
-                        merged_at=pr.merged_at.isoformat() if pr.merged_at else None,
-                        mergeable=pr.mergeable,
-                        mergeable_state=pr.mergeable_state,
-                        author=pr.user.login if pr.user else None,
-                        labels=labels,
-                        review_count=pr.reviews.totalCount if hasattr(pr.reviews, 'totalCount') else 0,
-                        comment_count=pr.comments if isinstance(pr.comments, int) else 0,
-                    ))
-                return result
-            except GithubException as e:
-                logger.error(f"Error listing PRs: {e}")
-                raise
-        
-        return await asyncio.to_thread(_list_prs)
+        token = await self._resolve_token(installation_id, token_override)
+        try:
+            prs = await self._api_client.get_paginated(
+                f"/repos/{repo_full_name}/pulls",
+                token=token,
+                params={"state": state, "sort": "updated", "direction": "desc"},
+                limit=limit,
+            )
+        except GitHubAPIError as e:
+            logger.error(f"Error listing PRs: {e}")
+            raise
+        return [_pr_from_json(pr) for pr in prs]
     
     async def get_pull_request(
         self,
@@ -151,38 +177,16 @@ class PRManager:
         Returns:
             Pull request info
         """
-        def _get_pr():
-            gh, GithubException = self._get_github_api(installation_id, token_override)
-            try:
-                repo = gh.get_repo(repo_full_name)
-                pr = repo.get_pull(pr_number)
-                
-                labels = [label.name for label in pr.labels] if pr.labels else []
-                return PullRequestInfo(
-                    number=pr.number,
-                    title=pr.title,
-                    body=pr.body or "",
-                    state=pr.state,
-                    head_branch=pr.head.ref,
-                    base_branch=pr.base.ref,
-                    head_sha=pr.head.sha,
-                    base_sha=pr.base.sha,
-                    html_url=pr.html_url,
-                    created_at=pr.created_at.isoformat() if pr.created_at else "",
-                    updated_at=pr.updated_at.isoformat() if pr.updated_at else "",
-                    merged_at=pr.merged_at.isoformat() if pr.merged_at else None,
-                    mergeable=pr.mergeable,
-                    mergeable_state=pr.mergeable_state,
-                    author=pr.user.login if pr.user else None,
-                    labels=labels,
-                    review_count=pr.reviews.totalCount if hasattr(pr.reviews, 'totalCount') else 0,
-                    comment_count=pr.comments if isinstance(pr.comments, int) else 0,
-                )
-            except GithubException as e:
-                logger.error(f"Error getting PR {pr_number}: {e}")
-                raise
-        
-        return await asyncio.to_thread(_get_pr)
+        token = await self._resolve_token(installation_id, token_override)
+        try:
+            pr, reviews = await asyncio.gather(
+                self._api_client.get_json(f"/repos/{repo_full_name}/pulls/{pr_number}", token=token),
+                self._api_client.get_paginated(f"/repos/{repo_full_name}/pulls/{pr_number}/reviews", token=token),
+            )
+        except GitHubAPIError as e:
+            logger.error(f"Error getting PR {pr_number}: {e}")
+            raise
+        return _pr_from_json(pr, review_count=len(reviews))
     
     async def merge_pull_request(
         self,
@@ -343,28 +347,24 @@ class PRManager:
         Returns:
             List of reviews
         """
-        def _list_reviews():
-            gh, GithubException = self._get_github_api(installation_id, token_override)
-            try:
-                repo = gh.get_repo(repo_full_name)
-                pr = repo.get_pull(pr_number)
-                
-                reviews = pr.get_reviews()
-                result = []
-                for review in reviews:
-                    result.append(PRReview(
-                        id=review.id,
-                        state=review.state,
-                        body=review.body,
-                        author=review.user.login if review.user else None,
-                        submitted_at=review.submitted_at.isoformat() if review.submitted_at else "",
-                    ))
-                return result
-            except GithubException as e:
-                logger.error(f"Error listing reviews for PR {pr_number}: {e}")
-                raise
-        
-        return await asyncio.to_thread(_list_reviews)
+        token = await self._resolve_token(installation_id, token_override)
+        try:
+            reviews = await self._api_client.get_paginated(
+                f"/repos/{repo_full_name}/pulls/{pr_number}/reviews", token=token
+            )
+        except GitHubAPIError as e:
+            logger.error(f"Error listing reviews for PR {pr_number}: {e}")
+            raise
+        return [
+            PRReview(
+                id=review["id"],
+                state=review.get("state"),
+                body=review.get("body"),
+                author=(review.get("user") or {}).get("login"),
+                submitted_at=iso_timestamp(review.get("submitted_at")) or "",
+            )
+            for review in reviews
+        ]
     
     async def list_comments(
         self,
@@ -385,27 +385,23 @@ class PRManager:
         Returns:
             List of comments
         """
-        def _list_comments():
-            gh, GithubException = self._get_github_api(installation_id, token_override)
-            try:
-                repo = gh.get_repo(repo_full_name)
-                issue = repo.get_issue(pr_number)
-                
-                comments = issue.get_comments()
-                result = []
-                for comment in comments:
-                    result.append(PRComment(
-                        id=comment.id,
-                        body=comment.body,
-                        author=comment.user.login if comment.user else None,
-                        created_at=comment.created_at.isoformat() if comment.created_at else "",
-                    ))
-                return result
-            except GithubException as e:
-                logger.error(f"Error listing comments for PR {pr_number}: {e}")
-                raise
-        
-        return await asyncio.to_thread(_list_comments)
+        token = await self._resolve_token(installation_id, token_override)
+        try:
+            comments = await self._api_client.get_paginated(
+                f"/repos/{repo_full_name}/issues/{pr_number}/comments", token=token
+            )
+        except GitHubAPIError as e:
+            logger.error(f"Error listing comments for PR {pr_number}: {e}")
+            raise
+        return [
+            PRComment(
+                id=comment["id"],
+                body=comment.get("body"),
+                author=(comment.get("user") or {}).get("login"),
+                created_at=iso_timestamp(comment.get("created_at")) or "",
+            )
+            for comment in comments
+        ]
 
 
 _pr_manager: Optional[PRManager] = None
@@ -2,6 +2,7 @@
 """Main LLM service integrating providers, routing, and cost tracking."""
 
 import logging
+import time
 from datetime import datetime, timezone
 from typing import AsyncIterator, Dict, List, Optional
 
@@ -10,6 +11,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from backend.config import settings
 from backend.services.cost.llm_tracker import LLMCostTracker
 from backend.services.llm.prompt_optimizer import get_prompt_optimizer
+from backend.services.metrics_registry import (
+    LLM_REQUEST_DURATION,
+    LLM_TOKENS,
+    PROVIDER_HTTP_RESPONSES,
+    PROVIDER_REQUESTS,
+)
 
 from mgx_observability import (
     ObservabilityConfig,
@@ -21,7 +28,15 @@ from mgx_observability import (
     start_span,
 )
 
-from .provider import LLMProvider, LLMResponse, AllProvidersFailedError, ProviderError
+from .provider import (
+    LLMProvider,
+    LLMResponse,
+    AllProvidersFailedError,
+    AuthenticationError,
+    ModelNotFoundError,
+    ProviderError,
+    RateLimitError,
+)
 from .router import LLMRouter, RoutingStrategy
 from .providers import (
     OpenAIProvider,
@@ -36,6 +51,23 @@ from .providers import (
 logger = logging.getLogger(__name__)
 
 
+def _provider_http_status(exc: BaseException) -> Optional[int]:
+    """HTTP status behind a provider failure, if one can be told."""
+    if isinstance(exc, RateLimitError):
+        return 429
+    if isinstance(exc, AuthenticationError):
+        return 401
+    if isinstance(exc, ModelNotFoundError):
+        return 404
+    for candidate in (exc, exc.__cause__):
+        status = getattr(candidate, "status_code", None)
+        if status is None:
+            status = getattr(getattr(candidate, "response", None), "status_code", None)
+        if isinstance(status, int):
+            return status
+    return None
+
+
 class LLMService:
     """
     Main LLM service facade.
@@ -316,6 +348,7 @@ class LLMService:
                 },
             ) as span:
                 started_at = datetime.now(timezone.utc)
+                started = time.perf_counter()
 
                 try:
                     response = await provider_instance.generate(
@@ -334,6 +367,11 @@ class LLMService:
                         latency_ms=0,
                         cost_usd=0.0,
                     )
+                    PROVIDER_REQUESTS.inc(provider=provider, model=model, result="failure")
+                    LLM_REQUEST_DURATION.observe(time.perf_counter() - started, provider=provider)
+                    status = _provider_http_status(e)
+                    if status is not None:
+                        PROVIDER_HTTP_RESPONSES.inc(provider=provider, status=status)
 
                     record_exception(span, e)
                     set_span_attributes(span, {"llm.success": False})
@@ -368,6 +406,10 @@ class LLMService:
                     latency_ms=response.latency_ms,
                     cost_usd=response.cost_usd,
                 )
+                PROVIDER_REQUESTS.inc(provider=provider, model=model, result="success")
+                LLM_REQUEST_DURATION.observe(time.perf_counter() - started, provider=provider)
+                LLM_TOKENS.inc(response.tokens_prompt or 0, provider=provider, kind="prompt")
+                LLM_TOKENS.inc(response.tokens_completion or 0, provider=provider, kind="completion")
 
                 set_span_attributes(
                     span,
@@ -0,0 +1,430 @@
+# -*- coding: utf-8 -*-
+"""backend.services.metrics_registry
+
+In-process Prometheus/OpenMetrics metrics.
+
+Counters and histograms are sharded per thread: each thread only ever writes
+its own shard (a plain dict), so recording a sample takes no lock; a lock is
+taken once per thread to register its shard. A scrape merges the shards.
+Histograms use fixed buckets, so recording is a bisect plus one increment.
+
+Values are per worker process. With several uvicorn workers each one serves
+its own ``/metrics``; let Prometheus scrape every worker (or sum by instance).
+
+Usage:
+    from backend.services.metrics_registry import TASK_RUNS
+
+    TASK_RUNS.inc(result="completed", provider="openai")
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+LabelKey = Tuple[str, ...]
+GaugeCallback = Callable[[], Union[float, Dict[LabelKey, float]]]
+
+# Seconds; covers fast queries through slow LLM calls
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+class _Shards:
+    """Per-thread dicts; writers never share one."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[dict] = []
+
+    def mine(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def all(self) -> List[dict]:
+        with self._lock:
+            shards = list(self._shards)
+        # dict.copy() is atomic under the GIL
+        return [shard.copy() for shard in shards]
+
+    def clear(self) -> None:
+        with self._lock:
+            for shard in self._shards:
+                shard.clear()
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, object]) -> LabelKey:
+        if not self.labelnames:
+            return ()
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> Iterable[Tuple[str, LabelKey, float, Tuple[Tuple[str, str], ...]]]:
+        """Yield ``(suffix, label values, value, extra labels)``."""
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic counter; the name should end in ``_total``."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._shards = _Shards()
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        shard = self._shards.mine()
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        key = self._key(labels)
+        return sum(shard.get(key, 0.0) for shard in self._shards.all())
+
+    def collect(self) -> Dict[LabelKey, float]:
+        merged: Dict[LabelKey, float] = {}
+        for shard in self._shards.all():
+            for key, value in shard.items():
+                merged[key] = merged.get(key, 0.0) + value
+        return merged
+
+    def samples(self):
+        for key, value in sorted(self.collect().items()):
+            yield "", key, value, ()
+
+    def reset(self) -> None:
+        self._shards.clear()
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram (cumulative buckets are computed at scrape time)."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets: Tuple[float, ...] = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+        self._shards = _Shards()
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        shard = self._shards.mine()
+        counts = shard.get(key)
+        if counts is None:
+            # One slot per bucket, one for +Inf, then the sum
+            counts = shard[key] = [0.0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def collect(self) -> Dict[LabelKey, Tuple[List[float], float, float]]:
+        """Label values → (cumulative bucket counts incl. +Inf, sum, count)."""
+        merged: Dict[LabelKey, List[float]] = {}
+        for shard in self._shards.all():
+            for key, counts in shard.items():
+                counts = list(counts)
+                total = merged.get(key)
+                if total is None:
+                    merged[key] = counts
+                else:
+                    for i, c in enumerate(counts):
+                        total[i] += c
+
+        result = {}
+        for key, counts in merged.items():
+            cumulative, running = [], 0.0
+            for c in counts[:-1]:
+                running += c
+                cumulative.append(running)
+            result[key] = (cumulative, counts[-1], running)
+        return result
+
+    def samples(self):
+        bounds = [_format_value(b) for b in self.buckets] + ["+Inf"]
+        for key, (cumulative, total, count) in sorted(self.collect().items()):
+            for bound, value in zip(bounds, cumulative):
+                yield "_bucket", key, value, (("le", bound),)
+            yield "_sum", key, total, ()
+            yield "_count", key, count, ()
+
+    def reset(self) -> None:
+        self._shards.clear()
+
+
+class Gauge(_Metric):
+    """Gauge set directly or computed by ``callback`` at scrape time."""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[GaugeCallback] = None,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+        self._callbacks: List[GaugeCallback] = [callback] if callback else []
+
+    def set(self, value: float, **labels: object) -> None:
+        self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: object) -> None:
+        self.inc(-amount, **labels)
+
+    def add_callback(self, callback: GaugeCallback) -> None:
+        """Add a source of values; results of all callbacks are summed per label set."""
+        self._callbacks.append(callback)
+
+    def collect(self) -> Dict[LabelKey, float]:
+        merged = dict(self._values)
+        for callback in list(self._callbacks):
+            try:
+                produced = callback()
+            except Exception:
+                continue
+            if not isinstance(produced, dict):
+                produced = {(): produced}
+            for key, value in produced.items():
+                merged[key] = merged.get(key, 0.0) + float(value)
+        return merged
+
+    def samples(self):
+        for key, value in sorted(self.collect().items()):
+            yield "", key, value, ()
+
+    def reset(self) -> None:
+        self._values.clear()
+
+
+class MetricsRegistry:
+    """Named metrics with Prometheus text / OpenMetrics rendering."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} already registered with a different type or labels")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[GaugeCallback] = None,
+    ) -> Gauge:
+        gauge = self._register(Gauge(name, documentation, labelnames))
+        if callback is not None:
+            gauge.add_callback(callback)
+        return gauge
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def reset(self) -> None:
+        """Zero every metric (tests)."""
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+    def render(self, openmetrics: bool = False) -> str:
+        """Render all metrics in the Prometheus text format (or OpenMetrics)."""
+        lines: List[str] = []
+        for metric in sorted(self._metrics.values(), key=lambda m: m.name):
+            family = metric.name
+            if openmetrics and metric.type_name == "counter" and family.endswith("_total"):
+                family = family[: -len("_total")]
+            lines.append(f"# HELP {family} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {family} {metric.type_name}")
+            for suffix, key, value, extra in metric.samples():
+                labels = list(zip(metric.labelnames, key)) + list(extra)
+                lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(float(value))
+    return repr(float(value))
+
+
+# Global registry instance
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
+
+
+# ---------------------------------------------------------------------------
+# Metrics referenced by monitoring/ dashboards, alerts and on-call queries
+# ---------------------------------------------------------------------------
+
+HTTP_REQUESTS = get_metrics_registry().counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status code",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_DURATION = get_metrics_registry().histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response finished",
+    ("method", "route"),
+)
+DB_QUERY_DURATION = get_metrics_registry().histogram(
+    "db_query_duration_seconds",
+    "Database statement execution time",
+    ("operation",),
+)
+DB_QUERY_ERRORS = get_metrics_registry().counter(
+    "db_query_errors_total",
+    "Database statements that raised",
+    ("operation",),
+)
+DB_POOL_CHECKOUTS = get_metrics_registry().counter(
+    "db_pool_checkouts_total",
+    "Connections checked out of the pool",
+)
+DB_CONNECTIONS_IN_USE = get_metrics_registry().gauge(
+    "db_connections_in_use",
+    "Pool connections currently checked out",
+)
+DB_POOL_SIZE = get_metrics_registry().gauge(
+    "db_pool_size",
+    "Configured connection pool size",
+)
+PROVIDER_REQUESTS = get_metrics_registry().counter(
+    "provider_requests_total",
+    "LLM provider calls by provider, model and result",
+    ("provider", "model", "result"),
+)
+PROVIDER_HTTP_RESPONSES = get_metrics_registry().counter(
+    "provider_http_responses_total",
+    "HTTP status codes returned by failed LLM provider calls",
+    ("provider", "status"),
+)
+LLM_REQUEST_DURATION = get_metrics_registry().histogram(
+    "llm_request_duration_seconds",
+    "LLM provider call latency",
+    ("provider",),
+)
+LLM_TOKENS = get_metrics_registry().counter(
+    "llm_tokens_total",
+    "LLM tokens by provider and kind (prompt/completion)",
+    ("provider", "kind"),
+)
+TASK_RUNS = get_metrics_registry().counter(
+    "task_runs_total",
+    "Task runs finished by TaskExecutor",
+    ("result", "mode", "provider"),
+)
+TASK_RUN_DURATION = get_metrics_registry().histogram(
+    "task_run_duration_seconds",
+    "Task run wall time",
+    ("mode",),
+    buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0),
+)
+TASK_RUNS_IN_PROGRESS = get_metrics_registry().gauge(
+    "task_runs_in_progress",
+    "Task runs currently executing",
+)
+
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "get_metrics_registry",
+    "DEFAULT_BUCKETS",
+    "PROMETHEUS_CONTENT_TYPE",
+    "OPENMETRICS_CONTENT_TYPE",
+    "HTTP_REQUESTS",
+    "HTTP_REQUEST_DURATION",
+    "DB_QUERY_DURATION",
+    "DB_QUERY_ERRORS",
+    "DB_POOL_CHECKOUTS",
+    "DB_CONNECTIONS_IN_USE",
+    "DB_POOL_SIZE",
+    "PROVIDER_REQUESTS",
+    "PROVIDER_HTTP_RESPONSES",
+    "LLM_REQUEST_DURATION",
+    "LLM_TOKENS",
+    "TASK_RUNS",
+    "TASK_RUN_DURATION",
+    "TASK_RUNS_IN_PROGRESS",
+]
@@ -19,6 +19,8 @@ async def run_parallel_task(
     *,
     max_concurrent: int = 3,
     output_dir_base: str = "output/parallel",
+    streaming: bool = True,
+    llm_budget_usd: Optional[float] = None,
 ) -> Dict[str, Any]:
     """
     Paralel mikroservis görevini çalıştırır ve DB'ye kaydeder.
@@ -28,6 +30,8 @@ async def run_parallel_task(
     task:            Kullanıcının yüksek seviye görevi.
     max_concurrent:  Aynı anda çalışacak maksimum servis sayısı.
     output_dir_base: Üretilen dosyaların kök dizini.
+    streaming:       Akışlı (pipelined) orkestrasyon modu.
+    llm_budget_usd:  Akışlı modda tüm servisler için toplam maliyet sınırı.
 
     Returns
     -------
@@ -45,6 +49,8 @@ async def run_parallel_task(
             base_config=config,
             max_concurrent=max_concurrent,
             output_dir_base=output_dir_base,
+            streaming=streaming,
+            llm_budget_usd=llm_budget_usd,
         )
         result = await orchestrator.run(task)
     except Exception as exc:
@@ -13,6 +13,8 @@ from . import gates  # noqa: F401
 
 from .gate_manager import QualityGateManager, get_gate_manager
 from .gates.base_gate import BaseQualityGate, GateResult, GateConfiguration
+from .file_index import ProjectFileIndex
+from .result_cache import GateResultCache, get_gate_result_cache
 
 __all__ = [
     "QualityGateManager",
@@ -20,4 +22,7 @@ __all__ = [
     "BaseQualityGate",
     "GateResult",
     "GateConfiguration",
+    "ProjectFileIndex",
+    "GateResultCache",
+    "get_gate_result_cache",
 ]
\ No newline at end of file
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""backend.services.quality_gates.file_index
+
+Shared snapshot of a project's files for one gate evaluation.
+
+The gate manager walks the working directory once with ``os.scandir`` and
+hands the resulting :class:`ProjectFileIndex` to every gate through its
+execution context, so gates select files with gitignore-style patterns
+instead of each re-globbing the tree. File contents are loaded lazily and
+memoized on the index; content hashes come from the result cache, which
+keeps them across evaluations while a file's mtime and size are unchanged.
+"""
+
+import fnmatch
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Pattern
+
+from .result_cache import DEFAULT_EXCLUDED_DIRS
+
+
+LANGUAGE_EXTENSIONS: Dict[str, str] = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".php": "php",
+    ".java": "java",
+    ".go": "go",
+    ".rb": "ruby",
+    ".cs": "csharp",
+}
+
+_PATTERN_CACHE: Dict[str, Pattern[str]] = {}
+
+
+def compile_pattern(pattern: str) -> Pattern[str]:
+    """
+    Compile a gitignore-style glob into a regex over POSIX relative paths.
+
+    ``**`` spans directories, ``*``/``?`` stay within one path segment, a
+    pattern without a slash matches at any depth and a trailing slash
+    matches everything below a directory.
+    """
+    cached = _PATTERN_CACHE.get(pattern)
+    if cached is not None:
+        return cached
+
+    glob = pattern.strip().replace("\\", "/")
+    anchored = glob.startswith("/")
+    glob = glob.lstrip("/")
+    if not anchored and "/" not in glob.rstrip("/"):
+        glob = "**/" + glob
+    if glob.endswith("/"):
+        glob += "**"
+
+    parts = []
+    i = 0
+    while i < len(glob):
+        if glob.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif glob[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif glob[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif glob[i] == "[":
+            end = glob.find("]", i + 1)
+            if end == -1:
+                parts.append(re.escape(glob[i]))
+                i += 1
+            else:
+                parts.append(fnmatch.translate(glob[i:end + 1])[4:-3])
+                i = end + 1
+        else:
+            parts.append(re.escape(glob[i]))
+            i += 1
+
+    compiled = re.compile("^" + "".join(parts) + "$")
+    _PATTERN_CACHE[pattern] = compiled
+    return compiled
+
+
+@dataclass
+class IndexedFile:
+    """One file in the project snapshot."""
+
+    path: str
+    relpath: str
+    size: int
+    mtime_ns: int
+    language: Optional[str] = None
+    _content: Optional[bytes] = field(default=None, repr=False)
+
+    def read_bytes(self) -> bytes:
+        """File contents, read once and shared by all gates."""
+        if self._content is None:
+            with open(self.path, "rb") as handle:
+                self._content = handle.read()
+        return self._content
+
+    def read_text(self, encoding: str = "utf-8") -> str:
+        """File contents decoded as text (undecodable bytes are dropped)."""
+        return self.read_bytes().decode(encoding, errors="ignore")
+
+
+class ProjectFileIndex:
+    """Snapshot of the files below a project root."""
+
+    def __init__(self, root: str, files: List[IndexedFile]):
+        self.root = os.path.normpath(os.path.abspath(root))
+        self.files = files
+        self._by_path = {f.path: f for f in files}
+
+    @classmethod
+    def build(
+        cls,
+        root: str,
+        excluded_dirs: Iterable[str] = DEFAULT_EXCLUDED_DIRS,
+    ) -> "ProjectFileIndex":
+        """
+        Walk ``root`` once with ``os.scandir``.
+
+        Excluded directories and hidden entries are pruned, matching what
+        the recursive globs this replaces could see.
+        """
+        root = os.path.normpath(os.path.abspath(root))
+        excluded = frozenset(excluded_dirs)
+        files: List[IndexedFile] = []
+        stack = [(root, "")]
+
+        while stack:
+            directory, prefix = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                relpath = prefix + entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in excluded:
+                            stack.append((entry.path, relpath + "/"))
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        files.append(IndexedFile(
+                            path=entry.path,
+                            relpath=relpath,
+                            size=stat.st_size,
+                            mtime_ns=stat.st_mtime_ns,
+                            language=LANGUAGE_EXTENSIONS.get(os.path.splitext(entry.name)[1].lower()),
+                        ))
+                except OSError:
+                    continue
+
+        files.sort(key=lambda f: f.relpath)
+        return cls(root, files)
+
+    def covers(self, working_directory: Optional[str]) -> bool:
+        """Whether this index was built for ``working_directory``."""
+        if not working_directory:
+            return False
+        return os.path.normpath(os.path.abspath(working_directory)) == self.root
+
+    def get(self, path: str) -> Optional[IndexedFile]:
+        """Look up a file by absolute path."""
+        return self._by_path.get(os.path.normpath(path))
+
+    def select(
+        self,
+        patterns: Iterable[str],
+        exclude_patterns: Iterable[str] = (),
+    ) -> List[IndexedFile]:
+        """Files matching any of ``patterns`` and none of ``exclude_patterns``."""
+        include = [compile_pattern(p) for p in patterns]
+        exclude = [compile_pattern(p) for p in exclude_patterns]
+        return [
+            f for f in self.files
+            if any(p.match(f.relpath) for p in include)
+            and not any(p.match(f.relpath) for p in exclude)
+        ]
+
+    def find(
+        self,
+        patterns: Iterable[str],
+        exclude_patterns: Iterable[str] = (),
+    ) -> List[str]:
+        """Absolute paths of :meth:`select` results."""
+        return [f.path for f in self.select(patterns, exclude_patterns)]
+
+    def by_language(self, *languages: str) -> List[IndexedFile]:
+        """Files classified as one of ``languages``."""
+        wanted = set(languages)
+        return [f for f in self.files if f.language in wanted]
+
+    def languages(self) -> Dict[str, int]:
+        """File count per detected language."""
+        counts: Dict[str, int] = {}
+        for f in self.files:
+            if f.language:
+                counts[f.language] = counts.get(f.language, 0) + 1
+        return counts
@@ -16,6 +16,32 @@ from dataclasses import asdict
 from ...db.models.entities import QualityGate, GateExecution
 from ...db.models.enums import QualityGateType, QualityGateStatus
 from .gates.base_gate import GateResult, GateConfiguration, create_gate, gate_registry
+from .file_index import ProjectFileIndex
+from .result_cache import GateResultCache, TREE_CACHED_GATES, get_gate_result_cache
+
+
+# Relative expected runtime per gate; the scheduler starts expensive gates first
+# so a long audit/test run does not end up as the tail of the evaluation.
+DEFAULT_GATE_COST_HINTS: Dict[QualityGateType, float] = {
+    QualityGateType.SECURITY: 10,
+    QualityGateType.PERFORMANCE: 9,
+    QualityGateType.COVERAGE: 8,
+    QualityGateType.TYPE_CHECK: 6,
+    QualityGateType.CONTRACT: 4,
+    QualityGateType.LINT: 3,
+    QualityGateType.COMPLEXITY: 2,
+}
+
+# CPU-bound subprocesses each gate keeps busy, counted against max_gate_processes
+DEFAULT_GATE_PROCESS_WEIGHTS: Dict[QualityGateType, int] = {
+    QualityGateType.SECURITY: 2,
+    QualityGateType.COVERAGE: 2,
+    QualityGateType.TYPE_CHECK: 2,
+    QualityGateType.PERFORMANCE: 1,
+    QualityGateType.LINT: 1,
+    QualityGateType.COMPLEXITY: 1,
+    QualityGateType.CONTRACT: 0,
+}
 
 
 class QualityGateManager:
@@ -39,6 +65,13 @@ class QualityGateManager:
                 self._sandbox_runner = None
         return self._sandbox_runner
     
+    @property
+    def result_cache(self) -> Optional[GateResultCache]:
+        """Content-hash result cache, or None when incremental evaluation is disabled."""
+        if not self._get_global_config("incremental_cache", True):
+            return None
+        return get_gate_result_cache()
+    
     async def initialize(self) -> None:
         """Initialize the gate manager."""
         await self._load_configuration()
@@ -74,7 +107,10 @@ class QualityGateManager:
             "global": {
                 "default_timeout": 300,
                 "parallel_execution": True,
-                "max_parallel_gates": 4
+                "max_parallel_gates": 4,
+                "max_gate_processes": os.cpu_count() or 4,
+                "fail_fast": False,
+                "incremental_cache": True
             }
         }
     
@@ -118,6 +154,10 @@ class QualityGateManager:
                     "execution_time_ms": 0
                 }
             
+            # Walk the project once; every gate selects its files from this snapshot
+            if working_directory and os.path.isdir(working_directory):
+                kwargs["file_index"] = await asyncio.to_thread(ProjectFileIndex.build, working_directory)
+            
             # Execute gates
             parallel_execution = self._get_global_config("parallel_execution", True)
             max_parallel = self._get_global_config("max_parallel_gates", 4)
@@ -188,44 +228,108 @@ class QualityGateManager:
         max_parallel: int,
         **kwargs
     ) -> Dict[QualityGateType, GateResult]:
-        """Execute gates in parallel with a limit on concurrent execution."""
+        """
+        Execute gates on a bounded pool, starting the next gate as soon as a slot frees.
         
-        results = {}
+        Gates are started most-expensive first (``cost_hint``) and only while
+        their subprocess weight (``max_processes``) fits the global
+        ``max_gate_processes`` budget; a cheaper gate that fits may overtake an
+        expensive one waiting for processes. With ``fail_fast`` enabled, the
+        first blocking failure cancels running gates and skips the rest.
+        """
         
-        # Split gates into batches
-        for i in range(0, len(gate_types), max_parallel):
-            batch = gate_types[i:i + max_parallel]
-            
-            # Execute batch in parallel
-            batch_tasks = []
-            for gate_type in batch:
-                task = self._execute_single_gate(
-                    gate_type, workspace_id, project_id,
-                    task_id, task_run_id, sandbox_execution_id,
-                    working_directory, application_url, openapi_spec,
-                    **kwargs
-                )
-                batch_tasks.append((gate_type, task))
-            
-            # Wait for batch completion
-            batch_results = await asyncio.gather(*[task for _, task in batch_tasks], return_exceptions=True)
-            
-            # Collect results
-            for (gate_type, _), result in zip(batch_tasks, batch_results):
-                if isinstance(result, Exception):
-                    self.logger.error(f"Gate {gate_type.value} failed: {result}")
-                    # Create error result
-                    results[gate_type] = GateResult(
-                        gate_type=gate_type,
-                        status=QualityGateStatus.ERROR,
-                        passed=False,
-                        error_message=str(result)
+        results: Dict[QualityGateType, GateResult] = {}
+        max_parallel = max(1, int(max_parallel or 1))
+        process_budget = max(1, int(self._get_global_config("max_gate_processes", os.cpu_count() or 4)))
+        fail_fast = self._get_global_config("fail_fast", False)
+        
+        pending = sorted(gate_types, key=self._get_gate_cost, reverse=True)
+        running: Dict[asyncio.Task, Tuple[QualityGateType, int]] = {}
+        processes_in_use = 0
+        failed_gate: Optional[QualityGateType] = None
+        
+        try:
+            while pending or running:
+                # Fill free slots with the most expensive gate that fits the process budget
+                index = 0
+                while index < len(pending) and len(running) < max_parallel:
+                    gate_type = pending[index]
+                    weight = self._get_gate_process_weight(gate_type)
+                    # An oversized gate may still run alone so it cannot starve
+                    if running and processes_in_use + weight > process_budget:
+                        index += 1
+                        continue
+                    pending.pop(index)
+                    task = asyncio.create_task(self._execute_single_gate(
+                        gate_type, workspace_id, project_id,
+                        task_id, task_run_id, sandbox_execution_id,
+                        working_directory, application_url, openapi_spec,
+                        **kwargs
+                    ))
+                    running[task] = (gate_type, weight)
+                    processes_in_use += weight
+                
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                
+                for task in done:
+                    gate_type, weight = running.pop(task)
+                    processes_in_use -= weight
+                    try:
+                        results[gate_type] = task.result()
+                    except Exception as e:
+                        self.logger.error(f"Gate {gate_type.value} failed: {e}")
+                        results[gate_type] = GateResult(
+                            gate_type=gate_type,
+                            status=QualityGateStatus.ERROR,
+                            passed=False,
+                            error_message=str(e)
+                        )
+                    
+                    if fail_fast and failed_gate is None and self._is_blocking_failure(gate_type, results[gate_type]):
+                        failed_gate = gate_type
+                
+                if failed_gate is not None:
+                    self.logger.warning(
+                        f"Blocking gate {failed_gate.value} failed; cancelling "
+                        f"{len(running)} running and {len(pending)} pending gates"
                     )
-                else:
-                    results[gate_type] = result
+                    for task, (gate_type, _) in running.items():
+                        task.cancel()
+                        pending.append(gate_type)
+                    await asyncio.gather(*running, return_exceptions=True)
+                    running.clear()
+                    for gate_type in pending:
+                        results[gate_type] = GateResult(
+                            gate_type=gate_type,
+                            status=QualityGateStatus.SKIPPED,
+                            passed=False,
+                            error_message=f"Cancelled after blocking failure in {failed_gate.value} gate"
+                        )
+                    pending.clear()
+        finally:
+            # Don't leak gate tasks if the evaluation itself is cancelled
+            for task in running:
+                task.cancel()
         
         return results
     
+    def _get_gate_cost(self, gate_type: QualityGateType) -> float:
+        """Relative expected runtime of a gate, used to start long gates first."""
+        gate_config = self._get_gate_config(gate_type.value) or {}
+        return float(gate_config.get("cost_hint", DEFAULT_GATE_COST_HINTS.get(gate_type, 1)))
+    
+    def _get_gate_process_weight(self, gate_type: QualityGateType) -> int:
+        """Number of CPU-bound subprocesses a gate is expected to keep busy."""
+        gate_config = self._get_gate_config(gate_type.value) or {}
+        return max(0, int(gate_config.get("max_processes", DEFAULT_GATE_PROCESS_WEIGHTS.get(gate_type, 1))))
+    
+    def _is_blocking_failure(self, gate_type: QualityGateType, result: GateResult) -> bool:
+        """Whether a gate result fails the evaluation (mirrors ``_calculate_overall_result``)."""
+        if result.status not in (QualityGateStatus.FAILED, QualityGateStatus.ERROR):
+            return False
+        gate_config = self._get_gate_config(gate_type.value)
+        return gate_config.get("blocking", True) if gate_config else True
+    
     async def _execute_gates_sequential(
         self,
         gate_types: List[QualityGateType],
@@ -275,6 +379,7 @@ class QualityGateManager:
         working_directory: Optional[str],
         application_url: Optional[str],
         openapi_spec: Optional[str],
+        file_index: Optional[ProjectFileIndex] = None,
         **kwargs
     ) -> GateResult:
         """Execute a single quality gate."""
@@ -300,6 +405,8 @@ class QualityGateManager:
             )
             
             gate_instance = create_gate(gate_type, config_obj)
+            if file_index is not None:
+                gate_instance.set_execution_context({"file_index": file_index})
             
             # Validate configuration
             config_errors = gate_instance.validate_configuration()
@@ -311,6 +418,19 @@ class QualityGateManager:
                     error_message=f"Configuration errors: {', '.join(config_errors)}"
                 )
             
+            # Reuse cached findings for unchanged files/trees
+            cache = self.result_cache if working_directory else None
+            tree_cache_key = None
+            if cache is not None:
+                gate_instance.result_cache = cache
+                if gate_type in TREE_CACHED_GATES:
+                    tree_cache_key, cached_result = await cache.get_tree_result(
+                        gate_type, gate_config, working_directory, file_index
+                    )
+                    if cached_result is not None:
+                        self.logger.info(f"Gate {gate_type.value}: tree unchanged, reusing cached result")
+                        return cached_result
+            
             # Execute gate
             result = await gate_instance.evaluate(
                 workspace_id=workspace_id,
@@ -324,6 +444,11 @@ class QualityGateManager:
                 **kwargs
             )
             
+            if tree_cache_key is not None and result.status in (
+                QualityGateStatus.PASSED, QualityGateStatus.WARNING, QualityGateStatus.FAILED
+            ):
+                cache.put_tree_result(tree_cache_key, result)
+            
             return result
             
         except Exception as e:
@@ -9,10 +9,12 @@ from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
 import logging
 import asyncio
+import os
 from dataclasses import dataclass, asdict
 
 from ....db.models.entities import QualityGate, GateExecution
 from ....db.models.enums import QualityGateType, QualityGateStatus, GateSeverity
+from ..file_index import ProjectFileIndex
 
 
 @dataclass
@@ -74,6 +76,8 @@ class BaseQualityGate(ABC):
         self.config = config
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self._execution_context: Dict[str, Any] = {}
+        # Set by the gate manager when incremental evaluation is enabled
+        self.result_cache = None
     
     @abstractmethod
     async def evaluate(
@@ -132,6 +136,55 @@ class BaseQualityGate(ABC):
                 error_message=f"Evaluation failed: {str(e)}"
             )
     
+    async def run_per_file_cached(
+        self,
+        command: List[str],
+        tool_config: Dict[str, Any],
+        working_directory: Optional[str],
+        files: List[str],
+        analyze,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Run a per-file analyzer, reusing cached findings for unchanged files.
+
+        ``analyze(files)`` returns findings keyed by absolute file path (or
+        ``None`` when the tool output was unusable). Without a result cache
+        every file is analyzed.
+        """
+        if self.result_cache is None:
+            return await analyze(files) or {}
+
+        cache_config = {
+            "tool": tool_config,
+            "thresholds": self.config.threshold_config,
+        }
+        return await self.result_cache.run_incremental(
+            self.gate_type, command, cache_config, working_directory, files, analyze
+        )
+    
+    async def get_file_index(self, working_directory: Optional[str]) -> ProjectFileIndex:
+        """
+        Get the project file index for ``working_directory``.
+        
+        The gate manager shares one index per evaluation through the
+        execution context; a gate run on its own builds and keeps its own.
+        """
+        index = self._execution_context.get("file_index")
+        if index is None or not index.covers(working_directory or os.getcwd()):
+            index = await asyncio.to_thread(ProjectFileIndex.build, working_directory or os.getcwd())
+            self._execution_context["file_index"] = index
+        return index
+    
+    async def find_files(
+        self,
+        working_directory: Optional[str],
+        patterns: List[str],
+        exclude_patterns: Optional[List[str]] = None
+    ) -> List[str]:
+        """Find files matching gitignore-style patterns via the shared file index."""
+        index = await self.get_file_index(working_directory)
+        return index.find(patterns, exclude_patterns or [])
+    
     def set_execution_context(self, context: Dict[str, Any]) -> None:
         """Set execution context for this evaluation."""
         self._execution_context.update(context)
@@ -165,8 +218,19 @@ class BaseQualityGate(ABC):
         
         return issue
     
-    def get_threshold_value(self, key: str, default: Any = None) -> Any:
-        """Get threshold configuration value with default."""
+    def get_threshold_value(self, key: Union[str, List[str]], default: Any = None) -> Any:
+        """Get threshold configuration value with default.
+        
+        ``key`` may be a list to look up a nested value, e.g.
+        ``["tests", "throughput", "min_rps"]``.
+        """
+        if isinstance(key, (list, tuple)):
+            value: Any = self.config.threshold_config
+            for part in key:
+                if not isinstance(value, dict) or part not in value:
+                    return default
+                value = value[part]
+            return value
         return self.config.threshold_config.get(key, default)
     
     def is_threshold_exceeded(
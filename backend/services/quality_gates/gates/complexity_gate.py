@@ -11,10 +11,10 @@ import re
 from typing import Dict, List, Optional, Any, Tuple
 import asyncio
 import logging
-import glob
 from pathlib import Path
 
 from .base_gate import BaseQualityGate, GateResult, GateConfiguration, register_gate
+from ..result_cache import normalize_path
 from ....db.models.enums import QualityGateType, QualityGateStatus, GateSeverity
 
 
@@ -231,27 +231,37 @@ class ComplexityGate(BaseQualityGate):
                     "message": "No Python files found"
                 }
             
-            # Run radon command
+            # Run radon command (only on files changed since the last run)
             cmd_parts = command.split()
-            cmd_parts.extend(python_files)
-            
-            result = await asyncio.create_subprocess_exec(
-                *cmd_parts,
-                cwd=working_directory,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+            run_info: Dict[str, Any] = {"exit_code": None}
+            
+            async def analyze(files: List[str]) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+                result = await asyncio.create_subprocess_exec(
+                    *cmd_parts,
+                    *files,
+                    cwd=working_directory,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                
+                stdout, stderr = await result.communicate()
+                run_info["exit_code"] = result.returncode
+                if result.returncode != 0:
+                    return None
+                
+                # Parse radon output
+                functions_by_file: Dict[str, List[Dict[str, Any]]] = {}
+                for func in self._parse_radon_output(stdout.decode() if stdout else ""):
+                    file_key = normalize_path(working_directory, func.get("file", ""))
+                    functions_by_file.setdefault(file_key, []).append(func)
+                return functions_by_file
+            
+            functions_by_file = await self.run_per_file_cached(
+                cmd_parts, config, working_directory, python_files, analyze
             )
-            
-            stdout, stderr = await result.communicate()
-            
-            # Parse radon output
-            functions = []
+            functions = [func for path in sorted(functions_by_file) for func in functions_by_file[path]]
             file_details = {}
             
-            if stdout:
-                output_text = stdout.decode()
-                functions = self._parse_radon_output(output_text)
-            
             # Calculate metrics
             total_functions = len(functions)
             functions_above_threshold = 0
@@ -309,7 +319,7 @@ class ComplexityGate(BaseQualityGate):
                 "file_details": file_complexities,
                 "raw_functions": functions,
                 "command": command,
-                "exit_code": result.returncode
+                "exit_code": run_info["exit_code"]
             }
             
         except Exception as e:
@@ -347,50 +357,61 @@ class ComplexityGate(BaseQualityGate):
                     "message": "No JavaScript/TypeScript files found"
                 }
             
-            # Run ESLint command
+            # Run ESLint command (only on files changed since the last run)
             cmd_parts = command.split()
-            cmd_parts.extend(js_files)
-            
-            result = await asyncio.create_subprocess_exec(
-                *cmd_parts,
-                cwd=working_directory,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await result.communicate()
-            
-            # Parse ESLint output
-            functions = []
-            file_details = {}
-            
-            if stdout:
+            run_info: Dict[str, Any] = {"exit_code": None}
+            
+            async def analyze(files: List[str]) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+                result = await asyncio.create_subprocess_exec(
+                    *cmd_parts,
+                    *files,
+                    cwd=working_directory,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                
+                stdout, stderr = await result.communicate()
+                run_info["exit_code"] = result.returncode
+                
+                # Parse ESLint output
                 try:
-                    eslint_output = json.loads(stdout.decode())
-                    
-                    for file_issues in eslint_output:
-                        file_path = file_issues.get("filePath", "")
-                        complexity_messages = [
-                            msg for msg in file_issues.get("messages", []) 
-                            if msg.get("ruleId") == "complexity"
-                        ]
-                        
-                        for message in complexity_messages:
-                            # Extract complexity value from message
-                            message_text = message.get("message", "")
-                            complexity_match = re.search(r'complexity of (\d+)', message_text)
-                            complexity = int(complexity_match.group(1)) if complexity_match else 10
-                            
-                            function_info = {
-                                "file": file_path,
-                                "line": message.get("line"),
-                                "complexity": complexity,
-                                "type": "function"  # ESLint doesn't distinguish function types easily
-                            }
-                            functions.append(function_info)
-                            
+                    eslint_output = json.loads(stdout.decode()) if stdout else None
                 except json.JSONDecodeError:
                     self.logger.warning("Failed to parse ESLint complexity output")
+                    eslint_output = None
+                if eslint_output is None:
+                    return None
+                
+                functions_by_file: Dict[str, List[Dict[str, Any]]] = {}
+                for file_issues in eslint_output:
+                    file_path = file_issues.get("filePath", "")
+                    complexity_messages = [
+                        msg for msg in file_issues.get("messages", []) 
+                        if msg.get("ruleId") == "complexity"
+                    ]
+                    
+                    for message in complexity_messages:
+                        # Extract complexity value from message
+                        message_text = message.get("message", "")
+                        complexity_match = re.search(r'complexity of (\d+)', message_text)
+                        complexity = int(complexity_match.group(1)) if complexity_match else 10
+                        
+                        function_info = {
+                            "file": file_path,
+                            "line": message.get("line"),
+                            "complexity": complexity,
+                            "type": "function"  # ESLint doesn't distinguish function types easily
+                        }
+                        file_key = normalize_path(working_directory, file_path)
+                        functions_by_file.setdefault(file_key, []).append(function_info)
+                
+                return functions_by_file
+            
+            functions_by_file = await self.run_per_file_cached(
+                cmd_parts, config, working_directory, js_files, analyze
+            )
+            functions = [func for path in sorted(functions_by_file) for func in functions_by_file[path]]
+            file_details = {}
             
             # Calculate metrics
             total_functions = len(functions)
@@ -437,7 +458,7 @@ class ComplexityGate(BaseQualityGate):
                 "file_details": file_complexities,
                 "raw_functions": functions,
                 "command": " ".join(cmd_parts),
-                "exit_code": result.returncode
+                "exit_code": run_info["exit_code"]
             }
             
         except Exception as e:
@@ -620,89 +641,28 @@ class ComplexityGate(BaseQualityGate):
     async def _find_python_files(self, working_directory: str) -> List[str]:
         """Find Python files in the working directory."""
         
-        patterns = ["**/*.py"]
         exclude_patterns = self.get_threshold_value("exclude_patterns", [
             "**/generated/**", "**/tests/**", "**/__pycache__/**", "**/.venv/**"
         ])
-        
-        files = []
-        
-        for pattern in patterns:
-            pattern_files = glob.glob(os.path.join(working_directory, pattern), recursive=True)
-            files.extend(pattern_files)
-        
-        # Filter out excluded patterns
-        filtered_files = []
-        for file_path in set(files):
-            should_exclude = False
-            for exclude_pattern in exclude_patterns:
-                if exclude_pattern.endswith('**'):
-                    exclude_pattern = exclude_pattern[:-2]
-                if exclude_pattern in file_path:
-                    should_exclude = True
-                    break
-            if not should_exclude:
-                filtered_files.append(file_path)
-        
-        return filtered_files
+        return await self.find_files(working_directory, ["**/*.py"], exclude_patterns)
     
     async def _find_javascript_files(self, working_directory: str) -> List[str]:
         """Find JavaScript/TypeScript files in the working directory."""
         
-        patterns = ["**/*.js", "**/*.ts", "**/*.jsx", "**/*.tsx"]
         exclude_patterns = self.get_threshold_value("exclude_patterns", [
             "**/generated/**", "**/node_modules/**", "**/bower_components/**"
         ])
-        
-        files = []
-        
-        for pattern in patterns:
-            pattern_files = glob.glob(os.path.join(working_directory, pattern), recursive=True)
-            files.extend(pattern_files)
-        
-        # Filter out excluded patterns
-        filtered_files = []
-        for file_path in set(files):
-            should_exclude = False
-            for exclude_pattern in exclude_patterns:
-                if exclude_pattern.endswith('**'):
-                    exclude_pattern = exclude_pattern[:-2]
-                if exclude_pattern in file_path:
-                    should_exclude = True
-                    break
-            if not should_exclude:
-                filtered_files.append(file_path)
-        
-        return filtered_files
+        return await self.find_files(
+            working_directory, ["**/*.js", "**/*.ts", "**/*.jsx", "**/*.tsx"], exclude_patterns
+        )
     
     async def _find_php_files(self, working_directory: str) -> List[str]:
         """Find PHP files in the working directory."""
         
-        patterns = ["**/*.php"]
         exclude_patterns = self.get_threshold_value("exclude_patterns", [
             "**/generated/**", "**/vendor/**"
         ])
-        
-        files = []
-        
-        for pattern in patterns:
-            pattern_files = glob.glob(os.path.join(working_directory, pattern), recursive=True)
-            files.extend(pattern_files)
-        
-        # Filter out excluded patterns
-        filtered_files = []
-        for file_path in set(files):
-            should_exclude = False
-            for exclude_pattern in exclude_patterns:
-                if exclude_pattern.endswith('**'):
-                    exclude_pattern = exclude_pattern[:-2]
-                if exclude_pattern in file_path:
-                    should_exclude = True
-                    break
-            if not should_exclude:
-                filtered_files.append(file_path)
-        
-        return filtered_files
+        return await self.find_files(working_directory, ["**/*.php"], exclude_patterns)
     
     def _generate_recommendations(
         self,
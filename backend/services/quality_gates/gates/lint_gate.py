@@ -13,6 +13,7 @@ import asyncio
 import logging
 
 from .base_gate import BaseQualityGate, GateResult, GateConfiguration, register_gate
+from ..result_cache import normalize_path
 from ....db.models.enums import QualityGateType, QualityGateStatus, GateSeverity
 
 
@@ -225,60 +226,66 @@ class LintGate(BaseQualityGate):
         if not cmd_parts[0].startswith("npx"):
             cmd_parts.insert(0, "npx")
         
-        cmd_parts.extend(files_to_lint)
+        run_info: Dict[str, Any] = {"exit_code": None}
         
-        try:
+        async def analyze(files: List[str]) -> Optional[Dict[str, List[Dict[str, Any]]]]:
             result = await asyncio.create_subprocess_exec(
                 *cmd_parts,
+                *files,
                 cwd=working_directory,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE
             )
             
             stdout, stderr = await result.communicate()
-            
-            issues = []
-            errors = 0
-            warnings = 0
-            
-            if stdout:
-                try:
-                    eslint_output = json.loads(stdout.decode())
-                    
-                    for file_issues in eslint_output:
-                        file_path = file_issues.get("filePath", "")
-                        file_error_count = file_issues.get("errorCount", 0)
-                        file_warning_count = file_issues.get("warningCount", 0)
-                        
-                        errors += file_error_count
-                        warnings += file_warning_count
-                        
-                        # Process individual messages
-                        for message in file_issues.get("messages", []):
-                            severity = "error" if message.get("severity") == 2 else "warning"
-                            issue = {
-                                "file": file_path,
-                                "line": message.get("line"),
-                                "column": message.get("column"),
-                                "message": message.get("message"),
-                                "rule": message.get("ruleId"),
-                                "severity": severity
-                            }
-                            issues.append(issue)
-                            
-                except json.JSONDecodeError as e:
-                    self.logger.warning(f"Failed to parse ESLint output: {e}")
+            run_info["exit_code"] = result.returncode
             
             if stderr:
                 self.logger.warning(f"ESLint stderr: {stderr.decode()}")
             
+            try:
+                eslint_output = json.loads(stdout.decode()) if stdout else None
+            except json.JSONDecodeError as e:
+                self.logger.warning(f"Failed to parse ESLint output: {e}")
+                eslint_output = None
+            if eslint_output is None:
+                return None
+            
+            issues_by_file: Dict[str, List[Dict[str, Any]]] = {}
+            for file_issues in eslint_output:
+                file_path = file_issues.get("filePath", "")
+                file_key = normalize_path(working_directory, file_path)
+                
+                # Process individual messages
+                for message in file_issues.get("messages", []):
+                    severity = "error" if message.get("severity") == 2 else "warning"
+                    issue = {
+                        "file": file_path,
+                        "line": message.get("line"),
+                        "column": message.get("column"),
+                        "message": message.get("message"),
+                        "rule": message.get("ruleId"),
+                        "severity": severity
+                    }
+                    issues_by_file.setdefault(file_key, []).append(issue)
+            
+            return issues_by_file
+        
+        try:
+            issues_by_file = await self.run_per_file_cached(
+                cmd_parts, config, working_directory, files_to_lint, analyze
+            )
+            issues = [issue for path in sorted(issues_by_file) for issue in issues_by_file[path]]
+            errors = sum(1 for issue in issues if issue["severity"] == "error")
+            warnings = len(issues) - errors
+            
             return {
                 "language": "javascript",
                 "errors": errors,
                 "warnings": warnings,
                 "issues": issues,
                 "command": " ".join(cmd_parts),
-                "exit_code": result.returncode
+                "exit_code": run_info["exit_code"]
             }
             
         except Exception as e:
@@ -320,58 +327,65 @@ class LintGate(BaseQualityGate):
         
         # Build Ruff command
         cmd_parts = command.split()
-        cmd_parts.extend(files_to_lint)
         
-        try:
+        run_info: Dict[str, Any] = {"exit_code": None}
+        
+        async def analyze(files: List[str]) -> Optional[Dict[str, List[Dict[str, Any]]]]:
             result = await asyncio.create_subprocess_exec(
                 *cmd_parts,
+                *files,
                 cwd=working_directory,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE
             )
             
             stdout, stderr = await result.communicate()
-            
-            issues = []
-            errors = 0
-            warnings = 0
-            
-            if stdout:
-                try:
-                    ruff_output = json.loads(stdout.decode())
-                    
-                    for issue in ruff_output:
-                        severity = issue.get("severity", "error").lower()
-                        issue_type = "error" if severity == "error" else "warning"
-                        
-                        if issue_type == "error":
-                            errors += 1
-                        else:
-                            warnings += 1
-                        
-                        parsed_issue = {
-                            "file": issue.get("filename", ""),
-                            "line": issue.get("line"),
-                            "column": issue.get("column"),
-                            "message": issue.get("message", ""),
-                            "rule": issue.get("code", ""),
-                            "severity": issue_type
-                        }
-                        issues.append(parsed_issue)
-                        
-                except json.JSONDecodeError as e:
-                    self.logger.warning(f"Failed to parse Ruff output: {e}")
+            run_info["exit_code"] = result.returncode
             
             if stderr:
                 self.logger.warning(f"Ruff stderr: {stderr.decode()}")
             
+            try:
+                ruff_output = json.loads(stdout.decode()) if stdout else None
+            except json.JSONDecodeError as e:
+                self.logger.warning(f"Failed to parse Ruff output: {e}")
+                ruff_output = None
+            if ruff_output is None:
+                return None
+            
+            issues_by_file: Dict[str, List[Dict[str, Any]]] = {}
+            for issue in ruff_output:
+                severity = issue.get("severity", "error").lower()
+                issue_type = "error" if severity == "error" else "warning"
+                
+                parsed_issue = {
+                    "file": issue.get("filename", ""),
+                    "line": issue.get("line"),
+                    "column": issue.get("column"),
+                    "message": issue.get("message", ""),
+                    "rule": issue.get("code", ""),
+                    "severity": issue_type
+                }
+                file_key = normalize_path(working_directory, parsed_issue["file"])
+                issues_by_file.setdefault(file_key, []).append(parsed_issue)
+            
+            return issues_by_file
+        
+        try:
+            issues_by_file = await self.run_per_file_cached(
+                cmd_parts, config, working_directory, files_to_lint, analyze
+            )
+            issues = [issue for path in sorted(issues_by_file) for issue in issues_by_file[path]]
+            errors = sum(1 for issue in issues if issue["severity"] == "error")
+            warnings = len(issues) - errors
+            
             return {
                 "language": "python",
                 "errors": errors,
                 "warnings": warnings,
                 "issues": issues,
                 "command": " ".join(cmd_parts),
-                "exit_code": result.returncode
+                "exit_code": run_info["exit_code"]
             }
             
         except Exception as e:
@@ -466,21 +480,7 @@ class LintGate(BaseQualityGate):
         patterns: List[str]
     ) -> List[str]:
         """Find files matching given patterns."""
-        import glob
-        
-        files = []
-        for pattern in patterns:
-            full_pattern = os.path.join(working_directory, pattern)
-            matched_files = glob.glob(full_pattern, recursive=True)
-            files.extend(matched_files)
-        
-        # Remove duplicates and filter for actual files
-        unique_files = []
-        for file_path in set(files):
-            if os.path.isfile(file_path):
-                unique_files.append(file_path)
-        
-        return unique_files
+        return await self.find_files(working_directory, patterns)
     
     def _generate_recommendations(
         self,
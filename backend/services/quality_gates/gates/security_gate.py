@@ -5,17 +5,14 @@ Quality gate for security audit and vulnerability scanning.
 """
 
 import json
-import subprocess
 import os
-import re
 from typing import Dict, List, Optional, Any, Tuple
 import asyncio
 import logging
-import tempfile
-import xml.etree.ElementTree as ET
-from pathlib import Path
 
 from .base_gate import BaseQualityGate, GateResult, GateConfiguration, register_gate
+from ..result_cache import normalize_path
+from ..secret_scanner import SCANNER_VERSION, SECRET_SCAN_PATTERNS, scan_paths
 from ....db.models.enums import QualityGateType, QualityGateStatus, GateSeverity
 
 
@@ -580,9 +577,7 @@ class SecurityGate(BaseQualityGate):
                     "message": "No code files found for scanning"
                 }
             
-            # Run semgrep with OWASP rules
-            rules = self.get_threshold_value(["tools", "code_scan", "semgrep", "rules"], ["owasp-top-ten"])
-            
+            # Run semgrep with its automatic rule selection
             cmd_parts = ["semgrep", "--config=auto", "--json", "--no-git-ignore"]
             cmd_parts.extend(code_files)
             
@@ -596,7 +591,7 @@ class SecurityGate(BaseQualityGate):
             stdout, stderr = await result.communicate()
             
             issues = []
-            critical_issues = high_issues = medium_issues = low_issues = 0
+            high_issues = medium_issues = low_issues = 0
             
             if stdout:
                 try:
@@ -654,68 +649,24 @@ class SecurityGate(BaseQualityGate):
     async def _hardcoded_secrets_scan(self, working_directory: str) -> Optional[Dict[str, Any]]:
         """Scan for hardcoded secrets in code."""
         
-        import glob
+        min_entropy = float(self.get_threshold_value("min_secret_entropy", 0.0) or 0.0)
+        files = await self.find_files(working_directory, SECRET_SCAN_PATTERNS)
         
-        issues = []
-        critical_issues = high_issues = 0
+        async def analyze(batch: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+            results = await scan_paths(batch, min_entropy=min_entropy)
+            return {normalize_path(working_directory, path): issues for path, issues in results.items()}
         
-        # Patterns for common secrets
-        secret_patterns = [
-            r'(?i)(password\s*[:=]\s*["\']([^"\']{6,})["\'])',
-            r'(?i)(api[_-]?key\s*[:=]\s*["\']([^"\']{10,})["\'])',
-            r'(?i)(secret\s*[:=]\s*["\']([^"\']{8,})["\'])',
-            r'(?i)(token\s*[:=]\s*["\']([^"\']{20,})["\'])',
-            r'\b(?:sk|pk|sk_live|pk_live)_[a-zA-Z0-9]{16,}\b',  # Stripe keys
-            r'\bAKIA[0-9A-Z]{16}\b',  # AWS Access Key ID
-        ]
+        findings = await self.run_per_file_cached(
+            [],
+            {"scanner": SCANNER_VERSION, "min_entropy": min_entropy},
+            working_directory,
+            files,
+            analyze,
+        )
         
-        # Scan common file types
-        file_patterns = ["**/*.py", "**/*.js", "**/*.ts", "**/*.php", "**/*.java", "**/*.go"]
-        
-        for pattern in file_patterns:
-            files = glob.glob(os.path.join(working_directory, pattern), recursive=True)
-            
-            for file_path in files:
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                        
-                        for pattern_idx, regex_pattern in enumerate(secret_patterns):
-                            matches = re.finditer(regex_pattern, content, re.MULTILINE)
-                            
-                            for match in matches:
-                                line_num = content[:match.start()].count('\n') + 1
-                                
-                                # High severity for real secrets, medium for generic matches
-                                severity = "high" if "password" in regex_pattern or "token" in regex_pattern else "critical"
-                                
-                                issue = {
-                                    "file": file_path,
-                                    "line": line_num,
-                                    "message": f"Potential hardcoded secret detected",
-                                    "match": match.group(0),
-                                    "severity": severity
-                                }
-                                issues.append(issue)
-                                
-                                if severity == "critical":
-                                    critical_issues += 1
-                                else:
-                                    high_issues += 1
-                                    
-                except Exception as e:
-                    self.logger.debug(f"Error scanning {file_path}: {e}")
-        
-        if not issues:
-            return {
-                "tool": "hardcoded_secrets",
-                "total_issues": 0,
-                "critical_issues": 0,
-                "high_issues": 0,
-                "medium_issues": 0,
-                "low_issues": 0,
-                "issues": []
-            }
+        issues = [issue for path in sorted(findings) for issue in findings[path]]
+        critical_issues = sum(1 for issue in issues if issue["severity"] == "critical")
+        high_issues = len(issues) - critical_issues
         
         return {
             "tool": "hardcoded_secrets",
@@ -901,18 +852,9 @@ class SecurityGate(BaseQualityGate):
     
     async def _find_security_scan_files(self, working_directory: str) -> List[str]:
         """Find files suitable for security scanning."""
-        import glob
         
         file_patterns = ["**/*.py", "**/*.js", "**/*.ts", "**/*.php", "**/*.java", "**/*.go", "**/*.rb", "**/*.cs"]
-        files = []
-        
-        for pattern in file_patterns:
-            matched_files = glob.glob(os.path.join(working_directory, pattern), recursive=True)
-            files.extend(matched_files)
-        
-        # Filter out common excluded directories
-        excluded_dirs = {'.git', 'node_modules', '__pycache__', '.venv', '.tox', 'venv', 'build', 'dist'}
-        return [f for f in set(files) if not any(excluded_dir in f for excluded_dir in excluded_dirs)]
+        return await self.find_files(working_directory, file_patterns)
     
     def _generate_recommendations(
         self,
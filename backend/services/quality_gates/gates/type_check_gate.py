@@ -10,7 +10,6 @@ import os
 from typing import Dict, List, Optional, Any
 import asyncio
 import logging
-import glob
 
 from .base_gate import BaseQualityGate, GateResult, GateConfiguration, register_gate
 from ....db.models.enums import QualityGateType, QualityGateStatus, GateSeverity
@@ -418,7 +417,6 @@ class TypeCheckGate(BaseQualityGate):
     async def _find_typescript_files(self, working_directory: str) -> List[str]:
         """Find TypeScript files in the working directory."""
         
-        patterns = ["**/*.ts", "**/*.tsx"]
         exclude_patterns = [
             "**/node_modules/**",
             "**/dist/**",
@@ -426,32 +424,11 @@ class TypeCheckGate(BaseQualityGate):
             "**/.git/**",
             "**/generated/**"
         ]
-        
-        files = []
-        
-        for pattern in patterns:
-            pattern_files = glob.glob(os.path.join(working_directory, pattern), recursive=True)
-            files.extend(pattern_files)
-        
-        # Filter out excluded patterns
-        filtered_files = []
-        for file_path in set(files):
-            should_exclude = False
-            for exclude_pattern in exclude_patterns:
-                if exclude_pattern.endswith('**'):
-                    exclude_pattern = exclude_pattern[:-2]
-                if exclude_pattern in file_path:
-                    should_exclude = True
-                    break
-            if not should_exclude:
-                filtered_files.append(file_path)
-        
-        return filtered_files
+        return await self.find_files(working_directory, ["**/*.ts", "**/*.tsx"], exclude_patterns)
     
     async def _find_python_files(self, working_directory: str) -> List[str]:
         """Find Python files in the working directory."""
         
-        patterns = ["**/*.py"]
         exclude_patterns = [
             "**/__pycache__/**",
             "**/.venv/**",
@@ -462,27 +439,7 @@ class TypeCheckGate(BaseQualityGate):
             "**/.git/**",
             "**/generated/**"
         ]
-        
-        files = []
-        
-        for pattern in patterns:
-            pattern_files = glob.glob(os.path.join(working_directory, pattern), recursive=True)
-            files.extend(pattern_files)
-        
-        # Filter out excluded patterns
-        filtered_files = []
-        for file_path in set(files):
-            should_exclude = False
-            for exclude_pattern in exclude_patterns:
-                if exclude_pattern.endswith('**'):
-                    exclude_pattern = exclude_pattern[:-2]
-                if exclude_pattern in file_path:
-                    should_exclude = True
-                    break
-            if not should_exclude:
-                filtered_files.append(file_path)
-        
-        return filtered_files
+        return await self.find_files(working_directory, ["**/*.py"], exclude_patterns)
     
     def _generate_recommendations(
         self,
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""backend.services.quality_gates.load_engine
+
+Embedded HTTP load generator used by the performance gate.
+
+Two modes are supported:
+
+- closed loop: ``virtual_users`` workers each send a request, wait for the
+  response and send the next one (optionally paced to a target rate).
+- open loop: requests are issued on a fixed schedule at ``rate_rps``
+  regardless of how fast responses come back.
+
+Latencies are recorded in a log-linear (HDR-style) histogram. Whenever
+requests follow a schedule (open loop, or paced closed loop) latency is
+measured from each request's *scheduled* send time rather than the moment
+it actually went out, so a stalled server cannot hide the queueing delay
+it causes (coordinated omission). The raw send-to-response time is kept
+separately as ``service_time``. Requests sent during ramp-up and warmup are
+not recorded.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram with ~1% relative precision.
+
+    Values are recorded in microseconds. Values below ``2**SUB_BUCKET_BITS``
+    are stored exactly; larger values share buckets whose width doubles with
+    every power of two, like HdrHistogram with two significant digits.
+    """
+
+    SUB_BUCKET_BITS = 7
+    _SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+    _HALF = _SUB_BUCKETS >> 1
+
+    def __init__(self):
+        self._counts: Dict[int, int] = {}
+        self.total_count = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+        self._sum_us = 0
+
+    def _index(self, value: int) -> int:
+        if value < self._SUB_BUCKETS:
+            return value
+        shift = value.bit_length() - self.SUB_BUCKET_BITS
+        return self._SUB_BUCKETS + (shift - 1) * self._HALF + ((value >> shift) - self._HALF)
+
+    def _upper_bound(self, index: int) -> int:
+        if index < self._SUB_BUCKETS:
+            return index
+        shift = (index - self._SUB_BUCKETS) // self._HALF + 1
+        mantissa = (index - self._SUB_BUCKETS) % self._HALF + self._HALF
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value_us: int, count: int = 1) -> None:
+        """Record ``count`` occurrences of a latency in microseconds."""
+        value = max(0, int(value_us))
+        index = self._index(value)
+        self._counts[index] = self._counts.get(index, 0) + count
+        self.total_count += count
+        self._sum_us += value * count
+        self.max_us = max(self.max_us, value)
+        self.min_us = value if self.min_us is None else min(self.min_us, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the samples of ``other`` into this histogram."""
+        for index, count in other._counts.items():
+            self._counts[index] = self._counts.get(index, 0) + count
+        self.total_count += other.total_count
+        self._sum_us += other._sum_us
+        self.max_us = max(self.max_us, other.max_us)
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+
+    def percentile(self, percent: float) -> int:
+        """Latency (µs) at or below which ``percent`` of samples fall."""
+        if not self.total_count:
+            return 0
+        target = max(1, int(round(self.total_count * percent / 100.0)))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= target:
+                return min(self._upper_bound(index), self.max_us)
+        return self.max_us
+
+    @property
+    def mean_us(self) -> float:
+        return self._sum_us / self.total_count if self.total_count else 0.0
+
+    def summary_ms(self) -> Dict[str, float]:
+        """Percentile summary in milliseconds."""
+        return {
+            "count": self.total_count,
+            "min_ms": round((self.min_us or 0) / 1000, 2),
+            "mean_ms": round(self.mean_us / 1000, 2),
+            "p50_ms": round(self.percentile(50) / 1000, 2),
+            "p95_ms": round(self.percentile(95) / 1000, 2),
+            "p99_ms": round(self.percentile(99) / 1000, 2),
+            "max_ms": round(self.max_us / 1000, 2),
+        }
+
+
+@dataclass
+class LoadProfile:
+    """Shape of one load run."""
+
+    mode: str = "closed"  # "closed" (virtual users) or "open" (constant arrival rate)
+    duration_seconds: float = 10.0
+    virtual_users: int = 10
+    rate_rps: Optional[float] = None  # open-loop arrival rate / closed-loop pacing
+    warmup_seconds: float = 0.0
+    ramp_seconds: float = 0.0
+    max_connections: int = 100
+    request_timeout_seconds: float = 10.0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], **defaults) -> "LoadProfile":
+        """Build a profile from a gate test config section, falling back to ``defaults``."""
+        values = dict(defaults)
+        for name in cls.__dataclass_fields__:
+            if config.get(name) is not None:
+                values[name] = config[name]
+        return cls(**values)
+
+    @property
+    def measure_after_seconds(self) -> float:
+        return max(self.warmup_seconds, self.ramp_seconds)
+
+
+@dataclass
+class LoadResult:
+    """Outcome of a load run (measurement window only)."""
+
+    profile: LoadProfile
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    service_time: LatencyHistogram = field(default_factory=LatencyHistogram)
+    successful_requests: int = 0
+    failed_requests: int = 0
+    timeouts: int = 0
+    status_codes: Dict[int, int] = field(default_factory=dict)
+    measured_seconds: float = 0.0
+
+    @property
+    def total_requests(self) -> int:
+        return self.successful_requests + self.failed_requests
+
+    @property
+    def measured_rps(self) -> float:
+        return self.successful_requests / self.measured_seconds if self.measured_seconds > 0 else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.failed_requests / self.total_requests if self.total_requests else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "mode": self.profile.mode,
+            "virtual_users": self.profile.virtual_users if self.profile.mode == "closed" else None,
+            "target_rps": self.profile.rate_rps,
+            "measured_rps": round(self.measured_rps, 2),
+            "measured_seconds": round(self.measured_seconds, 2),
+            "successful_requests": self.successful_requests,
+            "failed_requests": self.failed_requests,
+            "timeouts": self.timeouts,
+            "error_rate": round(self.error_rate, 4),
+            "status_codes": {str(code): count for code, count in sorted(self.status_codes.items())},
+            "latency": self.latency.summary_ms(),
+            "service_time": self.service_time.summary_ms(),
+        }
+
+
+class LoadGenerator:
+    """Drives HTTP load against a single URL according to a :class:`LoadProfile`."""
+
+    def __init__(self, url: str, method: str = "GET"):
+        self.url = url
+        self.method = method
+
+    async def run(self, profile: LoadProfile) -> LoadResult:
+        """Run ``profile`` and return results for the measurement window."""
+        result = LoadResult(profile=profile)
+        connector = aiohttp.TCPConnector(limit=profile.max_connections, limit_per_host=profile.max_connections)
+        timeout = aiohttp.ClientTimeout(total=profile.request_timeout_seconds)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            start = time.perf_counter()
+            measure_from = start + profile.measure_after_seconds
+            measure_until = measure_from + profile.duration_seconds
+            if profile.mode == "open":
+                await self._run_open_loop(session, profile, result, start, measure_from)
+            else:
+                await self._run_closed_loop(session, profile, result, measure_from, measure_until)
+
+        result.measured_seconds = profile.duration_seconds
+        return result
+
+    async def _send(
+        self,
+        session: aiohttp.ClientSession,
+        result: LoadResult,
+        intended_at: float,
+        record: bool,
+    ) -> None:
+        """Send one request; latency counts from ``intended_at``, service time from the actual send."""
+        sent_at = time.perf_counter()
+        status = None
+        timed_out = False
+        try:
+            async with session.request(self.method, self.url) as response:
+                await response.read()
+                status = response.status
+        except asyncio.TimeoutError:
+            timed_out = True
+        except aiohttp.ClientError as e:
+            logger.debug(f"Load request to {self.url} failed: {e}")
+
+        if not record:
+            return
+
+        done_at = time.perf_counter()
+        if status is not None:
+            result.status_codes[status] = result.status_codes.get(status, 0) + 1
+        if status is not None and status < 400:
+            result.successful_requests += 1
+        else:
+            result.failed_requests += 1
+            result.timeouts += int(timed_out)
+
+        result.latency.record(int((done_at - intended_at) * 1_000_000))
+        result.service_time.record(int((done_at - sent_at) * 1_000_000))
+
+    async def _run_closed_loop(
+        self,
+        session: aiohttp.ClientSession,
+        profile: LoadProfile,
+        result: LoadResult,
+        measure_from: float,
+        measure_until: float,
+    ) -> None:
+        users = max(1, int(profile.virtual_users))
+        # Optional pacing: each user aims for rate/users requests per second
+        interval = users / profile.rate_rps if profile.rate_rps else 0.0
+
+        async def user(index: int) -> None:
+            # Stagger user start-up across the ramp period
+            if profile.ramp_seconds > 0:
+                await asyncio.sleep(profile.ramp_seconds * index / users)
+            next_at = time.perf_counter()
+            while next_at < measure_until:
+                now = time.perf_counter()
+                if next_at > now:
+                    await asyncio.sleep(next_at - now)
+                intended = next_at if interval else time.perf_counter()
+                await self._send(session, result, intended, intended >= measure_from)
+                next_at = intended + interval if interval else time.perf_counter()
+
+        await asyncio.gather(*(user(i) for i in range(users)))
+
+    async def _run_open_loop(
+        self,
+        session: aiohttp.ClientSession,
+        profile: LoadProfile,
+        result: LoadResult,
+        start: float,
+        measure_from: float,
+    ) -> None:
+        rate = float(profile.rate_rps or profile.virtual_users)
+        if rate <= 0:
+            raise ValueError("Open-loop load requires a positive rate_rps")
+
+        in_flight = set()
+        # Bound memory if the server stalls; waiting here still counts toward latency
+        capacity = asyncio.Semaphore(max(1, profile.max_connections) * 4)
+
+        async def fire(intended: float, record: bool) -> None:
+            try:
+                await self._send(session, result, intended, record)
+            finally:
+                capacity.release()
+
+        # Ramp/warmup traffic (rate grows linearly over the ramp), then exactly
+        # rate * duration requests on a fixed schedule inside the window
+        scheduled = start
+        while scheduled < measure_from:
+            elapsed = scheduled - start
+            factor = min(1.0, elapsed / profile.ramp_seconds) if profile.ramp_seconds > 0 else 1.0
+            scheduled += 1.0 / (rate * max(factor, 0.05))
+            if scheduled >= measure_from:
+                break
+            await self._schedule(fire, scheduled, False, capacity, in_flight)
+
+        for i in range(int(round(rate * profile.duration_seconds))):
+            await self._schedule(fire, measure_from + i / rate, True, capacity, in_flight)
+
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def _schedule(self, fire, intended: float, record: bool, capacity, in_flight) -> None:
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await capacity.acquire()
+        task = asyncio.create_task(fire(intended, record))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+"""backend.services.quality_gates.result_cache
+
+Content-hash keyed cache of quality gate findings.
+
+Per-file findings are cached under ``(gate type, tool version, config hash,
+file path, file content hash)`` so a gate only re-analyzes files whose
+content changed since the last evaluation and merges cached findings for the
+rest. The config hash covers the gate/tool configuration plus the project's
+dependency and tool manifests, so editing e.g. ``package.json`` or
+``ruff.toml`` invalidates every entry derived from it.
+
+Gates whose analysis is inherently cross-file (type checking, coverage) are
+cached as a whole, keyed on a digest of the analyzed tree.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ...db.models.enums import QualityGateType
+
+
+logger = logging.getLogger(__name__)
+
+# Findings for one file: a list of JSON-serializable issue/function dicts.
+FileFindings = List[Dict[str, Any]]
+# Analyzers return ``None`` when the tool output was unusable (crash, bad
+# config); such runs are reported as-is but never cached.
+Analyzer = Callable[[List[str]], Awaitable[Optional[Dict[str, FileFindings]]]]
+
+# Files whose content changes what a tool reports for *other* files.
+DEPENDENCY_MANIFESTS = (
+    "package.json",
+    "package-lock.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "tsconfig.json",
+    ".eslintrc",
+    ".eslintrc.js",
+    ".eslintrc.json",
+    ".eslintrc.yml",
+    "eslint.config.js",
+    "requirements.txt",
+    "pyproject.toml",
+    "poetry.lock",
+    "setup.cfg",
+    "ruff.toml",
+    ".ruff.toml",
+    "mypy.ini",
+    ".flake8",
+    "composer.json",
+    "composer.lock",
+    "phpmd.xml",
+)
+
+# Gates cached as a whole because their findings depend on the full tree.
+TREE_CACHED_GATES = frozenset({QualityGateType.TYPE_CHECK, QualityGateType.COVERAGE})
+
+DEFAULT_EXCLUDED_DIRS = frozenset({
+    ".git", "node_modules", "__pycache__", ".venv", "venv", ".tox",
+    "build", "dist", "vendor", ".mypy_cache", ".pytest_cache",
+})
+
+
+def normalize_path(working_directory: Optional[str], path: str) -> str:
+    """Resolve ``path`` (absolute or relative to the working dir) to an absolute path."""
+    return os.path.normpath(os.path.join(working_directory or os.getcwd(), path))
+
+
+def hash_config(config: Any) -> str:
+    """Stable short hash of a JSON-serializable configuration value."""
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class GateResultCache:
+    """Bounded LRU cache of per-file and per-tree gate findings."""
+
+    def __init__(self, max_entries: int = 50000, max_digest_entries: int = 100000):
+        self.max_entries = max_entries
+        self.max_digest_entries = max_digest_entries
+        self._entries: "OrderedDict[Tuple[str, ...], Any]" = OrderedDict()
+        # path -> (mtime_ns, size, sha256) so unchanged files are not re-read
+        self._digests: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+        self._digest_lock = threading.Lock()
+        self._tool_versions: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Fingerprints
+    # ------------------------------------------------------------------
+
+    def file_digest(self, path: str) -> Optional[str]:
+        """Return the content hash of ``path``, reusing it while mtime/size are unchanged."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        with self._digest_lock:
+            cached = self._digests.get(path)
+            if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                self._digests.move_to_end(path)
+                return cached[2]
+
+        digest = hashlib.sha256()
+        try:
+            with open(path, "rb") as handle:
+                for block in iter(lambda: handle.read(1 << 16), b""):
+                    digest.update(block)
+        except OSError:
+            return None
+
+        value = digest.hexdigest()
+        with self._digest_lock:
+            self._digests[path] = (stat.st_mtime_ns, stat.st_size, value)
+            self._digests.move_to_end(path)
+            while len(self._digests) > self.max_digest_entries:
+                self._digests.popitem(last=False)
+        return value
+
+    def manifest_digest(self, working_directory: Optional[str]) -> str:
+        """Digest of the dependency/tool manifests present in the project root."""
+        if not working_directory:
+            return ""
+        parts = []
+        for name in DEPENDENCY_MANIFESTS:
+            digest = self.file_digest(os.path.join(working_directory, name))
+            if digest:
+                parts.append(f"{name}:{digest}")
+        return hash_config(parts)
+
+    def config_fingerprint(self, config: Any, working_directory: Optional[str]) -> str:
+        """Hash of the gate configuration combined with the project manifests."""
+        return hash_config([config, self.manifest_digest(working_directory)])
+
+    def tree_digest(
+        self,
+        working_directory: str,
+        excluded_dirs: Iterable[str] = DEFAULT_EXCLUDED_DIRS,
+    ) -> str:
+        """Digest of every file under ``working_directory`` (paths and contents)."""
+        excluded = set(excluded_dirs)
+        entries = []
+        for root, dirs, files in os.walk(working_directory):
+            dirs[:] = sorted(d for d in dirs if d not in excluded)
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                digest = self.file_digest(path)
+                if digest:
+                    entries.append(f"{os.path.relpath(path, working_directory)}:{digest}")
+        return hash_config(entries)
+
+    async def tool_version(self, command: List[str], cwd: Optional[str] = None) -> str:
+        """Return ``<tool> --version`` output, memoized per tool for the process lifetime."""
+        tool = command[:2] if command and command[0] == "npx" else command[:1]
+        key = " ".join(tool)
+        if not key:
+            return "unknown"
+        if key in self._tool_versions:
+            return self._tool_versions[key]
+
+        version = "unknown"
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *tool, "--version",
+                cwd=cwd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=30)
+            if process.returncode == 0 and stdout:
+                version = stdout.decode(errors="replace").strip().splitlines()[0]
+        except Exception as e:
+            logger.debug(f"Could not determine version of {key}: {e}")
+        self._tool_versions[key] = version
+        return version
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _get(self, key: Tuple[str, ...]) -> Any:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def _put(self, key: Tuple[str, ...], value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _fingerprint_files(
+        self,
+        config: Any,
+        working_directory: Optional[str],
+        files: List[str],
+    ) -> Tuple[str, Dict[str, Optional[str]]]:
+        """Hash config/manifests and file contents (blocking; run in a thread)."""
+        fingerprint = self.config_fingerprint(config, working_directory)
+        digests = {}
+        for file_path in files:
+            path = normalize_path(working_directory, file_path)
+            digests[path] = self.file_digest(path)
+        return fingerprint, digests
+
+    async def run_incremental(
+        self,
+        gate_type: QualityGateType,
+        command: List[str],
+        config: Any,
+        working_directory: Optional[str],
+        files: List[str],
+        analyze: Analyzer,
+    ) -> Dict[str, FileFindings]:
+        """
+        Return findings for ``files``, running ``analyze`` only on cache misses.
+
+        ``analyze`` receives the changed files and must return findings keyed
+        by normalized absolute path; files it does not mention are recorded as
+        clean. The merged mapping covers every input file.
+        """
+        version = await self.tool_version(command, cwd=working_directory)
+        fingerprint, digests = await asyncio.to_thread(
+            self._fingerprint_files, config, working_directory, files
+        )
+
+        merged: Dict[str, FileFindings] = {}
+        misses: List[str] = []
+        keys: Dict[str, Tuple[str, ...]] = {}
+
+        for file_path in files:
+            path = normalize_path(working_directory, file_path)
+            digest = digests.get(path)
+            if digest is None:
+                misses.append(file_path)
+                continue
+            key = ("file", gate_type.value, version, fingerprint, path, digest)
+            keys[path] = key
+            cached = self._get(key)
+            if cached is None:
+                misses.append(file_path)
+            else:
+                merged[path] = cached
+
+        self.hits += len(files) - len(misses)
+        self.misses += len(misses)
+
+        if misses:
+            fresh = await analyze(misses)
+            cacheable = fresh is not None
+            fresh = fresh or {}
+            for file_path in misses:
+                path = normalize_path(working_directory, file_path)
+                findings = fresh.get(path, [])
+                merged[path] = findings
+                if cacheable and path in keys:
+                    self._put(keys[path], findings)
+            # Findings reported for files outside the requested set are kept as-is
+            for path, findings in fresh.items():
+                merged.setdefault(path, findings)
+
+        logger.debug(
+            f"{gate_type.value}: {len(files) - len(misses)} cached, {len(misses)} analyzed"
+        )
+        return merged
+
+    def index_digest(self, file_index: Any) -> str:
+        """Digest of the files in a ``ProjectFileIndex`` (paths and contents)."""
+        entries = []
+        for indexed in file_index.files:
+            digest = self.file_digest(indexed.path)
+            if digest:
+                entries.append(f"{indexed.relpath}:{digest}")
+        return hash_config(entries)
+
+    async def get_tree_result(
+        self,
+        gate_type: QualityGateType,
+        config: Any,
+        working_directory: str,
+        file_index: Any = None,
+    ) -> Tuple[Tuple[str, ...], Any]:
+        """
+        Look up a whole-gate result; returns ``(key, cached GateResult or None)``.
+
+        When the evaluation's file index is given the tree is not walked again.
+        """
+        def fingerprint_tree() -> Tuple[str, str]:
+            if file_index is not None and file_index.covers(working_directory):
+                tree = self.index_digest(file_index)
+            else:
+                tree = self.tree_digest(working_directory)
+            return self.config_fingerprint(config, working_directory), tree
+
+        fingerprint, tree = await asyncio.to_thread(fingerprint_tree)
+        key = ("tree", gate_type.value, fingerprint, tree)
+        cached = self._get(key)
+        if cached is None:
+            self.misses += 1
+            return key, None
+        self.hits += 1
+        return key, copy.deepcopy(cached)
+
+    def put_tree_result(self, key: Tuple[str, ...], result: Any) -> None:
+        """Store a whole-gate ``GateResult`` under a key from ``get_tree_result``."""
+        self._put(key, copy.deepcopy(result))
+
+    def invalidate(self, gate_type: Optional[QualityGateType] = None) -> int:
+        """Drop cached findings for one gate type (or all); returns entries removed."""
+        if gate_type is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+        stale = [key for key in self._entries if key[1] == gate_type.value]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+# Global cache instance
+_gate_result_cache: Optional[GateResultCache] = None
+
+
+def get_gate_result_cache() -> GateResultCache:
+    """Get global gate result cache instance."""
+    global _gate_result_cache
+    if _gate_result_cache is None:
+        _gate_result_cache = GateResultCache()
+    return _gate_result_cache
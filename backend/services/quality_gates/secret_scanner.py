@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""backend.services.quality_gates.secret_scanner
+
+Single-pass scanner for hardcoded secrets.
+
+All secret rules are compiled into one alternation of named groups and run
+once over each memory-mapped file, so a file is read once regardless of the
+number of rules. Line numbers come from a newline offset index built only
+for files that actually contain a match. Large trees are scanned in batches
+on a process pool.
+"""
+
+import asyncio
+import bisect
+import logging
+import math
+import mmap
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever rules change so cached findings are invalidated
+SCANNER_VERSION = "1"
+
+# (rule name, pattern, severity). Keyword rules capture the value in a group.
+SECRET_RULES: List[Tuple[str, str, str]] = [
+    ("password", r'(?i:password\s*[:=]\s*["\']([^"\']{6,})["\'])', "high"),
+    ("api_key", r'(?i:api[_-]?key\s*[:=]\s*["\']([^"\']{10,})["\'])', "critical"),
+    ("secret", r'(?i:secret\s*[:=]\s*["\']([^"\']{8,})["\'])', "critical"),
+    ("token", r'(?i:token\s*[:=]\s*["\']([^"\']{20,})["\'])', "high"),
+    ("stripe_key", r'\b(?:sk|pk|sk_live|pk_live)_[a-zA-Z0-9]{16,}\b', "critical"),
+    ("aws_access_key", r'\bAKIA[0-9A-Z]{16}\b', "critical"),
+]
+
+SECRET_SCAN_PATTERNS = ["**/*.py", "**/*.js", "**/*.ts", "**/*.php", "**/*.java", "**/*.go"]
+
+# Generated bundles beyond this size are skipped rather than scanned
+DEFAULT_MAX_FILE_BYTES = 20 * 1024 * 1024
+
+# Below these sizes a process pool costs more than it saves
+PROCESS_POOL_MIN_FILES = 64
+PROCESS_POOL_MIN_BYTES = 8 * 1024 * 1024
+PROCESS_POOL_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def _compile_rules(rules: List[Tuple[str, str, str]]) -> "re.Pattern[bytes]":
+    alternation = "|".join(f"(?P<r{index}>{pattern})" for index, (_, pattern, _) in enumerate(rules))
+    return re.compile(alternation.encode("ascii"))
+
+
+_COMBINED_PATTERN = _compile_rules(SECRET_RULES)
+# Group holding the secret value per rule (the quoted value for keyword rules,
+# the whole rule match otherwise); entropy is scored on this value
+_VALUE_GROUPS = [
+    _COMBINED_PATTERN.groupindex[f"r{index}"] + (1 if re.compile(pattern).groups else 0)
+    for index, (_, pattern, _) in enumerate(SECRET_RULES)
+]
+_NEWLINE = re.compile(b"\n")
+
+
+def shannon_entropy(value: str) -> float:
+    """Shannon entropy of ``value`` in bits per character."""
+    if not value:
+        return 0.0
+    length = len(value)
+    return -sum((count / length) * math.log2(count / length) for count in Counter(value).values())
+
+
+def scan_file(
+    path: str,
+    min_entropy: float = 0.0,
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+) -> List[Dict[str, Any]]:
+    """Scan one file for secrets in a single regex pass."""
+    try:
+        size = os.path.getsize(path)
+        if size == 0 or size > max_file_bytes:
+            return []
+        with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            issues = []
+            line_starts: Optional[List[int]] = None
+            for match in _COMBINED_PATTERN.finditer(data):
+                index = int(match.lastgroup[1:])
+                rule, _, severity = SECRET_RULES[index]
+                text = match.group(0).decode("utf-8", errors="ignore")
+
+                value = match.group(_VALUE_GROUPS[index]).decode("utf-8", errors="ignore")
+                entropy = shannon_entropy(value)
+                if entropy < min_entropy:
+                    continue
+
+                if line_starts is None:
+                    line_starts = [m.end() for m in _NEWLINE.finditer(data)]
+                issues.append({
+                    "file": path,
+                    "line": bisect.bisect_right(line_starts, match.start()) + 1,
+                    "message": "Potential hardcoded secret detected",
+                    "match": text,
+                    "rule": rule,
+                    "entropy": round(entropy, 2),
+                    "severity": severity,
+                })
+            return issues
+    except (OSError, ValueError) as e:
+        logger.debug(f"Error scanning {path}: {e}")
+        return []
+
+
+def scan_files(
+    paths: List[str],
+    min_entropy: float = 0.0,
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Scan a batch of files; returns issues keyed by path (runs in a worker)."""
+    return {path: scan_file(path, min_entropy, max_file_bytes) for path in paths}
+
+
+# Lazily created pool shared by all scans
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=PROCESS_POOL_WORKERS)
+    return _process_pool
+
+
+async def scan_paths(
+    paths: List[str],
+    min_entropy: float = 0.0,
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Scan ``paths`` off the event loop.
+
+    Small batches run in a thread; large trees are split across a process
+    pool, falling back to a thread if the pool is unavailable.
+    """
+    if not paths:
+        return {}
+
+    total_bytes = 0
+    for path in paths:
+        try:
+            total_bytes += os.path.getsize(path)
+        except OSError:
+            pass
+
+    if len(paths) < PROCESS_POOL_MIN_FILES and total_bytes < PROCESS_POOL_MIN_BYTES:
+        return await asyncio.to_thread(scan_files, paths, min_entropy, max_file_bytes)
+
+    global _process_pool
+    try:
+        pool = _get_process_pool()
+        # A few batches per worker keeps IPC low while balancing uneven files
+        batch_size = max(1, math.ceil(len(paths) / (PROCESS_POOL_WORKERS * 4)))
+        loop = asyncio.get_running_loop()
+        futures = [
+            loop.run_in_executor(pool, scan_files, paths[i:i + batch_size], min_entropy, max_file_bytes)
+            for i in range(0, len(paths), batch_size)
+        ]
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        for batch in await asyncio.gather(*futures):
+            results.update(batch)
+        return results
+    except (BrokenProcessPool, OSError, RuntimeError) as e:
+        logger.warning(f"Secret scan process pool unavailable, scanning in a thread: {e}")
+        _process_pool = None
+        return await asyncio.to_thread(scan_files, paths, min_entropy, max_file_bytes)
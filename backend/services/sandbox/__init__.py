@@ -7,7 +7,8 @@ with Docker-based containerization and resource limits.
 """
 
 from .runner import SandboxRunner, SandboxRunnerError
-from .executors import NodeExecutor, PythonExecutor, PHPExecutor, DockerExecutor
+from .executors import NodeExecutor, PythonExecutor, PHPExecutor, DockerExecutor, ExecutorFactory
+from .output import OutputRingBuffer
 
 # Global sandbox runner instance
 _sandbox_runner_instance = None
@@ -28,5 +29,7 @@ __all__ = [
     "PythonExecutor", 
     "PHPExecutor",
     "DockerExecutor",
+    "ExecutorFactory",
+    "OutputRingBuffer",
     "get_sandbox_runner",
 ]
\ No newline at end of file
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Bounded output capture for sandbox executions.
+
+Container output is streamed frame by frame from a worker thread; these
+buffers keep only the most recent bytes of each stream so a chatty or
+runaway process cannot grow the backend's memory without bound.
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Dict
+
+
+class OutputRingBuffer:
+    """
+    Thread-safe byte ring buffer that keeps the tail of a stream.
+
+    Writes beyond ``max_bytes`` evict the oldest bytes; the number of evicted
+    bytes is tracked in ``truncated_bytes`` so callers can flag the output.
+    """
+
+    def __init__(self, max_bytes: int):
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        self.max_bytes = max_bytes
+        self.truncated_bytes = 0
+        self._chunks: Deque[bytes] = deque()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk, evicting the oldest bytes when over capacity."""
+        if not chunk:
+            return
+
+        with self._lock:
+            if len(chunk) >= self.max_bytes:
+                # The chunk alone fills the buffer: keep only its tail.
+                self.truncated_bytes += self._size + len(chunk) - self.max_bytes
+                self._chunks.clear()
+                self._chunks.append(chunk[-self.max_bytes:])
+                self._size = self.max_bytes
+                return
+
+            self._chunks.append(chunk)
+            self._size += len(chunk)
+
+            while self._size > self.max_bytes:
+                overflow = self._size - self.max_bytes
+                head = self._chunks[0]
+                if len(head) <= overflow:
+                    self._chunks.popleft()
+                    self._size -= len(head)
+                    self.truncated_bytes += len(head)
+                else:
+                    self._chunks[0] = head[overflow:]
+                    self._size -= overflow
+                    self.truncated_bytes += overflow
+
+    def getvalue(self) -> bytes:
+        """Return the buffered bytes (oldest first)."""
+        with self._lock:
+            return b"".join(self._chunks)
+
+    def text(self) -> str:
+        """Return the buffered bytes decoded as UTF-8 (lossy)."""
+        return self.getvalue().decode("utf-8", errors="replace")
+
+    @property
+    def truncated(self) -> bool:
+        return self.truncated_bytes > 0
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def new_output_buffers(max_bytes: int) -> Dict[str, OutputRingBuffer]:
+    """Create a ``{"stdout": ..., "stderr": ...}`` pair of ring buffers."""
+    return {
+        "stdout": OutputRingBuffer(max_bytes),
+        "stderr": OutputRingBuffer(max_bytes),
+    }
+
+
+__all__ = ["OutputRingBuffer", "new_output_buffers"]
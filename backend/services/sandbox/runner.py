@@ -7,6 +7,7 @@ and multi-language support for safe code execution.
 """
 
 import asyncio
+import codecs
 import json
 import logging
 import os
@@ -14,7 +15,7 @@ import shlex
 import time
 import uuid
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Awaitable, Callable
 from datetime import datetime
 
 try:
@@ -35,10 +36,27 @@ except ImportError:  # pragma: no cover
 
     Container = object  # type: ignore
 
+try:
+    from requests.exceptions import ConnectionError as _RequestsConnectionError  # type: ignore
+    from requests.exceptions import ReadTimeout as _RequestsReadTimeout  # type: ignore
+except ImportError:  # pragma: no cover
+    _RequestsConnectionError = _RequestsReadTimeout = None  # type: ignore
+
 from .executors import LanguageExecutor, ExecutorFactory
+from .output import OutputRingBuffer, new_output_buffers
 
 logger = logging.getLogger(__name__)
 
+# ``container.wait(timeout=...)`` surfaces an API-side timeout as a requests error.
+_WAIT_TIMEOUT_ERRORS = tuple(
+    exc
+    for exc in (asyncio.TimeoutError, _RequestsReadTimeout, _RequestsConnectionError)
+    if exc is not None
+)
+
+# Callback receiving ("stdout" | "stderr", decoded text) as frames arrive.
+OutputCallback = Callable[[str, str], Awaitable[None]]
+
 
 class SandboxRunnerError(Exception):
     """Base exception for sandbox runner errors."""
@@ -88,6 +106,12 @@ class SandboxRunner:
     DEFAULT_MEMORY_LIMIT = "512m"
     DEFAULT_CPU_LIMIT = "1.0"
     DEFAULT_TIMEOUT = 30.0
+
+    # Per-stream cap on captured output (the tail is kept)
+    DEFAULT_MAX_OUTPUT_BYTES = 1024 * 1024
+
+    # Extra wall-clock slack over the API-side wait timeout
+    WAIT_GRACE_SECONDS = 5.0
     
     # Supported base images (single-file execute_code)
     BASE_IMAGES = {
@@ -127,14 +151,22 @@ class SandboxRunner:
                     "Docker SDK for Python is not installed. Install 'docker' or provide a docker_client."
                 )
             docker_host = os.getenv("DOCKER_HOST", "").strip()
-            if docker_host:
-                docker_client = docker.DockerClient(base_url=docker_host)
-            else:
-                docker_client = docker.from_env()
+            try:
+                if docker_host:
+                    docker_client = docker.DockerClient(base_url=docker_host)
+                else:
+                    docker_client = docker.from_env()
+            except Exception as e:
+                logger.error(f"Failed to create Docker client: {e}")
+                raise SandboxRunnerError(f"Docker connection failed: {e}")
 
         self.docker_client = docker_client
         self.executor_factory = ExecutorFactory()
         self.active_containers: Dict[str, Container] = {}
+        self.max_output_bytes = int(
+            os.getenv("SANDBOX_MAX_OUTPUT_BYTES", str(self.DEFAULT_MAX_OUTPUT_BYTES))
+        )
+        self._output_buffers: Dict[str, Dict[str, OutputRingBuffer]] = {}
 
         # Validate Docker connection
         try:
@@ -168,7 +200,9 @@ class SandboxRunner:
             memory_limit_mb: Memory limit in megabytes
             workspace_id: Workspace ID for scoping
             project_id: Project ID for scoping
-            **kwargs: Additional execution parameters
+            **kwargs: Additional execution parameters; ``on_output`` is an
+                optional async callback receiving ``(stream, text)`` for each
+                stdout/stderr frame as it is produced
         
         Returns:
             Execution result dictionary with success status, output, and metrics
@@ -216,6 +250,7 @@ class SandboxRunner:
                 container_config=container_config,
                 executor=executor,
                 timeout=timeout,
+                on_output=kwargs.get("on_output"),
             )
             
             # Calculate duration
@@ -357,8 +392,10 @@ class SandboxRunner:
                 {"name": "nofile", "soft": 4096, "hard": 8192},
                 {"name": "nproc", "soft": 256, "hard": 512},
             ],
-            "detach": False,
-            "remove": True,
+            # Started detached so output can be streamed; removed explicitly
+            # once logs and stats have been collected.
+            "detach": True,
+            "remove": False,
         }
 
     async def execute_project(
@@ -376,6 +413,8 @@ class SandboxRunner:
         """
         Write all project files under a temp dir and run ``test_command`` in a disposable
         container (Docker daemon: host or DinD via DOCKER_HOST).
+
+        Accepts the same ``on_output`` streaming callback as ``execute_code``.
         """
         lang = self._normalize_project_language(language)
         if lang not in self.PROJECT_BASE_IMAGES:
@@ -422,6 +461,7 @@ class SandboxRunner:
                 container_config=container_config,
                 executor=executor,
                 timeout=timeout,
+                on_output=kwargs.get("on_output"),
             )
 
             duration_ms = int((time.time() - start_time) * 1000)
@@ -551,8 +591,8 @@ class SandboxRunner:
                 {"name": "nofile", "soft": 1024, "hard": 2048},
                 {"name": "nproc", "soft": 64, "hard": 128},
             ],
-            "detach": False,  # Run in foreground to capture output
-            "remove": True,  # Auto-remove container after execution
+            "detach": True,  # Run detached so output can be streamed
+            "remove": False,  # Removed explicitly after logs/stats are collected
         }
         
         return container_config
@@ -563,53 +603,70 @@ class SandboxRunner:
         container_config: Dict[str, Any],
         executor: LanguageExecutor,
         timeout: float,
+        on_output: Optional[OutputCallback] = None,
     ) -> Dict[str, Any]:
         """
         Execute command in Docker container with monitoring.
+
+        All blocking Docker SDK calls run in worker threads so the event loop
+        stays responsive. stdout/stderr are read as demultiplexed frames while
+        the container runs, captured in bounded ring buffers and, when
+        ``on_output`` is given, forwarded incrementally.
         
         Args:
             execution_id: Execution identifier
             container_config: Docker container configuration
             executor: Language-specific executor
             timeout: Execution timeout
+            on_output: Optional async callback for live stdout/stderr frames
         
         Returns:
             Execution result dictionary
         """
         container = None
-        start_time = time.time()
+        buffers = new_output_buffers(self.max_output_bytes)
+        self._output_buffers[execution_id] = buffers
+        loop = asyncio.get_running_loop()
+        frames: Optional[asyncio.Queue] = asyncio.Queue() if on_output else None
+        forwarder: Optional[asyncio.Task] = None
+        pump: Optional[asyncio.Future] = None
         
         try:
             # Pull image if needed (in production, ensure images are pre-built)
             logger.debug(f"Pulling image: {container_config['image']}")
             
-            # Create container
-            container = self.docker_client.containers.run(**container_config)
+            # Create and start the container without blocking the loop
+            container = await asyncio.to_thread(
+                self.docker_client.containers.run, **container_config
+            )
             self.active_containers[execution_id] = container
+
+            if frames is not None:
+                forwarder = asyncio.create_task(
+                    self._forward_output(execution_id, frames, on_output)
+                )
+            pump = loop.run_in_executor(
+                None, self._pump_container_output, container, buffers, loop, frames
+            )
             
-            # Wait for completion with timeout
+            # Wait for completion; the Docker API enforces the timeout and the
+            # outer wait_for guards against a hung daemon connection.
             try:
-                result = container.wait(timeout=timeout)
+                result = await asyncio.wait_for(
+                    asyncio.to_thread(container.wait, timeout=timeout),
+                    timeout=timeout + self.WAIT_GRACE_SECONDS,
+                )
                 exit_code = result.get("StatusCode", 0)
                 
-                # Get container logs
-                logs = container.logs(stdout=True, stderr=True)
-                stdout_stderr = logs.decode("utf-8", errors="replace")
+                streamed = await pump
+                if not streamed:
+                    # Attach raced with a fast exit (or is unsupported):
+                    # fetch each stream separately, still demultiplexed.
+                    await self._collect_output(container, buffers)
+                await self._finish_forwarding(frames, forwarder)
                 
-                # Parse stdout/stderr
-                stdout_lines = []
-                stderr_lines = []
-                for line in stdout_stderr.split("\n"):
-                    if line.strip():
-                        # Try to determine if line is stderr (assuming apps use stderr for errors)
-                        if any(error_indicator in line.lower() for error_indicator in 
-                               ["error", "exception", "failed", "traceback", "stack trace"]):
-                            stderr_lines.append(line)
-                        else:
-                            stdout_lines.append(line)
-                
-                stdout = "\n".join(stdout_lines)
-                stderr = "\n".join(stderr_lines)
+                stdout = buffers["stdout"].text().strip("\n")
+                stderr = buffers["stderr"].text().strip("\n")
                 
                 # Get resource usage from container stats
                 resource_usage = await self._get_resource_usage(container)
@@ -626,38 +683,142 @@ class SandboxRunner:
                     "exit_code": exit_code,
                     "resource_usage": resource_usage,
                     "container_id": container.id,
+                    "output_truncated": buffers["stdout"].truncated or buffers["stderr"].truncated,
                 }
                 
-            except asyncio.TimeoutError:
-                # Kill container on timeout
+            except _WAIT_TIMEOUT_ERRORS:
+                # Kill container on timeout; the output stream then ends
                 if container:
-                    container.kill()
+                    await self._kill_container(container)
+                await asyncio.wait({pump}, timeout=self.WAIT_GRACE_SECONDS)
+                await self._finish_forwarding(frames, forwarder)
                 
                 return {
                     "success": False,
-                    "stdout": "",
-                    "stderr": f"Execution timed out after {timeout} seconds",
+                    "stdout": buffers["stdout"].text().strip("\n"),
+                    "stderr": f"Execution exceeded timeout of {timeout} seconds",
                     "exit_code": 124,  # timeout exit code
                     "resource_usage": await self._get_resource_usage(container),
                     "error_type": "ExecutionTimeoutError",
-                    "error_message": f"Execution timed out after {timeout} seconds",
+                    "error_message": f"Execution exceeded timeout of {timeout} seconds",
                 }
                 
         except DockerException as e:
             logger.error(f"Docker error during execution {execution_id}: {e}")
             
             if container:
-                try:
-                    container.kill()
-                except:
-                    pass
+                await self._kill_container(container)
             
             raise SandboxRunnerError(f"Docker execution failed: {e}")
             
         finally:
+            if forwarder is not None and not forwarder.done():
+                forwarder.cancel()
+            if container is not None:
+                await self._remove_container(container)
             # Clean up container reference
-            if execution_id in self.active_containers:
-                del self.active_containers[execution_id]
+            self.active_containers.pop(execution_id, None)
+            self._output_buffers.pop(execution_id, None)
+
+    @staticmethod
+    def _pump_container_output(
+        container: Container,
+        buffers: Dict[str, OutputRingBuffer],
+        loop: asyncio.AbstractEventLoop,
+        frames: Optional[asyncio.Queue],
+    ) -> bool:
+        """
+        Read demultiplexed output frames until the container exits.
+
+        Runs in a worker thread. Returns True if the attach stream delivered
+        any output, False if nothing was received (e.g. the container had
+        already exited) so the caller can fall back to ``container.logs``.
+        """
+        received = False
+        try:
+            stream = container.attach(
+                stdout=True, stderr=True, stream=True, logs=True, demux=True
+            )
+            for stdout_chunk, stderr_chunk in stream:
+                for name, chunk in (("stdout", stdout_chunk), ("stderr", stderr_chunk)):
+                    if not chunk:
+                        continue
+                    received = True
+                    buffers[name].write(chunk)
+                    if frames is not None:
+                        loop.call_soon_threadsafe(frames.put_nowait, (name, chunk))
+        except Exception as e:
+            logger.debug(f"Output stream ended for container {getattr(container, 'id', '?')}: {e}")
+        return received
+
+    async def _collect_output(
+        self,
+        container: Container,
+        buffers: Dict[str, OutputRingBuffer],
+    ) -> None:
+        """Fetch stdout and stderr separately after the container has exited."""
+        for name in ("stdout", "stderr"):
+            try:
+                data = await asyncio.to_thread(
+                    container.logs, stdout=name == "stdout", stderr=name == "stderr"
+                )
+            except DockerException as e:
+                logger.warning(f"Failed to read {name} of container {container.id}: {e}")
+                continue
+            if isinstance(data, bytes):
+                buffers[name].write(data)
+
+    async def _forward_output(
+        self,
+        execution_id: str,
+        frames: asyncio.Queue,
+        on_output: OutputCallback,
+    ) -> None:
+        """Decode queued frames and hand them to the output callback."""
+        decoders = {
+            name: codecs.getincrementaldecoder("utf-8")(errors="replace")
+            for name in ("stdout", "stderr")
+        }
+        while True:
+            item = await frames.get()
+            if item is None:
+                break
+            name, chunk = item
+            text = decoders[name].decode(chunk)
+            if not text:
+                continue
+            try:
+                await on_output(name, text)
+            except Exception as e:
+                logger.warning(f"Output callback failed for execution {execution_id}: {e}")
+
+    @staticmethod
+    async def _finish_forwarding(
+        frames: Optional[asyncio.Queue],
+        forwarder: Optional[asyncio.Task],
+    ) -> None:
+        """Signal end-of-stream to the forwarder and wait for it to drain."""
+        if frames is None or forwarder is None:
+            return
+        frames.put_nowait(None)
+        try:
+            await forwarder
+        except asyncio.CancelledError:
+            pass
+
+    async def _kill_container(self, container: Container) -> None:
+        """Kill a container, ignoring errors (it may already be gone)."""
+        try:
+            await asyncio.to_thread(container.kill)
+        except Exception as e:
+            logger.debug(f"Failed to kill container {getattr(container, 'id', '?')}: {e}")
+
+    async def _remove_container(self, container: Container) -> None:
+        """Force-remove a finished container, ignoring errors."""
+        try:
+            await asyncio.to_thread(container.remove, force=True)
+        except Exception as e:
+            logger.debug(f"Failed to remove container {getattr(container, 'id', '?')}: {e}")
     
     async def _get_resource_usage(self, container: Optional[Container]) -> Dict[str, Any]:
         """
@@ -678,7 +839,7 @@ class SandboxRunner:
             }
         
         try:
-            stats = container.stats(stream=False)
+            stats = await asyncio.to_thread(container.stats, stream=False)
             
             # Memory usage
             memory_usage = stats["memory_stats"].get("usage", 0)
@@ -783,8 +944,8 @@ class SandboxRunner:
         container = self.active_containers[execution_id]
         
         try:
-            container.kill()
-            del self.active_containers[execution_id]
+            await asyncio.to_thread(container.kill)
+            self.active_containers.pop(execution_id, None)
             logger.info(f"Execution {execution_id} stopped")
             return True
         except DockerException as e:
@@ -804,10 +965,15 @@ class SandboxRunner:
         if execution_id not in self.active_containers:
             return None
         
+        buffers = self._output_buffers.get(execution_id)
+        if buffers is not None:
+            # Served from the live capture; no Docker round trip needed
+            return buffers["stdout"].text() + buffers["stderr"].text()
+        
         container = self.active_containers[execution_id]
         
         try:
-            logs = container.logs(stdout=True, stderr=True, stream=False)
+            logs = await asyncio.to_thread(container.logs, stdout=True, stderr=True, stream=False)
             return logs.decode("utf-8", errors="replace")
         except DockerException as e:
             logger.error(f"Failed to get logs for execution {execution_id}: {e}")
@@ -5,11 +5,12 @@ Secret management services for secure storage, encryption, and rotation.
 """
 
 from .encryption import EncryptionService
-from .manager import SecretManager
+from .manager import DecryptedValueCache, SecretManager
 from .vault import VaultClient
 
 __all__ = [
     "EncryptionService",
+    "DecryptedValueCache",
     "SecretManager", 
     "VaultClient",
 ]
\ No newline at end of file
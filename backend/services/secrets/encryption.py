@@ -5,16 +5,26 @@ Encryption service supporting multiple backends:
 - Fernet (built-in, for development)
 - AWS KMS
 - HashiCorp Vault
+
+Values are envelope-encrypted by default: a Fernet data key encrypts the
+value locally and only the data key is encrypted ("wrapped") by the backend.
+A data key is reused for many values and kept unwrapped in memory for a
+while, so KMS and Vault are not called once per secret read or write.
 """
 
+import asyncio
 import base64
+import hashlib
 import logging
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 
 try:
-    from cryptography.fernet import Fernet
+    from cryptography.fernet import Fernet, MultiFernet
     from cryptography.hazmat.primitives import hashes
     from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 except ImportError:
@@ -37,10 +47,16 @@ from backend.db.models.enums import SecretBackend
 
 logger = logging.getLogger(__name__)
 
+# Envelope format: "env1.<base64 of the wrapped data key>.<Fernet token>"
+_ENVELOPE_PREFIX = "env1."
+
 
 class EncryptionBackend(ABC):
     """Abstract base class for encryption backends."""
 
+    # Rotated keys live in the key service, so every worker and every restart sees them
+    shared_keys = True
+
     @abstractmethod
     async def encrypt(self, plaintext: str) -> str:
         """Encrypt plaintext and return ciphertext."""
@@ -65,6 +81,9 @@ class EncryptionBackend(ABC):
 class FernetBackend(EncryptionBackend):
     """Fernet encryption backend for development and testing."""
 
+    # A rotated key exists only in this process; restarts reload secret_encryption_key
+    shared_keys = False
+
     def __init__(self, encryption_key: Optional[str] = None):
         if Fernet is None:
             raise ImportError("cryptography package not installed")
@@ -80,6 +99,8 @@ class FernetBackend(EncryptionBackend):
             encryption_key = base64.urlsafe_b64encode(key_bytes).decode()
         
         self._fernet = Fernet(key_bytes)
+        # Keys replaced by rotate_key(); kept so existing ciphertexts stay readable
+        self._retired_fernets: list = []
         self._key = encryption_key
         self._created_at = datetime.now(timezone.utc)
 
@@ -96,16 +117,24 @@ class FernetBackend(EncryptionBackend):
         """Decrypt ciphertext using Fernet."""
         try:
             ciphertext_bytes = base64.urlsafe_b64decode(ciphertext.encode())
-            plaintext_bytes = self._fernet.decrypt(ciphertext_bytes)
+            if self._retired_fernets:
+                plaintext_bytes = MultiFernet([self._fernet, *self._retired_fernets]).decrypt(ciphertext_bytes)
+            else:
+                plaintext_bytes = self._fernet.decrypt(ciphertext_bytes)
             return plaintext_bytes.decode()
         except Exception as e:
             logger.error(f"Fernet decryption failed: {e}")
             raise
 
     async def rotate_key(self) -> bool:
-        """Rotate Fernet key by generating a new one."""
+        """Rotate Fernet key by generating a new one.
+
+        The previous key is retired rather than discarded: it can still
+        decrypt, but all new ciphertexts use the new key.
+        """
         try:
             new_key = Fernet.generate_key()
+            self._retired_fernets.insert(0, self._fernet)
             self._fernet = Fernet(new_key)
             self._key = base64.urlsafe_b64encode(new_key).decode()
             self._created_at = datetime.now(timezone.utc)
@@ -129,7 +158,7 @@ class FernetBackend(EncryptionBackend):
     @property
     def key_id(self) -> str:
         """Return key identifier for tracking."""
-        return f"fernet_{self._created_at.strftime('%Y%m%d_%H%M%S')}"
+        return f"fernet_{hashlib.sha256(self._key.encode()).hexdigest()[:12]}"
 
 
 class AWSKMSBackend(EncryptionBackend):
@@ -279,6 +308,16 @@ class VaultBackend(EncryptionBackend):
         return f"vault_{self.mount_point}"
 
 
+@dataclass
+class _DataKey:
+    """Data key used for envelope encryption, with its wrapped form."""
+    key: bytes
+    fernet: Any
+    header: str
+    expires_at: float
+    uses: int = 0
+
+
 class EncryptionService:
     """Main encryption service supporting multiple backends."""
 
@@ -286,6 +325,12 @@ class EncryptionService:
         self._backends: Dict[SecretBackend, EncryptionBackend] = {}
         self._current_backend: Optional[EncryptionBackend] = None
         self._key_rotation_history: list = []
+        # Data key currently used for encryption
+        self._data_key: Optional[_DataKey] = None
+        # Wrapped data key header -> (expires_at, key bytes, Fernet)
+        self._unwrapped_keys: "OrderedDict[str, tuple]" = OrderedDict()
+        self._unwrapping: Dict[str, asyncio.Future] = {}
+        self._stats = {"data_keys_generated": 0, "data_key_unwraps": 0, "data_key_cache_hits": 0}
 
     async def initialize(self, backend_type: SecretBackend, **kwargs) -> None:
         """Initialize encryption service with specified backend."""
@@ -299,25 +344,35 @@ class EncryptionService:
             else:
                 raise ValueError(f"Unsupported encryption backend: {backend_type}")
 
-            # Test backend health
-            if not await backend.is_healthy():
-                raise Exception(f"Encryption backend {backend_type} is not healthy")
-
-            self._backends[backend_type] = backend
-            self._current_backend = backend
+            await self.register_backend(backend)
             logger.info(f"Encryption service initialized with {backend_type} backend")
 
         except Exception as e:
             logger.error(f"Failed to initialize encryption service: {e}")
             raise
 
+    async def register_backend(self, backend: EncryptionBackend) -> None:
+        """Health-check a backend instance and make it the current backend."""
+        if not await backend.is_healthy():
+            raise Exception(f"Encryption backend {backend.backend_type} is not healthy")
+
+        self._backends[backend.backend_type] = backend
+        self._current_backend = backend
+        self._data_key = None
+        self._unwrapped_keys.clear()
+
     async def encrypt(self, plaintext: str) -> str:
         """Encrypt plaintext using current backend."""
         if not self._current_backend:
             raise Exception("Encryption service not initialized")
         
         try:
-            ciphertext = await self._current_backend.encrypt(plaintext)
+            if settings.secret_envelope_encryption and Fernet is not None:
+                data_key = await self._get_data_key()
+                token = data_key.fernet.encrypt(plaintext.encode()).decode()
+                ciphertext = f"{_ENVELOPE_PREFIX}{data_key.header}.{token}"
+            else:
+                ciphertext = await self._current_backend.encrypt(plaintext)
             logger.debug("Data encrypted successfully")
             return ciphertext
         except Exception as e:
@@ -330,18 +385,137 @@ class EncryptionService:
             raise Exception("Encryption service not initialized")
         
         try:
-            plaintext = await self._current_backend.decrypt(ciphertext)
+            if ciphertext.startswith(_ENVELOPE_PREFIX):
+                header, token = ciphertext[len(_ENVELOPE_PREFIX):].split(".", 1)
+                _, fernet = await self._unwrap_data_key(header)
+                plaintext = fernet.decrypt(token.encode()).decode()
+            else:
+                # Written before envelope encryption, or with it disabled
+                plaintext = await self._current_backend.decrypt(ciphertext)
             logger.debug("Data decrypted successfully")
             return plaintext
         except Exception as e:
             logger.error(f"Decryption failed: {e}")
             raise
 
-    async def rotate_encryption_key(self) -> Dict[str, Any]:
-        """Rotate encryption key across all backends."""
+    async def reencrypt(self, ciphertext: str, rewrapped: Optional[Dict[str, str]] = None) -> str:
+        """
+        Re-encrypt a ciphertext under the backend's current key.
+
+        Envelope ciphertexts keep their payload; only the data key is
+        rewrapped. Legacy ciphertexts are decrypted and envelope-encrypted.
+
+        Args:
+            ciphertext: Value produced by :meth:`encrypt`
+            rewrapped: Old header -> new header map shared across a bulk run,
+                so each distinct data key is rewrapped once
+
+        Returns:
+            The re-encrypted ciphertext
+        """
+        if not self._current_backend:
+            raise Exception("Encryption service not initialized")
+
+        if not ciphertext.startswith(_ENVELOPE_PREFIX):
+            return await self.encrypt(await self._current_backend.decrypt(ciphertext))
+
+        header, token = ciphertext[len(_ENVELOPE_PREFIX):].split(".", 1)
+        new_header = rewrapped.get(header) if rewrapped is not None else None
+        if new_header is None:
+            key, fernet = await self._unwrap_data_key(header)
+            new_header = await self._wrap_data_key(key)
+            self._remember_data_key(new_header, key, fernet)
+            if rewrapped is not None:
+                rewrapped[header] = new_header
+        return f"{_ENVELOPE_PREFIX}{new_header}.{token}"
+
+    async def _get_data_key(self) -> _DataKey:
+        """Return the current data key, generating a new one when it is used up or expired."""
+        now = time.monotonic()
+        data_key = self._data_key
+        if data_key is None or data_key.uses >= settings.secret_data_key_max_uses or now >= data_key.expires_at:
+            key = Fernet.generate_key()
+            header = await self._wrap_data_key(key)
+            data_key = _DataKey(key, Fernet(key), header, now + settings.secret_data_key_ttl_seconds)
+            self._remember_data_key(header, key, data_key.fernet)
+            self._data_key = data_key
+            self._stats["data_keys_generated"] += 1
+        data_key.uses += 1
+        return data_key
+
+    async def _wrap_data_key(self, key: bytes) -> str:
+        wrapped = await self._current_backend.encrypt(key.decode())
+        return base64.urlsafe_b64encode(wrapped.encode()).decode()
+
+    async def _unwrap_data_key(self, header: str) -> tuple:
+        """Return (key bytes, Fernet) for a wrapped data key, from memory when possible."""
+        cached = self._unwrapped_keys.get(header)
+        if cached is not None and cached[0] > time.monotonic():
+            self._unwrapped_keys.move_to_end(header)
+            self._stats["data_key_cache_hits"] += 1
+            return cached[1], cached[2]
+
+        # Concurrent reads of values sharing a data key unwrap it once
+        pending = self._unwrapping.get(header)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._unwrapping[header] = future
+        try:
+            self._stats["data_key_unwraps"] += 1
+            wrapped = base64.urlsafe_b64decode(header.encode()).decode()
+            key = (await self._current_backend.decrypt(wrapped)).encode()
+            fernet = Fernet(key)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        else:
+            self._remember_data_key(header, key, fernet)
+            future.set_result((key, fernet))
+            return key, fernet
+        finally:
+            del self._unwrapping[header]
+
+    def _remember_data_key(self, header: str, key: bytes, fernet: Any) -> None:
+        self._unwrapped_keys[header] = (time.monotonic() + settings.secret_data_key_ttl_seconds, key, fernet)
+        self._unwrapped_keys.move_to_end(header)
+        while len(self._unwrapped_keys) > settings.secret_data_key_cache_size:
+            self._unwrapped_keys.popitem(last=False)
+
+    def clear_data_keys(self) -> None:
+        """Drop the current data key and all unwrapped data keys from memory."""
+        self._data_key = None
+        self._unwrapped_keys.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Data key counters and cache size."""
+        return {**self._stats, "cached_data_keys": len(self._unwrapped_keys)}
+
+    async def rotate_encryption_key(self, shared_only: bool = False) -> Dict[str, Any]:
+        """
+        Rotate encryption key across all backends.
+
+        Args:
+            shared_only: Skip backends whose rotated key would exist only in
+                this process (see ``EncryptionBackend.shared_keys``)
+        """
         rotation_results = {}
 
         for backend_type, backend in self._backends.items():
+            if shared_only and not backend.shared_keys:
+                logger.warning(f"Skipping key rotation for {backend_type}: rotated key would not be persisted")
+                rotation_results[backend_type] = {
+                    'success': False,
+                    'skipped': True,
+                    'error': 'Rotated key would exist only in this process; set a new key in configuration instead',
+                    'timestamp': datetime.now(timezone.utc).isoformat()
+                }
+                continue
             try:
                 success = await backend.rotate_key()
                 rotation_results[backend_type] = {
@@ -363,6 +537,9 @@ class EncryptionService:
                     'timestamp': datetime.now(timezone.utc).isoformat()
                 }
 
+        # New values must get data keys wrapped with the new backend key
+        self._data_key = None
+
         # Record rotation history
         self._key_rotation_history.append({
             'timestamp': datetime.now(timezone.utc).isoformat(),
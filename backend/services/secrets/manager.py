@@ -5,11 +5,13 @@ Secret management service for secure storage, retrieval, rotation, and audit log
 """
 
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict, Any, Union
 from uuid import UUID
 
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import and_, or_, desc, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.config import settings
@@ -88,11 +90,72 @@ class SecretMetadata:
         self.is_rotation_due = secret.is_rotation_due
 
 
+class DecryptedValueCache:
+    """Short-lived in-memory cache of decrypted secret values.
+
+    Entries remember the ciphertext they were decrypted from and are only
+    served while the stored ciphertext is unchanged, so a value rewritten by
+    another process is never returned. Local writes invalidate explicitly.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.secret_value_cache_ttl_seconds
+        self.max_entries = max_entries if max_entries is not None else settings.secret_value_cache_max_entries
+        # Secret ID -> (expires_at, ciphertext, value)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get(self, secret_id: str, encrypted_value: str) -> Optional[str]:
+        """Return the cached value if it is fresh and matches ``encrypted_value``."""
+        entry = self._entries.get(secret_id)
+        if entry is None or entry[0] <= time.monotonic() or entry[1] != encrypted_value:
+            if entry is not None:
+                del self._entries[secret_id]
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(secret_id)
+        self._stats["hits"] += 1
+        return entry[2]
+
+    def put(self, secret_id: str, encrypted_value: str, value: str) -> None:
+        """Cache a decrypted value."""
+        if self.ttl_seconds <= 0:
+            return
+        self._entries[secret_id] = (time.monotonic() + self.ttl_seconds, encrypted_value, value)
+        self._entries.move_to_end(secret_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, secret_id: str) -> None:
+        """Drop the cached value of one secret."""
+        self._entries.pop(secret_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached values."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and cache size."""
+        return {**self._stats, "cached": len(self._entries)}
+
+
+_value_cache: Optional[DecryptedValueCache] = None
+
+
+def get_secret_value_cache() -> DecryptedValueCache:
+    """Get the process-wide decrypted value cache."""
+    global _value_cache
+    if _value_cache is None:
+        _value_cache = DecryptedValueCache()
+    return _value_cache
+
+
 class SecretManager:
     """Service for managing encrypted secrets with rotation and audit logging."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, value_cache: Optional[DecryptedValueCache] = None):
         self.session = session
+        self.value_cache = value_cache if value_cache is not None else get_secret_value_cache()
 
     async def _get_audit_logger(self) -> AuditLogger:
         """Get audit logger instance."""
@@ -242,8 +305,14 @@ class SecretManager:
             workspace_id, secret_id, user_id, ip_address, user_agent
         )
         
+        cached_value = self.value_cache.get(secret.id, secret.encrypted_value)
+        if cached_value is not None:
+            logger.debug(f"Served secret '{secret.name}' value from cache for user {user_id}")
+            return cached_value
+
         try:
             decrypted_value = await encryption_service.decrypt(secret.encrypted_value)
+            self.value_cache.put(secret.id, secret.encrypted_value, decrypted_value)
             
             # Update access statistics (you might want to track this)
             logger.debug(f"Decrypted secret '{secret.name}' value for user {user_id}")
@@ -417,6 +486,8 @@ class SecretManager:
 
             await self.session.commit()
             await self.session.refresh(secret)
+            if 'value' in updated_fields:
+                self.value_cache.invalidate(secret.id)
 
             # Log audit event
             audit_logger = await self._get_audit_logger()
@@ -500,6 +571,7 @@ class SecretManager:
             secret.updated_at = datetime.now(timezone.utc)
 
             await self.session.commit()
+            self.value_cache.invalidate(secret.id)
 
             # Log audit event
             audit_logger = await self._get_audit_logger()
@@ -520,6 +592,83 @@ class SecretManager:
             logger.error(f"Failed to delete secret {secret_id}: {e}")
             raise
 
+    async def rotate_encryption_key(self, batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Rotate the encryption key and re-encrypt stored secrets under it.
+
+        Only backends whose rotated key is shared (KMS, Vault) are rotated.
+        A rotated Fernet key would exist only in this process: other workers
+        and the next restart would not be able to read anything written with it.
+        Secrets are re-encrypted only when the current backend was rotated.
+
+        Returns:
+            Per-backend rotation results and the re-encryption counts
+            (None when nothing was re-encrypted)
+        """
+        results = await encryption_service.rotate_encryption_key(shared_only=True)
+        current = results.get(encryption_service.current_backend, {})
+        reencryption = await self.reencrypt_secrets(batch_size) if current.get('success') else None
+        return {'results': results, 'reencryption': reencryption}
+
+    async def reencrypt_secrets(self, batch_size: Optional[int] = None) -> Dict[str, int]:
+        """
+        Re-encrypt every stored secret under the current encryption key.
+
+        Call after rotating the encryption key. Rows are streamed in primary
+        key order and each batch is committed on its own, so memory stays
+        bounded and an interrupted run can simply be started again.
+        Envelope-encrypted values only have their data key rewrapped, once
+        per distinct data key.
+
+        Returns:
+            Counts of processed, re-encrypted and failed secrets and batches
+        """
+        batch_size = batch_size or settings.secret_reencrypt_batch_size
+        rewrapped: Dict[str, str] = {}
+        counts = {'processed': 0, 'reencrypted': 0, 'failed': 0, 'batches': 0}
+        last_id = ""
+
+        while True:
+            result = await self.session.execute(
+                select(Secret.id, Secret.encrypted_value)
+                .where(Secret.id > last_id)
+                .order_by(Secret.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+
+            try:
+                for secret_id, encrypted_value in rows:
+                    counts['processed'] += 1
+                    try:
+                        new_value = await encryption_service.reencrypt(encrypted_value, rewrapped)
+                    except Exception as e:
+                        counts['failed'] += 1
+                        logger.error(f"Failed to re-encrypt secret {secret_id}: {e}")
+                        continue
+
+                    if new_value != encrypted_value:
+                        await self.session.execute(
+                            update(Secret).where(Secret.id == secret_id).values(encrypted_value=new_value)
+                        )
+                        counts['reencrypted'] += 1
+
+                await self.session.commit()
+            except Exception:
+                await self.session.rollback()
+                raise
+
+            counts['batches'] += 1
+            last_id = rows[-1][0]
+
+        logger.info(
+            f"Re-encrypted {counts['reencrypted']} of {counts['processed']} secrets "
+            f"({len(rewrapped)} data keys rewrapped, {counts['failed']} failed)"
+        )
+        return counts
+
     async def get_rotation_due_secrets(
         self,
         workspace_id: str,
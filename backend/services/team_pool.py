@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""backend.services.team_pool
+
+Bounded pool of reusable team instances.
+
+Building an ``MGXStyleTeam`` (roles, LLM clients, per-role configs) is
+expensive and the instance carries per-task state, so sharing one instance
+between concurrent tasks either serializes them or mixes their role memory.
+The pool hands each task its own instance: teams are checked out, reset on
+checkin and reused. The pool is capped in total and, optionally, per
+workspace; callers beyond a cap wait in FIFO order. Idle instances above the
+pre-warm floor are dropped after ``idle_timeout_seconds``.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+TeamFactory = Callable[[], Union[Any, Awaitable[Any]]]
+TeamReset = Callable[[Any], Union[None, Awaitable[None]]]
+
+
+class TeamPoolTimeout(TimeoutError):
+    """No team became available within the acquire timeout."""
+
+
+async def _maybe_await(value: Any) -> Any:
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class TeamPool:
+    """Checkout/checkin pool with total and per-workspace limits."""
+
+    def __init__(
+        self,
+        factory: TeamFactory,
+        reset: Optional[TeamReset] = None,
+        max_size: int = 4,
+        per_workspace_limit: int = 0,
+        min_idle: int = 0,
+        idle_timeout_seconds: float = 900.0,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            factory: Builds a new team (sync or async)
+            reset: Clears per-task state on checkin; a failing reset discards the team
+            max_size: Maximum instances alive at once
+            per_workspace_limit: Maximum instances one workspace may hold (0 = no limit)
+            min_idle: Idle instances kept regardless of idle_timeout_seconds
+            idle_timeout_seconds: Idle time after which an instance is dropped (0 = never)
+        """
+        self.factory = factory
+        self.reset = reset
+        self.max_size = max(1, max_size)
+        self.per_workspace_limit = max(0, per_workspace_limit)
+        self.min_idle = max(0, min(min_idle, self.max_size))
+        self.idle_timeout_seconds = idle_timeout_seconds
+
+        self._cond = asyncio.Condition()
+        # Most recently released last; reuse from the right, evict from the left
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._in_use: Dict[int, Optional[str]] = {}
+        self._workspace_counts: Dict[str, int] = {}
+        self._size = 0  # idle + in use + being built
+        self._waiting = 0
+        self._closed = False
+
+        self.created = 0
+        self.evicted = 0
+        self.discarded = 0
+        self.checkouts = 0
+        self.wait_count = 0
+        self.wait_total_seconds = 0.0
+        self.wait_max_seconds = 0.0
+
+    # ------------------------------------------------------------------
+    # Checkout / checkin
+    # ------------------------------------------------------------------
+
+    async def acquire(self, workspace_id: Optional[str] = None, timeout: Optional[float] = None) -> Any:
+        """Check out a team, building one if the pool is below ``max_size``.
+
+        Raises:
+            TeamPoolTimeout: If no team is available within ``timeout`` seconds
+        """
+        started = time.monotonic()
+        deadline = started + timeout if timeout else None
+        build = False
+
+        async with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Team pool is closed")
+                self._evict_idle_locked()
+                if self._workspace_allows(workspace_id):
+                    if self._idle:
+                        team, _ = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        build = True
+                        team = None
+                        break
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TeamPoolTimeout(f"No team available after {timeout:.1f}s")
+                self._waiting += 1
+                try:
+                    await asyncio.wait_for(self._cond.wait(), remaining)
+                except asyncio.TimeoutError:
+                    raise TeamPoolTimeout(f"No team available after {timeout:.1f}s") from None
+                finally:
+                    self._waiting -= 1
+
+            if workspace_id is not None:
+                self._workspace_counts[workspace_id] = self._workspace_counts.get(workspace_id, 0) + 1
+
+        if build:
+            try:
+                team = await _maybe_await(self.factory())
+            except BaseException:
+                async with self._cond:
+                    self._size -= 1
+                    self._release_workspace(workspace_id)
+                    self._cond.notify_all()
+                raise
+            self.created += 1
+
+        self._in_use[id(team)] = workspace_id
+        self.checkouts += 1
+        self._record_wait(time.monotonic() - started)
+        return team
+
+    async def release(self, team: Any, discard: bool = False) -> None:
+        """Return a team to the pool (reset first) or drop it with ``discard``."""
+        if id(team) not in self._in_use:
+            logger.warning("Ignoring release of a team that is not checked out")
+            return
+        workspace_id = self._in_use.pop(id(team))
+
+        if not discard and not self._closed and self.reset is not None:
+            try:
+                await _maybe_await(self.reset(team))
+            except Exception as e:
+                logger.warning(f"Team reset failed, discarding instance: {e}")
+                discard = True
+
+        async with self._cond:
+            self._release_workspace(workspace_id)
+            if discard or self._closed:
+                self._size -= 1
+                self.discarded += 1
+            else:
+                self._idle.append((team, time.monotonic()))
+                self._evict_idle_locked()
+            # Waiters differ in workspace, so wake all of them
+            self._cond.notify_all()
+
+    @asynccontextmanager
+    async def checkout(self, workspace_id: Optional[str] = None, timeout: Optional[float] = None):
+        """Context manager around acquire/release.
+
+        Usage:
+            async with pool.checkout(workspace_id) as team:
+                await team.execute()
+        """
+        team = await self.acquire(workspace_id, timeout=timeout)
+        discard = False
+        try:
+            yield team
+        except asyncio.CancelledError:
+            # A cancelled run may leave the team mid-flight
+            discard = True
+            raise
+        finally:
+            await self.release(team, discard=discard)
+
+    async def prewarm(self, count: Optional[int] = None) -> int:
+        """Build idle teams until ``count`` (default ``min_idle``) exist; returns how many were built."""
+        target = min(self.max_size, self.min_idle if count is None else count)
+        built = 0
+        while True:
+            async with self._cond:
+                if self._closed or self._size >= target:
+                    return built
+                self._size += 1
+            try:
+                team = await _maybe_await(self.factory())
+            except BaseException:
+                async with self._cond:
+                    self._size -= 1
+                    self._cond.notify_all()
+                raise
+            self.created += 1
+            built += 1
+            async with self._cond:
+                self._idle.append((team, time.monotonic()))
+                self._cond.notify_all()
+
+    async def close(self) -> None:
+        """Drop idle teams; teams still checked out are dropped on release."""
+        async with self._cond:
+            self._closed = True
+            self._size -= len(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool occupancy and checkout wait-time metrics."""
+        return {
+            "max_size": self.max_size,
+            "size": self._size,
+            "idle": len(self._idle),
+            "in_use": len(self._in_use),
+            "waiting": self._waiting,
+            "per_workspace_in_use": dict(self._workspace_counts),
+            "created": self.created,
+            "evicted": self.evicted,
+            "discarded": self.discarded,
+            "checkouts": self.checkouts,
+            "wait_count": self.wait_count,
+            "wait_total_seconds": round(self.wait_total_seconds, 6),
+            "wait_avg_seconds": round(self.wait_total_seconds / self.wait_count, 6) if self.wait_count else 0.0,
+            "wait_max_seconds": round(self.wait_max_seconds, 6),
+        }
+
+    # ------------------------------------------------------------------
+    # Internals (call with self._cond held)
+    # ------------------------------------------------------------------
+
+    def _workspace_allows(self, workspace_id: Optional[str]) -> bool:
+        if workspace_id is None or not self.per_workspace_limit:
+            return True
+        return self._workspace_counts.get(workspace_id, 0) < self.per_workspace_limit
+
+    def _release_workspace(self, workspace_id: Optional[str]) -> None:
+        if workspace_id is None:
+            return
+        count = self._workspace_counts.get(workspace_id, 0) - 1
+        if count > 0:
+            self._workspace_counts[workspace_id] = count
+        else:
+            self._workspace_counts.pop(workspace_id, None)
+
+    def _evict_idle_locked(self) -> None:
+        if not self.idle_timeout_seconds:
+            return
+        cutoff = time.monotonic() - self.idle_timeout_seconds
+        while len(self._idle) > self.min_idle and self._idle[0][1] <= cutoff:
+            self._idle.popleft()
+            self._size -= 1
+            self.evicted += 1
+
+    def _record_wait(self, seconds: float) -> None:
+        self.wait_count += 1
+        self.wait_total_seconds += seconds
+        self.wait_max_seconds = max(self.wait_max_seconds, seconds)
+
+
+__all__ = ["TeamPool", "TeamPoolTimeout"]
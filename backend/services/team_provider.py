@@ -15,6 +15,8 @@ from pathlib import Path
 from typing import Optional, Dict, Any, TYPE_CHECKING, Callable
 from contextlib import asynccontextmanager
 
+from backend.services.team_pool import TeamPool
+
 if TYPE_CHECKING:
     from mgx_agent import MGXStyleTeam, TeamConfig
 
@@ -42,22 +44,52 @@ class MGXTeamProvider:
         # Store config as-is - lazy import will happen in get_team()
         self.config = config
         self._team: Optional['MGXStyleTeam'] = None
+        self._team_cls = None
+        self._pool: Optional[TeamPool] = None
+        self._prewarm_task: Optional[asyncio.Task] = None
         self._lock = asyncio.Lock()
+        self._runtime_lock = asyncio.Lock()
         logger.info(f"MGXTeamProvider initialized (config will be resolved lazily)")
     
     async def get_team(self) -> 'MGXStyleTeam':
         """
-        Get or create the team instance.
+        Get or create the shared team instance.
         
-        Thread-safe lazy initialization with async lock.
+        Thread-safe lazy initialization with async lock. Task execution
+        should check a team out of the pool instead (``run_task``,
+        ``get_team_context``) so concurrent tasks do not share state.
         
         Returns:
             MGXStyleTeam instance
         """
-        # Lazy import to avoid Pydantic validation errors - only import when actually needed
         if self._team is None:
             async with self._lock:
                 if self._team is None:
+                    self._team = await self._build_team()
+        
+        return self._team
+    
+    async def _build_team(self) -> 'MGXStyleTeam':
+        """Build a new MGXStyleTeam (used by the pool and ``get_team``)."""
+        team_cls = await self._load_team_class()
+        try:
+            logger.info("Creating new MGXStyleTeam instance")
+            return team_cls(config=self.config)
+        except Exception as e:
+            logger.error(f"Failed to create MGXStyleTeam: {e}", exc_info=True)
+            raise RuntimeError(f"mgx_agent not available: {e}")
+    
+    async def _load_team_class(self):
+        """
+        Prepare the MetaGPT environment and import MGXStyleTeam (once).
+        
+        Returns:
+            The MGXStyleTeam class
+        """
+        # Lazy import to avoid Pydantic validation errors - only import when actually needed
+        if self._team_cls is None:
+            async with self._runtime_lock:
+                if self._team_cls is None:
                     try:
                         from backend.config import settings
                         
@@ -301,14 +333,104 @@ class MGXTeamProvider:
                             self.config.auto_approve_plan = True
                             logger.info("Set auto_approve_plan=True on existing config")
                         
-                        logger.info("Creating new MGXStyleTeam instance")
-                        self._team = MGXStyleTeam(config=self.config)
+                        self._team_cls = MGXStyleTeam
                     except Exception as e:
-                        logger.error(f"Failed to import or create MGXStyleTeam: {e}", exc_info=True)
+                        logger.error(f"Failed to import MGXStyleTeam: {e}", exc_info=True)
                         raise RuntimeError(f"mgx_agent not available: {e}")
         
-        return self._team
+        return self._team_cls
+
+    @property
+    def pool(self) -> TeamPool:
+        """Pool of MGXStyleTeam instances used for task execution."""
+        if self._pool is None:
+            from backend.config import settings
+
+            self._pool = TeamPool(
+                factory=self._build_team,
+                reset=self._reset_team,
+                max_size=settings.team_pool_max_size,
+                per_workspace_limit=settings.team_pool_per_workspace_limit,
+                min_idle=settings.team_pool_prewarm,
+                idle_timeout_seconds=settings.team_pool_idle_timeout_seconds,
+            )
+        return self._pool
+    
+    async def acquire_team(self, workspace_id: Optional[str] = None) -> 'MGXStyleTeam':
+        """
+        Check a team out of the pool; pair with ``release_team``.
+        
+        Args:
+            workspace_id: Workspace the task belongs to (per-workspace limit)
+        """
+        from backend.config import settings
+
+        return await self.pool.acquire(
+            workspace_id,
+            timeout=settings.team_pool_acquire_timeout_seconds or None,
+        )
+    
+    async def release_team(self, team: 'MGXStyleTeam', discard: bool = False) -> None:
+        """Return a checked-out team to the pool (``discard`` drops it instead)."""
+        await self.pool.release(team, discard=discard)
+    
+    async def prewarm(self) -> int:
+        """Build the configured number of idle teams ahead of the first task."""
+        return await self.pool.prewarm()
+    
+    def start_prewarm(self) -> Optional[asyncio.Task]:
+        """Pre-warm the pool in the background; failures are only logged."""
+        if not self.pool.min_idle:
+            return None
 
+        async def _prewarm():
+            try:
+                built = await self.prewarm()
+                logger.info(f"Pre-warmed {built} MGXStyleTeam instance(s)")
+            except Exception as e:
+                logger.warning(f"MGXStyleTeam pre-warm failed: {e}")
+
+        self._prewarm_task = asyncio.create_task(_prewarm())
+        return self._prewarm_task
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """Pool occupancy and checkout wait-time metrics."""
+        return self.pool.stats()
+    
+    @staticmethod
+    def _reset_team(team: Any) -> None:
+        """Clear per-task state so a pooled team can run the next task."""
+        from mgx_agent.adapter import MetaGPTAdapter
+
+        team.plan_approved = False
+        message_stream = getattr(team, "message_stream", None)
+        if message_stream is not None:
+            message_stream.reset()
+        parallel_rounds = getattr(team, "parallel_rounds", None)
+        if parallel_rounds is not None:
+            parallel_rounds.reset()
+        team.current_task = None
+        team.current_task_spec = None
+        team.progress = []
+        team.memory_log = []
+        team._last_output_dir = None
+        if getattr(team, "metrics", None):
+            team.metrics = []
+
+        env = getattr(getattr(team, "team", None), "env", None)
+        if env is None:
+            return
+        for role in getattr(env, "roles", {}).values():
+            mem_store = MetaGPTAdapter.get_memory_store(role)
+            if mem_store is not None and hasattr(mem_store, "clear"):
+                mem_store.clear()
+            msg_buffer = getattr(getattr(role, "rc", None), "msg_buffer", None)
+            if msg_buffer is not None and hasattr(msg_buffer, "pop_all"):
+                msg_buffer.pop_all()
+        history = getattr(env, "history", None)
+        if history is not None and hasattr(history, "clear"):
+            history.clear()
+    
     async def _persist_mgx_run_history(
         self,
         task: str,
@@ -368,7 +490,9 @@ class MGXTeamProvider:
     async def run_task(
         self, 
         task: str, 
-        max_attempts: int = 3
+        max_attempts: int = 3,
+        team: Optional['MGXStyleTeam'] = None,
+        workspace_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Run a task through the team.
@@ -376,11 +500,17 @@ class MGXTeamProvider:
         Args:
             task: Task description
             max_attempts: Maximum retry attempts
+            team: Team already checked out by the caller; otherwise one is
+                checked out of the pool for the duration of the task
+            workspace_id: Workspace the task belongs to (per-workspace limit)
         
         Returns:
             Task execution result
         """
-        team = await self.get_team()
+        if team is None:
+            async with self.get_team_context(workspace_id) as pooled_team:
+                return await self.run_task(task, max_attempts, team=pooled_team)
+        
         logger.info(f"Running task: {task[:50]}...")
         started_at = datetime.now(timezone.utc)
         plan: Optional[str] = None
@@ -421,38 +551,33 @@ class MGXTeamProvider:
                 "run_id": run_id,
             }
     
-    async def run_task_stream(self, task: str):
+    async def run_task_stream(self, task: str, workspace_id: Optional[str] = None):
         """
         Run a task through the team with streaming agent messages.
         
+        A team is checked out of the pool for the lifetime of the stream.
+        Messages are pushed by the team's message stream as roles publish
+        them, so each one is yielded once, as soon as it exists.
+        
         Args:
             task: Task description
+            workspace_id: Workspace the task belongs to (per-workspace limit)
             
         Yields:
             Dict with agent messages in DeepSite-compatible format:
             {
+                "id": "Stable message ID",
                 "agent": "Mike|Alex|Bob|Charlie",
                 "content": "Message content...",
                 "type": "message|plan|code|test|review",
                 "timestamp": "ISO timestamp"
             }
         """
-        from mgx_agent.adapter import MetaGPTAdapter
-        
-        team = await self.get_team()
+        team = await self.acquire_team(workspace_id)
         logger.info(f"Running task with streaming: {task[:50]}...")
         stream_started = datetime.now(timezone.utc)
         plan: Optional[str] = None
         
-        # Track seen messages to avoid duplicates
-        seen_message_ids = set()
-        
-        def get_message_id(msg):
-            """Generate unique ID for a message"""
-            content = getattr(msg, 'content', str(msg))
-            role = getattr(msg, 'role', 'unknown')
-            return f"{role}:{hash(content[:100])}"
-        
         def get_agent_name(role_name: str) -> str:
             """Map role name to agent name"""
             role_map = {
@@ -463,8 +588,8 @@ class MGXTeamProvider:
             }
             return role_map.get(role_name, role_name)
         
-        def get_message_type(role_name: str, cause_by: Any) -> str:
-            """Determine message type based on role and action"""
+        def get_message_type(role_name: str) -> str:
+            """Determine message type based on role"""
             if role_name == "TeamLeader":
                 return "plan"
             elif role_name == "Engineer":
@@ -475,34 +600,22 @@ class MGXTeamProvider:
                 return "review"
             return "message"
         
-        def collect_new_messages(team_instance):
-            """Collect new messages from team environment"""
-            new_messages = []
-            if hasattr(team_instance, 'team') and hasattr(team_instance.team, 'env'):
-                if hasattr(team_instance.team.env, 'roles'):
-                    for role in team_instance.team.env.roles.values():
-                        mem_store = MetaGPTAdapter.get_memory_store(role)
-                        if mem_store:
-                            messages = MetaGPTAdapter.get_messages(mem_store)
-                            for msg in messages:
-                                msg_id = get_message_id(msg)
-                                if msg_id not in seen_message_ids:
-                                    seen_message_ids.add(msg_id)
-                                    role_name = getattr(msg, 'role', 'unknown')
-                                    agent_name = get_agent_name(role_name)
-                                    cause_by = getattr(msg, 'cause_by', None)
-                                    msg_type = get_message_type(role_name, cause_by)
-                                    content = getattr(msg, 'content', str(msg))
-                                    
-                                    if content and len(content.strip()) > 0:
-                                        new_messages.append({
-                                            "agent": agent_name,
-                                            "content": content,
-                                            "type": msg_type,
-                                            "timestamp": datetime.utcnow().isoformat() + "Z"
-                                        })
-            return new_messages
+        def format_message(msg) -> Optional[Dict[str, Any]]:
+            """Convert a published team message to the streaming format"""
+            content = getattr(msg, 'content', str(msg))
+            if not content or not content.strip():
+                return None
+            role_name = getattr(msg, 'role', 'unknown')
+            return {
+                "id": team.message_stream.message_id(msg),
+                "agent": get_agent_name(role_name),
+                "content": content,
+                "type": get_message_type(role_name),
+                "timestamp": datetime.utcnow().isoformat() + "Z"
+            }
         
+        subscription = team.message_stream.subscribe()
+        phase_task: Optional[asyncio.Task] = None
         try:
             # Phase 1: Analyze and Plan
             yield {
@@ -512,12 +625,12 @@ class MGXTeamProvider:
                 "timestamp": datetime.utcnow().isoformat() + "Z"
             }
             
-            plan = await team.analyze_and_plan(task)
-            
-            # Stream plan message
-            plan_messages = collect_new_messages(team)
-            for msg in plan_messages:
-                yield msg
+            phase_task = asyncio.create_task(team.analyze_and_plan(task))
+            async for msg in subscription.until(phase_task):
+                event = format_message(msg)
+                if event:
+                    yield event
+            plan = phase_task.result()
             
             # Auto-approve the plan
             if hasattr(team, 'approve_plan'):
@@ -529,26 +642,13 @@ class MGXTeamProvider:
                     "timestamp": datetime.utcnow().isoformat() + "Z"
                 }
             
-            # Phase 2: Execute
-            # Execute in background and periodically check for new messages
-            import asyncio
-            
-            execution_task = asyncio.create_task(team.execute())
-            
-            # Poll for new messages while execution is running
-            while not execution_task.done():
-                await asyncio.sleep(0.5)  # Check every 500ms
-                new_messages = collect_new_messages(team)
-                for msg in new_messages:
-                    yield msg
-            
-            # Wait for execution to complete
-            result = await execution_task
-            
-            # Collect any remaining messages
-            final_messages = collect_new_messages(team)
-            for msg in final_messages:
-                yield msg
+            # Phase 2: Execute, forwarding messages as roles publish them
+            phase_task = asyncio.create_task(team.execute())
+            async for msg in subscription.until(phase_task):
+                event = format_message(msg)
+                if event:
+                    yield event
+            phase_task.result()
             
             # Final status
             yield {
@@ -575,6 +675,13 @@ class MGXTeamProvider:
                 "type": "error",
                 "timestamp": datetime.utcnow().isoformat() + "Z"
             }
+        finally:
+            subscription.close()
+            discard = phase_task is not None and not phase_task.done()
+            if discard:
+                # Stream abandoned mid-run; the instance cannot be reused safely
+                phase_task.cancel()
+            await self.release_team(team, discard=discard)
     
     async def simple_chat(self, message: str) -> Dict[str, Any]:
         """
@@ -774,22 +881,37 @@ KRİTİK KURALLAR - MUTLAKA UY:
             logger.info("Shutting down MGXStyleTeam")
             # Add any cleanup logic if needed
             self._team = None
+        if self._prewarm_task is not None and not self._prewarm_task.done():
+            self._prewarm_task.cancel()
+        self._prewarm_task = None
+        if self._pool is not None:
+            logger.info(f"Closing MGXStyleTeam pool: {self._pool.stats()}")
+            await self._pool.close()
+            self._pool = None
     
     @asynccontextmanager
-    async def get_team_context(self):
+    async def get_team_context(self, workspace_id: Optional[str] = None):
         """
         Context manager for team operations.
         
+        The team is checked out of the pool and reset when the block exits.
+        
         Usage:
-            async with team_provider.get_team_context() as team:
+            async with team_provider.get_team_context(workspace_id) as team:
                 result = await team.run(task)
         """
-        team = await self.get_team()
+        team = await self.acquire_team(workspace_id)
+        discard = False
         try:
             yield team
+        except asyncio.CancelledError:
+            discard = True
+            raise
         except Exception as e:
             logger.error(f"Team operation failed: {str(e)}")
             raise
+        finally:
+            await self.release_team(team, discard=discard)
     
     def __str__(self) -> str:
         """String representation."""
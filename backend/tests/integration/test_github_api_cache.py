@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""End-to-end tests for the conditional-request GitHub API client.
+
+A local stub GitHub server serves commits, pulls and issues with ETags,
+honours ``If-None-Match`` and counts the upstream hits it receives.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from backend.services.github.activity_feed import ActivityFeed
+from backend.services.github.api_client import GitHubAPIClient, GitHubAPIError
+from backend.services.github.issues_manager import IssuesManager
+from backend.services.github.pr_manager import PRManager
+
+REPO = "acme/widgets"
+
+
+def _resources():
+    user = {"login": "octocat"}
+    pulls = [
+        {
+            "number": n,
+            "title": f"PR {n}",
+            "body": "",
+            "state": "open",
+            "head": {"ref": f"feature/{n}", "sha": f"h{n}"},
+            "base": {"ref": "main", "sha": "b0"},
+            "html_url": f"https://github.com/{REPO}/pull/{n}",
+            "created_at": "2026-01-01T10:00:00Z",
+            "updated_at": f"2026-01-0{n}T12:00:00Z",
+            "merged_at": None,
+            "user": user,
+            "labels": [{"name": "bug"}],
+        }
+        for n in (1, 2)
+    ]
+    issues = [
+        {
+            "number": n,
+            "title": f"Issue {n}",
+            "body": "text",
+            "state": "open",
+            "html_url": f"https://github.com/{REPO}/issues/{n}",
+            "created_at": "2026-01-01T10:00:00Z",
+            "updated_at": f"2026-01-0{n}T13:00:00Z",
+            "closed_at": None,
+            "user": user,
+            "labels": [],
+            "assignees": [user],
+            "comments": 2,
+        }
+        for n in (3, 4, 5)
+    ]
+    # The issues endpoint also lists pull requests
+    issues.append({**issues[0], "number": 1, "pull_request": {"url": "..."}})
+    commits = [
+        {
+            "sha": f"c{n}",
+            "html_url": f"https://github.com/{REPO}/commit/c{n}",
+            "commit": {
+                "message": f"Commit {n}\n\nDetails",
+                "author": {"name": "Octo Cat", "date": f"2026-01-0{n}T09:00:00Z"},
+            },
+        }
+        for n in (1, 2, 3)
+    ]
+    return {
+        f"/repos/{REPO}/pulls": pulls,
+        f"/repos/{REPO}/issues": issues,
+        f"/repos/{REPO}/commits": commits,
+        f"/repos/{REPO}/issues/3": issues[0],
+    }
+
+
+class GitHubStub:
+    """Threaded GitHub REST stub with ETag support and hit counters."""
+
+    def __init__(self, latency: float = 0.0):
+        self.resources = _resources()
+        self.latency = latency
+        self.hits = Counter()
+        self.not_modified = 0
+        self.authorization = set()
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):  # noqa: N802
+                parsed = urlparse(self.path)
+                with stub._lock:
+                    stub.hits[parsed.path] += 1
+                    stub.authorization.add(self.headers.get("Authorization"))
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                data = stub.resources.get(parsed.path)
+                if data is None:
+                    return self._send(404, {"message": "Not Found"})
+
+                query = parse_qs(parsed.query)
+                headers = {}
+                if isinstance(data, list):
+                    per_page = int(query.get("per_page", ["30"])[0])
+                    page = int(query.get("page", ["1"])[0])
+                    start = (page - 1) * per_page
+                    if start + per_page < len(data):
+                        next_query = {**{k: v[0] for k, v in query.items()}, "page": page + 1}
+                        next_url = f"{stub.url}{parsed.path}?" + "&".join(f"{k}={v}" for k, v in next_query.items())
+                        headers["Link"] = f'<{next_url}>; rel="next"'
+                    data = data[start:start + per_page]
+
+                body = json.dumps(data).encode()
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    with stub._lock:
+                        stub.not_modified += 1
+                    return self._send(304, None, {"ETag": etag})
+                self._send(200, body, {"ETag": etag, **headers})
+
+            def _send(self, status, body, headers=None):
+                if body is not None and not isinstance(body, bytes):
+                    body = json.dumps(body).encode()
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body or b"")))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def github_stub():
+    with GitHubStub() as stub:
+        yield stub
+
+
+@pytest.fixture
+async def api_client(github_stub):
+    client = GitHubAPIClient(base_url=github_stub.url)
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+def git_service():
+    service = MagicMock()
+    service._resolve_token.return_value = "test-token"
+    return service
+
+
+class TestGitHubAPIClient:
+    """Conditional caching and request collapsing against the stub."""
+
+    async def test_revalidation_is_served_from_cache(self, github_stub, api_client):
+        path = f"/repos/{REPO}/issues/3"
+        first = await api_client.get_json(path, token="t")
+        second = await api_client.get_json(path, token="t")
+
+        assert first == second
+        assert github_stub.hits[path] == 2
+        assert github_stub.not_modified == 1
+        assert api_client.stats()["not_modified"] == 1
+
+    async def test_changed_resource_is_refetched(self, github_stub, api_client):
+        path = f"/repos/{REPO}/issues/3"
+        await api_client.get_json(path, token="t")
+        github_stub.resources[path] = {**github_stub.resources[path], "title": "Renamed"}
+
+        assert (await api_client.get_json(path, token="t"))["title"] == "Renamed"
+        assert github_stub.not_modified == 0
+
+    async def test_concurrent_identical_lookups_share_one_request(self):
+        with GitHubStub(latency=0.05) as slow_stub:
+            client = GitHubAPIClient(base_url=slow_stub.url)
+            path = f"/repos/{REPO}/issues/3"
+            results = await asyncio.gather(*(client.get_json(path, token="t") for _ in range(10)))
+            await client.aclose()
+
+        assert all(result == results[0] for result in results)
+        assert slow_stub.hits[path] == 1
+        assert client.stats()["collapsed"] == 9
+
+    async def test_cache_is_scoped_per_token(self, github_stub, api_client):
+        path = f"/repos/{REPO}/issues/3"
+        await api_client.get_json(path, token="a")
+        await api_client.get_json(path, token="b")
+
+        assert github_stub.not_modified == 0
+        assert github_stub.authorization == {"Bearer a", "Bearer b"}
+
+    async def test_pagination_and_errors(self, github_stub, api_client):
+        commits = await api_client.get_paginated(f"/repos/{REPO}/commits", token="t", params={"per_page": 2})
+        assert [c["sha"] for c in commits] == ["c1", "c2", "c3"]
+        assert github_stub.hits[f"/repos/{REPO}/commits"] == 2
+
+        with pytest.raises(GitHubAPIError) as exc_info:
+            await api_client.get_json(f"/repos/{REPO}/missing", token="t")
+        assert exc_info.value.status_code == 404
+
+
+class TestActivityFeedCaching:
+    """The activity feed revalidates instead of refetching on every view."""
+
+    async def test_repeated_feed_views_revalidate(self, github_stub, api_client, git_service):
+        feed = ActivityFeed(
+            git_service=git_service,
+            pr_manager=PRManager(git_service=git_service, api_client=api_client),
+            issues_manager=IssuesManager(git_service=git_service, api_client=api_client),
+            api_client=api_client,
+        )
+
+        first = await feed.get_activity_feed(REPO, limit=20)
+        second = await feed.get_activity_feed(REPO, limit=20)
+
+        assert [e.id for e in first] == [e.id for e in second]
+        assert {e.type for e in first} == {"commit", "pull_request", "issue"}
+        # Pull requests listed by the issues endpoint are skipped
+        assert sorted(e.id for e in first if e.type == "issue") == ["issue_3", "issue_4", "issue_5"]
+        assert next(e for e in first if e.id == "commit_c1").timestamp == "2026-01-01T09:00:00+00:00"
+
+        assert sum(github_stub.hits.values()) == 6
+        assert github_stub.not_modified == 3
+
+    async def test_issue_details_match_rest_payload(self, api_client, git_service):
+        manager = IssuesManager(git_service=git_service, api_client=api_client)
+        issue = await manager.get_issue(REPO, 3)
+
+        assert issue.title == "Issue 3"
+        assert issue.assignees == ["octocat"]
+        assert issue.comment_count == 2
+        assert issue.updated_at == "2026-01-03T13:00:00+00:00"
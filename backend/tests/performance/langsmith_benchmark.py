@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""Benchmark: per-call LangSmith run export vs. the batched background exporter.
+
+A local HTTP stub stands in for the LangSmith API (``POST /runs`` and
+``POST /runs/batch``), optionally adding a fixed delay per request to model
+network latency. The "per_call" variant reproduces the old logger: a new
+HTTP client and one request per run, each sent from a worker thread and
+awaited by the caller. The "batched" variant goes through ``LangSmithLogger``
+and its ``LangSmithExporter``.
+
+Usage:
+    python -m backend.tests.performance.langsmith_benchmark --runs 500
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+import httpx
+
+from mgx_observability.langsmith import LangSmithExporter, LangSmithLogger
+
+
+class LangSmithStub:
+    """Threaded HTTP server counting the runs it receives."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.runs = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):  # noqa: N802
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                payload = json.loads(body or b"{}")
+                received = len(payload.get("post", [])) if self.path == "/runs/batch" else 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                with stub._lock:
+                    stub.runs += received
+                    stub.requests += 1
+                self.send_response(202)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "LangSmithStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _call_kwargs(i: int) -> Dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    return {
+        "name": f"bench.{i}",
+        "provider": "stub",
+        "model": "stub-model",
+        "prompt": "p" * 512,
+        "output": "o" * 512,
+        "metadata": {"step": i},
+        "start_time": now,
+        "end_time": now,
+    }
+
+
+async def measure_per_call(url: str, runs: int) -> Dict[str, float]:
+    """Old behaviour: new client per run, one request per run, caller awaits it."""
+
+    def send(kwargs: Dict[str, Any]) -> None:
+        with httpx.Client(base_url=url, headers={"x-api-key": "bench"}) as client:
+            client.post("/runs", content=json.dumps(kwargs, default=str)).raise_for_status()
+
+    started = time.perf_counter()
+    for i in range(runs):
+        await asyncio.to_thread(send, _call_kwargs(i))
+    elapsed = time.perf_counter() - started
+    return {
+        "runs": runs,
+        "caller_us_per_run": round(elapsed / runs * 1e6, 1),
+        "runs_per_second": round(runs / elapsed, 1),
+    }
+
+
+async def measure_batched(url: str, runs: int, batch_size: int = 100) -> Dict[str, float]:
+    """Background exporter: enqueue cost for the caller, then end-to-end until flushed."""
+    exporter = LangSmithExporter(api_key="bench", endpoint=url, max_batch_size=batch_size, flush_interval=0.05)
+    logger = LangSmithLogger(api_key="bench", project="bench", endpoint=url, exporter=exporter)
+
+    started = time.perf_counter()
+    for i in range(runs):
+        await logger.log_llm_call(**_call_kwargs(i))
+    enqueued = time.perf_counter() - started
+    exporter.shutdown(timeout=60)
+    elapsed = time.perf_counter() - started
+
+    stats = exporter.stats()
+    return {
+        "runs": runs,
+        "caller_us_per_run": round(enqueued / runs * 1e6, 1),
+        "runs_per_second": round(runs / elapsed, 1),
+        "sent": stats["sent"],
+        "dropped": stats["dropped"],
+        "batches": stats["batches"],
+    }
+
+
+async def run_langsmith_benchmark(runs: int = 500, latency: float = 0.002) -> Dict[str, Any]:
+    """Run both variants against a fresh stub each and report the speedup."""
+    report: Dict[str, Any] = {"latency_s": latency}
+    with LangSmithStub(latency) as stub:
+        report["per_call"] = await measure_per_call(stub.url, runs)
+        report["per_call"]["received"] = stub.runs
+    with LangSmithStub(latency) as stub:
+        report["batched"] = await measure_batched(stub.url, runs)
+        report["batched"]["received"] = stub.runs
+        report["batched"]["requests"] = stub.requests
+
+    report["speedup"] = {
+        "throughput": round(report["batched"]["runs_per_second"] / report["per_call"]["runs_per_second"], 2),
+        "caller_latency": round(
+            report["per_call"]["caller_us_per_run"] / max(report["batched"]["caller_us_per_run"], 0.1), 2
+        ),
+    }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.002, help="Stub delay per request (seconds)")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_langsmith_benchmark(args.runs, args.latency))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""Microbenchmark: stacked BaseHTTPMiddleware layers vs. the pure-ASGI pipeline.
+
+Both variants run the same pipeline stages (feature flag context,
+observability context, structured logging, security headers). The "stacked"
+variant wraps every stage in its own ``BaseHTTPMiddleware``, which is how the
+stack was built before ``RequestPipeline``; the "pipeline" variant runs them
+in one ``RequestPipeline``. Requests are driven straight through the ASGI
+interface (no server, no HTTP client) so only middleware cost is measured.
+
+Usage:
+    python -m backend.tests.performance.middleware_benchmark --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from backend.middleware.feature_flag_context import FeatureFlagContextStage
+from backend.middleware.logging import StructuredLoggingStage
+from backend.middleware.observability import ObservabilityContextStage
+from backend.middleware.pipeline import PipelineStage, RequestPipeline
+from backend.middleware.security_headers import SecurityHeadersConfig, SecurityHeadersStage
+
+STREAM_CHUNK = b"x" * 4096
+
+
+class StackedStageMiddleware(BaseHTTPMiddleware):
+    """One pipeline stage as a ``BaseHTTPMiddleware`` layer (the old layout)."""
+
+    def __init__(self, app, stage: PipelineStage):
+        super().__init__(app)
+        self.stage = stage
+
+    async def dispatch(self, request: Request, call_next):
+        ctx: Dict[str, Any] = {}
+        error: Optional[BaseException] = None
+        try:
+            short_circuit = await self.stage.enter(request, ctx)
+            if short_circuit is not None:
+                return short_circuit
+            response = await call_next(request)
+            message = {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": response.raw_headers,
+            }
+            self.stage.response_started(request, message, ctx)
+            response.raw_headers = message["headers"]
+            return response
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            self.stage.exit(request, ctx, error)
+
+
+def default_stages() -> List[PipelineStage]:
+    """The stages ``create_app`` installs, outermost first."""
+    return [
+        FeatureFlagContextStage(),
+        ObservabilityContextStage(),
+        StructuredLoggingStage(),
+        SecurityHeadersStage(SecurityHeadersConfig(enable_hsts=True)),
+    ]
+
+
+def build_app(mode: str, stages: Optional[Sequence[PipelineStage]] = None, stream_chunks: int = 256) -> Starlette:
+    """Build a minimal app with the stages installed as ``stacked`` or ``pipeline``."""
+    stages = list(stages if stages is not None else default_stages())
+
+    async def ping(request: Request):
+        return JSONResponse({"ok": True})
+
+    async def stream(request: Request):
+        async def body():
+            for _ in range(stream_chunks):
+                yield STREAM_CHUNK
+
+        return StreamingResponse(body(), media_type="application/octet-stream")
+
+    if mode == "pipeline":
+        middleware = [Middleware(RequestPipeline, stages=stages)]
+    elif mode == "stacked":
+        # Middleware(...) list order is outermost first
+        middleware = [Middleware(StackedStageMiddleware, stage=stage) for stage in stages]
+    else:
+        raise ValueError(f"Unknown mode: {mode}")
+
+    return Starlette(
+        routes=[Route("/ping", ping), Route("/stream", stream)],
+        middleware=middleware,
+    )
+
+
+def _scope(path: str) -> Dict[str, Any]:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"workspace_id=ws-1",
+        "root_path": "",
+        "headers": [
+            (b"host", b"bench"),
+            (b"x-workspace-id", b"ws-1"),
+            (b"x-user-id", b"user-1"),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+
+async def call(app, path: str) -> Dict[str, Any]:
+    """Drive one request through ``app``; returns status, headers and timing of each chunk."""
+    received = False
+    started = time.perf_counter()
+    result: Dict[str, Any] = {"status": None, "headers": {}, "chunk_times": [], "bytes": 0}
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.sleep(3600)  # never disconnects during the request
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+            result["headers"] = {k.decode().lower(): v.decode() for k, v in message.get("headers", [])}
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            if body:
+                result["chunk_times"].append(time.perf_counter() - started)
+                result["bytes"] += len(body)
+
+    await app(_scope(path), receive, send)
+    result["total_seconds"] = time.perf_counter() - started
+    return result
+
+
+async def measure_request_overhead(app, requests: int) -> Dict[str, float]:
+    """Sequential small JSON requests; per-request latency percentiles in microseconds."""
+    for _ in range(min(50, requests)):
+        await call(app, "/ping")  # warm up
+
+    samples = []
+    for _ in range(requests):
+        samples.append((await call(app, "/ping"))["total_seconds"])
+    samples.sort()
+    return {
+        "requests": requests,
+        "mean_us": round(sum(samples) / len(samples) * 1e6, 1),
+        "p50_us": round(samples[len(samples) // 2] * 1e6, 1),
+        "p99_us": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6, 1),
+    }
+
+
+async def measure_streaming(app, repeats: int) -> Dict[str, float]:
+    """Streaming response throughput and time to first chunk."""
+    totals, firsts, size = [], [], 0
+    for _ in range(repeats):
+        result = await call(app, "/stream")
+        totals.append(result["total_seconds"])
+        firsts.append(result["chunk_times"][0])
+        size = result["bytes"]
+    total = sum(totals)
+    return {
+        "repeats": repeats,
+        "bytes_per_response": size,
+        "throughput_mb_s": round(size * repeats / total / 1e6, 1),
+        "first_chunk_us": round(sorted(firsts)[len(firsts) // 2] * 1e6, 1),
+    }
+
+
+async def run_middleware_benchmark(requests: int = 2000, stream_repeats: int = 50) -> Dict[str, Any]:
+    """Run both variants and report overhead, streaming throughput and the speedup."""
+    structlog_logger = logging.getLogger("backend.middleware.logging")
+    previous_level = structlog_logger.level
+    structlog_logger.setLevel(logging.WARNING)  # keep log I/O out of the numbers
+    try:
+        report: Dict[str, Any] = {}
+        for mode in ("stacked", "pipeline"):
+            app = build_app(mode)
+            report[mode] = {
+                "request": await measure_request_overhead(app, requests),
+                "streaming": await measure_streaming(app, stream_repeats),
+            }
+    finally:
+        structlog_logger.setLevel(previous_level)
+
+    stacked, pipeline = report["stacked"], report["pipeline"]
+    report["speedup"] = {
+        "request_mean": round(stacked["request"]["mean_us"] / pipeline["request"]["mean_us"], 2),
+        "request_p99": round(stacked["request"]["p99_us"] / pipeline["request"]["p99_us"], 2),
+        "streaming_throughput": round(
+            pipeline["streaming"]["throughput_mb_s"] / max(stacked["streaming"]["throughput_mb_s"], 0.1), 2
+        ),
+    }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--stream-repeats", type=int, default=50)
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_middleware_benchmark(args.requests, args.stream_repeats))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
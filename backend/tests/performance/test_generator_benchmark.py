@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""Benchmark: scaffold generation, per-variable replace vs. compiled templates."""
+
+import pytest
+
+from backend.tests.performance.generator_benchmark import run_generator_benchmark
+
+
+@pytest.mark.performance
+class TestGeneratorBenchmark:
+    """Compare the legacy sequential renderer with compiled concurrent generation."""
+
+    @pytest.mark.asyncio
+    async def test_compiled_generation_matches_and_outperforms_legacy(self):
+        report = await run_generator_benchmark(files=200, lines=300, custom_vars=40)
+
+        assert report["identical_output"] is True
+        assert report["compiled_templates"] == 8
+        assert report["compiled"]["files_per_second"] > report["legacy"]["files_per_second"]
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""Benchmark: LangSmith export throughput, per-call vs. batched exporter."""
+
+import pytest
+
+from backend.tests.performance.langsmith_benchmark import run_langsmith_benchmark
+
+
+@pytest.mark.performance
+class TestLangSmithBenchmark:
+    """Compare per-run clients and requests with the background exporter."""
+
+    @pytest.mark.asyncio
+    async def test_batched_exporter_outperforms_per_call_export(self):
+        report = await run_langsmith_benchmark(runs=100, latency=0.002)
+
+        assert report["batched"]["received"] == report["per_call"]["received"] == 100
+        assert report["batched"]["dropped"] == 0
+        assert report["batched"]["runs_per_second"] > report["per_call"]["runs_per_second"]
+        assert report["batched"]["caller_us_per_run"] < report["per_call"]["caller_us_per_run"]
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""Benchmark: per-request overhead of the request pipeline vs. stacked middleware."""
+
+import pytest
+
+from backend.tests.performance.middleware_benchmark import run_middleware_benchmark
+
+
+@pytest.mark.performance
+class TestMiddlewareBenchmark:
+    """Compare stacked BaseHTTPMiddleware layers with RequestPipeline."""
+
+    @pytest.mark.asyncio
+    async def test_pipeline_is_cheaper_than_stacked_layers(self):
+        report = await run_middleware_benchmark(requests=300, stream_repeats=10)
+
+        assert report["pipeline"]["request"]["mean_us"] < report["stacked"]["request"]["mean_us"]
+        assert (
+            report["pipeline"]["streaming"]["throughput_mb_s"]
+            > report["stacked"]["streaming"]["throughput_mb_s"]
+        )
@@ -1,7 +1,32 @@
-import pytest
+# -*- coding: utf-8 -*-
+"""backend.tests.test_agent_memory
+
+Tests for team memory and the append-only agent memory service.
+"""
+
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.db.models import (
+    AgentContextVersion,
+    AgentDefinition,
+    AgentInstance,
+    AgentMemoryEntry,
+    Project,
+    Workspace,
+)
+from backend.db.models.base import Base
+from backend.services.agents.context import SharedContextService
+from backend.services.agents.memory import AgentMemoryService
 from mgx_agent.team import MGXStyleTeam, TeamConfig
 
+
 @pytest.mark.asyncio
 class TestAgentMemory:
     
@@ -56,3 +81,199 @@ class TestAgentMemory:
         # Using mocks to verify RelevantMemoryMixin behavior or similar if accessible
         # Since we are testing MGXStyleTeam, we can check if it manages roles correctly.
         pass
+
+
+class TestAgentMemoryService:
+    """Test cases for agent memory storage."""
+
+    @pytest.fixture
+    async def session(self):
+        """In-memory database with one workspace, project and agent instance."""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as session:
+            workspace = Workspace(name="Memory", slug=f"memory-{uuid4().hex[:8]}")
+            session.add(workspace)
+            await session.flush()
+            project = Project(workspace_id=workspace.id, name="Memory", slug="memory")
+            definition = AgentDefinition(name="Coder", slug=f"coder-{uuid4().hex[:8]}", agent_type="coder")
+            session.add_all([project, definition])
+            await session.flush()
+            instances = [
+                AgentInstance(
+                    workspace_id=workspace.id,
+                    project_id=project.id,
+                    definition_id=definition.id,
+                    name=f"coder-{i}",
+                )
+                for i in range(2)
+            ]
+            session.add_all(instances)
+            await session.flush()
+            session.info["ids"] = (workspace.id, project.id, instances[0].id, instances[1].id)
+            yield session
+        await engine.dispose()
+
+    @staticmethod
+    async def _count(session, model, *conditions):
+        result = await session.execute(select(func.count()).select_from(model).where(*conditions))
+        return result.scalar_one()
+
+    @pytest.mark.asyncio
+    async def test_store_appends_one_row_without_snapshots(self, session):
+        """Each store inserts one entry; context versions are only written periodically."""
+        workspace_id, project_id, agent_id, _ = session.info["ids"]
+        service = AgentMemoryService(SharedContextService(), snapshot_interval=50)
+
+        for i in range(10):
+            await service.store_memory(session, agent_id, workspace_id, project_id, "history", {"step": i})
+
+        assert await self._count(session, AgentMemoryEntry) == 10
+        assert await self._count(session, AgentContextVersion) == 0
+
+    @pytest.mark.asyncio
+    async def test_retrieve_order_and_limit(self, session):
+        """Entries come back oldest first; a limit keeps the most recent ones."""
+        workspace_id, project_id, agent_id, _ = session.info["ids"]
+        service = AgentMemoryService(SharedContextService())
+        base = datetime.now(timezone.utc)
+
+        for i in range(5):
+            session.add(AgentMemoryEntry(
+                workspace_id=workspace_id,
+                project_id=project_id,
+                agent_instance_id=agent_id,
+                memory_key="history",
+                data={"step": i},
+                meta_data={},
+                size_bytes=11,
+                recorded_at=base + timedelta(seconds=i),
+                last_accessed_at=base + timedelta(seconds=i),
+            ))
+        await session.flush()
+
+        entries = await service.retrieve_memory(session, agent_id, workspace_id, "history")
+        assert [e["data"]["step"] for e in entries] == [0, 1, 2, 3, 4]
+
+        latest = await service.retrieve_memory(session, agent_id, workspace_id, "history", limit=2)
+        assert [e["data"]["step"] for e in latest] == [3, 4]
+
+        since = await service.retrieve_memory(
+            session, agent_id, workspace_id, "history", since=base + timedelta(seconds=3)
+        )
+        assert [e["data"]["step"] for e in since] == [3, 4]
+
+    @pytest.mark.asyncio
+    async def test_pruning_keeps_most_recent_entries(self, session):
+        """Compaction evicts least recently used entries beyond the cap and snapshots the context."""
+        workspace_id, project_id, agent_id, _ = session.info["ids"]
+        service = AgentMemoryService(SharedContextService(), max_memory_entries=3, snapshot_interval=5)
+
+        for i in range(5):
+            await service.store_memory(session, agent_id, workspace_id, project_id, "history", {"step": i})
+
+        entries = await service.retrieve_memory(session, agent_id, workspace_id, "history")
+        assert [e["data"]["step"] for e in entries] == [2, 3, 4]
+        assert await self._count(session, AgentContextVersion) == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_reads_defer_access_time_writes(self, session):
+        """Cache hits do not write; buffered access times are flushed in one update."""
+        workspace_id, project_id, agent_id, _ = session.info["ids"]
+        service = AgentMemoryService(SharedContextService(), access_flush_interval=3600)
+        for i in range(3):
+            await service.store_memory(session, agent_id, workspace_id, project_id, "history", {"step": i})
+
+        updates = []
+
+        def count_updates(conn, cursor, statement, *args):
+            if statement.lstrip().upper().startswith("UPDATE"):
+                updates.append(statement)
+
+        sync_engine = session.bind.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", count_updates)
+        try:
+            for _ in range(5):
+                entries = await service.retrieve_memory(session, agent_id, workspace_id, "history")
+            assert len(entries) == 3
+            assert updates == []
+
+            assert await service.flush_access_times(session) == 3
+            assert len(updates) == 1
+            assert await service.flush_access_times(session) == 0
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", count_updates)
+
+    @pytest.mark.asyncio
+    async def test_cache_hits_skip_expired_entries(self, session, monkeypatch):
+        """Entries past the TTL are not served from the cache."""
+        workspace_id, project_id, agent_id, _ = session.info["ids"]
+        service = AgentMemoryService(SharedContextService())
+        await service.store_memory(session, agent_id, workspace_id, project_id, "history", {"step": 0})
+        await service.store_memory(session, agent_id, workspace_id, project_id, "history", {"step": 1})
+        entries = await service.retrieve_memory(session, agent_id, workspace_id, "history")
+        assert len(entries) == 2
+
+        # Expire the first entry only
+        cutoff = datetime.fromisoformat(entries[0]["timestamp"])
+        monkeypatch.setattr(service, "_ttl_cutoff", lambda: cutoff)
+
+        entries = await service.retrieve_memory(session, agent_id, workspace_id, "history")
+        assert [e["data"]["step"] for e in entries] == [1]
+
+    @pytest.mark.asyncio
+    async def test_cache_hits_with_aware_timestamps(self, session):
+        """Timezone-aware ``recorded_at`` values (as Postgres returns them) are served from the cache."""
+        workspace_id, project_id, agent_id, _ = session.info["ids"]
+        service = AgentMemoryService(SharedContextService(), memory_ttl_hours=1)
+        now = datetime.now(timezone.utc)
+        for i, age in enumerate((timedelta(hours=2), timedelta(minutes=5))):
+            session.add(AgentMemoryEntry(
+                workspace_id=workspace_id,
+                project_id=project_id,
+                agent_instance_id=agent_id,
+                memory_key="history",
+                data={"step": i},
+                meta_data={},
+                size_bytes=11,
+                recorded_at=now - age,
+                last_accessed_at=now - age,
+            ))
+        await session.flush()
+
+        entries = await service.retrieve_memory(session, agent_id, workspace_id, "history")
+        assert [e["data"]["step"] for e in entries] == [1]
+        assert datetime.fromisoformat(entries[0]["timestamp"]).tzinfo is not None
+
+        # Cache hit: expiry compares aware timestamps
+        service.memory_cache[f"{agent_id}:history"][entries[0]["id"]]["timestamp"] = (
+            now - timedelta(hours=3)
+        ).isoformat()
+        assert await service.retrieve_memory(session, agent_id, workspace_id, "history") == []
+
+    @pytest.mark.asyncio
+    async def test_thread_context_and_stats(self, session):
+        """Threading copies the latest entry; stats aggregate per key."""
+        workspace_id, project_id, source_id, target_id = session.info["ids"]
+        service = AgentMemoryService(SharedContextService())
+
+        await service.store_memory(session, source_id, workspace_id, project_id, "plan", {"v": 1})
+        await service.store_memory(session, source_id, workspace_id, project_id, "plan", {"v": 2})
+        await service.store_memory(session, source_id, workspace_id, project_id, "notes", "draft")
+
+        threaded = await service.thread_context_between_steps(
+            session, source_id, target_id, workspace_id, project_id, ["plan"]
+        )
+        assert threaded == {"plan": {"v": 2}}
+
+        stats = await service.get_memory_stats(session, source_id, workspace_id)
+        assert stats["total_entries"] == 3
+        assert stats["memory_keys"] == ["notes", "plan"]
+
+        await service.clear_memory(session, source_id, workspace_id, "plan")
+        stats = await service.get_memory_stats(session, source_id, workspace_id)
+        assert stats["memory_keys"] == ["notes"]
+        assert await service.retrieve_memory(session, target_id, workspace_id, "plan") != []
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""backend.tests.test_agent_message_bus
+
+Tests for batched agent message persistence and deferred retention.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.db.models import (
+    AgentDefinition,
+    AgentInstance,
+    AgentMessage,
+    AgentMessageDirection,
+    Project,
+    Workspace,
+)
+from backend.db.models.base import Base
+from backend.services.agents.messages import AgentMessageBus
+
+
+class TestAgentMessageBus:
+    """Test cases for the agent message bus."""
+
+    @pytest.fixture
+    async def env(self):
+        """Session factory plus ids of one agent instance."""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as session:
+            workspace = Workspace(name="Bus", slug=f"bus-{uuid4().hex[:8]}")
+            session.add(workspace)
+            await session.flush()
+            project = Project(workspace_id=workspace.id, name="Bus", slug="bus")
+            definition = AgentDefinition(name="Coder", slug=f"coder-{uuid4().hex[:8]}", agent_type="coder")
+            session.add_all([project, definition])
+            await session.flush()
+            instance = AgentInstance(
+                workspace_id=workspace.id,
+                project_id=project.id,
+                definition_id=definition.id,
+                name="coder",
+            )
+            session.add(instance)
+            await session.commit()
+            ids = {
+                "workspace_id": workspace.id,
+                "project_id": project.id,
+                "agent_instance_id": instance.id,
+            }
+
+        yield session_factory, ids
+        await engine.dispose()
+
+    @pytest.fixture
+    def bus(self):
+        bus = AgentMessageBus(retention_limit=5, retention_check_interval=4)
+        bus.published = []
+
+        async def record(message):
+            bus.published.append(message.payload["n"])
+
+        bus._broadcast_message = record
+        return bus
+
+    @staticmethod
+    async def _count(session_factory):
+        async with session_factory() as session:
+            result = await session.execute(select(func.count()).select_from(AgentMessage))
+            return result.scalar_one()
+
+    @pytest.mark.asyncio
+    async def test_retention_runs_every_interval(self, env, bus):
+        """Overflow is only trimmed once the check interval is reached."""
+        session_factory, ids = env
+        async with session_factory() as session:
+            for n in range(7):
+                await bus.append(
+                    session, direction=AgentMessageDirection.OUTBOUND, payload={"n": n}, **ids
+                )
+            await session.commit()
+
+        # 4th append trimmed nothing (4 <= 5); the next pass is due at the 8th
+        assert await self._count(session_factory) == 7
+
+        async with session_factory() as session:
+            await bus.append(session, direction=AgentMessageDirection.OUTBOUND, payload={"n": 7}, **ids)
+            await session.commit()
+        assert await self._count(session_factory) == 5
+
+    @pytest.mark.asyncio
+    async def test_batch_flushes_at_capacity_and_on_exit(self, env, bus):
+        """A batch writes in bulk and broadcasts only after persisting."""
+        session_factory, ids = env
+        async with bus.batch(session_factory, max_pending=3, flush_interval_seconds=0) as batch:
+            for n in range(4):
+                await batch.add(direction=AgentMessageDirection.OUTBOUND, payload={"n": n}, **ids)
+            assert await self._count(session_factory) == 3
+            assert bus.published == [0, 1, 2]
+            assert batch.pending == 1
+
+        assert await self._count(session_factory) == 4
+        assert bus.published == [0, 1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_batch_flushes_after_interval(self, env, bus):
+        """Buffered messages are written once the flush interval elapses."""
+        session_factory, ids = env
+        batch = bus.batch(session_factory, max_pending=100, flush_interval_seconds=0.01)
+        await batch.add(direction=AgentMessageDirection.OUTBOUND, payload={"n": 0}, **ids)
+        assert await self._count(session_factory) == 0
+
+        await asyncio.sleep(0.1)
+        assert await self._count(session_factory) == 1
+        assert batch.pending == 0
+
+    @staticmethod
+    def _failing_commits(session_factory, failures):
+        """Session factory whose first ``failures`` commits raise."""
+        state = {"left": failures}
+
+        def factory():
+            session = session_factory()
+            commit = session.commit
+
+            async def flaky_commit():
+                if state["left"] > 0:
+                    state["left"] -= 1
+                    raise RuntimeError("database unavailable")
+                await commit()
+
+            session.commit = flaky_commit
+            return session
+
+        return factory
+
+    @pytest.mark.asyncio
+    async def test_failed_commit_keeps_messages(self, env, bus):
+        """A failed flush puts the messages back ahead of newer ones."""
+        session_factory, ids = env
+        batch = bus.batch(self._failing_commits(session_factory, 1), max_pending=100, flush_interval_seconds=0)
+        for n in range(2):
+            await batch.add(direction=AgentMessageDirection.OUTBOUND, payload={"n": n}, **ids)
+
+        with pytest.raises(RuntimeError):
+            await batch.flush()
+        assert batch.pending == 2
+        assert bus.published == []
+
+        await batch.add(direction=AgentMessageDirection.OUTBOUND, payload={"n": 2}, **ids)
+        await batch.flush()
+        assert await self._count(session_factory) == 3
+        assert bus.published == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_timed_flush_retries_after_failure(self, env, bus):
+        """A failed timed flush is retried instead of dropping the messages."""
+        session_factory, ids = env
+        batch = bus.batch(self._failing_commits(session_factory, 2), max_pending=100, flush_interval_seconds=0.01)
+        await batch.add(direction=AgentMessageDirection.OUTBOUND, payload={"n": 0}, **ids)
+
+        # Two failures back off 0.1s then 0.2s before the third attempt succeeds;
+        # pending drops to 0 while each attempt is in flight, so wait for the broadcast
+        for _ in range(100):
+            await asyncio.sleep(0.02)
+            if bus.published:
+                break
+        assert await self._count(session_factory) == 1
+        assert bus.published == [0]
+
+    @pytest.mark.asyncio
+    async def test_batch_stamps_messages_when_added(self, env, bus):
+        """created_at is the time a message was buffered, not the flush time."""
+        session_factory, ids = env
+        batch = bus.batch(session_factory, max_pending=100, flush_interval_seconds=0)
+        await batch.add(direction=AgentMessageDirection.OUTBOUND, payload={"n": 0}, **ids)
+        await asyncio.sleep(0.05)
+        await batch.add(direction=AgentMessageDirection.OUTBOUND, payload={"n": 1}, **ids)
+        await asyncio.sleep(0.05)
+
+        flushed_at = datetime.now(timezone.utc)
+        first, second = await batch.flush()
+
+        assert second.created_at - first.created_at >= timedelta(seconds=0.04)
+        assert flushed_at - second.created_at >= timedelta(seconds=0.04)
+
+    @pytest.mark.asyncio
+    async def test_buffer_is_capped_while_commits_fail(self, env, bus):
+        """Repeated commit failures drop the oldest messages past ``max_buffered``."""
+        session_factory, ids = env
+        batch = bus.batch(
+            self._failing_commits(session_factory, 3),
+            max_pending=3,
+            flush_interval_seconds=0,
+            max_buffered=3,
+        )
+        for n in range(5):
+            try:
+                await batch.add(direction=AgentMessageDirection.OUTBOUND, payload={"n": n}, **ids)
+            except RuntimeError:
+                pass
+        assert batch.pending == 3
+        assert batch.dropped == 2
+
+        await batch.flush()
+        assert bus.published == [2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_failed_commit_does_not_advance_retention_count(self, env, bus):
+        """Only committed appends count towards the next retention pass."""
+        session_factory, ids = env
+        agent_id = ids["agent_instance_id"]
+        batch = bus.batch(self._failing_commits(session_factory, 1), max_pending=100, flush_interval_seconds=0)
+        for n in range(3):
+            await batch.add(direction=AgentMessageDirection.OUTBOUND, payload={"n": n}, **ids)
+
+        with pytest.raises(RuntimeError):
+            await batch.flush()
+        assert bus._appends_since_retention.get(agent_id, 0) == 0
+
+        await batch.flush()
+        assert bus._appends_since_retention[agent_id] == 3
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""backend.tests.test_audit_writer
+
+Tests for the buffered audit pipeline and streaming export.
+"""
+
+import json
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.db.models.base import Base
+from backend.db.models.entities import AuditLog
+from backend.db.models.enums import AuditAction
+from backend.schemas import AuditLogExportRequest
+from backend.services.audit.logger import AuditLogger
+from backend.services.audit.writer import AuditWriter
+
+
+class TestAuditWriter:
+    """Test cases for buffered audit writes."""
+
+    @pytest.fixture
+    async def session_factory(self):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        await engine.dispose()
+
+    @staticmethod
+    async def _count(session_factory):
+        async with session_factory() as session:
+            result = await session.execute(select(func.count()).select_from(AuditLog))
+            return result.scalar_one()
+
+    @pytest.mark.asyncio
+    async def test_writes_are_batched_and_flushed(self, session_factory):
+        """Queued rows are inserted in batches and visible after flush."""
+        writer = AuditWriter(session_factory, batch_size=10)
+        audit_logger = AuditLogger(session_factory, writer=writer)
+        workspace_id = str(uuid4())
+
+        batches = []
+        original_write = writer._write
+
+        async def record_write(batch):
+            batches.append(len(batch))
+            await original_write(batch)
+
+        writer._write = record_write
+
+        logs = [
+            await audit_logger.log_action(
+                user_id=None,
+                workspace_id=workspace_id,
+                action=AuditAction.USER_LOGIN,
+                resource_type="user",
+                changes={"attempt": i},
+            )
+            for i in range(25)
+        ]
+        assert logs[0].id is not None
+
+        trail = await audit_logger.get_audit_trail(workspace_id, limit=100)
+        assert len(trail) == 25
+        assert sum(batches) == 25
+        assert len(batches) < 25
+
+    @pytest.mark.asyncio
+    async def test_spool_is_replayed_on_start(self, session_factory, tmp_path):
+        """Rows spooled but never committed are inserted on the next start."""
+        spool = tmp_path / "audit.spool"
+        workspace_id = str(uuid4())
+
+        crashed = AuditWriter(session_factory, spool_path=str(spool))
+        AuditLogger(session_factory, writer=crashed)
+
+        async def fail(batch):
+            raise RuntimeError("database unavailable")
+
+        crashed._write = fail
+        await crashed.submit(AuditLog, {
+            "id": str(uuid4()),
+            "workspace_id": workspace_id,
+            "action": AuditAction.USER_LOGIN,
+            "resource_type": "user",
+            "changes": {},
+        })
+        await crashed.flush()
+        assert await self._count(session_factory) == 0
+        assert spool.read_text().strip()
+
+        recovered = AuditLogger(session_factory, writer=AuditWriter(session_factory, spool_path=str(spool)))
+        await recovered.writer.start()
+        assert await self._count(session_factory) == 1
+        assert spool.read_text() == ""
+
+    @staticmethod
+    def _row(workspace_id, **overrides):
+        return {
+            "id": str(uuid4()),
+            "workspace_id": workspace_id,
+            "action": AuditAction.USER_LOGIN,
+            "resource_type": "user",
+            "changes": {},
+            **overrides,
+        }
+
+    @pytest.mark.asyncio
+    async def test_bad_row_does_not_drop_its_batch(self, session_factory):
+        """A failing batch is written row by row; only the bad row is lost."""
+        writer = AuditWriter(session_factory, batch_size=10, retry_delay=0)
+        workspace_id = str(uuid4())
+
+        for i in range(5):
+            overrides = {"resource_type": None} if i == 2 else {}
+            await writer.submit(AuditLog, self._row(workspace_id, **overrides))
+        await writer.flush()
+
+        assert await self._count(session_factory) == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_rows_are_retried_and_spool_redrained(self, session_factory, tmp_path):
+        """Rows given up on stay spooled and are re-drained once writes succeed."""
+        spool = tmp_path / "audit.spool"
+        writer = AuditWriter(session_factory, spool_path=str(spool), max_attempts=2, retry_delay=0)
+        workspace_id = str(uuid4())
+        original_write = writer._write
+        outage = {"on": True}
+
+        async def flaky_write(batch):
+            if outage["on"]:
+                raise RuntimeError("database unavailable")
+            await original_write(batch)
+
+        writer._write = flaky_write
+        for _ in range(3):
+            await writer.submit(AuditLog, self._row(workspace_id))
+        await writer.flush()
+        assert await self._count(session_factory) == 0
+        assert writer._spool_dirty
+        assert len(spool.read_text().splitlines()) == 3
+
+        outage["on"] = False
+        await writer.submit(AuditLog, self._row(workspace_id))
+        await writer.flush()
+
+        assert await self._count(session_factory) == 4
+        assert not writer._spool_dirty
+        assert spool.read_text() == ""
+
+        # With the flag cleared the spool is truncated after later batches again
+        await writer.submit(AuditLog, self._row(workspace_id))
+        await writer.flush()
+        assert spool.read_text() == ""
+
+    @pytest.mark.asyncio
+    async def test_failed_replay_is_retried(self, session_factory, tmp_path):
+        """start() keeps retrying the spool replay until it succeeds."""
+        spool = tmp_path / "audit.spool"
+        spool.write_text(json.dumps({"table": AuditLog.__tablename__, "row": self._row(str(uuid4()))}) + "\n")
+
+        writer = AuditWriter(session_factory, spool_path=str(spool))
+        writer.register_model(AuditLog)
+        original_replay = writer._replay_spool
+        calls = []
+
+        async def flaky_replay():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("database unavailable")
+            return await original_replay()
+
+        writer._replay_spool = flaky_replay
+        await writer.start()
+        assert not writer._started
+
+        await writer.start()
+        assert writer._started
+        assert await self._count(session_factory) == 1
+        assert spool.read_text() == ""
+
+    @pytest.mark.asyncio
+    async def test_stream_export_jsonl_and_csv(self, session_factory):
+        """Streaming export yields every matching row in chunks."""
+        audit_logger = AuditLogger(session_factory)
+        workspace_id = str(uuid4())
+        for i in range(7):
+            await audit_logger.log_action(
+                user_id=None,
+                workspace_id=workspace_id,
+                action=AuditAction.TASK_CREATED,
+                resource_type="task",
+                changes={"n": i},
+            )
+
+        request = AuditLogExportRequest(format="jsonl", sort_order="asc")
+        chunks = [c async for c in audit_logger.stream_audit_logs(workspace_id, request, "jsonl", chunk_size=3)]
+        lines = "".join(chunks).splitlines()
+        assert len(chunks) == 3
+        assert [json.loads(line)["changes"]["n"] for line in lines] == list(range(7))
+
+        csv_text = "".join([
+            c async for c in audit_logger.stream_audit_logs(
+                workspace_id, AuditLogExportRequest(format="csv"), "csv"
+            )
+        ])
+        assert csv_text.splitlines()[0].startswith("ID,Timestamp")
+        assert len(csv_text.splitlines()) == 8
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""Tests for the cached DeepSite skill/rule prompt assembly."""
+
+import os
+
+import pytest
+
+from backend.services.deepsite import mgx_bridge
+
+
+@pytest.fixture
+def prompt_dirs(tmp_path, monkeypatch):
+    """Point the bridge at a temporary skills/rules tree with empty caches."""
+    skills = tmp_path / "skills"
+    rules = tmp_path / "rules"
+    (rules / "common").mkdir(parents=True)
+    skills.mkdir()
+    (skills / "security-review.md").write_text("SEC " * 50, encoding="utf-8")
+    (skills / "html-design.md").write_text("DESIGN " * 50, encoding="utf-8")
+    (skills / "mike-planner.md").write_text("PLAN " * 50, encoding="utf-8")
+    (rules / "common" / "security.md").write_text("RULE " * 50, encoding="utf-8")
+
+    monkeypatch.setattr(mgx_bridge, "_SKILLS_DIR", str(skills))
+    monkeypatch.setattr(mgx_bridge, "_RULES_DIR", str(rules))
+    monkeypatch.setattr(mgx_bridge, "_file_cache", {})
+    monkeypatch.setattr(mgx_bridge, "_skill_context_cache", {})
+    return skills, rules
+
+
+@pytest.fixture
+def read_counter(monkeypatch):
+    """Count real file reads performed by the bridge."""
+    reads = []
+    real_open = open
+
+    def counting_open(path, *args, **kwargs):
+        reads.append(os.path.basename(path))
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(mgx_bridge, "open", counting_open, raising=False)
+    return reads
+
+
+class TestSkillContextCache:
+    def test_repeated_builds_do_not_reread_files(self, prompt_dirs, read_counter):
+        first = mgx_bridge._build_skill_context("html")
+        assert sorted(read_counter) == ["html-design.md", "mike-planner.md", "security-review.md", "security.md"]
+
+        read_counter.clear()
+        assert mgx_bridge._build_skill_context("html") == first
+        assert mgx_bridge._load_skill("mike-planner.md", 10) == "PLAN PLAN "
+        assert read_counter == []
+
+    def test_modified_file_invalidates_cache(self, prompt_dirs, read_counter):
+        skills, _ = prompt_dirs
+        before = mgx_bridge._build_skill_context("html")
+
+        path = skills / "mike-planner.md"
+        path.write_text("UPDATED PLAN", encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        read_counter.clear()
+
+        after = mgx_bridge._build_skill_context("html")
+        assert after != before
+        assert "--- PLANNING PROTOCOL ---\nUPDATED PLAN" in after
+        assert read_counter == ["mike-planner.md"]
+
+    def test_removed_file_drops_its_section(self, prompt_dirs):
+        skills, _ = prompt_dirs
+        assert "HTML DESIGN QUALITY" in mgx_bridge._build_skill_context("html")
+
+        (skills / "html-design.md").unlink()
+        assert "HTML DESIGN QUALITY" not in mgx_bridge._build_skill_context("html")
+        assert mgx_bridge._load_skill("html-design.md") == ""
+
+    def test_sections_respect_total_budget(self, prompt_dirs):
+        skills, _ = prompt_dirs
+        (skills / "security-review.md").write_text("S" * 5000, encoding="utf-8")
+        (skills / "html-design.md").write_text("D" * 5000, encoding="utf-8")
+
+        context = mgx_bridge._build_skill_context("html")
+        assert "S" * 800 in context and "S" * 801 not in context
+        assert "D" * 800 in context and "D" * 801 not in context
+        # Non-html stacks skip the design skill
+        assert "HTML DESIGN QUALITY" not in mgx_bridge._build_skill_context("vue")
+
+
+class TestStackPreamble:
+    def test_task_reuses_stack_preamble(self, prompt_dirs):
+        mgx_bridge._stack_preamble.cache_clear()
+        task_a = mgx_bridge._build_task("Build a CRM", None, "laravel-blade")
+        task_b = mgx_bridge._build_task("Build a blog", None, "laravel-blade")
+
+        assert task_a.startswith("## STACK: Laravel 11 + Blade + PostgreSQL 16")
+        assert "## USER REQUEST\nBuild a blog" in task_b
+        assert mgx_bridge._stack_preamble.cache_info().hits == 1
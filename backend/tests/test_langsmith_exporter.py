@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Tests for the batched background LangSmith exporter."""
+
+import time
+
+from backend.tests.performance.langsmith_benchmark import LangSmithStub
+from mgx_observability.langsmith import LangSmithExporter, LangSmithLogger
+
+
+class TestLangSmithExporter:
+    async def test_runs_are_sent_in_size_bounded_batches(self):
+        with LangSmithStub() as stub:
+            exporter = LangSmithExporter(api_key="k", endpoint=stub.url, max_batch_size=10, flush_interval=5)
+            logger = LangSmithLogger(api_key="k", project="p", endpoint=stub.url, exporter=exporter)
+
+            run_ids = [
+                await logger.log_llm_call(name="n", provider="p", model="m", prompt="q", output="a")
+                for _ in range(25)
+            ]
+            assert exporter.flush(timeout=10)
+
+            assert all(run_ids)
+            assert stub.runs == 25
+            assert stub.requests == 3
+            assert exporter.stats()["sent"] == 25
+            exporter.shutdown()
+
+    def test_partial_batch_is_sent_after_the_flush_interval(self):
+        with LangSmithStub() as stub:
+            exporter = LangSmithExporter(api_key="k", endpoint=stub.url, max_batch_size=100, flush_interval=0.05)
+            exporter.submit({"id": "1"})
+
+            deadline = time.monotonic() + 5
+            while stub.runs == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            assert stub.runs == 1
+            exporter.shutdown()
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        exporter = LangSmithExporter(api_key="k", endpoint="http://127.0.0.1:9", max_queue_size=2)
+        exporter._ensure_started = lambda: None  # keep the worker from draining the queue
+
+        results = [exporter.submit({"id": str(i)}) for i in range(3)]
+
+        assert results == [True, True, False]
+        assert exporter.stats()["dropped"] == 1
+
+    def test_shutdown_flushes_pending_runs_and_rejects_new_ones(self):
+        with LangSmithStub() as stub:
+            exporter = LangSmithExporter(api_key="k", endpoint=stub.url, max_batch_size=100, flush_interval=60)
+            for i in range(5):
+                exporter.submit({"id": str(i)})
+
+            exporter.shutdown(timeout=10)
+
+            assert stub.runs == 5
+            assert exporter.submit({"id": "late"}) is False
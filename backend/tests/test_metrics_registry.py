@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""Tests for the in-process Prometheus/OpenMetrics registry and its hooks."""
+
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from backend.db.engine import instrument_engine
+from backend.middleware.metrics import HTTPMetricsStage
+from backend.middleware.pipeline import RequestPipeline
+from backend.services.metrics_registry import (
+    DB_POOL_CHECKOUTS,
+    DB_QUERY_DURATION,
+    DB_QUERY_ERRORS,
+    HTTP_REQUESTS,
+    MetricsRegistry,
+    get_metrics_registry,
+)
+from backend.tests.performance.middleware_benchmark import call
+
+
+class TestMetricsRegistry:
+    def test_counter_sums_shards_from_all_threads(self):
+        counter = MetricsRegistry().counter("jobs_total", "Jobs", ("kind",))
+
+        def work():
+            for _ in range(1000):
+                counter.inc(kind="a")
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.inc(5, kind="b")
+
+        assert counter.value(kind="a") == 8000
+        assert counter.collect() == {("a",): 8000, ("b",): 5}
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = MetricsRegistry().histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        cumulative, total, count = histogram.collect()[()]
+        assert cumulative == [2, 3, 4]  # le=0.1, le=1, +Inf
+        assert total == 3.65
+        assert count == 4
+
+    def test_render_prometheus_and_openmetrics(self):
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests", ("path",)).inc(path='/a"b')
+        registry.histogram("wait_seconds", "Wait", buckets=(1.0,)).observe(0.5)
+        registry.gauge("pool_size", "Pool", callback=lambda: 5)
+
+        text_format = registry.render()
+        assert "# TYPE requests_total counter" in text_format
+        assert 'requests_total{path="/a\\"b"} 1' in text_format
+        assert 'wait_seconds_bucket{le="1"} 1' in text_format
+        assert 'wait_seconds_bucket{le="+Inf"} 1' in text_format
+        assert "wait_seconds_count 1" in text_format
+        assert "pool_size 5" in text_format
+
+        openmetrics = registry.render(openmetrics=True)
+        assert "# TYPE requests counter" in openmetrics
+        assert openmetrics.endswith("# EOF\n")
+
+    def test_registering_the_same_name_returns_the_existing_metric(self):
+        registry = MetricsRegistry()
+        first = registry.counter("x_total", "X")
+        assert registry.counter("x_total", "X") is first
+
+
+class TestMetricsHooks:
+    async def test_http_stage_labels_by_route_template(self):
+        async def item(request):
+            return PlainTextResponse("ok")
+
+        async def broken(request):
+            raise RuntimeError("boom")
+
+        app = Starlette(
+            routes=[Route("/items/{item_id}", item), Route("/broken", broken)],
+            middleware=[Middleware(RequestPipeline, stages=[HTTPMetricsStage()])],
+        )
+        before_ok = HTTP_REQUESTS.value(method="GET", route="/items/{item_id}", status=200)
+        before_missing = HTTP_REQUESTS.value(method="GET", route="unmatched", status=404)
+        before_error = HTTP_REQUESTS.value(method="GET", route="/broken", status=500)
+
+        await call(app, "/items/1")
+        await call(app, "/items/2")
+        await call(app, "/nope")
+        try:
+            await call(app, "/broken")
+        except RuntimeError:
+            pass
+
+        assert HTTP_REQUESTS.value(method="GET", route="/items/{item_id}", status=200) == before_ok + 2
+        assert HTTP_REQUESTS.value(method="GET", route="unmatched", status=404) == before_missing + 1
+        assert HTTP_REQUESTS.value(method="GET", route="/broken", status=500) == before_error + 1
+
+    async def test_engine_records_queries_and_checkouts(self):
+        engine = instrument_engine(create_async_engine("sqlite+aiosqlite:///:memory:"))
+
+        def select_count():
+            return DB_QUERY_DURATION.collect().get(("SELECT",), ([], 0.0, 0))[2]
+
+        before_select, before_checkouts = select_count(), DB_POOL_CHECKOUTS.value()
+        before_errors = DB_QUERY_ERRORS.value(operation="SELECT")
+
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await conn.execute(text("SELECT 2"))
+                try:
+                    await conn.execute(text("SELECT * FROM missing_table"))
+                except Exception:
+                    pass
+        finally:
+            await engine.dispose()
+
+        assert select_count() == before_select + 2
+        assert DB_POOL_CHECKOUTS.value() >= before_checkouts + 1
+        assert DB_QUERY_ERRORS.value(operation="SELECT") == before_errors + 1
+        assert "db_connections_in_use" in get_metrics_registry().render()
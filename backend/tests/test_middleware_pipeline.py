@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""Tests for the pure-ASGI request pipeline and its middleware stages."""
+
+import asyncio
+
+import pytest
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from backend.middleware.pipeline import PipelineStage, RequestPipeline
+from backend.tests.performance.middleware_benchmark import build_app, call
+from mgx_observability import get_current_context
+
+
+class _RecordingStage(PipelineStage):
+    def __init__(self, name, events, short_circuit=None):
+        self.name = name
+        self.events = events
+        self.short_circuit = short_circuit
+
+    async def enter(self, request, ctx):
+        self.events.append(("enter", self.name))
+        return self.short_circuit
+
+    def response_started(self, request, message, ctx):
+        self.events.append(("response", self.name))
+
+    def exit(self, request, ctx, exc):
+        self.events.append(("exit", self.name, type(exc).__name__ if exc else None))
+
+
+def _app(endpoint, stages):
+    return Starlette(
+        routes=[Route("/", endpoint)],
+        middleware=[Middleware(RequestPipeline, stages=stages)],
+    )
+
+
+class TestRequestPipeline:
+    async def test_stages_match_the_old_stacked_middleware_output(self):
+        stacked = await call(build_app("stacked"), "/ping")
+        pipeline = await call(build_app("pipeline"), "/ping")
+
+        volatile = {"x-correlation-id", "x-request-id"}
+        assert pipeline["status"] == stacked["status"] == 200
+        assert {k: v for k, v in pipeline["headers"].items() if k not in volatile} == {
+            k: v for k, v in stacked["headers"].items() if k not in volatile
+        }
+        assert pipeline["headers"]["x-frame-options"] == "DENY"
+        assert "strict-transport-security" in pipeline["headers"]
+        assert pipeline["headers"]["x-correlation-id"]
+
+    async def test_request_context_is_visible_to_the_endpoint(self):
+        seen = {}
+
+        async def endpoint(request: Request):
+            seen["workspace"] = get_current_context().workspace_id
+            seen["user_id"] = request.state.user_id
+            return JSONResponse({"ok": True})
+
+        app = build_app("pipeline")
+        app.router.routes.append(Route("/context", endpoint))
+        await call(app, "/context")
+
+        assert seen == {"workspace": "ws-1", "user_id": "user-1"}
+        assert get_current_context().workspace_id is None  # reset after the request
+
+    async def test_streaming_chunks_are_forwarded_as_produced(self):
+        async def endpoint(request: Request):
+            async def body():
+                yield b"first"
+                await asyncio.sleep(0.05)
+                yield b"second"
+
+            return StreamingResponse(body())
+
+        result = await call(_app(endpoint, [_RecordingStage("a", [])]), "/")
+
+        first, second = result["chunk_times"]
+        assert first < 0.04 <= second
+
+    async def test_order_short_circuit_and_errors(self):
+        events = []
+
+        async def ok(request: Request):
+            return PlainTextResponse("ok")
+
+        await call(_app(ok, [_RecordingStage("outer", events), _RecordingStage("inner", events)]), "/")
+        assert events == [
+            ("enter", "outer"),
+            ("enter", "inner"),
+            ("response", "inner"),
+            ("response", "outer"),
+            ("exit", "inner", None),
+            ("exit", "outer", None),
+        ]
+
+        events.clear()
+        denied = PlainTextResponse("denied", status_code=401)
+        result = await call(
+            _app(ok, [_RecordingStage("auth", events, short_circuit=denied), _RecordingStage("inner", events)]),
+            "/",
+        )
+        assert result["status"] == 401
+        assert ("enter", "inner") not in events
+
+        events.clear()
+
+        async def broken(request: Request):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await call(_app(broken, [_RecordingStage("outer", events)]), "/")
+        assert events[-1] == ("exit", "outer", "RuntimeError")
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""backend.tests.test_pagination
+
+Tests for keyset pagination and opt-in row counts.
+"""
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.db.models import Project, Task, Workspace
+from backend.db.models.base import Base
+from backend.db.pagination import (
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+    fetch_keyset_page,
+    page_total,
+)
+
+
+class TestKeysetPagination:
+    """Test cases for cursor-based list pages."""
+
+    @pytest.fixture
+    async def session(self):
+        """In-memory database with 25 tasks sharing created_at values.
+
+        Five use the server default timestamp, which SQLite stores without
+        microseconds.
+        """
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as session:
+            workspace = Workspace(name="Pages", slug=f"pages-{uuid4().hex[:8]}")
+            session.add(workspace)
+            await session.flush()
+            project = Project(workspace_id=workspace.id, name="Pages", slug="pages")
+            session.add(project)
+            await session.flush()
+
+            base = datetime(2026, 1, 1, 12, 0, 0)
+            session.add_all(
+                Task(
+                    workspace_id=workspace.id,
+                    project_id=project.id,
+                    name=f"task-{i}",
+                    created_at=base + timedelta(seconds=i // 2),
+                )
+                for i in range(20)
+            )
+            session.add_all(
+                Task(workspace_id=workspace.id, project_id=project.id, name=f"default-{i}") for i in range(5)
+            )
+            await session.flush()
+            session.info["workspace_id"] = workspace.id
+            session.info["project_id"] = project.id
+            yield session
+        await engine.dispose()
+
+    @staticmethod
+    def _query(session):
+        return select(Task).where(Task.workspace_id == session.info["workspace_id"])
+
+    @pytest.mark.asyncio
+    async def test_cursor_walk_returns_every_row_once_newest_first(self, session):
+        seen, cursor = [], None
+        for _ in range(10):
+            page = await fetch_keyset_page(session, self._query(session), Task, 3, cursor=cursor)
+            seen.extend(page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert len(seen) == 25
+        assert len({task.id for task in seen}) == 25
+        keys = [(task.created_at, task.id) for task in seen]
+        assert keys == sorted(keys, reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_total_is_free_only_on_a_single_page(self, session):
+        query = self._query(session)
+
+        single = await fetch_keyset_page(session, query, Task, 50)
+        assert single.next_cursor is None
+        assert page_total(single, None, 0) == 25
+
+        first = await fetch_keyset_page(session, query, Task, 10)
+        assert page_total(first, None, 0) is None
+
+        past_end = await fetch_keyset_page(session, query, Task, 10, skip=40)
+        assert past_end.items == []
+        assert page_total(past_end, None, 40) is None
+
+    @pytest.mark.asyncio
+    async def test_count_modes(self, session):
+        query = self._query(session)
+
+        assert await count_rows(session, query, "exact") == (25, False)
+        # Not PostgreSQL: a cached exact count
+        assert await count_rows(session, query, "estimate") == (25, False)
+        session.add(
+            Task(workspace_id=session.info["workspace_id"], project_id=session.info["project_id"], name="late")
+        )
+        await session.flush()
+        assert await count_rows(session, query, "estimate") == (25, False)
+        assert await count_rows(session, query, "exact") == (26, False)
+
+        with pytest.raises(ValueError):
+            await count_rows(session, query, "approximate")
+
+    def test_cursor_round_trip_and_validation(self):
+        created_at = datetime(2026, 5, 4, 3, 2, 1, 123456)
+        assert decode_cursor(encode_cursor(created_at, "abc")) == (created_at, "abc")
+
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Tests for the DeepSite preview port allocator."""
+
+import asyncio
+import os
+import random
+import time
+from uuid import uuid4
+
+import pytest
+
+from backend.services.deepsite import port_allocator, project_runner
+from backend.services.deepsite.port_allocator import PortAllocator
+
+
+async def _churn(allocate, release, previews: int, concurrency: int) -> set:
+    """Launch and tear down ``previews`` previews with ``concurrency`` running at once."""
+    held = {}
+    seen_ports = set()
+    gate = asyncio.Semaphore(concurrency)
+
+    async def preview(i: int) -> None:
+        project_id = f"stress-{i}"
+        async with gate:
+            port = await allocate(project_id)
+            assert port not in held, f"port {port} leased twice"
+            held[port] = project_id
+            seen_ports.add(port)
+            await asyncio.sleep(random.random() / 1000)
+            assert held.pop(port) == project_id
+            await release(project_id)
+
+    await asyncio.gather(*(preview(i) for i in range(previews)))
+    return seen_ports
+
+
+class TestLocalPortAllocator:
+    async def test_allocate_is_idempotent_per_project(self):
+        allocator = PortAllocator(9100, 9102)
+
+        first = await allocator.allocate("a")
+        assert await allocator.allocate("a") == first
+        assert await allocator.allocate("b") != first
+        assert await allocator.renew("a") == first
+        assert await allocator.renew("missing") is None
+
+    async def test_exhaustion_and_release(self):
+        allocator = PortAllocator(9100, 9101)
+        ports = {await allocator.allocate("a"), await allocator.allocate("b")}
+        assert ports == {9100, 9101}
+
+        with pytest.raises(RuntimeError):
+            await allocator.allocate("c")
+
+        released = await allocator.release("a")
+        assert await allocator.allocate("c") == released
+        assert await allocator.release("a") is None
+
+    async def test_expired_leases_are_reclaimed(self, monkeypatch):
+        allocator = PortAllocator(9100, 9100, lease_ttl=60)
+        clock = [1000.0]
+        monkeypatch.setattr(port_allocator.time, "time", lambda: clock[0])
+
+        leaked = await allocator.allocate("leaked")
+        clock[0] += 30
+        # Renewing pushes the expiry past the first deadline
+        assert await allocator.renew("leaked") == leaked
+        clock[0] += 45
+        with pytest.raises(RuntimeError):
+            await allocator.allocate("fresh")
+
+        clock[0] += 20
+        assert await allocator.allocate("fresh") == leaked
+        assert await allocator.renew("leaked") is None
+
+    async def test_unreachable_redis_fails_instead_of_using_local_pool(self):
+        pytest.importorskip("redis")
+        allocator = PortAllocator(9100, 9110, redis_url="redis://127.0.0.1:1/0")
+
+        # The local pool cannot see other instances' leases, so nothing falls back to it
+        with pytest.raises(RuntimeError, match="Redis allocate failed"):
+            await allocator.allocate("a")
+        with pytest.raises(RuntimeError, match="Redis release failed"):
+            await allocator.release("a")
+        with pytest.raises(RuntimeError, match="Redis renew failed"):
+            await allocator.renew("a")
+        assert allocator.stats()["local"] == {"free": 11, "leased": 0}
+        await allocator.close()
+
+    async def test_stress_launch_and_teardown(self, monkeypatch):
+        allocator = PortAllocator(9100, 9299)
+        monkeypatch.setattr(port_allocator, "_port_allocator", allocator)
+
+        started = time.perf_counter()
+        seen = await _churn(project_runner.allocate_port, project_runner.release_port, 600, 200)
+
+        assert len(seen) <= 200
+        assert allocator.stats()["local"] == {"free": 200, "leased": 0}
+        assert time.perf_counter() - started < 5
+
+
+@pytest.mark.skipif(not os.getenv("REDIS_URL"), reason="REDIS_URL not set")
+class TestRedisPortAllocator:
+    @pytest.fixture
+    async def allocator(self):
+        # Her test kendi port aralığıyla ayrı free-list anahtarı kullanır
+        base = 20000 + random.randrange(0, 40000, 100)
+        allocator = PortAllocator(base, base + 99, redis_url=os.environ["REDIS_URL"], lease_ttl=60)
+        yield allocator
+        await allocator.close()
+
+    async def test_allocate_release_round_trip(self, allocator):
+        project_id = uuid4().hex
+        port = await allocator.allocate(project_id)
+        assert allocator.stats()["backend"] == "redis"
+        assert await allocator.allocate(project_id) == port
+        assert await allocator.renew(project_id) == port
+        assert await allocator.release(project_id) == port
+        assert await allocator.renew(project_id) is None
+
+    async def test_stress_launch_and_teardown(self, allocator):
+        seen = await _churn(allocator.allocate, allocator.release, 500, 100)
+        assert len(seen) <= 100
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""backend.tests.test_principal_cache
+
+Tests for the authenticated principal cache.
+"""
+
+import time
+
+from backend.services.auth.principal_cache import PrincipalCache
+
+
+class TestPrincipalCache:
+    """Test cases for PrincipalCache."""
+
+    def test_hit_after_put(self):
+        cache = PrincipalCache(ttl_seconds=30)
+        assert cache.get("u1", "t1") is None
+        cache.put("u1", "t1", {"id": "u1", "is_active": True})
+        assert cache.get("u1", "t1") == {"id": "u1", "is_active": True}
+        assert cache.get("u1", "t2") is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_entries_expire(self):
+        cache = PrincipalCache(ttl_seconds=0.01)
+        cache.put("u1", "t1", {"id": "u1"})
+        time.sleep(0.02)
+        assert cache.get("u1", "t1") is None
+
+    def test_invalidate_user_drops_all_tokens(self):
+        cache = PrincipalCache(ttl_seconds=30)
+        cache.put("u1", "t1", {"id": "u1"})
+        cache.put("u1", "t2", {"id": "u1"})
+        cache.put("u2", "t3", {"id": "u2"})
+        cache.invalidate_user("u1")
+        assert cache.get("u1", "t1") is None
+        assert cache.get("u1", "t2") is None
+        assert cache.get("u2", "t3") == {"id": "u2"}
+
+    def test_lru_eviction(self):
+        cache = PrincipalCache(ttl_seconds=30, max_entries=2)
+        cache.put("u1", "a", {})
+        cache.put("u2", "b", {})
+        cache.get("u1", "a")
+        cache.put("u3", "c", {})
+        assert cache.get("u2", "b") is None
+        assert cache.get("u1", "a") == {}
@@ -13,6 +13,7 @@ from sqlalchemy.orm import sessionmaker
 from backend.db.models import Base, ProjectTemplate, TemplateFeature, GeneratedProject
 from backend.db.models.enums import StackType, TemplateFeatureType, ProjectTemplateStatus
 from backend.services.generator.generator import ProjectGenerator, ProjectGenerationError
+from backend.services.generator.engines.file_engine import FileEngine
 from backend.services.generator.template_manager import TemplateManager
 
 
@@ -230,6 +231,45 @@ class TestFileEngine:
             assert '"name": "test-project"' in content
             assert '"version": "1.0.0"' in content
 
+    def test_process_template_single_pass(self, file_engine):
+        """Values are substituted once and conditional blocks are dropped."""
+        template = (
+            "{{#IF_AUTH}}import jwt from 'jsonwebtoken';\n{{/IF_AUTH}}"
+            "{{#IF_DATABASE}}import { sequelize } from './database/connection';\n{{/IF_DATABASE}}"
+            "name={{PROJECT_NAME}} port={{PORT}} extra={{EXTRA}} keep={{UNKNOWN}} {{ $blade }}"
+        )
+        settings = {"project_name": "{{PORT}}", "extra": 7, "features": {"auth": True}}
+
+        assert file_engine._process_template(template, settings) == (
+            "name={{PORT}} port=3000 extra=7 keep={{UNKNOWN}} {{ $blade }}"
+        )
+
+    def test_compiled_templates_are_cached_by_content(self, file_engine):
+        """Identical template content compiles once per feature combination."""
+        template = "{{PROJECT_NAME}}-{{PROJECT_VERSION}}"
+        assert file_engine._process_template(template, {"project_name": "a"}) == "a-1.0.0"
+        assert file_engine._process_template(template, {"project_name": "b"}) == "b-1.0.0"
+        file_engine._process_template(template, {"features": {"auth": True}})
+
+        assert len(file_engine._compiled) == 2
+
+    @pytest.mark.asyncio
+    async def test_generate_files_concurrently(self, tmp_path):
+        """All manifest files are rendered and written."""
+        template_dir = tmp_path / "templates" / "stack"
+        template_dir.mkdir(parents=True)
+        (template_dir / "module.ts.template").write_text("export const name = '{{PROJECT_NAME}}';\n")
+        engine = FileEngine(templates_path=tmp_path / "templates", concurrency=4)
+
+        manifest = {f"src/m{i}.ts": "module.ts.template" for i in range(50)}
+        await engine.generate_files(tmp_path / "out", manifest, {"project_name": "demo"})
+
+        for relative_path in manifest:
+            assert (tmp_path / "out" / relative_path).read_text() == "export const name = 'demo';\n"
+
+        with pytest.raises(FileNotFoundError):
+            await engine.generate_files(tmp_path / "out", {"x.ts": "missing.template"}, {})
+
 
 class TestIntegration:
     """Integration tests for the complete generator system."""
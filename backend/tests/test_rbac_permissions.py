@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""backend.tests.test_rbac_permissions
+
+Tests for compiled RBAC permission sets.
+"""
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.db.models.base import Base
+from backend.db.models.entities import Permission, Role, UserRole
+from backend.db.models.enums import PermissionAction, PermissionResource, RoleName
+from backend.services.auth.rbac import RBACService
+
+
+class TestCompiledPermissions:
+    """Test cases for compiled permission checks."""
+
+    @pytest.fixture
+    async def rbac_service(self):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        yield RBACService(session_factory, max_cached_principals=2)
+        await engine.dispose()
+
+    @staticmethod
+    async def _grant(service, user_id, workspace_id, permissions, fine_grained=(), name=RoleName.DEVELOPER):
+        async with service.session_factory() as session:
+            role = Role(
+                workspace_id=workspace_id,
+                name=name,
+                permissions=permissions,
+                is_active=True,
+            )
+            session.add(role)
+            await session.flush()
+            session.add(UserRole(user_id=user_id, workspace_id=workspace_id, role_id=role.id, is_active=True))
+            for resource, action, conditions in fine_grained:
+                session.add(Permission(
+                    workspace_id=workspace_id,
+                    role_id=role.id,
+                    resource=resource,
+                    action=action,
+                    conditions=conditions,
+                    is_active=True,
+                ))
+            await session.commit()
+            return role.id
+
+    @pytest.mark.asyncio
+    async def test_compiled_checks_and_batch(self, rbac_service):
+        """Role strings, wildcards and conditional grants are compiled once."""
+        user_id, workspace_id = str(uuid4()), str(uuid4())
+        await self._grant(
+            rbac_service, user_id, workspace_id,
+            ["tasks:read", "workflows:*"],
+            [(PermissionResource.SECRETS, PermissionAction.READ, {"project_id": "p1"})],
+        )
+
+        calls = []
+        original = rbac_service._compile_permissions
+
+        async def counting(*args):
+            calls.append(args)
+            return await original(*args)
+
+        rbac_service._compile_permissions = counting
+
+        results = await rbac_service.check_permissions(user_id, workspace_id, [
+            ("tasks", "read"),
+            ("tasks", "delete"),
+            ("workflows", "execute"),
+            ("secrets", "read", {"project_id": "p1"}),
+            ("secrets", "read", {"project_id": "p2"}),
+            ("secrets", "read"),
+            ("unknown", "read"),
+        ])
+        assert results == [True, False, True, True, False, False, False]
+        assert await rbac_service.check_permission(user_id, workspace_id, "tasks", "read")
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_targeted_invalidation(self, rbac_service):
+        """Only the invalidated user's set is recompiled."""
+        user_a, user_b, workspace_id = str(uuid4()), str(uuid4()), str(uuid4())
+        await self._grant(rbac_service, user_a, workspace_id, ["tasks:read"])
+        await self._grant(rbac_service, user_b, workspace_id, ["tasks:read"], name=RoleName.VIEWER)
+
+        first_a = await rbac_service.get_compiled_permissions(user_a, workspace_id)
+        first_b = await rbac_service.get_compiled_permissions(user_b, workspace_id)
+
+        rbac_service.invalidate_user(user_a)
+        assert await rbac_service.get_compiled_permissions(user_a, workspace_id) is not first_a
+        assert await rbac_service.get_compiled_permissions(user_b, workspace_id) is first_b
+
+    @pytest.mark.asyncio
+    async def test_role_invalidation_and_lru_bound(self, rbac_service):
+        """Role updates recompile holders; the cache keeps at most N sets."""
+        user_id = str(uuid4())
+        workspaces = [str(uuid4()) for _ in range(3)]
+        role_id = await self._grant(rbac_service, user_id, workspaces[0], ["tasks:read"])
+        compiled = await rbac_service.get_compiled_permissions(user_id, workspaces[0])
+
+        rbac_service.invalidate_role(role_id)
+        assert await rbac_service.get_compiled_permissions(user_id, workspaces[0]) is not compiled
+
+        for workspace_id in workspaces[1:]:
+            await rbac_service.get_compiled_permissions(user_id, workspace_id)
+        assert len(rbac_service._cache) == 2
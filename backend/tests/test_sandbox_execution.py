@@ -14,6 +14,8 @@ import asyncio
 import json
 import pytest
 import tempfile
+import threading
+import time
 from unittest.mock import AsyncMock, MagicMock, patch, mock_open
 from pathlib import Path
 from uuid import uuid4
@@ -27,6 +29,7 @@ from backend.services.sandbox import (
     PHPExecutor,
     DockerExecutor,
     ExecutorFactory,
+    OutputRingBuffer,
 )
 from backend.services.sandbox.executors import LanguageExecutor
 from backend.db.models.entities import SandboxExecution
@@ -153,6 +156,46 @@ class TestSandboxRunner:
         assert "timeout" in result["error_message"].lower()
         assert result["exit_code"] == 124  # Timeout exit code
     
+    @pytest.mark.asyncio
+    async def test_execution_past_timeout_is_killed(self, sandbox_runner, mock_docker_client):
+        """Test a container still running past its timeout is killed and reported."""
+        killed = threading.Event()
+        container = mock_docker_client.containers.run.return_value
+        container.kill.side_effect = lambda: killed.set()
+        
+        def hung_wait(timeout=None):
+            # A daemon that never answers until the container is gone
+            killed.wait(10)
+            return {"StatusCode": 137}
+        
+        def output():
+            yield (b"started\n", None)
+            killed.wait(10)
+        
+        container.wait.side_effect = hung_wait
+        container.attach.return_value = output()
+        sandbox_runner.WAIT_GRACE_SECONDS = 0.2
+        execution_id = str(uuid4())
+        
+        started = time.monotonic()
+        result = await sandbox_runner.execute_code(
+            execution_id=execution_id,
+            code="while True: pass",
+            command="python main.py",
+            language="python",
+            timeout=1,
+        )
+        
+        assert time.monotonic() - started < 5
+        container.kill.assert_called_once()
+        container.remove.assert_called_once_with(force=True)
+        assert execution_id not in sandbox_runner.active_containers
+        assert result["success"] is False
+        assert result["exit_code"] == 124
+        assert result["error_type"] == "ExecutionTimeoutError"
+        assert "timeout of 1 seconds" in result["error_message"]
+        assert result["stdout"] == "started"
+    
     def test_container_security_config(self, sandbox_runner):
         """Test container security configuration."""
         workdir = "/tmp/test"
@@ -211,6 +254,78 @@ class TestSandboxRunner:
         """Test stopping non-existent execution."""
         result = await sandbox_runner.stop_execution("nonexistent")
         assert result is False
+    
+    @pytest.mark.asyncio
+    async def test_execute_code_streams_demuxed_output(self, sandbox_runner, mock_docker_client):
+        """Test stdout/stderr frames are forwarded live and kept separate."""
+        container = mock_docker_client.containers.run.return_value
+        container.attach.return_value = iter([
+            (b"line 1\n", None),
+            (None, b"warn: deprecated\n"),
+            (b"line 2\n", None),
+        ])
+        
+        frames = []
+        
+        async def on_output(stream, text):
+            frames.append((stream, text))
+        
+        result = await sandbox_runner.execute_code(
+            execution_id=str(uuid4()),
+            code="print('x')",
+            command="python main.py",
+            language="python",
+            on_output=on_output,
+        )
+        
+        assert frames == [
+            ("stdout", "line 1\n"),
+            ("stderr", "warn: deprecated\n"),
+            ("stdout", "line 2\n"),
+        ]
+        assert result["stdout"] == "line 1\nline 2"
+        assert result["stderr"] == "warn: deprecated"
+        assert result["output_truncated"] is False
+        container.logs.assert_not_called()
+        container.remove.assert_called_once_with(force=True)
+    
+    @pytest.mark.asyncio
+    async def test_execute_code_caps_captured_output(self, sandbox_runner, mock_docker_client):
+        """Test captured output is bounded by the ring buffer size."""
+        container = mock_docker_client.containers.run.return_value
+        container.attach.return_value = iter([(b"a" * 64, None), (b"b" * 64, None)])
+        sandbox_runner.max_output_bytes = 100
+        
+        result = await sandbox_runner.execute_code(
+            execution_id=str(uuid4()),
+            code="print('x')",
+            command="python main.py",
+            language="python",
+        )
+        
+        assert result["stdout"] == "a" * 36 + "b" * 64
+        assert result["output_truncated"] is True
+
+
+class TestOutputRingBuffer:
+    """Test cases for bounded sandbox output capture."""
+    
+    def test_keeps_tail_within_capacity(self):
+        buffer = OutputRingBuffer(10)
+        for chunk in (b"0123", b"4567", b"89ab"):
+            buffer.write(chunk)
+        
+        assert buffer.getvalue() == b"23456789ab"
+        assert buffer.truncated_bytes == 2
+        assert len(buffer) == 10
+    
+    def test_oversized_chunk(self):
+        buffer = OutputRingBuffer(4)
+        buffer.write(b"xy")
+        buffer.write(b"0123456789")
+        
+        assert buffer.getvalue() == b"6789"
+        assert buffer.truncated_bytes == 8
 
 
 class TestLanguageExecutors:
@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+"""Tests for envelope encryption, the decrypted value cache and bulk re-encryption.
+
+KMS and Vault are replaced by in-process stand-ins that keep versioned keys
+like the real services and count every round trip.
+"""
+
+import asyncio
+import base64
+from collections import Counter
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from cryptography.fernet import Fernet
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.config import settings
+from backend.db.models import Base
+from backend.db.models.entities import Secret, Workspace
+from backend.db.models.enums import SecretBackend, SecretRotationPolicy, SecretType
+from backend.services.secrets.encryption import EncryptionBackend, EncryptionService, FernetBackend
+from backend.services.secrets.manager import DecryptedValueCache, SecretManager, SecretUpdateRequest
+
+
+class _LocalKeyService(EncryptionBackend):
+    """Versioned keys held in process; every encrypt/decrypt is one counted round trip."""
+
+    def __init__(self, latency: float = 0.0):
+        self._versions = [Fernet(Fernet.generate_key())]
+        self._min_version = 1
+        self.latency = latency
+        self.calls = Counter()
+
+    async def _round_trip(self, operation: str):
+        self.calls[operation] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def encrypt(self, plaintext: str) -> str:
+        await self._round_trip("encrypt")
+        version = len(self._versions)
+        return self._format(version, self._versions[-1].encrypt(plaintext.encode()))
+
+    async def decrypt(self, ciphertext: str) -> str:
+        await self._round_trip("decrypt")
+        version, token = self._parse(ciphertext)
+        if version < self._min_version:
+            raise ValueError(f"key version {version} is disabled")
+        return self._versions[version - 1].decrypt(token).decode()
+
+    async def rotate_key(self) -> bool:
+        self._versions.append(Fernet(Fernet.generate_key()))
+        return True
+
+    async def is_healthy(self) -> bool:
+        return True
+
+    def disable_old_versions(self):
+        """Only the latest key version may decrypt from now on."""
+        self._min_version = len(self._versions)
+
+    @property
+    def key_id(self) -> str:
+        return f"{self.backend_type.value}_v{len(self._versions)}"
+
+
+class LocalKMSBackend(_LocalKeyService):
+    """Stand-in for AWS KMS: base64 ciphertext blobs carrying the key version."""
+
+    backend_type = SecretBackend.AWS_KMS
+
+    def _format(self, version: int, token: bytes) -> str:
+        return base64.b64encode(bytes([version]) + token).decode()
+
+    def _parse(self, ciphertext: str):
+        blob = base64.b64decode(ciphertext)
+        return blob[0], blob[1:]
+
+
+class LocalVaultBackend(_LocalKeyService):
+    """Stand-in for the Vault transit engine: ``vault:v<n>:<ciphertext>``."""
+
+    backend_type = SecretBackend.VAULT
+
+    def _format(self, version: int, token: bytes) -> str:
+        return f"vault:v{version}:{token.decode()}"
+
+    def _parse(self, ciphertext: str):
+        _, version, token = ciphertext.split(":", 2)
+        return int(version[1:]), token.encode()
+
+
+@pytest.fixture(params=[LocalKMSBackend, LocalVaultBackend], ids=["kms", "vault"])
+def backend_class(request):
+    return request.param
+
+
+async def _service(backend: EncryptionBackend) -> EncryptionService:
+    service = EncryptionService()
+    await service.register_backend(backend)
+    return service
+
+
+class TestEnvelopeEncryption:
+    """Data keys are wrapped by the backend once and reused."""
+
+    async def test_backend_is_called_once_per_data_key(self, backend_class):
+        backend = backend_class()
+        writer = await _service(backend)
+        ciphertexts = [await writer.encrypt(f"value-{i}") for i in range(50)]
+
+        assert backend.calls == Counter(encrypt=1)
+        assert len(set(ciphertexts)) == 50
+
+        # A fresh process has to unwrap the data key, but only once
+        reader = await _service(backend)
+        assert [await reader.decrypt(c) for c in ciphertexts] == [f"value-{i}" for i in range(50)]
+        assert backend.calls == Counter(encrypt=1, decrypt=1)
+        assert reader.stats()["data_key_unwraps"] == 1
+
+    async def test_data_key_rolls_over_after_max_uses(self, backend_class, monkeypatch):
+        monkeypatch.setattr(settings, "secret_data_key_max_uses", 10)
+        backend = backend_class()
+        service = await _service(backend)
+
+        for i in range(25):
+            await service.encrypt(f"value-{i}")
+
+        assert backend.calls["encrypt"] == 3
+        assert service.stats()["data_keys_generated"] == 3
+
+    async def test_concurrent_cold_reads_unwrap_once(self, backend_class):
+        backend = backend_class(latency=0.02)
+        ciphertext = await (await _service(backend)).encrypt("hot-secret")
+
+        reader = await _service(backend)
+        values = await asyncio.gather(*(reader.decrypt(ciphertext) for _ in range(20)))
+
+        assert values == ["hot-secret"] * 20
+        assert backend.calls["decrypt"] == 1
+
+    async def test_legacy_ciphertexts_still_decrypt(self, backend_class):
+        backend = backend_class()
+        service = await _service(backend)
+        legacy = await backend.encrypt("written-before-envelopes")
+
+        assert await service.decrypt(legacy) == "written-before-envelopes"
+
+    async def test_envelope_encryption_can_be_disabled(self, backend_class, monkeypatch):
+        monkeypatch.setattr(settings, "secret_envelope_encryption", False)
+        backend = backend_class()
+        service = await _service(backend)
+
+        ciphertext = await service.encrypt("direct")
+
+        assert not ciphertext.startswith("env1.")
+        assert await service.decrypt(ciphertext) == "direct"
+        assert backend.calls == Counter(encrypt=1, decrypt=1)
+
+    async def test_fernet_rotation_keeps_existing_values_readable(self):
+        backend = FernetBackend()
+        service = await _service(backend)
+        ciphertext = await service.encrypt("before-rotation")
+        original_key_id = backend.key_id
+
+        await service.rotate_encryption_key()
+        service.clear_data_keys()
+
+        assert backend.key_id != original_key_id
+        assert await service.decrypt(ciphertext) == "before-rotation"
+
+
+class TestDecryptedValueCache:
+    """Cached values are served only while fresh and matching the stored ciphertext."""
+
+    def test_hit_requires_matching_ciphertext(self):
+        cache = DecryptedValueCache(ttl_seconds=60, max_entries=10)
+        cache.put("s1", "cipher-a", "value")
+
+        assert cache.get("s1", "cipher-a") == "value"
+        assert cache.get("s1", "cipher-b") is None
+        # The mismatching entry is dropped
+        assert cache.get("s1", "cipher-a") is None
+
+    async def test_entries_expire(self):
+        cache = DecryptedValueCache(ttl_seconds=0.01, max_entries=10)
+        cache.put("s1", "cipher", "value")
+        await asyncio.sleep(0.02)
+
+        assert cache.get("s1", "cipher") is None
+
+    def test_zero_ttl_disables_cache_and_size_is_bounded(self):
+        disabled = DecryptedValueCache(ttl_seconds=0, max_entries=10)
+        disabled.put("s1", "cipher", "value")
+        assert disabled.get("s1", "cipher") is None
+
+        cache = DecryptedValueCache(ttl_seconds=60, max_entries=2)
+        for i in range(3):
+            cache.put(f"s{i}", "cipher", f"value-{i}")
+        assert cache.get("s0", "cipher") is None
+        assert cache.stats()["cached"] == 2
+
+
+class TestSecretManagerValueCache:
+    """get_secret_value decrypts once per TTL; writes invalidate."""
+
+    @pytest.fixture
+    def mock_session(self):
+        session = AsyncMock(spec=AsyncSession)
+        session.commit = AsyncMock()
+        session.refresh = AsyncMock()
+        return session
+
+    @pytest.fixture
+    def secret_manager(self, mock_session):
+        manager = SecretManager(mock_session, value_cache=DecryptedValueCache(ttl_seconds=60, max_entries=10))
+        manager._get_audit_logger = AsyncMock(return_value=AsyncMock())
+        return manager
+
+    @pytest.fixture
+    def mock_secret(self, mock_session):
+        secret = MagicMock()
+        secret.id = "secret123"
+        secret.workspace_id = "workspace123"
+        secret.is_active = True
+        secret.encrypted_value = "cipher-1"
+        secret.rotation_policy = SecretRotationPolicy.MANUAL
+        mock_session.get = AsyncMock(return_value=secret)
+        return secret
+
+    async def test_repeated_reads_decrypt_once(self, secret_manager, mock_secret):
+        with patch("backend.services.secrets.manager.encryption_service") as mock_encryption:
+            mock_encryption.decrypt = AsyncMock(return_value="plain")
+            values = [await secret_manager.get_secret_value("workspace123", "secret123") for _ in range(5)]
+
+        assert values == ["plain"] * 5
+        mock_encryption.decrypt.assert_called_once_with("cipher-1")
+
+    async def test_update_and_delete_invalidate(self, secret_manager, mock_secret):
+        with patch("backend.services.secrets.manager.encryption_service") as mock_encryption:
+            mock_encryption.decrypt = AsyncMock(return_value="plain")
+            mock_encryption.encrypt = AsyncMock(return_value="cipher-1")
+            await secret_manager.get_secret_value("workspace123", "secret123")
+
+            # Same ciphertext on purpose: only the explicit invalidation forces a decrypt
+            await secret_manager.update_secret("workspace123", "secret123", SecretUpdateRequest(value="plain"))
+            await secret_manager.get_secret_value("workspace123", "secret123")
+            assert mock_encryption.decrypt.await_count == 2
+
+            await secret_manager.delete_secret("workspace123", "secret123")
+            assert secret_manager.value_cache.stats()["cached"] == 0
+
+
+class TestBulkReencryption:
+    """Key rotation re-encrypts stored secrets batch by batch."""
+
+    @pytest.fixture
+    async def session(self):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as session:
+            yield session
+        await engine.dispose()
+
+    async def test_rotation_rewraps_each_data_key_once(self, session, backend_class, monkeypatch):
+        monkeypatch.setattr(settings, "secret_data_key_max_uses", 25)
+        backend = backend_class()
+        service = await _service(backend)
+        monkeypatch.setattr("backend.services.secrets.manager.encryption_service", service)
+
+        workspace = Workspace(name="Rotation", slug=f"rotation-{uuid4().hex[:8]}")
+        session.add(workspace)
+        await session.flush()
+        values = {f"SECRET_{i}": f"value-{i}" for i in range(100)}
+        values["LEGACY_0"] = "legacy-value"
+        for name, value in values.items():
+            encrypted = await backend.encrypt(value) if name.startswith("LEGACY") else await service.encrypt(value)
+            session.add(Secret(
+                workspace_id=workspace.id,
+                name=name,
+                secret_type=SecretType.API_KEY,
+                encrypted_value=encrypted,
+                rotation_policy=SecretRotationPolicy.MANUAL,
+                meta_data={},
+                is_active=True,
+            ))
+        await session.commit()
+        assert service.stats()["data_keys_generated"] == 4
+
+        await service.rotate_encryption_key()
+        backend.calls.clear()
+        counts = await SecretManager(session).reencrypt_secrets(batch_size=30)
+
+        assert counts == {"processed": 101, "reencrypted": 101, "failed": 0, "batches": 4}
+        # Four rewraps, plus one legacy decrypt and one new data key for it
+        assert backend.calls == Counter(encrypt=5, decrypt=1)
+
+        # Values stay readable once the old key version is gone
+        backend.disable_old_versions()
+        reader = await _service(backend)
+        rows = (await session.execute(select(Secret.name, Secret.encrypted_value))).all()
+        assert {name: await reader.decrypt(encrypted) for name, encrypted in rows} == values
+
+    async def _store(self, session, service, values):
+        workspace = Workspace(name="Rotation", slug=f"rotation-{uuid4().hex[:8]}")
+        session.add(workspace)
+        await session.flush()
+        for name, value in values.items():
+            session.add(Secret(
+                workspace_id=workspace.id,
+                name=name,
+                secret_type=SecretType.API_KEY,
+                encrypted_value=await service.encrypt(value),
+                rotation_policy=SecretRotationPolicy.MANUAL,
+                meta_data={},
+                is_active=True,
+            ))
+        await session.commit()
+
+    async def test_shared_key_rotation_reencrypts(self, session, backend_class, monkeypatch):
+        service = await _service(backend_class())
+        monkeypatch.setattr("backend.services.secrets.manager.encryption_service", service)
+        await self._store(session, service, {"API_KEY": "value"})
+
+        rotation = await SecretManager(session).rotate_encryption_key()
+
+        assert rotation["results"][backend_class.backend_type]["success"] is True
+        assert rotation["reencryption"]["reencrypted"] == 1
+
+    async def test_fernet_rotation_survives_restart(self, session, monkeypatch):
+        monkeypatch.setattr(settings, "secret_encryption_key", await EncryptionService().generate_fernet_key())
+
+        async def service_from_settings() -> EncryptionService:
+            # What app start-up does with the fernet backend
+            service = EncryptionService()
+            await service.initialize(SecretBackend.FERNET, encryption_key=settings.secret_encryption_key)
+            return service
+
+        service = await service_from_settings()
+        monkeypatch.setattr("backend.services.secrets.manager.encryption_service", service)
+        await self._store(session, service, {"API_KEY": "value"})
+
+        rotation = await SecretManager(session).rotate_encryption_key()
+
+        # The rotated key could not be persisted, so nothing was rotated or rewritten
+        assert rotation["results"][SecretBackend.FERNET]["skipped"] is True
+        assert rotation["reencryption"] is None
+        await self._store(session, service, {"AFTER_ROTATION": "later"})
+
+        restarted = await service_from_settings()
+        rows = (await session.execute(select(Secret.name, Secret.encrypted_value))).all()
+        assert {name: await restarted.decrypt(encrypted) for name, encrypted in rows} == {
+            "API_KEY": "value",
+            "AFTER_ROTATION": "later",
+        }
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""Tests for the trace-indexed in-memory span store."""
+
+from mgx_observability.span_store import SpanRecord, SpanStore
+
+
+def _span(trace_id: str, span_id: str, payload: str = "") -> SpanRecord:
+    return SpanRecord(
+        name=f"op-{span_id}",
+        trace_id=trace_id,
+        span_id=span_id,
+        parent_span_id=None,
+        kind="INTERNAL",
+        start_time="2026-01-01T00:00:00+00:00",
+        end_time="2026-01-01T00:00:01+00:00",
+        duration_ms=1000.0,
+        attributes={"payload": payload},
+        status_code="OK",
+        status_description=None,
+        resource={"service.name": "test"},
+    )
+
+
+class TestSpanStore:
+    def test_list_is_newest_first_across_and_within_traces(self):
+        store = SpanStore()
+        for i, trace_id in enumerate(["a", "b", "a", "c", "b"]):
+            store.add(_span(trace_id, str(i)))
+
+        assert [s.span_id for s in store.list(limit=3)] == ["4", "3", "2"]
+        assert [s.span_id for s in store.list(trace_id="a")] == ["2", "0"]
+        assert [s.span_id for s in store.get_trace("b")] == ["1", "4"]
+        assert store.list(trace_id="missing") == []
+
+    def test_evicts_whole_least_recently_updated_traces(self):
+        store = SpanStore(maxlen=4)
+        for trace_id, span_id in [("a", "1"), ("a", "2"), ("b", "3"), ("a", "4"), ("c", "5")]:
+            store.add(_span(trace_id, span_id))
+
+        # "b" was updated least recently and is dropped as a whole
+        assert store.get_trace("b") == []
+        assert [s.span_id for s in store.get_trace("a")] == ["1", "2", "4"]
+        assert store.stats()["spans"] == 4
+
+    def test_byte_budget_and_spill_file(self, tmp_path):
+        spill = tmp_path / "spans.jsonl"
+        store = SpanStore(max_bytes=2000, spill_path=str(spill))
+        for i in range(6):
+            store.add(_span(f"t{i}", str(i), payload="x" * 400))
+
+        stats = store.stats()
+        assert stats["bytes"] <= 2000
+        assert stats["traces"] < 6
+        assert stats["spilled_traces"] == 6 - stats["traces"]
+
+        # Evicted traces are read back from the spill file
+        spilled = store.get_trace("t0")
+        assert [s.span_id for s in spilled] == ["0"]
+        assert spilled[0].attributes == {"payload": "x" * 400}
+
+    def test_single_oversized_trace_keeps_its_newest_spans(self):
+        store = SpanStore(maxlen=3)
+        for i in range(5):
+            store.add(_span("only", str(i)))
+
+        assert [s.span_id for s in store.get_trace("only")] == ["2", "3", "4"]
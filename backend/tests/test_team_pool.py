@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Tests for the MGXStyleTeam pool."""
+
+import asyncio
+
+import pytest
+
+from backend.services.team_pool import TeamPool, TeamPoolTimeout
+
+
+class _Team:
+    def __init__(self, number: int):
+        self.number = number
+        self.current_task = None
+
+
+def _make_pool(**kwargs):
+    built = []
+
+    def factory():
+        team = _Team(len(built))
+        built.append(team)
+        return team
+
+    def reset(team):
+        team.current_task = None
+
+    return TeamPool(factory, reset=reset, **kwargs), built
+
+
+class TestTeamPool:
+    async def test_concurrent_checkouts_get_distinct_teams_and_reuse_on_checkin(self):
+        pool, built = _make_pool(max_size=3)
+
+        first = await pool.acquire()
+        second = await pool.acquire()
+        assert first is not second
+
+        first.current_task = "build a todo app"
+        await pool.release(first)
+
+        third = await pool.acquire()
+        assert third is first
+        assert third.current_task is None  # reset on checkin
+        assert len(built) == 2
+
+        stats = pool.stats()
+        assert stats["in_use"] == 2
+        assert stats["idle"] == 0
+        assert stats["checkouts"] == 3
+        assert stats["wait_count"] == 3
+
+    async def test_waiters_block_at_max_size_and_time_out(self):
+        pool, _ = _make_pool(max_size=1)
+        team = await pool.acquire()
+
+        with pytest.raises(TeamPoolTimeout):
+            await pool.acquire(timeout=0.05)
+
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)
+        assert pool.stats()["waiting"] == 1
+
+        await pool.release(team)
+        assert await asyncio.wait_for(waiter, 1) is team
+        assert pool.stats()["wait_max_seconds"] > 0
+
+    async def test_per_workspace_limit_leaves_capacity_for_other_workspaces(self):
+        pool, _ = _make_pool(max_size=3, per_workspace_limit=1)
+
+        async with pool.checkout("ws-a"):
+            with pytest.raises(TeamPoolTimeout):
+                await pool.acquire("ws-a", timeout=0.05)
+
+            other = await pool.acquire("ws-b", timeout=0.05)
+            assert pool.stats()["per_workspace_in_use"] == {"ws-a": 1, "ws-b": 1}
+            await pool.release(other)
+
+        assert pool.stats()["per_workspace_in_use"] == {}
+
+    async def test_prewarm_and_idle_eviction_keep_the_floor(self):
+        pool, built = _make_pool(max_size=4, min_idle=1, idle_timeout_seconds=0.01)
+        assert await pool.prewarm() == 1
+
+        teams = [await pool.acquire() for _ in range(3)]
+        assert len(built) == 3  # one pre-warmed, two built on demand
+        for team in teams:
+            await pool.release(team)
+
+        await asyncio.sleep(0.02)
+        await pool.release(await pool.acquire())
+
+        stats = pool.stats()
+        assert stats["evicted"] == 2
+        assert stats["size"] == stats["idle"] == 1
+
+    async def test_failed_reset_discards_the_team(self):
+        def broken_reset(team):
+            raise RuntimeError("role memory is gone")
+
+        pool = TeamPool(lambda: _Team(0), reset=broken_reset, max_size=1)
+        team = await pool.acquire()
+        await pool.release(team)
+
+        assert pool.stats()["discarded"] == 1
+        assert await pool.acquire() is not team
@@ -79,6 +79,9 @@ def _load(rel_path: str, module_name: str):
 _mod_models = _load("mgx_agent/microservice/models.py", "mgx_agent.microservice.models")
 _mod_decomp = _load("mgx_agent/microservice/decomposer.py", "mgx_agent.microservice.decomposer")
 _mod_integ = _load("mgx_agent/microservice/integrator.py", "mgx_agent.microservice.integrator")
+_mod_sched = _load("mgx_agent/microservice/scheduler.py", "mgx_agent.microservice.scheduler")
+_load("mgx_agent/performance/async_tools.py", "mgx_agent.performance.async_tools")
+_mod_orch = _load("mgx_agent/microservice/orchestrator.py", "mgx_agent.microservice.orchestrator")
 
 ServiceSpec = _mod_models.ServiceSpec
 ServiceResult = _mod_models.ServiceResult
@@ -88,6 +91,12 @@ DecomposeTask = _mod_decomp.DecomposeTask
 _parse_llm_response = _mod_decomp._parse_llm_response
 _single_service_fallback = _mod_decomp._single_service_fallback
 
+SpecStreamParser = _mod_decomp.SpecStreamParser
+
+ContractBoard = _mod_sched.ContractBoard
+PhaseScheduler = _mod_sched.PhaseScheduler
+ParallelOrchestrator = _mod_orch.ParallelOrchestrator
+
 IntegrateServices = _mod_integ.IntegrateServices
 _parse_files = _mod_integ._parse_files
 _fallback_files = _mod_integ._fallback_files
@@ -382,3 +391,150 @@ class TestIntegrateServicesRun:
         with patch.object(action, "_aask", new=AsyncMock(side_effect=capture)):
             await action.run([failed])
         assert "FAILED" in captured[0] or "timeout" in captured[0]
+
+
+# ===========================================================================
+# Akışlı orkestrasyon — parser, sözleşme panosu, planlayıcı, orkestratör
+# ===========================================================================
+class TestSpecStreamParser:
+    def test_specs_decoded_as_each_object_closes(self):
+        raw = json.dumps([
+            {"name": "auth", "description": "Auth {API}", "stack": "fastapi", "port": 8001},
+            {"name": "web", "description": "Web \"ui\"", "stack": "nextjs", "port": 8001},
+        ])
+        split = raw.index("}, {") + 1
+        parser = SpecStreamParser()
+
+        first = parser.feed("```json\n" + raw[:split])
+        second = parser.feed(raw[split:])
+
+        assert [s.name for s in first] == ["auth"]
+        assert [s.name for s in second] == ["web"]
+        assert second[0].port != 8001  # çakışan port yeniden atanır
+
+    @run_async
+    async def test_run_stream_falls_back_without_json(self):
+        action = DecomposeTask()
+        with patch.object(action, "_aask", new=AsyncMock(return_value="no json")):
+            specs = [s async for s in action.run_stream("Build something")]
+        assert [s.name for s in specs] == ["main-service"]
+
+
+class TestContractBoard:
+    @run_async
+    async def test_dependents_wait_only_for_contracts_and_cycles_are_released(self):
+        board = ContractBoard()
+        for name, deps in [("a", ["b"]), ("b", ["c"]), ("c", ["b"]), ("d", ["ghost"])]:
+            board.declare(ServiceSpec(name, "x", "fastapi", 8001, deps))
+
+        waiter = asyncio.create_task(board.wait_for("a", ["b"]))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        await board.close_declarations()
+        # b <-> c döngüsü ve bilinmeyen bağımlılık beklemez
+        assert await board.wait_for("b", ["c"]) == {"c": None}
+        assert await board.wait_for("d", ["ghost"]) == {"ghost": None}
+
+        await board.publish("b", "GET /users")
+        assert await asyncio.wait_for(waiter, 1) == {"b": "GET /users"}
+
+
+class TestPhaseScheduler:
+    @run_async
+    async def test_plan_phases_get_slots_before_execute_phases(self):
+        scheduler = PhaseScheduler(max_concurrent=1)
+        order = []
+
+        async def phase(label, priority):
+            async with scheduler.slot(priority):
+                order.append(label)
+                await asyncio.sleep(0)
+
+        await scheduler.acquire(0)
+        tasks = [
+            asyncio.create_task(phase("execute", 1)),
+            asyncio.create_task(phase("plan", 0)),
+        ]
+        await asyncio.sleep(0)
+        scheduler.release()
+        await asyncio.gather(*tasks)
+
+        assert order == ["plan", "execute"]
+
+
+class _FakeConfig:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class _FakeBaseConfig:
+    enable_caching = False
+
+    def dict(self):
+        return {}
+
+
+class _FakeTeam:
+    events: list = []
+
+    def __init__(self, config=None, output_dir_base=None):
+        self.output_dir_base = output_dir_base
+        self.metrics = []
+
+    async def analyze_and_plan(self, description):
+        name = self.output_dir_base.rsplit("/", 1)[-1]
+        _FakeTeam.events.append(("plan", name, description))
+        return f"contract of {name}"
+
+    def approve_plan(self):
+        return True
+
+    async def execute(self):
+        name = self.output_dir_base.rsplit("/", 1)[-1]
+        await asyncio.sleep(0.05 if name == "slow" else 0)
+        _FakeTeam.events.append(("done", name, ""))
+        return f"code of {name}"
+
+
+class TestStreamingOrchestrator:
+    @run_async
+    async def test_dependents_start_on_contracts_and_integration_overlaps(self):
+        _FakeTeam.events = []
+        specs = [
+            ServiceSpec("web", "Frontend", "nextjs", 8002, ["slow"]),
+            ServiceSpec("slow", "Slow API", "fastapi", 8001, []),
+        ]
+
+        async def fake_stream(task):
+            for spec in specs:
+                yield spec
+
+        async def fake_integrate(results):
+            _FakeTeam.events.append(("integrate", "", ""))
+            return {"README.md": "llm readme"}
+
+        events = []
+        orchestrator = ParallelOrchestrator(
+            _FakeBaseConfig(),
+            streaming=True,
+            on_event=lambda event, data: events.append(event),
+        )
+        with patch.object(_mod_orch, "_get_team_classes", return_value=(_FakeTeam, _FakeConfig)), \
+                patch.object(orchestrator, "_decompose_stream", side_effect=fake_stream), \
+                patch.object(orchestrator, "_integrate", side_effect=fake_integrate):
+            result = await orchestrator.run("Build a shop")
+
+        steps = [(kind, name) for kind, name, _ in _FakeTeam.events]
+        # web, slow'un yürütmesini değil yalnızca sözleşmesini bekler
+        assert steps.index(("plan", "web")) < steps.index(("done", "slow"))
+        web_description = next(d for kind, name, d in _FakeTeam.events if (kind, name) == ("plan", "web"))
+        assert "contract of slow" in web_description
+        # entegrasyon en yavaş servisin bitmesini beklemez
+        assert steps.index(("integrate", "")) < steps.index(("done", "slow"))
+
+        assert [r.spec.name for r in result.services] == ["web", "slow"]
+        assert result.success and all(r.success for r in result.services)
+        assert result.integration_files["README.md"] == "llm readme"
+        assert "docker-compose.yml" in result.integration_files
+        assert events.count("integration_updated") == 2
@@ -42,6 +42,12 @@ from .actions import (
 # Adapter
 from .adapter import MetaGPTAdapter
 
+# Message streaming
+from .message_stream import TeamMessageStream, MessageSubscription
+
+# Speculative parallel rounds
+from .parallel_rounds import ArtifactSnapshot, ParallelRoundRunner, SpeculativeStep
+
 # Roles & Mixins
 from .roles import (
     RelevantMemoryMixin,
@@ -105,6 +111,15 @@ __all__ = [
     # Adapter
     'MetaGPTAdapter',
     
+    # Message streaming
+    'TeamMessageStream',
+    'MessageSubscription',
+    
+    # Parallel rounds
+    'ArtifactSnapshot',
+    'ParallelRoundRunner',
+    'SpeculativeStep',
+    
     # Roles
     'RelevantMemoryMixin',
     'Mike',
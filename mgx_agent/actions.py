@@ -10,8 +10,12 @@ LLM çağrıları yapan Action sınıfları:
 - ReviewCode: Kod inceleme
 """
 
+import asyncio
+import atexit
 import os
 import re
+import shutil
+import tempfile
 import uuid
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
@@ -72,6 +76,77 @@ def print_phase_header(phase: str, emoji: str = "🔄"):
     print(f"{'='*60}")
 
 
+# One lock per quality gate directory: files are synced and evaluated atomically
+_QUALITY_GATE_DIR_LOCKS: Dict[str, asyncio.Lock] = {}
+# Root of this process's quality gate directories (created on first use)
+_QUALITY_GATE_ROOT: Optional[str] = None
+
+
+def _quality_gate_root() -> str:
+    """Directory owned by this process that quality gate workdirs live under.
+
+    ``MGX_QUALITY_GATE_DIR`` points at a directory the service owns;
+    otherwise a private ``mkdtemp`` directory (mode 0700) is created and
+    removed at exit. A predictable shared path under the system temp
+    directory would let other processes or users race the file sync.
+    """
+    global _QUALITY_GATE_ROOT
+    if _QUALITY_GATE_ROOT is None:
+        configured = os.getenv("MGX_QUALITY_GATE_DIR", "").strip()
+        if configured:
+            os.makedirs(configured, mode=0o700, exist_ok=True)
+            _QUALITY_GATE_ROOT = os.path.realpath(configured)
+        else:
+            _QUALITY_GATE_ROOT = os.path.realpath(tempfile.mkdtemp(prefix="mgx_quality_gates_"))
+            atexit.register(shutil.rmtree, _QUALITY_GATE_ROOT, True)
+    return _QUALITY_GATE_ROOT
+
+
+def _quality_gate_workdir(workspace_id: str, project_id: str) -> str:
+    """Stable per-project scratch directory quality gates evaluate generated files in."""
+    parts = [
+        re.sub(r"[^A-Za-z0-9_.-]", "_", str(value or "default")).lstrip(".") or "default"
+        for value in (workspace_id, project_id)
+    ]
+    return os.path.join(_quality_gate_root(), *parts)
+
+
+def _sync_quality_gate_files(working_directory: str, files: List[Tuple[str, str]]) -> None:
+    """Mirror ``files`` into ``working_directory``, only rewriting changed files."""
+    root = os.path.realpath(working_directory)
+    os.makedirs(root, exist_ok=True)
+
+    wanted = set()
+    for filepath, content in files:
+        if not filepath:
+            continue
+        target = os.path.realpath(os.path.join(root, filepath.lstrip("/\\")))
+        if os.path.commonpath([root, target]) != root:
+            logger.warning(f"⚠️ Skipping file outside quality gate directory: {filepath}")
+            continue
+        wanted.add(target)
+        data = (content or "").encode("utf-8")
+        try:
+            with open(target, "rb") as handle:
+                if handle.read() == data:
+                    continue
+        except OSError:
+            pass
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as handle:
+            handle.write(data)
+
+    # Drop files that are no longer part of the generated project
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if path not in wanted:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
 def _env_flag(name: str) -> bool:
     return str(os.getenv(name, "")).strip().lower() in {"1", "true", "yes", "on"}
 
@@ -839,14 +914,19 @@ Orijinal görevi unutma: {instruction}
             
             logger.info(f"🏗️ Running quality gates: {gate_types}")
             
-            # Run quality gates
-            result = await gate_manager.evaluate_gates(
-                workspace_id=workspace_id,
-                project_id=project_id,
-                gate_types=gate_types,
-                task_run_id=task_run_id,
-                working_directory="/tmp/test",  # Use temp directory for testing
-            )
+            # Gates run against a stable per-project directory so unchanged
+            # files keep their mtime and cached findings are reused.
+            working_directory = _quality_gate_workdir(workspace_id, project_id)
+            lock = _QUALITY_GATE_DIR_LOCKS.setdefault(working_directory, asyncio.Lock())
+            async with lock:
+                await asyncio.to_thread(_sync_quality_gate_files, working_directory, files)
+                result = await gate_manager.evaluate_gates(
+                    workspace_id=workspace_id,
+                    project_id=project_id,
+                    gate_types=gate_types,
+                    task_run_id=task_run_id,
+                    working_directory=working_directory,
+                )
             
             if not result.get("success", False):
                 logger.warning(f"⚠️ Quality gate evaluation failed: {result.get('error', 'Unknown error')}")
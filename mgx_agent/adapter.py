@@ -220,3 +220,75 @@ class MetaGPTAdapter:
         except Exception as e:
             logger.warning(f"⚠️ News alınırken hata: {e}")
             return []
+    
+    @staticmethod
+    def discard_pending(role) -> int:
+        """
+        Role'un işlenmemiş mesajlarını (msg_buffer + rc.news) at.
+
+        Role bir sonraki turda bu mesajlar yüzünden çalışmaz; hafızası
+        değişmez.
+
+        Args:
+            role: MetaGPT Role instance
+
+        Returns:
+            Atılan mesaj sayısı
+        """
+        rc = getattr(role, "rc", None)
+        if rc is None:
+            return 0
+
+        dropped = 0
+        try:
+            buffer = getattr(rc, "msg_buffer", None)
+            if buffer is not None and hasattr(buffer, "pop_all"):
+                dropped += len(buffer.pop_all() or [])
+            news = getattr(rc, "news", None)
+            if news:
+                dropped += len(news)
+                rc.news = []
+        except Exception as e:
+            logger.warning(f"⚠️ Bekleyen mesajlar atılırken hata: {e}")
+        return dropped
+
+    @staticmethod
+    def observe_publish(env, callback) -> bool:
+        """
+        Environment'ın publish_message çağrılarını gözlemle.
+        
+        Orijinal publish_message çalıştıktan sonra ``callback(message)``
+        çağrılır. Aynı environment'a ikinci kez kurulursa eski gözlemcinin
+        yerini alır (sarmalayıcılar üst üste binmez).
+        
+        Args:
+            env: MetaGPT Environment instance
+            callback: Yayınlanan her mesaj için çağrılacak fonksiyon
+            
+        Returns:
+            True if the hook was installed, False otherwise
+        """
+        publish = getattr(env, "publish_message", None) if env is not None else None
+        if publish is None or not callable(publish):
+            return False
+        
+        original = getattr(publish, "_mgx_original", publish)
+        
+        def publish_message(message, *args, **kwargs):
+            result = original(message, *args, **kwargs)
+            try:
+                callback(message)
+            except Exception as e:
+                logger.warning(f"⚠️ Mesaj gözlemcisi hatası: {e}")
+            return result
+        
+        publish_message._mgx_original = original
+        
+        try:
+            # MetaGPT Environment bir pydantic modeli; instance attribute'u
+            # model alanı olmadan set etmek için object.__setattr__ gerekli
+            object.__setattr__(env, "publish_message", publish_message)
+        except Exception as e:
+            logger.warning(f"⚠️ publish_message gözlemcisi kurulamadı: {e}")
+            return False
+        return True
@@ -97,6 +97,10 @@ class TeamConfig(BaseModel):
     
     # LLM ayarları
     use_multi_llm: bool = Field(default=False, description="Her role farklı LLM")
+    enable_parallel_rounds: bool = Field(
+        default=False,
+        description="Bağımsız rol aksiyonlarını aynı turda spekülatif olarak paralel çalıştır",
+    )
     
     # Log ayarları
     log_level: LogLevel = Field(default=LogLevel.INFO, description="Log seviyesi")
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Push-based stream of messages published by an MGX team.
+
+Every message that goes through the team environment's ``publish_message``
+(role outputs, the approved plan, revision requests) is handed to
+``TeamMessageStream.publish`` as it happens. Subscribers receive each
+message exactly once, in publication order, through an asyncio queue, so
+consumers no longer poll and rescan role memories to find what is new.
+
+Provides:
+- TeamMessageStream: Dedupes messages by stable ID (MetaGPT ``Message.id``
+  when present) and fans them out to subscribers
+- MessageSubscription: Async iterator over one subscriber's queue
+"""
+
+import asyncio
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Set, Tuple
+
+from metagpt.logs import logger
+
+_CLOSED = object()
+
+
+class MessageSubscription:
+    """One subscriber's view of a ``TeamMessageStream``."""
+
+    def __init__(self, stream: "TeamMessageStream"):
+        self._stream = stream
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._closed = False
+
+    def _put(self, message: Any) -> None:
+        if not self._closed:
+            self._queue.put_nowait(message)
+
+    def close(self) -> None:
+        """Stop receiving; iteration ends once queued messages are consumed."""
+        if self._closed:
+            return
+        self._closed = True
+        self._stream._unsubscribe(self)
+        self._queue.put_nowait(_CLOSED)
+
+    def drain(self) -> List[Any]:
+        """Return queued messages without waiting."""
+        messages = []
+        while not self._queue.empty():
+            message = self._queue.get_nowait()
+            if message is _CLOSED:
+                self._queue.put_nowait(_CLOSED)
+                break
+            messages.append(message)
+        return messages
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Any]:
+        while True:
+            message = await self._queue.get()
+            if message is _CLOSED:
+                self._queue.put_nowait(_CLOSED)
+                return
+            yield message
+
+    async def until(self, task: "asyncio.Future") -> AsyncIterator[Any]:
+        """Yield messages as they arrive until ``task`` finishes, then the rest.
+
+        The task's result or exception is left for the caller to collect.
+        """
+        getter = None
+        try:
+            while not task.done():
+                getter = asyncio.ensure_future(self._queue.get())
+                done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                if getter not in done:
+                    break
+                message = getter.result()
+                if message is _CLOSED:
+                    self._queue.put_nowait(_CLOSED)
+                    return
+                yield message
+        finally:
+            if getter is not None and not getter.done():
+                getter.cancel()
+        for message in self.drain():
+            yield message
+
+    def __enter__(self) -> "MessageSubscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TeamMessageStream:
+    """Deduplicating fan-out of published team messages."""
+
+    def __init__(self):
+        self._subscribers: List[MessageSubscription] = []
+        self._seen: Set[str] = set()
+        # Messages without an ``id`` attribute get one assigned here
+        self._assigned_ids: Dict[int, Tuple[Any, str]] = {}
+        self.published = 0
+
+    def message_id(self, message: Any) -> str:
+        """Stable ID of ``message`` for the lifetime of this stream."""
+        existing = getattr(message, "id", None)
+        if isinstance(existing, str) and existing:
+            return existing
+        entry = self._assigned_ids.get(id(message))
+        if entry is None or entry[0] is not message:
+            entry = (message, uuid.uuid4().hex)
+            self._assigned_ids[id(message)] = entry
+        return entry[1]
+
+    def publish(self, message: Any) -> bool:
+        """Deliver ``message`` to every subscriber; False if it was already published."""
+        if message is None:
+            return False
+        msg_id = self.message_id(message)
+        if msg_id in self._seen:
+            return False
+        self._seen.add(msg_id)
+        self.published += 1
+        for subscription in list(self._subscribers):
+            try:
+                subscription._put(message)
+            except Exception as e:
+                logger.warning(f"⚠️ Mesaj aboneye iletilemedi: {e}")
+        return True
+
+    def subscribe(self) -> MessageSubscription:
+        """Subscribe to messages published from now on."""
+        subscription = MessageSubscription(self)
+        self._subscribers.append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: MessageSubscription) -> None:
+        try:
+            self._subscribers.remove(subscription)
+        except ValueError:
+            pass
+
+    def reset(self) -> None:
+        """Forget published IDs (between tasks); subscribers stay attached."""
+        self._seen.clear()
+        self._assigned_ids.clear()
+        self.published = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+__all__ = ["MessageSubscription", "TeamMessageStream"]
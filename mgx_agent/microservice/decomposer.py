@@ -10,7 +10,7 @@ from __future__ import annotations
 
 import json
 import re
-from typing import List, Optional
+from typing import AsyncIterator, Iterator, List, Optional
 
 from metagpt.actions import Action
 from metagpt.logs import logger
@@ -85,6 +85,121 @@ class DecomposeTask(Action):
         logger.info(f"[DecomposeTask] {len(specs)} servis üretildi: {[s.name for s in specs]}")
         return specs
 
+    async def run_stream(self, task: str, max_services: int = 6) -> AsyncIterator[ServiceSpec]:
+        """
+        ``run`` ile aynı sözleşme; ancak her ServiceSpec, JSON dizisindeki
+        nesnesi kapanır kapanmaz üretilir (yanıtın tamamı beklenmez).
+
+        Parameters
+        ----------
+        task:         Kullanıcının orijinal yüksek seviye görevi.
+        max_services: Üretilebilecek maksimum servis sayısı (varsayılan 6).
+
+        Yields
+        ------
+        ServiceSpec — hiçbir spec çözülemezse tek-elemanlı fallback.
+        """
+        prompt = _DECOMPOSE_PROMPT.format(task=task.strip(), max_services=max_services)
+        parser = SpecStreamParser()
+        chunks: List[str] = []
+        produced = 0
+
+        try:
+            async for chunk in self._aask_chunks(prompt):
+                chunks.append(chunk)
+                for spec in parser.feed(chunk):
+                    if produced >= max_services:
+                        continue
+                    produced += 1
+                    yield spec
+        except Exception as exc:
+            logger.warning(f"[DecomposeTask] LLM akışı başarısız: {exc}")
+
+        if produced == 0:
+            # Akış parser'ı nesne bulamadıysa tam metni klasik yolla dene
+            specs = _parse_llm_response("".join(chunks), task)
+            if not specs:
+                logger.warning("[DecomposeTask] JSON parse başarısız — fallback kullanılıyor")
+                specs = _single_service_fallback(task)
+            for spec in specs[:max_services]:
+                yield spec
+
+    async def _aask_chunks(self, prompt: str) -> AsyncIterator[str]:
+        """
+        LLM yanıtını parça parça üretir.
+
+        Varsayılan uygulama yanıtı tek parça olarak döndürür; akış destekli
+        bir LLM ile alt sınıflar bu metodu override ederek spec'lerin yanıt
+        gelirken çözülmesini sağlayabilir.
+        """
+        yield await self._aask(prompt)
+
+
+class SpecStreamParser:
+    """
+    JSON dizisi halinde akan LLM çıktısından ServiceSpec'leri artımlı çözer.
+
+    ``feed`` her çağrıda yalnızca o parçada tamamlanan nesneleri döndürür;
+    port çakışmaları ``_parse_llm_response`` ile aynı kurala göre düzeltilir.
+    """
+
+    def __init__(self) -> None:
+        self._buffer: List[str] = []
+        self._in_array = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._used_ports: set[int] = set()
+        self._port_iter: Iterator[int] = iter(_BASE_PORTS)
+        self._index = 0
+
+    def feed(self, chunk: str) -> List[ServiceSpec]:
+        specs: List[ServiceSpec] = []
+        for ch in chunk:
+            if not self._in_array:
+                if ch == "[":
+                    self._in_array = True
+                continue
+
+            if self._depth > 0:
+                self._buffer.append(ch)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                if self._depth == 0:
+                    self._buffer = [ch]
+                self._depth += 1
+            elif ch == "}" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    spec = self._decode("".join(self._buffer))
+                    self._buffer = []
+                    if spec is not None:
+                        specs.append(spec)
+        return specs
+
+    def _decode(self, raw: str) -> Optional[ServiceSpec]:
+        idx = self._index
+        self._index += 1
+        try:
+            item = json.loads(raw)
+        except json.JSONDecodeError:
+            logger.debug(f"[DecomposeTask] {idx}. item JSON değil")
+            return None
+        if not isinstance(item, dict):
+            return None
+        return _spec_from_item(item, idx, self._used_ports, self._port_iter)
+
 
 def _parse_llm_response(raw: str, task: str) -> List[ServiceSpec]:
     """LLM çıktısından ServiceSpec listesi parse eder."""
@@ -108,23 +223,31 @@ def _parse_llm_response(raw: str, task: str) -> List[ServiceSpec]:
     for idx, item in enumerate(data):
         if not isinstance(item, dict):
             continue
-        try:
-            # Port çakışması önleme
-            port = int(item.get("port") or 0)
-            if port in used_ports or port < 1024:
-                port = _next_free_port(port_iter, used_ports)
-            used_ports.add(port)
-
-            spec = ServiceSpec.from_dict({**item, "port": port})
-            if not spec.name or not spec.description:
-                continue
+        spec = _spec_from_item(item, idx, used_ports, port_iter)
+        if spec is not None:
             specs.append(spec)
-        except Exception as exc:
-            logger.debug(f"[DecomposeTask] {idx}. item parse hatası: {exc}")
 
     return specs
 
 
+def _spec_from_item(item: dict, idx: int, used_ports: set, port_iter) -> Optional[ServiceSpec]:
+    """Tek bir JSON nesnesinden ServiceSpec üretir (geçersizse None)."""
+    try:
+        # Port çakışması önleme
+        port = int(item.get("port") or 0)
+        if port in used_ports or port < 1024:
+            port = _next_free_port(port_iter, used_ports)
+        used_ports.add(port)
+
+        spec = ServiceSpec.from_dict({**item, "port": port})
+        if not spec.name or not spec.description:
+            return None
+        return spec
+    except Exception as exc:
+        logger.debug(f"[DecomposeTask] {idx}. item parse hatası: {exc}")
+        return None
+
+
 def _next_free_port(port_iter, used: set) -> int:
     for p in port_iter:
         if p not in used:
@@ -145,4 +268,4 @@ def _single_service_fallback(task: str) -> List[ServiceSpec]:
     ]
 
 
-__all__ = ["DecomposeTask"]
+__all__ = ["DecomposeTask", "SpecStreamParser"]
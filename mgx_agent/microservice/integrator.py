@@ -177,6 +177,28 @@ class IntegrateServices(Action):
         return files
 
 
+class IntegrationBuilder:
+    """
+    Servisler tamamlandıkça şablon tabanlı entegrasyon dosyalarını günceller.
+
+    LLM entegrasyonu beklenirken (veya başarısız olursa) güncel
+    docker-compose / nginx / sözleşme / README taslağı her an hazırdır.
+    """
+
+    def __init__(self) -> None:
+        self._results: Dict[str, ServiceResult] = {}
+
+    def add(self, result: ServiceResult) -> Dict[str, str]:
+        """Bir servis sonucunu ekler ve güncel dosyaları döndürür."""
+        self._results[result.spec.name] = result
+        return self.files()
+
+    def files(self) -> Dict[str, str]:
+        if not self._results:
+            return {}
+        return _fallback_files(list(self._results.values()))
+
+
 def _parse_files(raw: str) -> Dict[str, str]:
     files: Dict[str, str] = {}
     for m in _MARKER_RE.finditer(raw):
@@ -187,4 +209,4 @@ def _parse_files(raw: str) -> Dict[str, str]:
     return files
 
 
-__all__ = ["IntegrateServices"]
+__all__ = ["IntegrateServices", "IntegrationBuilder"]
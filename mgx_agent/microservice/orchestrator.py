@@ -10,16 +10,36 @@ Yüksek seviye bir görevi şu adımlarda yürütür:
 
 Hata yönetimi: bir servis başarısız olursa diğerleri devam eder;
 başarısız servisler de entegrasyon adımına aktarılır (mevcut çıktıyla çalışır).
+
+Akışlı mod (``streaming=True``) aşamaları üst üste bindirir:
+
+  - Her servis, spec'i ayrıştırma çıktısından çözülür çözülmez başlar.
+  - Bağımlılığı olan servis yalnızca bağımlılıklarının sözleşmesini (plan
+    çıktısını) bekler; tüm yürütmenin bitmesini beklemez.
+  - Tüm sözleşmeler hazır olunca LLM entegrasyonu, servisler hâlâ
+    yürütülürken başlar; şablon tabanlı entegrasyon dosyaları her servis
+    tamamlandıkça güncellenir.
+  - LLM fazları servisler arasında paylaşılan bir PhaseScheduler'dan slot
+    alır (plan fazları öncelikli) ve opsiyonel toplam bütçeye tabidir;
+    servis takımları tek bir yanıt önbelleğini paylaşır.
 """
 from __future__ import annotations
 
+import asyncio
+import inspect
 import logging
 import time
-from typing import List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from mgx_agent.microservice.models import ParallelRunResult, ServiceResult, ServiceSpec
 from mgx_agent.microservice.decomposer import DecomposeTask
-from mgx_agent.microservice.integrator import IntegrateServices
+from mgx_agent.microservice.integrator import IntegrateServices, IntegrationBuilder
+from mgx_agent.microservice.scheduler import (
+    PHASE_EXECUTE,
+    PHASE_PLAN,
+    ContractBoard,
+    PhaseScheduler,
+)
 from mgx_agent.performance.async_tools import bounded_gather
 
 logger = logging.getLogger(__name__)
@@ -53,6 +73,15 @@ class ParallelOrchestrator:
     output_dir_base:
         Üretilen dosyaların kaydedileceği kök dizin.
         Her servis kendi alt dizinini (``<output_dir_base>/<service_name>``) oluşturur.
+    streaming:
+        True ise akışlı (pipelined) mod kullanılır (modül açıklamasına bakın).
+    llm_budget_usd:
+        Akışlı modda tüm servisler için toplam tahmini maliyet sınırı.
+        Aşıldığında henüz yürütülmemiş servisler başarısız sayılır.
+    on_event:
+        Akışlı modda ``(event, data)`` ile çağrılan opsiyonel geri çağırım
+        (``service_started``, ``contract_ready``, ``service_completed``,
+        ``integration_updated``). Senkron veya async olabilir.
     """
 
     def __init__(
@@ -61,11 +90,17 @@ class ParallelOrchestrator:
         *,
         max_concurrent: int = 3,
         output_dir_base: str = "output/parallel",
+        streaming: bool = False,
+        llm_budget_usd: Optional[float] = None,
+        on_event: Optional[Callable[[str, Dict[str, Any]], Any]] = None,
     ):
         # base_config=None durumunda TeamConfig lazy import ile run() içinde çözülür
         self._base_config_raw = base_config
         self.max_concurrent = max(1, min(max_concurrent, 6))
         self.output_dir_base = output_dir_base
+        self.streaming = streaming
+        self.llm_budget_usd = llm_budget_usd
+        self.on_event = on_event
 
     @property
     def base_config(self):
@@ -94,6 +129,9 @@ class ParallelOrchestrator:
         -------
         ParallelRunResult
         """
+        if self.streaming:
+            return await self.run_streaming(task)
+
         t0 = time.perf_counter()
         logger.info(f"[ParallelOrchestrator] Görev başlıyor: {task[:80]!r}")
 
@@ -152,10 +190,217 @@ class ParallelOrchestrator:
             duration=duration,
         )
 
+    async def run_streaming(self, task: str) -> ParallelRunResult:
+        """
+        Akışlı mikroservis akışını çalıştırır.
+
+        Parameters
+        ----------
+        task: Kullanıcının orijinal yüksek seviye görevi.
+
+        Returns
+        -------
+        ParallelRunResult — servisler ayrıştırma sırasıyla.
+        """
+        t0 = time.perf_counter()
+        logger.info(f"[ParallelOrchestrator] Akışlı görev başlıyor: {task[:80]!r}")
+
+        board = ContractBoard()
+        scheduler = PhaseScheduler(self.max_concurrent, budget_usd=self.llm_budget_usd)
+        shared_cache = self._shared_cache()
+        specs: List[ServiceSpec] = []
+        service_tasks: Dict[str, asyncio.Task] = {}
+
+        # ── 1. Decompose → her spec çözülür çözülmez servisi başlat ────
+        try:
+            async for spec in self._decompose_stream(task):
+                if spec.name in service_tasks:
+                    logger.warning(f"[ParallelOrchestrator] Yinelenen servis adı atlandı: {spec.name}")
+                    continue
+                specs.append(spec)
+                board.declare(spec)
+                service_tasks[spec.name] = asyncio.create_task(
+                    self._run_service_streaming(spec, board, scheduler, shared_cache)
+                )
+        finally:
+            await board.close_declarations()
+
+        logger.info(
+            f"[ParallelOrchestrator] {len(specs)} servis ayrıştırıldı: "
+            f"{[s.name for s in specs]}"
+        )
+
+        # ── 2. Sözleşmeler hazır olunca entegrasyon, yürütmeyle paralel ─
+        integration_task = asyncio.create_task(self._integrate_contracts(board, specs))
+
+        builder = IntegrationBuilder()
+        results_by_name: Dict[str, ServiceResult] = {}
+        for finished in asyncio.as_completed(list(service_tasks.values())):
+            result = await finished
+            results_by_name[result.spec.name] = result
+            await self._emit("service_completed", result.to_dict())
+            await self._emit("integration_updated", {"files": builder.add(result)})
+
+        service_results = [results_by_name[spec.name] for spec in specs]
+        succeeded = sum(1 for r in service_results if r.success)
+        logger.info(
+            f"[ParallelOrchestrator] Akışlı yürütme tamamlandı: "
+            f"{succeeded}/{len(service_results)} başarılı, planlayıcı={scheduler.stats()}"
+        )
+
+        # ── 3. LLM entegrasyonu (çoğunlukla zaten bitmiş olur) ──────────
+        integration_files = {**builder.files(), **(await integration_task)}
+
+        duration = time.perf_counter() - t0
+        logger.info(f"[ParallelOrchestrator] Toplam süre: {duration:.1f}s")
+
+        return ParallelRunResult(
+            task=task,
+            services=service_results,
+            integration_files=integration_files,
+            success=succeeded > 0,
+            duration=duration,
+        )
+
     # ------------------------------------------------------------------
     # Private helpers
     # ------------------------------------------------------------------
 
+    async def _emit(self, event: str, data: Dict[str, Any]) -> None:
+        if self.on_event is None:
+            return
+        try:
+            result = self.on_event(event, data)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as exc:
+            logger.debug(f"[ParallelOrchestrator] on_event({event}) hatası: {exc}")
+
+    async def _decompose_stream(self, task: str):
+        action = DecomposeTask(context=None)
+        async for spec in action.run_stream(task):
+            yield spec
+
+    def _shared_cache(self):
+        """Servis takımlarının paylaşacağı yanıt önbelleği (kapalıysa None)."""
+        if not getattr(self.base_config, "enable_caching", True):
+            return None
+        try:
+            from mgx_agent.cache import InMemoryLRUTTLCache
+
+            return InMemoryLRUTTLCache(
+                max_entries=int(getattr(self.base_config, "cache_max_entries", 1024)),
+                ttl_seconds=int(getattr(self.base_config, "cache_ttl_seconds", 3600)),
+            )
+        except Exception as exc:
+            logger.debug(f"[ParallelOrchestrator] Paylaşılan önbellek oluşturulamadı: {exc}")
+            return None
+
+    def _service_config(self, spec: ServiceSpec):
+        _, TeamConfig = _get_team_classes()
+
+        # Her servis bağımsız config kopyası alır
+        config_data = self.base_config.dict()
+        config_data["target_stack"] = spec.stack
+        config_data["auto_approve_plan"] = True
+        config_data["enable_progress_bar"] = False  # paralel çıktı karışmasın
+
+        try:
+            return TeamConfig(**config_data)
+        except Exception:
+            return TeamConfig(
+                target_stack=spec.stack,
+                auto_approve_plan=True,
+                enable_progress_bar=False,
+            )
+
+    async def _run_service_streaming(
+        self,
+        spec: ServiceSpec,
+        board: ContractBoard,
+        scheduler: PhaseScheduler,
+        shared_cache=None,
+    ) -> ServiceResult:
+        MGXStyleTeam, _ = _get_team_classes()
+
+        t0 = time.perf_counter()
+        output_dir = f"{self.output_dir_base}/{spec.name}"
+        published = False
+
+        try:
+            # Yalnızca bağımlılıkların sözleşmeleri beklenir
+            contracts = await board.wait_for(spec.name, spec.dependencies)
+            description = _with_contracts(spec.description, contracts)
+            logger.info(
+                f"[ParallelOrchestrator] Servis başlıyor: {spec.name} "
+                f"(stack={spec.stack}, port={spec.port})"
+            )
+            await self._emit("service_started", {"service": spec.to_dict()})
+
+            team = MGXStyleTeam(config=self._service_config(spec), output_dir_base=output_dir)
+            if shared_cache is not None:
+                team._cache = shared_cache
+
+            async with scheduler.slot(PHASE_PLAN):
+                plan = await team.analyze_and_plan(description)
+            await board.publish(spec.name, plan or "")
+            published = True
+            await self._emit("contract_ready", {"service": spec.name, "contract": (plan or "")[:2000]})
+
+            team.approve_plan()
+            async with scheduler.slot(PHASE_EXECUTE):
+                output = await team.execute()
+            metrics = getattr(team, "metrics", None) or []
+            if metrics:
+                scheduler.charge(getattr(metrics[-1], "estimated_cost", 0.0))
+
+            duration = time.perf_counter() - t0
+            logger.info(
+                f"[ParallelOrchestrator] {spec.name} tamamlandı ({duration:.1f}s)"
+            )
+            return ServiceResult(
+                spec=spec,
+                success=True,
+                output=output or plan or "",
+                output_dir=getattr(team, "_last_output_dir", output_dir),
+                duration=duration,
+            )
+        except Exception as exc:
+            duration = time.perf_counter() - t0
+            logger.error(
+                f"[ParallelOrchestrator] {spec.name} başarısız: {exc}",
+                exc_info=True,
+            )
+            return ServiceResult(
+                spec=spec,
+                success=False,
+                error=str(exc),
+                duration=duration,
+            )
+        finally:
+            if not published:
+                await board.fail(spec.name)
+
+    async def _integrate_contracts(
+        self, board: ContractBoard, specs: List[ServiceSpec]
+    ) -> Dict[str, str]:
+        """Tüm sözleşmeler netleşince LLM entegrasyonunu çalıştırır."""
+        contracts = await board.wait_all()
+        planned = [
+            ServiceResult(
+                spec=spec,
+                success=contracts.get(spec.name) is not None,
+                output=contracts.get(spec.name) or "",
+                error=None if contracts.get(spec.name) is not None else "plan üretilemedi",
+            )
+            for spec in specs
+        ]
+        try:
+            return await self._integrate(planned)
+        except Exception as exc:
+            logger.warning(f"[ParallelOrchestrator] Akışlı entegrasyon hatası: {exc}")
+            return {}
+
     async def _decompose(self, task: str) -> List[ServiceSpec]:
         action = DecomposeTask(context=None)
         try:
@@ -167,7 +412,7 @@ class ParallelOrchestrator:
         return specs
 
     async def _run_service(self, spec: ServiceSpec) -> ServiceResult:
-        MGXStyleTeam, TeamConfig = _get_team_classes()
+        MGXStyleTeam, _ = _get_team_classes()
 
         t0 = time.perf_counter()
         logger.info(
@@ -175,20 +420,7 @@ class ParallelOrchestrator:
             f"(stack={spec.stack}, port={spec.port})"
         )
 
-        # Her servis bağımsız config kopyası alır
-        config_data = self.base_config.dict()
-        config_data["target_stack"] = spec.stack
-        config_data["auto_approve_plan"] = True
-        config_data["enable_progress_bar"] = False  # paralel çıktı karışmasın
-
-        try:
-            config = TeamConfig(**config_data)
-        except Exception:
-            config = TeamConfig(
-                target_stack=spec.stack,
-                auto_approve_plan=True,
-                enable_progress_bar=False,
-            )
+        config = self._service_config(spec)
 
         output_dir = f"{self.output_dir_base}/{spec.name}"
 
@@ -234,4 +466,15 @@ class ParallelOrchestrator:
         return files
 
 
+def _with_contracts(description: str, contracts: Dict[str, Optional[str]]) -> str:
+    """Bağımlılık sözleşmelerini servis görev açıklamasına ekler."""
+    available = {name: c for name, c in contracts.items() if c}
+    if not available:
+        return description
+    sections = "\n\n".join(
+        f"### {name}\n{contract[:4000]}" for name, contract in available.items()
+    )
+    return f"{description}\n\n## Contracts of services this service calls\n{sections}"
+
+
 __all__ = ["ParallelOrchestrator"]
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Akışlı (pipelined) orkestrasyon için koordinasyon yapıları.
+
+ContractBoard  : Servislerin sözleşmelerini (plan çıktısı) yayınladığı pano.
+                 Bağımlı servisler yalnızca ihtiyaç duydukları sözleşmeleri bekler.
+PhaseScheduler : Tüm servisler arasında paylaşılan LLM slot + bütçe planlayıcısı.
+                 Plan fazları, başkalarının önünü açtığı için yürütme
+                 fazlarından önce slot alır.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from mgx_agent.microservice.models import ServiceSpec
+
+# Faz öncelikleri (küçük değer önce çalışır)
+PHASE_PLAN = 0
+PHASE_EXECUTE = 1
+
+
+class ContractBoard:
+    """
+    Servis sözleşmelerinin yayınlandığı ve beklendiği pano.
+
+    Ayrıştırma henüz bitmemişken bildirilmemiş bir bağımlılık beklenir (spec
+    daha sonra gelebilir). ``close_declarations`` çağrıldıktan sonra
+    bilinmeyen bağımlılıklar ve döngüsel bağımlılıklar beklenmez.
+    """
+
+    def __init__(self) -> None:
+        self._cond = asyncio.Condition()
+        self._deps: Dict[str, List[str]] = {}
+        self._contracts: Dict[str, str] = {}
+        self._failed: Set[str] = set()
+        self._cyclic: Dict[str, Set[str]] = {}
+        self._closed = False
+
+    def declare(self, spec: ServiceSpec) -> None:
+        self._deps[spec.name] = list(spec.dependencies or [])
+
+    async def close_declarations(self) -> None:
+        """Ayrıştırma bitti: döngüleri hesapla ve bekleyenleri uyandır."""
+        async with self._cond:
+            self._closed = True
+            self._cyclic = _cyclic_dependencies(self._deps)
+            self._cond.notify_all()
+
+    async def publish(self, name: str, contract: str) -> None:
+        async with self._cond:
+            if name not in self._contracts and name not in self._failed:
+                self._contracts[name] = contract
+                self._cond.notify_all()
+
+    async def fail(self, name: str) -> None:
+        async with self._cond:
+            if name not in self._contracts:
+                self._failed.add(name)
+                self._cond.notify_all()
+
+    async def wait_for(self, service: str, deps: Iterable[str]) -> Dict[str, Optional[str]]:
+        """``deps`` sözleşmelerini bekler; yayınlanmayanlar için None döner."""
+        deps = list(deps)
+        async with self._cond:
+            await self._cond.wait_for(lambda: all(self._resolved(service, d) for d in deps))
+            return {d: self._contracts.get(d) for d in deps}
+
+    async def wait_all(self) -> Dict[str, Optional[str]]:
+        """Bildirilen tüm servislerin sözleşmesi (veya hatası) netleşene kadar bekler."""
+        async with self._cond:
+            await self._cond.wait_for(
+                lambda: self._closed
+                and all(n in self._contracts or n in self._failed for n in self._deps)
+            )
+            return {n: self._contracts.get(n) for n in self._deps}
+
+    def _resolved(self, service: str, dep: str) -> bool:
+        if dep == service or dep in self._contracts or dep in self._failed:
+            return True
+        if not self._closed:
+            return False
+        return dep not in self._deps or dep in self._cyclic.get(service, ())
+
+
+def _cyclic_dependencies(deps: Dict[str, List[str]]) -> Dict[str, Set[str]]:
+    """Her servis için, kendisine geri ulaşan (döngü oluşturan) bağımlılıklar."""
+
+    def reaches(start: str, target: str) -> bool:
+        stack, seen = [start], set()
+        while stack:
+            node = stack.pop()
+            if node == target:
+                return True
+            if node in seen:
+                continue
+            seen.add(node)
+            stack.extend(d for d in deps.get(node, ()) if d in deps)
+        return False
+
+    cyclic: Dict[str, Set[str]] = {}
+    for name, service_deps in deps.items():
+        for dep in service_deps:
+            if dep in deps and dep != name and reaches(dep, name):
+                cyclic.setdefault(name, set()).add(dep)
+    return cyclic
+
+
+class BudgetExhausted(RuntimeError):
+    """Paylaşılan LLM bütçesi tükendi."""
+
+
+class PhaseScheduler:
+    """
+    Servisler arası paylaşılan LLM eşzamanlılık slotları ve bütçe takibi.
+
+    Parameters
+    ----------
+    max_concurrent:
+        Aynı anda çalışabilecek LLM ağırlıklı faz sayısı.
+    budget_usd:
+        Tüm servisler için toplam tahmini maliyet sınırı (None = sınırsız).
+    """
+
+    def __init__(self, max_concurrent: int = 3, budget_usd: Optional[float] = None) -> None:
+        self.max_concurrent = max(1, max_concurrent)
+        self.budget_usd = budget_usd
+        self.spent_usd = 0.0
+        self._active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self.max_wait_seconds = 0.0
+
+    @property
+    def exhausted(self) -> bool:
+        return self.budget_usd is not None and self.spent_usd >= self.budget_usd
+
+    def charge(self, cost_usd: float) -> None:
+        self.spent_usd += max(0.0, float(cost_usd or 0.0))
+
+    async def acquire(self, priority: int) -> None:
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            return
+
+        started = time.perf_counter()
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # Slot devredilmişti; bir sonrakine aktar
+                self.release()
+            raise
+        self.max_wait_seconds = max(self.max_wait_seconds, time.perf_counter() - started)
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)  # slot doğrudan bekleyene geçer
+                return
+        self._active -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int):
+        """
+        Usage:
+            async with scheduler.slot(PHASE_PLAN):
+                await team.analyze_and_plan(task)
+        """
+        if priority >= PHASE_EXECUTE and self.exhausted:
+            raise BudgetExhausted(
+                f"LLM bütçesi tükendi (${self.spent_usd:.2f} / ${self.budget_usd:.2f})"
+            )
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": self._active,
+            "waiting": sum(1 for _, _, f in self._waiters if not f.done()),
+            "budget_usd": self.budget_usd,
+            "spent_usd": round(self.spent_usd, 4),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+        }
+
+
+__all__ = [
+    "ContractBoard",
+    "PhaseScheduler",
+    "BudgetExhausted",
+    "PHASE_PLAN",
+    "PHASE_EXECUTE",
+]
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Speculative parallel rounds for MGXStyleTeam.
+
+In the default mode each ``team.run(n_round=1)`` lets only the roles that
+observed a watched message act, so code → tests → review takes one round per
+role. With ``TeamConfig.enable_parallel_rounds`` a round also starts the
+registered speculative steps against a snapshot of the latest artifacts
+while the regular roles run:
+
+- A step is started when every artifact it reads is present and it has not
+  already produced output for those exact artifact versions.
+- If an upstream role publishes a new version of an artifact the step reads
+  while it runs, the step is cancelled at once (no LLM result is awaited).
+- When the round ends, the step's output is accepted only if the artifacts it
+  read are unchanged (conflict check); otherwise it is discarded.
+- A role whose output is already current for the artifacts it reads has its
+  pending trigger messages dropped instead of acting again.
+- A warm-up step (no ``make_message``) only prepares work for the role's own
+  action, e.g. Charlie's code-only sandbox run while Bob writes tests. It is
+  never published and never drops the role's trigger.
+
+Provides:
+- ArtifactSnapshot: Code, tests and review at the start of a round
+- SpeculativeStep: A role action that may run ahead of its trigger
+- ParallelRoundRunner: Runs rounds with speculation and conflict detection
+"""
+
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from metagpt.logs import logger
+
+from mgx_agent.adapter import MetaGPTAdapter
+
+# Artifact → the role profile that publishes it (see MGXStyleTeam._collect_raw_results)
+ARTIFACT_ROLES: Dict[str, str] = {
+    "code": "Engineer",
+    "tests": "Tester",
+    "review": "Reviewer",
+}
+
+
+@dataclass(frozen=True)
+class ArtifactSnapshot:
+    """Latest code, tests and review at one point in time."""
+
+    code: str = ""
+    tests: str = ""
+    review: str = ""
+
+    def has(self, names: Sequence[str]) -> bool:
+        return all((getattr(self, name) or "").strip() for name in names)
+
+    def fingerprint(self, names: Sequence[str]) -> str:
+        """Hash of the named artifacts; equal fingerprints mean unchanged inputs."""
+        digest = hashlib.sha1()
+        for name in names:
+            digest.update(name.encode())
+            digest.update(b"\0")
+            digest.update((getattr(self, name) or "").encode("utf-8", "replace"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+
+@dataclass(eq=False)
+class SpeculativeStep:
+    """
+    A role action that can run against a snapshot before its trigger arrives.
+
+    Attributes:
+        role: The MetaGPT role that normally performs the action
+        reads: Every artifact ``run`` uses; changes invalidate the output, so
+            an artifact that is read but left out here makes stale output look current
+        run: Produces the output content from a snapshot
+        make_message: Wraps accepted content in the message the role would
+            publish; None for a warm-up step whose output is kept by ``run``
+    """
+
+    role: Any
+    reads: Tuple[str, ...]
+    run: Callable[[ArtifactSnapshot], Awaitable[str]]
+    make_message: Optional[Callable[[str], Any]] = None
+
+    @property
+    def publishes(self) -> bool:
+        return self.make_message is not None
+
+    @property
+    def name(self) -> str:
+        return str(getattr(self.role, "name", None) or id(self.role))
+
+    @property
+    def output_role(self) -> Optional[str]:
+        return getattr(self.role, "profile", None)
+
+    @property
+    def upstream_roles(self) -> Tuple[str, ...]:
+        return tuple(ARTIFACT_ROLES[name] for name in self.reads if name in ARTIFACT_ROLES)
+
+
+class ParallelRoundRunner:
+    """Runs team rounds with speculative steps alongside the regular roles."""
+
+    def __init__(self, team: Any, steps: Sequence[SpeculativeStep]):
+        """
+        Args:
+            team: MGXStyleTeam (uses ``team``, ``message_stream`` and
+                ``_collect_raw_results``)
+            steps: Speculative steps to consider each round
+        """
+        self._team = team
+        self.steps: List[SpeculativeStep] = list(steps)
+        # Step name → fingerprint of the inputs its latest output was based on
+        self._current: Dict[str, str] = {}
+
+        self.rounds = 0
+        self.speculated = 0
+        self.accepted = 0
+        self.invalidated = 0
+        self.skipped = 0
+
+    def snapshot(self) -> ArtifactSnapshot:
+        code, tests, review = self._team._collect_raw_results()
+        return ArtifactSnapshot(code=code or "", tests=tests or "", review=review or "")
+
+    def reset(self) -> None:
+        """Forget which outputs are current (between tasks)."""
+        self._current.clear()
+
+    async def run_rounds(self, n_round: int) -> int:
+        """Run up to ``n_round`` rounds, stopping early once nothing acts.
+
+        Returns:
+            Number of rounds that did work
+        """
+        executed = 0
+        for _ in range(max(0, n_round)):
+            if not await self.run_round():
+                break
+            executed += 1
+        return executed
+
+    async def run_round(self) -> bool:
+        """Run one round; False if no role had anything to do."""
+        env = self._team.team.env
+        snapshot = self.snapshot()
+
+        for step in self.steps:
+            if step.publishes and not self._is_idle(step.role) and self._is_current(step, snapshot):
+                dropped = MetaGPTAdapter.discard_pending(step.role)
+                self.skipped += 1
+                logger.debug(f"⏭️ {step.name}: çıktısı güncel, {dropped} tetikleyici mesaj atlandı")
+
+        speculative = [
+            step
+            for step in self.steps
+            if self._is_idle(step.role)
+            and snapshot.has(step.reads)
+            and not self._is_current(step, snapshot)
+        ]
+        if not speculative and getattr(env, "is_idle", False):
+            return False
+
+        self.rounds += 1
+        tasks: Dict[SpeculativeStep, asyncio.Task] = {
+            step: asyncio.create_task(step.run(snapshot)) for step in speculative
+        }
+        self.speculated += len(tasks)
+        by_output_role = {step.output_role: step for step in self.steps}
+
+        subscription = self._team.message_stream.subscribe()
+        regular = asyncio.create_task(self._team.team.run(n_round=1))
+        try:
+            async for message in subscription.until(regular):
+                role = getattr(message, "role", None)
+                for step, task in tasks.items():
+                    if not task.done() and role in step.upstream_roles:
+                        task.cancel()
+                        logger.info(f"♻️ {step.name}: girdi değişti, spekülatif çalışma iptal edildi")
+                regular_step = by_output_role.get(role)
+                if regular_step is not None and regular_step not in tasks:
+                    # The role acted normally on the artifacts as of the round start
+                    self._current[regular_step.name] = snapshot.fingerprint(regular_step.reads)
+            regular.result()
+            if tasks:
+                await asyncio.wait(tasks.values())
+        finally:
+            subscription.close()
+            for task in [regular, *tasks.values()]:
+                if not task.done():
+                    task.cancel()
+
+        after = self.snapshot()
+        for step, task in tasks.items():
+            self._settle(step, task, snapshot, after)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "rounds": self.rounds,
+            "speculated": self.speculated,
+            "accepted": self.accepted,
+            "invalidated": self.invalidated,
+            "skipped": self.skipped,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _is_idle(role: Any) -> bool:
+        return bool(getattr(role, "is_idle", True))
+
+    def _is_current(self, step: SpeculativeStep, snapshot: ArtifactSnapshot) -> bool:
+        return self._current.get(step.name) == snapshot.fingerprint(step.reads)
+
+    def _settle(
+        self,
+        step: SpeculativeStep,
+        task: "asyncio.Task",
+        snapshot: ArtifactSnapshot,
+        after: ArtifactSnapshot,
+    ) -> None:
+        if task.cancelled() or after.fingerprint(step.reads) != snapshot.fingerprint(step.reads):
+            self.invalidated += 1
+            return
+        if task.exception() is not None:
+            logger.warning(f"⚠️ {step.name}: spekülatif çalışma başarısız: {task.exception()}")
+            return
+
+        self._current[step.name] = snapshot.fingerprint(step.reads)
+        self.accepted += 1
+        if not step.publishes:
+            logger.info(f"⚡ {step.name}: ön hazırlık kabul edildi")
+            return
+
+        message = step.make_message(task.result())
+        MetaGPTAdapter.add_message(MetaGPTAdapter.get_memory_store(step.role), message)
+        self._team.team.env.publish_message(message)
+        logger.info(f"⚡ {step.name}: spekülatif çıktı kabul edildi")
+
+
+__all__ = ["ARTIFACT_ROLES", "ArtifactSnapshot", "SpeculativeStep", "ParallelRoundRunner"]
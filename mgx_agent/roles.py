@@ -15,12 +15,13 @@ Açık kaynak MetaGPT'yi MGX'e benzer şekilde çalıştıran örnek.
 
 # Lokal geliştirme: examples klasöründen çalışırken metagpt paketini bul
 
+import hashlib
 import json
 import os
 import re
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from enum import Enum
 
 from pydantic import BaseModel, Field, validator
@@ -697,6 +698,28 @@ class Charlie(RelevantMemoryMixin, Role):
         
         print(f"📝 Kod ve testler alındı, inceleniyor...")
         
+        review = await self.review_artifacts(code, tests)
+        
+        # Tamamlandı bildirimi
+        print(f"\n{'─'*50}")
+        print(f"✅ CHARLIE: Review tamamlandı! ({len(review)} karakter)")
+        print(f"{'─'*50}\n")
+        
+        # Hafızaya ekle (adapter üzerinden)
+        msg = Message(content=review, role=self.profile, cause_by=ReviewCode)
+        mem_store = MetaGPTAdapter.get_memory_store(self)
+        MetaGPTAdapter.add_message(mem_store, msg)
+        
+        logger.info(f"✅ CHARLIE: Review mesajı hafızaya eklendi ({len(review)} karakter)")
+        
+        return msg
+    
+    async def review_artifacts(self, code: str, tests: str) -> str:
+        """Verilen kod ve testleri incele, review metnini döndür.
+        
+        _act() bunu hafızadaki son kod/testlerle çağırır. Paralel tur modunda
+        sandbox raporu prepare_review() ile önceden hazırlanmış olabilir.
+        """
         # Human reviewer modu kontrolü
         if hasattr(self, 'is_human') and self.is_human:
             # İnsan modu - terminal'den input al
@@ -753,24 +776,8 @@ class Charlie(RelevantMemoryMixin, Role):
             else:
                 print_step_progress(2, 4, "Test coverage değerlendiriliyor...", role=self)
 
-            target_stack = None
-            if team_ref is not None:
-                spec = team_ref.get_task_spec()
-                task_text = (spec or {}).get("task") or ""
-                if task_text.strip():
-                    target_stack = infer_stack_from_task(task_text)
-            if not target_stack and code_in and code_in != "No code found":
-                target_stack = infer_stack_from_task(code_in[:800])
-
-            sandbox_report = ""
-            if not disable_sandbox:
-                try:
-                    sandbox_action = RunSandboxTests()
-                    sandbox_action.llm = self.llm
-                    sandbox_report = await sandbox_action.run(code_in, target_stack)
-                except Exception as e:
-                    logger.warning(f"⚠️ Charlie sandbox: {e}")
-                    sandbox_report = f"## Sandbox Test Sonuçları\n- **Durum:** Hata: `{e}`\n"
+            target_stack = self._review_stack(code_in)
+            sandbox_report = "" if disable_sandbox else await self._sandbox_report(code_in, target_stack)
 
             async def _compute_review() -> str:
                 review_action = ReviewCode()
@@ -804,19 +811,52 @@ class Charlie(RelevantMemoryMixin, Role):
             
             print_step_progress(4, 4, "Review tamamlandı!", role=self)
         
-        # Tamamlandı bildirimi
-        print(f"\n{'─'*50}")
-        print(f"✅ CHARLIE: Review tamamlandı! ({len(review)} karakter)")
-        print(f"{'─'*50}\n")
-        
-        # Hafızaya ekle (adapter üzerinden)
-        msg = Message(content=review, role=self.profile, cause_by=ReviewCode)
-        mem_store = MetaGPTAdapter.get_memory_store(self)
-        MetaGPTAdapter.add_message(mem_store, msg)
-        
-        logger.info(f"✅ CHARLIE: Review mesajı hafızaya eklendi ({len(review)} karakter)")
+        return review
+    
+    async def prepare_review(self, code: str) -> str:
+        """Review'un yalnızca koda bağlı kısmını (sandbox raporu) önceden hazırla.
         
-        return msg
+        Paralel tur modunda Bob testleri yazarken çalışır. Review'un yerine
+        geçmez: rapor koda göre saklanır, review_artifacts() aynı kod için
+        sandbox'ı tekrar çalıştırmaz.
+        """
+        if getattr(self, "is_human", False) or os.getenv("DISABLE_SANDBOX_TESTING", "").lower() in (
+            "true",
+            "1",
+            "yes",
+        ):
+            return ""
+        code_in = code if code else "No code found"
+        return await self._sandbox_report(code_in, self._review_stack(code_in))
+    
+    def _review_stack(self, code_in: str) -> Optional[str]:
+        """Review için hedef stack: önce görev metninden, yoksa koddan çıkar."""
+        target_stack = None
+        team_ref = getattr(self, "_team_ref", None)
+        if team_ref is not None:
+            spec = team_ref.get_task_spec()
+            task_text = (spec or {}).get("task") or ""
+            if task_text.strip():
+                target_stack = infer_stack_from_task(task_text)
+        if not target_stack and code_in and code_in != "No code found":
+            target_stack = infer_stack_from_task(code_in[:800])
+        return target_stack
+    
+    async def _sandbox_report(self, code_in: str, target_stack: Optional[str]) -> str:
+        """Kodun sandbox raporu; aynı kod + stack için son başarılı rapor tekrar kullanılır."""
+        key = (hashlib.sha1(code_in.encode("utf-8", "replace")).hexdigest(), target_stack)
+        prepared = getattr(self, "_prepared_sandbox", None)
+        if prepared is not None and prepared[0] == key:
+            return prepared[1]
+        try:
+            sandbox_action = RunSandboxTests()
+            sandbox_action.llm = self.llm
+            report = await sandbox_action.run(code_in, target_stack)
+        except Exception as e:
+            logger.warning(f"⚠️ Charlie sandbox: {e}")
+            return f"## Sandbox Test Sonuçları\n- **Durum:** Hata: `{e}`\n"
+        self._prepared_sandbox = (key, report)
+        return report
     
     async def _observe(self) -> int:
         """Override observe - Charlie için debug log ekle"""
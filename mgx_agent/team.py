@@ -42,6 +42,8 @@ except ImportError:
 
 # Import from mgx_agent package for modular structure  
 from mgx_agent.adapter import MetaGPTAdapter
+from mgx_agent.message_stream import TeamMessageStream
+from mgx_agent.parallel_rounds import ParallelRoundRunner, SpeculativeStep
 from mgx_agent.actions import (
     AnalyzeTask,
     DraftPlan,
@@ -120,6 +122,10 @@ class TeamConfig(BaseModel):
     
     # LLM ayarları
     use_multi_llm: bool = Field(default=False, description="Her role farklı LLM")
+    enable_parallel_rounds: bool = Field(
+        default=False,
+        description="Bağımsız rol aksiyonlarını aynı turda spekülatif olarak paralel çalıştır",
+    )
     
     # Log ayarları
     log_level: LogLevel = Field(default=LogLevel.INFO, description="Log seviyesi")
@@ -437,6 +443,10 @@ class MGXStyleTeam:
         if hasattr(self.team, "hire"):
             self.team.hire(roles_list)
 
+        # Yayınlanan mesajlar için push tabanlı akış (hafıza taraması yerine)
+        self.message_stream = TeamMessageStream()
+        MetaGPTAdapter.observe_publish(getattr(self.team, "env", None), self.message_stream.publish)
+
         # Role referanslarını sakla (team.env.roles erişimini azaltmak için)
         if len(roles_list) >= 4:
             self._mike = roles_list[0]
@@ -449,6 +459,12 @@ class MGXStyleTeam:
             self._bob = None
             self._charlie = None
         
+        # Spekülatif paralel tur modu (opt-in)
+        self.parallel_rounds: Optional[ParallelRoundRunner] = None
+        if getattr(config, "enable_parallel_rounds", False):
+            self.parallel_rounds = ParallelRoundRunner(self, self._speculative_steps())
+            logger.info("⚡ Paralel tur modu aktif - Review, testlerle aynı turda çalışır")
+        
         # Multi-LLM sanity check: Gerçekten farklı modeller kullanılıyor mu?
         if self.multi_llm_mode:
             self._verify_multi_llm_setup(roles_list)
@@ -971,6 +987,7 @@ class MGXStyleTeam:
                 cached_role = cached.get("role", "TeamLeader") if isinstance(cached, dict) else "TeamLeader"
 
                 self.last_plan = Message(content=str(cached_content), role=cached_role, cause_by=AnalyzeTask)
+                self.message_stream.publish(self.last_plan)
                 self.add_to_memory(
                     "Mike",
                     "AnalyzeTask + DraftPlan (cache)",
@@ -1039,6 +1056,8 @@ class MGXStyleTeam:
         # ÖNEMLİ: Plan mesajını team environment'a publish et
         # Bu sayede Alex (Engineer) plan mesajını alacak
         self.last_plan = analysis
+        # Plan, execute() environment'a publish etmeden önce de izleyicilere ulaşsın
+        self.message_stream.publish(analysis)
 
         # Cache the plan for repeated identical tasks
         if getattr(self.config, "enable_caching", True):
@@ -1106,6 +1125,31 @@ class MGXStyleTeam:
         base["investment"] *= multiplier
         return base
     
+    def _speculative_steps(self) -> List[SpeculativeStep]:
+        """Paralel tur modunda tetikleyicisini beklemeden çalışabilecek adımlar.
+        
+        Charlie'nin review'u testlere de bağlıdır, bu yüzden spekülatif olarak
+        yayınlanmaz. Yalnızca koda bağlı kısmı (sandbox raporu) Bob testleri
+        yazarken önceden hazırlanır; Bob'un testleri gelince Charlie normal
+        review'unu bu raporla yapar. Kod aynı turda değişirse hazırlık iptal
+        edilir. İnsan reviewer için hazırlık yapılmaz.
+        """
+        charlie = self._charlie
+        if charlie is None or getattr(charlie, "is_human", False) or not hasattr(charlie, "prepare_review"):
+            return []
+        
+        async def _prepare(snapshot) -> str:
+            return await charlie.prepare_review(snapshot.code)
+        
+        return [SpeculativeStep(role=charlie, reads=("code",), run=_prepare)]
+    
+    async def _run_rounds(self, n_round: int = 1) -> None:
+        """``n_round`` tur çalıştır (paralel tur modunda spekülatif adımlarla)."""
+        if self.parallel_rounds is not None:
+            await self.parallel_rounds.run_rounds(n_round)
+        else:
+            await self.team.run(n_round=n_round)
+    
     async def _execute_with_early_termination(self, max_rounds: int) -> int:
         """
         Execute with early termination if task is completed.
@@ -1119,7 +1163,7 @@ class MGXStyleTeam:
         actual_rounds = 0
         
         for round_num in range(1, max_rounds + 1):
-            await self.team.run(n_round=1)
+            await self._run_rounds(1)
             actual_rounds += 1
             
             # Check if task is completed (early termination)
@@ -1383,7 +1427,7 @@ class MGXStyleTeam:
                     # Charlie'nin çalışması için ek bir round (MetaGPT'nin normal akışı)
                     # Manuel tetikleme hacklerini kaldırdık - sadece team.run() kullanıyoruz
                     logger.debug("🔍 Charlie'nin review yapması için ek round çalıştırılıyor...")
-                    await self.team.run(n_round=1)  # Charlie'nin Bob'un mesajını gözlemlemesi ve review yapması için
+                    await self._run_rounds(1)  # Charlie'nin Bob'un mesajını gözlemlemesi ve review yapması için
 
                     set_span_attributes(
                         span,
@@ -1392,6 +1436,14 @@ class MGXStyleTeam:
                             "mgx.exec.early_terminated": actual_rounds < n_round,
                         },
                     )
+                    if self.parallel_rounds is not None:
+                        set_span_attributes(
+                            span,
+                            {
+                                f"mgx.exec.parallel.{key}": value
+                                for key, value in self.parallel_rounds.stats().items()
+                            },
+                        )
             
             # Record execution timing
             self.phase_timings.execution_duration = exec_timer.duration
@@ -1543,12 +1595,12 @@ MEVCUT KOD (İYİLEŞTİRİLECEK):
                     
                     # Tekrar çalıştır (with timing)
                     async with AsyncTimer(f"revision_round_{revision_count}", log_on_exit=True) as rev_timer:
-                        await self.team.run(n_round=n_round)
+                        await self._run_rounds(n_round)
                         
                         # Charlie'nin revision turunda da review yapması için ek round
                         # Manuel tetikleme hacklerini kaldırdık - sadece team.run() kullanıyoruz
                         logger.debug("🔍 Charlie'nin revision review yapması için ek round çalıştırılıyor...")
-                        await self.team.run(n_round=1)  # Charlie'nin Bob'un mesajını gözlemlemesi ve review yapması için
+                        await self._run_rounds(1)  # Charlie'nin Bob'un mesajını gözlemlemesi ve review yapması için
                     
                     self.phase_timings.add_phase(f"revision_round_{revision_count}", rev_timer.duration)
                     
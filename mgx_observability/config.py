@@ -15,6 +15,8 @@ class ObservabilityConfig:
     otlp_headers: Optional[str] = None
     sample_ratio: float = 0.1
     span_store_maxlen: int = 2000
+    span_store_max_bytes: Optional[int] = None
+    span_store_spill_path: Optional[str] = None
 
     langsmith_enabled: bool = False
     langsmith_api_key: Optional[str] = None
@@ -43,6 +45,8 @@ class ObservabilityConfig:
             otlp_headers=self.otlp_headers,
             sample_ratio=ratio,
             span_store_maxlen=int(self.span_store_maxlen or 2000),
+            span_store_max_bytes=int(self.span_store_max_bytes) if self.span_store_max_bytes else None,
+            span_store_spill_path=self.span_store_spill_path or None,
             langsmith_enabled=bool(self.langsmith_enabled),
             langsmith_api_key=self.langsmith_api_key,
             langsmith_project=self.langsmith_project,
@@ -510,6 +510,29 @@ class TestCharlieRole:
             # Should have called ReviewCode.run
             mock_review.run.assert_called_once()
     
+    def test_charlie_review_reuses_prepared_sandbox_report(self, event_loop, monkeypatch):
+        """Test the code-only warm-up is reused by the test-aware review."""
+        from mgx_agent.roles import Charlie
+        
+        monkeypatch.delenv("DISABLE_SANDBOX_TESTING", raising=False)
+        charlie = Charlie(is_human=False)
+        charlie.llm = AsyncMock()
+        
+        with patch('mgx_agent.roles.RunSandboxTests') as MockSandbox, \
+                patch('mgx_agent.roles.ReviewCode') as MockReview:
+            MockSandbox.return_value.run = AsyncMock(return_value="## Sandbox OK")
+            MockReview.return_value.run = AsyncMock(return_value="SONUÇ: ONAYLANDI")
+            
+            prepared = event_loop.run_until_complete(charlie.prepare_review("def func(): pass"))
+            event_loop.run_until_complete(
+                charlie.review_artifacts("def func(): pass", "def test_func(): pass")
+            )
+            
+            # Sandbox ran once (during the warm-up); the review used its report
+            assert prepared == "## Sandbox OK"
+            MockSandbox.return_value.run.assert_awaited_once()
+            assert MockReview.return_value.run.call_args.kwargs["sandbox_report"] == "## Sandbox OK"
+    
     def test_charlie_human_mode_with_input(self, event_loop):
         """Test Charlie accepts human input in human mode."""
         from mgx_agent.roles import Charlie
@@ -677,3 +677,38 @@ class TestActionsIntegration:
         
         assert call_count == 2
         assert "pass" in result
+
+
+class TestQualityGateWorkdir:
+    """Test quality gate scratch directory placement"""
+
+    def test_workdirs_share_private_root(self, monkeypatch):
+        """Workdirs live under a per-process mkdtemp root, not a shared temp path"""
+        import tempfile
+        from mgx_agent import actions
+
+        monkeypatch.delenv("MGX_QUALITY_GATE_DIR", raising=False)
+        monkeypatch.setattr(actions, "_QUALITY_GATE_ROOT", None)
+
+        first = actions._quality_gate_workdir("ws", "proj")
+        second = actions._quality_gate_workdir("ws", "other")
+        root = actions._quality_gate_root()
+
+        assert os.path.dirname(os.path.dirname(first)) == root
+        assert os.path.dirname(os.path.dirname(second)) == root
+        assert root != os.path.join(tempfile.gettempdir(), "mgx_quality_gates")
+        assert os.stat(root).st_mode & 0o777 == 0o700
+
+    def test_configured_root_and_dot_segments(self, monkeypatch, tmp_path):
+        """MGX_QUALITY_GATE_DIR is honoured and ids cannot climb out of it"""
+        from mgx_agent import actions
+
+        configured = tmp_path / "gates"
+        monkeypatch.setenv("MGX_QUALITY_GATE_DIR", str(configured))
+        monkeypatch.setattr(actions, "_QUALITY_GATE_ROOT", None)
+
+        workdir = actions._quality_gate_workdir("..", "../..")
+
+        assert configured.is_dir()
+        root = os.path.realpath(str(configured))
+        assert os.path.commonpath([root, os.path.realpath(workdir)]) == root
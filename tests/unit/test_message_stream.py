@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for mgx_agent.message_stream
+
+Tests coverage:
+- TeamMessageStream dedupe by Message.id and by assigned IDs
+- MessageSubscription.until() yields messages while a task runs
+- MetaGPTAdapter.observe_publish() hooks env.publish_message once
+"""
+
+import asyncio
+
+import pytest
+
+from mgx_agent.adapter import MetaGPTAdapter
+from mgx_agent.message_stream import TeamMessageStream
+from tests.helpers.metagpt_stubs import MockMessage
+
+
+class _Env:
+    def __init__(self):
+        self.history = []
+
+    def publish_message(self, message):
+        self.history.append(message)
+        return True
+
+
+class _IdentifiedMessage:
+    def __init__(self, msg_id, content):
+        self.id = msg_id
+        self.role = "Engineer"
+        self.content = content
+
+
+class TestTeamMessageStream:
+    """Test TeamMessageStream publication and dedupe"""
+
+    def test_each_message_is_delivered_once_with_a_stable_id(self):
+        stream = TeamMessageStream()
+        subscription = stream.subscribe()
+        plan = MockMessage(role="TeamLeader", content="plan")
+
+        assert stream.publish(plan) is True
+        assert stream.publish(plan) is False  # re-published by execute()
+        assert stream.publish(_IdentifiedMessage("m-1", "code")) is True
+        assert stream.publish(_IdentifiedMessage("m-1", "code")) is False
+
+        received = subscription.drain()
+        assert [m.content for m in received] == ["plan", "code"]
+        assert stream.message_id(plan) == stream.message_id(plan)
+        assert stream.message_id(received[1]) == "m-1"
+
+    def test_reset_forgets_ids_and_close_detaches(self):
+        stream = TeamMessageStream()
+        subscription = stream.subscribe()
+        message = _IdentifiedMessage("m-1", "code")
+        stream.publish(message)
+
+        stream.reset()
+        assert stream.publish(message) is True
+
+        subscription.close()
+        assert stream.subscriber_count == 0
+        stream.publish(_IdentifiedMessage("m-2", "late"))
+        assert len(subscription.drain()) == 2
+
+    @pytest.mark.asyncio
+    async def test_until_yields_messages_while_task_runs(self):
+        stream = TeamMessageStream()
+        subscription = stream.subscribe()
+
+        async def run():
+            for i in range(3):
+                stream.publish(_IdentifiedMessage(f"m-{i}", f"round {i}"))
+                await asyncio.sleep(0.01)
+            return "done"
+
+        task = asyncio.create_task(run())
+        seen = []
+        async for message in subscription.until(task):
+            seen.append((message.id, task.done()))
+
+        assert [msg_id for msg_id, _ in seen] == ["m-0", "m-1", "m-2"]
+        assert seen[0][1] is False  # delivered before the run finished
+        assert task.result() == "done"
+
+
+class TestMetaGPTAdapterObservePublish:
+    """Test MetaGPTAdapter.observe_publish()"""
+
+    def test_observer_sees_published_messages(self):
+        env = _Env()
+        stream = TeamMessageStream()
+        subscription = stream.subscribe()
+
+        assert MetaGPTAdapter.observe_publish(env, stream.publish) is True
+        message = MockMessage(role="Tester", content="tests")
+        assert env.publish_message(message) is True
+
+        assert env.history == [message]
+        assert subscription.drain() == [message]
+
+    def test_reinstalling_replaces_the_observer(self):
+        env = _Env()
+        calls = []
+        MetaGPTAdapter.observe_publish(env, lambda m: calls.append("first"))
+        MetaGPTAdapter.observe_publish(env, lambda m: calls.append("second"))
+
+        env.publish_message(MockMessage(role="Reviewer", content="ok"))
+
+        assert calls == ["second"]
+        assert len(env.history) == 1
+
+    def test_missing_env_is_not_hooked(self):
+        assert MetaGPTAdapter.observe_publish(None, lambda m: None) is False
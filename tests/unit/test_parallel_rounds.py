@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for mgx_agent.parallel_rounds
+
+Tests coverage:
+- Speculative review runs ahead of its trigger and is accepted
+- A role whose output is current for its inputs does not act again
+- An upstream artifact change cancels the speculative step immediately
+- A review of stale tests does not suppress the reviewer's real trigger
+- A code-only warm-up overlaps test writing in the Alex → Bob → Charlie chain
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from mgx_agent.adapter import MetaGPTAdapter
+from mgx_agent.message_stream import TeamMessageStream
+from mgx_agent.parallel_rounds import ArtifactSnapshot, ParallelRoundRunner, SpeculativeStep
+
+
+class _Msg:
+    def __init__(self, role, content, cause_by):
+        self.role = role
+        self.content = content
+        self.cause_by = cause_by
+
+
+class _Memory:
+    def __init__(self):
+        self.storage = []
+
+    def add(self, message):
+        self.storage.append(message)
+
+    def get(self):
+        return list(self.storage)
+
+
+class _Buffer:
+    def __init__(self):
+        self.items = []
+
+    def pop_all(self):
+        items, self.items = self.items, []
+        return items
+
+
+class _RoleContext:
+    def __init__(self):
+        self.memory = _Memory()
+        self.msg_buffer = _Buffer()
+        self.news = []
+
+
+class _Role:
+    def __init__(self, name, profile, watch, action, act=None):
+        self.name = name
+        self.profile = profile
+        self.watch = watch
+        self.action = action
+        self.rc = _RoleContext()
+        self._act = act
+        self.acted = 0
+
+    @property
+    def is_idle(self):
+        return not self.rc.msg_buffer.items and not self.rc.news
+
+    async def run(self, env):
+        self.rc.msg_buffer.pop_all()
+        self.acted += 1
+        message = _Msg(self.profile, await self._act(), self.action)
+        self.rc.memory.add(message)
+        env.publish_message(message)
+
+
+class _Env:
+    def __init__(self, roles):
+        self.roles = {role.name: role for role in roles}
+
+    def publish_message(self, message):
+        for role in self.roles.values():
+            if message.cause_by in role.watch:
+                role.rc.msg_buffer.items.append(message)
+
+    @property
+    def is_idle(self):
+        return all(role.is_idle for role in self.roles.values())
+
+
+class _Team:
+    def __init__(self, roles):
+        self.env = _Env(roles)
+
+    async def run(self, n_round=1):
+        await asyncio.gather(
+            *(role.run(self.env) for role in self.env.roles.values() if not role.is_idle)
+        )
+
+
+class _MGXTeam:
+    def __init__(self, roles):
+        self.team = _Team(roles)
+        self.message_stream = TeamMessageStream()
+        MetaGPTAdapter.observe_publish(self.team.env, self.message_stream.publish)
+
+    def _collect_raw_results(self):
+        latest = {}
+        for role in self.team.env.roles.values():
+            for message in role.rc.memory.get():
+                latest[message.role] = message.content
+        return latest.get("Engineer", ""), latest.get("Tester", ""), latest.get("Reviewer", "")
+
+
+def _build(alex_act, bob_act, review_delay=0.0):
+    reviews = []
+
+    async def review(snapshot: ArtifactSnapshot) -> str:
+        reviews.append((snapshot.code, time.perf_counter()))
+        await asyncio.sleep(review_delay)
+        return f"APPROVED {snapshot.code} / {snapshot.tests}"
+
+    async def review_latest() -> str:
+        # Charlie's regular action: reviews whatever is latest, without delay
+        code, tests, _ = team._collect_raw_results()
+        return f"APPROVED {code} / {tests}"
+
+    alex = _Role("Alex", "Engineer", ["AnalyzeTask"], "WriteCode", alex_act)
+    bob = _Role("Bob", "Tester", ["WriteCode"], "WriteTest", bob_act)
+    charlie = _Role("Charlie", "Reviewer", ["WriteTest"], "ReviewCode", review_latest)
+    team = _MGXTeam([alex, bob, charlie])
+
+    step = SpeculativeStep(
+        role=charlie,
+        reads=("code", "tests"),
+        run=review,
+        make_message=lambda content: _Msg("Reviewer", content, "ReviewCode"),
+    )
+    return team, (alex, bob, charlie), ParallelRoundRunner(team, [step]), reviews
+
+
+class TestParallelRoundRunner:
+    """Test ParallelRoundRunner speculation and conflict handling"""
+
+    @pytest.mark.asyncio
+    async def test_review_runs_ahead_and_is_not_repeated(self):
+        team, (alex, bob, charlie), runner, reviews = _build(None, None)
+        alex.rc.memory.add(_Msg("Engineer", "code v1", "WriteCode"))
+        bob.rc.memory.add(_Msg("Tester", "tests v1", "WriteTest"))
+
+        assert await runner.run_round() is True
+        assert team._collect_raw_results() == ("code v1", "tests v1", "APPROVED code v1 / tests v1")
+        assert len(reviews) == 1
+
+        # Charlie is triggered by Bob's tests, but its review is already current
+        charlie.rc.msg_buffer.items.append(_Msg("Tester", "tests v1", "WriteTest"))
+        assert await runner.run_rounds(3) == 0
+        assert charlie.is_idle and charlie.acted == 0 and len(reviews) == 1
+        assert runner.stats() == {
+            "rounds": 1,
+            "speculated": 1,
+            "accepted": 1,
+            "invalidated": 0,
+            "skipped": 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_review_of_stale_tests_keeps_the_real_trigger(self):
+        async def write_tests():
+            await asyncio.sleep(0.01)
+            return "tests v2"
+
+        team, (alex, bob, charlie), runner, reviews = _build(None, write_tests, review_delay=5)
+        alex.rc.memory.add(_Msg("Engineer", "code v1", "WriteCode"))
+        bob.rc.memory.add(_Msg("Tester", "tests v1", "WriteTest"))
+        bob.rc.msg_buffer.items.append(_Msg("Engineer", "code v1", "WriteCode"))
+
+        started = time.perf_counter()
+        assert await runner.run_round() is True
+
+        # Bob's new tests cancel the review started against tests v1
+        assert time.perf_counter() - started < 1
+        assert charlie.rc.memory.get() == []
+        assert runner.stats()["invalidated"] == 1
+
+        # Charlie's trigger is not dropped: it reviews the new tests normally
+        assert await runner.run_round() is True
+        assert charlie.acted == 1
+        assert team._collect_raw_results()[2] == "APPROVED code v1 / tests v2"
+        assert runner.stats()["skipped"] == 0
+
+    @pytest.mark.asyncio
+    async def test_upstream_change_cancels_the_speculative_step(self):
+        async def revise_code():
+            await asyncio.sleep(0.01)
+            return "code v2"
+
+        team, (alex, bob, charlie), runner, reviews = _build(revise_code, None, review_delay=5)
+        alex.rc.memory.add(_Msg("Engineer", "code v1", "WriteCode"))
+        bob.rc.memory.add(_Msg("Tester", "tests v1", "WriteTest"))
+        alex.rc.msg_buffer.items.append(_Msg("TeamLeader", "revise", "AnalyzeTask"))
+
+        started = time.perf_counter()
+        assert await runner.run_round() is True
+
+        assert time.perf_counter() - started < 1  # cancelled, not awaited
+        assert [code for code, _ in reviews] == ["code v1"]
+        assert charlie.rc.memory.get() == []
+        assert runner.stats()["invalidated"] == 1
+        assert runner.stats()["accepted"] == 0
+
+    @pytest.mark.asyncio
+    async def test_code_warm_up_overlaps_test_writing_in_the_role_chain(self):
+        timeline = []
+        prepared = {}
+
+        async def write_code():
+            return "code v1"
+
+        async def write_tests():
+            timeline.append("tests started")
+            await asyncio.sleep(0.05)
+            timeline.append("tests done")
+            return "tests v1"
+
+        async def prepare(snapshot: ArtifactSnapshot) -> str:
+            timeline.append("warm-up started")
+            await asyncio.sleep(0.05)
+            prepared[snapshot.code] = f"sandbox {snapshot.code}"
+            return prepared[snapshot.code]
+
+        async def review() -> str:
+            code, tests, _ = team._collect_raw_results()
+            return f"APPROVED {code} / {tests} ({prepared.get(code, 'no sandbox')})"
+
+        alex = _Role("Alex", "Engineer", ["AnalyzeTask"], "WriteCode", write_code)
+        bob = _Role("Bob", "Tester", ["WriteCode"], "WriteTest", write_tests)
+        charlie = _Role("Charlie", "Reviewer", ["WriteTest"], "ReviewCode", review)
+        team = _MGXTeam([alex, bob, charlie])
+        runner = ParallelRoundRunner(team, [SpeculativeStep(role=charlie, reads=("code",), run=prepare)])
+        alex.rc.msg_buffer.items.append(_Msg("TeamLeader", "task", "AnalyzeTask"))
+
+        # code, tests (+ warm-up), review; then nothing is left to do
+        assert await runner.run_rounds(5) == 3
+
+        # The warm-up ran while Bob was writing tests and was kept
+        assert timeline.index("warm-up started") < timeline.index("tests done")
+        assert runner.stats() == {
+            "rounds": 3,
+            "speculated": 1,
+            "accepted": 1,
+            "invalidated": 0,
+            "skipped": 0,
+        }
+        # Charlie still reviewed the real tests once, reusing the warm-up result
+        assert charlie.acted == 1
+        assert team._collect_raw_results()[2] == "APPROVED code v1 / tests v1 (sandbox code v1)"
+
+    def test_fingerprint_covers_only_read_artifacts(self):
+        before = ArtifactSnapshot(code="c", tests="t1")
+        after = ArtifactSnapshot(code="c", tests="t2")
+
+        assert before.fingerprint(("code",)) == after.fingerprint(("code",))
+        assert before.fingerprint(("code", "tests")) != after.fingerprint(("code", "tests"))
+        assert not ArtifactSnapshot(code="  ").has(("code",))